@@ -10,9 +10,13 @@ Uses A-T-Q (Accomplishments-Trajectory-Qualifications) scoring model:
 This module contains the core AI evaluation logic.
 Supports multiple LLM providers via abstraction layer.
 """
+import hashlib
 import os
 import re
-from llm_providers import get_provider
+import threading
+from llm_providers import get_provider, PromptWithPrefix
+from llm_cache import cached_evaluate
+from structured_output import STAGE1_SCHEMA, decode_structured, load_json_object
 
 
 # Path to recruiting-evaluation skill
@@ -21,14 +25,8 @@ SKILL_PATH = os.environ.get('RECRUITING_SKILL_PATH') or os.path.join(
 )
 
 
-def load_skill_instructions():
-    """Load recruiting-evaluation skill instructions"""
-    try:
-        with open(SKILL_PATH, 'r') as f:
-            return f.read()
-    except FileNotFoundError:
-        # Fallback: use A-T-Q scoring instructions if skill file not found
-        return """
+# Fallback: A-T-Q scoring instructions used when the skill file is not found
+DEFAULT_SKILL_INSTRUCTIONS = """
 You are evaluating a candidate using the A-T-Q (Accomplishments-Trajectory-Qualifications) scoring model.
 
 ## A-T-Q Scoring Framework
@@ -86,9 +84,80 @@ Location is a REQUIREMENT (met/unmet in Q), NOT a risk penalty.
 - <70 = DECLINE
 """
 
+DEFAULT_SKILL_HASH = hashlib.sha256(DEFAULT_SKILL_INSTRUCTIONS.encode('utf-8')).hexdigest()
 
-def build_stage1_prompt(skill_instructions, job_data, candidate_data):
-    """Build Stage 1: Resume Screening prompt using A-T-Q model"""
+# Process-wide copy of the skill file, keyed on (path, mtime, size)
+_skill_lock = threading.Lock()
+_skill_cache = {'signature': None, 'instructions': None, 'hash': None}
+
+
+def _skill_file_signature(path):
+    """(path, mtime_ns, size) of the skill file, or None if it can't be stat'ed"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (path, stat.st_mtime_ns, stat.st_size)
+
+
+def _read_skill_file():
+    """Read SKILL_PATH, returning (instructions, sha256 hex digest)"""
+    try:
+        with open(SKILL_PATH, 'r') as f:
+            instructions = f.read()
+    except FileNotFoundError:
+        return DEFAULT_SKILL_INSTRUCTIONS, DEFAULT_SKILL_HASH
+    return instructions, hashlib.sha256(instructions.encode('utf-8')).hexdigest()
+
+
+def load_skill():
+    """
+    Load recruiting-evaluation skill instructions along with their content hash
+
+    The file is read once per process and re-read only when its mtime or size
+    changes, so evaluations don't hit the disk on every call.
+
+    Returns:
+        Tuple of (instructions, sha256 hex digest of the instructions)
+    """
+    signature = _skill_file_signature(SKILL_PATH)
+    if signature is None:
+        # Nothing to key the cache on (usually a missing file and the built-in fallback)
+        return _read_skill_file()
+
+    with _skill_lock:
+        if _skill_cache['signature'] != signature:
+            instructions, skill_hash = _read_skill_file()
+            _skill_cache.update(signature=signature, instructions=instructions, hash=skill_hash)
+        return _skill_cache['instructions'], _skill_cache['hash']
+
+
+def load_skill_instructions():
+    """Load recruiting-evaluation skill instructions"""
+    return load_skill()[0]
+
+
+def get_skill_hash():
+    """SHA-256 of the skill instructions currently in use (stored on evaluations for reproducibility)"""
+    return load_skill()[1]
+
+
+def clear_skill_cache():
+    """Forget the cached skill file so the next load re-reads it"""
+    with _skill_lock:
+        _skill_cache.update(signature=None, instructions=None, hash=None)
+
+
+def build_stage1_prompt_parts(skill_instructions, job_data, candidate_data):
+    """
+    Build the Stage 1 prompt as a shared prefix and a per-candidate suffix
+
+    The prefix (skill instructions + job block) is identical for every candidate
+    of a requisition, so providers can cache it; only the suffix changes.
+
+    Returns:
+        Tuple of (prefix, suffix); prefix + suffix is the full prompt
+    """
     must_haves = '\n'.join([f"- {req}" for req in job_data.get('must_have_requirements', [])])
     preferreds = '\n'.join([f"- {req}" for req in job_data.get('preferred_requirements', [])])
 
@@ -96,7 +165,7 @@ def build_stage1_prompt(skill_instructions, job_data, candidate_data):
     if not must_haves and job_data.get('requirements'):
         must_haves = '\n'.join([f"- {req}" for req in job_data.get('requirements', [])])
 
-    prompt = f"""{skill_instructions}
+    prefix = f"""{skill_instructions}
 
 ---
 
@@ -122,7 +191,9 @@ Employment Type: {job_data.get('employment_type', 'Full-time')}
 
 ---
 
-**CANDIDATE PROFILE:**
+"""
+
+    suffix = f"""**CANDIDATE PROFILE:**
 Name: {candidate_data.get('full_name', candidate_data.get('name', 'N/A'))}
 Email: {candidate_data.get('email', 'N/A')}
 
@@ -170,14 +241,57 @@ INTERVIEW_QUESTIONS:
 REASONING:
 [2-3 paragraphs explaining the A-T-Q scores and recommendation. Focus on what they HAVE accomplished, not credentials. Note any unmet requirements factually without treating them as "risks".]
 """
-    return prompt
+    return prefix, suffix
 
 
-def parse_stage1_response(response_text):
-    """Parse Stage 1 A-T-Q evaluation response from Claude"""
-    lines = response_text.strip().split('\n')
-
-    evaluation = {
+def build_stage1_prompt(skill_instructions, job_data, candidate_data):
+    """Build Stage 1: Resume Screening prompt using A-T-Q model (with a cacheable prefix)"""
+    prefix, suffix = build_stage1_prompt_parts(skill_instructions, job_data, candidate_data)
+    return PromptWithPrefix(prefix, suffix)
+
+
+# Stage 1 response headers -> (kind, field). A line "HEADER: value" is dispatched on the
+# text before its first colon, so each line costs one dict lookup.
+_STAGE1_HEADERS = {
+    # Main scores: first number anywhere in the value
+    'SCORE': ('score', 'score'),
+    'A_SCORE': ('score', 'a_score'),
+    'T_SCORE': ('score', 't_score'),
+    'Q_SCORE': ('score', 'q_score'),
+    'RECOMMENDATION': ('text', 'recommendation'),
+
+    # Sub-scores: number at the start of the value
+    'Comparable Work': ('subscore', ('accomplishments_analysis', 'comparable_work')),
+    'Comparable Scale': ('subscore', ('accomplishments_analysis', 'comparable_scale')),
+    'Impact Evidence': ('subscore', ('accomplishments_analysis', 'impact_evidence')),
+    'Growth Pattern': ('subscore', ('trajectory_analysis', 'growth_pattern')),
+    'Progression Velocity': ('subscore', ('trajectory_analysis', 'progression_velocity')),
+    'Intentionality': ('subscore', ('trajectory_analysis', 'intentionality')),
+    'Must-Haves Met': ('subtext', ('qualifications_analysis', 'must_haves_met')),
+    'Preferreds Met': ('subtext', ('qualifications_analysis', 'preferreds_met')),
+
+    # Section markers
+    'KEY_STRENGTHS': ('section', 'strengths'),
+    'OBSERVATIONS': ('section', 'observations'),
+    'INTERVIEW_QUESTIONS': ('section', 'questions'),
+    'REASONING': ('section', 'reasoning'),
+    'ACCOMPLISHMENTS_ANALYSIS': ('section', 'accomplishments'),
+    'TRAJECTORY_ANALYSIS': ('section', 'trajectory'),
+    'QUALIFICATIONS_ANALYSIS': ('section', 'qualifications'),
+}
+
+# Bullet sections -> evaluation list they fill
+_STAGE1_BULLET_SECTIONS = {'strengths': 'key_strengths', 'observations': 'observations'}
+
+_NUMBER_RE = re.compile(r'\d+')
+_QUESTION_PREFIXES = ('1.', '2.', '3.', '4.', '5.')
+_QUESTION_NUMBER_RE = re.compile(r'^\d+\.\s*')
+_MULTI_SPACE_RE = re.compile(r'  +')
+
+
+def _empty_stage1_evaluation():
+    """Stage 1 evaluation with every field at its default"""
+    return {
         'score': 0,
         'a_score': 0,
         't_score': 0,
@@ -203,135 +317,30 @@ def parse_stage1_response(response_text):
         'reasoning': ''
     }
 
-    current_section = None
 
-    for line in lines:
-        line = line.strip()
+def _parse_int(match):
+    """int() of a regex match, or None if there's no match"""
+    if match is None:
+        return None
+    try:
+        return int(match.group())
+    except ValueError:
+        return None
 
-        # Main scores
-        if line.startswith('SCORE:'):
-            try:
-                evaluation['score'] = int(re.search(r'\d+', line.split(':', 1)[1]).group())
-            except:
-                pass
-        elif line.startswith('A_SCORE:'):
-            try:
-                evaluation['a_score'] = int(re.search(r'\d+', line.split(':', 1)[1]).group())
-            except:
-                pass
-        elif line.startswith('T_SCORE:'):
-            try:
-                evaluation['t_score'] = int(re.search(r'\d+', line.split(':', 1)[1]).group())
-            except:
-                pass
-        elif line.startswith('Q_SCORE:'):
-            try:
-                evaluation['q_score'] = int(re.search(r'\d+', line.split(':', 1)[1]).group())
-            except:
-                pass
-        elif line.startswith('RECOMMENDATION:'):
-            evaluation['recommendation'] = line.split(':', 1)[1].strip()
-
-        # Accomplishments sub-scores
-        elif line.startswith('Comparable Work:'):
-            try:
-                parts = line.split(':', 1)[1].strip()
-                score_match = re.search(r'^(\d+)', parts)
-                if score_match:
-                    evaluation['accomplishments_analysis']['comparable_work'] = int(score_match.group(1))
-            except:
-                pass
-        elif line.startswith('Comparable Scale:'):
-            try:
-                parts = line.split(':', 1)[1].strip()
-                score_match = re.search(r'^(\d+)', parts)
-                if score_match:
-                    evaluation['accomplishments_analysis']['comparable_scale'] = int(score_match.group(1))
-            except:
-                pass
-        elif line.startswith('Impact Evidence:'):
-            try:
-                parts = line.split(':', 1)[1].strip()
-                score_match = re.search(r'^(\d+)', parts)
-                if score_match:
-                    evaluation['accomplishments_analysis']['impact_evidence'] = int(score_match.group(1))
-            except:
-                pass
-
-        # Trajectory sub-scores
-        elif line.startswith('Growth Pattern:'):
-            try:
-                parts = line.split(':', 1)[1].strip()
-                score_match = re.search(r'^(\d+)', parts)
-                if score_match:
-                    evaluation['trajectory_analysis']['growth_pattern'] = int(score_match.group(1))
-            except:
-                pass
-        elif line.startswith('Progression Velocity:'):
-            try:
-                parts = line.split(':', 1)[1].strip()
-                score_match = re.search(r'^(\d+)', parts)
-                if score_match:
-                    evaluation['trajectory_analysis']['progression_velocity'] = int(score_match.group(1))
-            except:
-                pass
-        elif line.startswith('Intentionality:'):
-            try:
-                parts = line.split(':', 1)[1].strip()
-                score_match = re.search(r'^(\d+)', parts)
-                if score_match:
-                    evaluation['trajectory_analysis']['intentionality'] = int(score_match.group(1))
-            except:
-                pass
-
-        # Qualifications analysis
-        elif line.startswith('Must-Haves Met:'):
-            evaluation['qualifications_analysis']['must_haves_met'] = line.split(':', 1)[1].strip()
-        elif line.startswith('Preferreds Met:'):
-            evaluation['qualifications_analysis']['preferreds_met'] = line.split(':', 1)[1].strip()
-
-        # Section markers
-        elif line.startswith('KEY_STRENGTHS:'):
-            current_section = 'strengths'
-        elif line.startswith('OBSERVATIONS:'):
-            current_section = 'observations'
-        elif line.startswith('INTERVIEW_QUESTIONS:'):
-            current_section = 'questions'
-        elif line.startswith('REASONING:'):
-            current_section = 'reasoning'
-        elif line.startswith('ACCOMPLISHMENTS_ANALYSIS:'):
-            current_section = 'accomplishments'
-        elif line.startswith('TRAJECTORY_ANALYSIS:'):
-            current_section = 'trajectory'
-        elif line.startswith('QUALIFICATIONS_ANALYSIS:'):
-            current_section = 'qualifications'
-
-        # List items
-        elif line.startswith('- ') and current_section == 'strengths':
-            evaluation['key_strengths'].append(line[2:])
-        elif line.startswith('- ') and current_section == 'observations':
-            evaluation['observations'].append(line[2:])
-        elif line.startswith(('1.', '2.', '3.', '4.', '5.')) and current_section == 'questions':
-            # Remove the number and period prefix
-            question = re.sub(r'^\d+\.\s*', '', line).strip()
-            if question:
-                evaluation['interview_questions'].append(question)
-
-        # Reasoning paragraphs
-        elif current_section == 'reasoning':
-            if line:
-                if evaluation['reasoning'] and evaluation['reasoning'][-1] not in '.!?':
-                    evaluation['reasoning'] += ' '
-                evaluation['reasoning'] += line + ' '
-            else:
-                if evaluation['reasoning'] and not evaluation['reasoning'].endswith('\n\n'):
-                    evaluation['reasoning'] = evaluation['reasoning'].strip() + '\n\n'
 
-    # Clean up reasoning
-    evaluation['reasoning'] = evaluation['reasoning'].strip()
-    evaluation['reasoning'] = re.sub(r'  +', ' ', evaluation['reasoning'])
+def _coerce_int(value):
+    """Integer score from a JSON value (int, float or numeric string), or None"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        return _parse_int(_NUMBER_RE.search(value))
+    return None
+
 
-    # Calculate A-T-Q scores from sub-components if main scores are 0
+def _derive_atq_scores(evaluation):
+    """Fill in A/T/overall scores the model left at 0 from their components"""
     if evaluation['a_score'] == 0:
         aa = evaluation['accomplishments_analysis']
         if aa['comparable_work'] > 0 or aa['comparable_scale'] > 0 or aa['impact_evidence'] > 0:
@@ -361,7 +370,129 @@ def parse_stage1_response(response_text):
     return evaluation
 
 
-def evaluate_candidate_with_ai(job_data, candidate_data, stage=1, provider='anthropic', model=None, api_key=None):
+def parse_stage1_json(data):
+    """
+    Build a Stage 1 evaluation from structured (JSON / tool-use) output
+
+    Args:
+        data: Dict with the same keys as parse_stage1_response's result;
+            missing or malformed fields keep their defaults
+
+    Returns:
+        Evaluation dict (same shape as parse_stage1_response)
+    """
+    evaluation = _empty_stage1_evaluation()
+
+    for field in ('score', 'a_score', 't_score', 'q_score'):
+        value = _coerce_int(data.get(field))
+        if value is not None:
+            evaluation[field] = value
+    if isinstance(data.get('recommendation'), str):
+        evaluation['recommendation'] = data['recommendation'].strip()
+
+    for group in ('accomplishments_analysis', 'trajectory_analysis', 'qualifications_analysis'):
+        values = data.get(group)
+        if not isinstance(values, dict):
+            continue
+        for field, default in evaluation[group].items():
+            if field not in values:
+                continue
+            if isinstance(default, str):
+                evaluation[group][field] = str(values[field]).strip()
+            else:
+                value = _coerce_int(values[field])
+                if value is not None:
+                    evaluation[group][field] = value
+
+    for field in ('key_strengths', 'observations', 'interview_questions'):
+        items = data.get(field)
+        if isinstance(items, list):
+            evaluation[field] = [str(item).strip() for item in items if str(item).strip()]
+    if isinstance(data.get('reasoning'), str):
+        evaluation['reasoning'] = data['reasoning'].strip()
+
+    return _derive_atq_scores(evaluation)
+
+
+# Appended to the Stage 1 prompt when the answer comes back as structured output
+STRUCTURED_OUTPUT_NOTE = (
+    "\nReturn the evaluation as structured output instead of the text format above; "
+    "each field corresponds to the section of the same name.\n"
+)
+
+
+def parse_stage1_response(response_text):
+    """
+    Parse Stage 1 A-T-Q evaluation response from Claude
+
+    Accepts the line-oriented format requested by build_stage1_prompt or a
+    JSON object with the same fields (structured output).
+    """
+    text = response_text.strip()
+    data = load_json_object(text) if text[:1] in ('{', '`') else None
+    if data is not None:
+        return parse_stage1_json(data)
+
+    evaluation = _empty_stage1_evaluation()
+    headers = _STAGE1_HEADERS
+    current_section = None
+    bullets = None
+    questions = evaluation['interview_questions']
+    # Reasoning lines grouped into paragraphs at blank lines
+    paragraphs = []
+    new_paragraph = False
+
+    for line in text.split('\n'):
+        line = line.strip()
+
+        head, colon, value = line.partition(':')
+        entry = headers.get(head) if colon else None
+        if entry is not None:
+            kind, field = entry
+            if kind == 'section':
+                current_section = field
+                bullets = evaluation.get(_STAGE1_BULLET_SECTIONS.get(field))
+            elif kind == 'score':
+                number = _parse_int(_NUMBER_RE.search(value))
+                if number is not None:
+                    evaluation[field] = number
+            elif kind == 'subscore':
+                number = _parse_int(_NUMBER_RE.match(value.strip()))
+                if number is not None:
+                    evaluation[field[0]][field[1]] = number
+            elif kind == 'subtext':
+                evaluation[field[0]][field[1]] = value.strip()
+            else:
+                evaluation[field] = value.strip()
+
+        elif bullets is not None and line.startswith('- '):
+            bullets.append(line[2:])
+        elif current_section == 'questions':
+            if line.startswith(_QUESTION_PREFIXES):
+                # Remove the number and period prefix
+                question = _QUESTION_NUMBER_RE.sub('', line).strip()
+                if question:
+                    questions.append(question)
+        elif current_section == 'reasoning':
+            if not line:
+                new_paragraph = bool(paragraphs)
+            elif new_paragraph or not paragraphs:
+                paragraphs.append([line])
+                new_paragraph = False
+            else:
+                paragraphs[-1].append(line)
+
+    # Paragraphs are separated by a blank line; later paragraphs keep the single
+    # leading space earlier versions of this parser produced
+    if paragraphs:
+        reasoning = '\n\n '.join(' '.join(paragraph) for paragraph in paragraphs)
+        evaluation['reasoning'] = _MULTI_SPACE_RE.sub(' ', reasoning.strip())
+
+    return _derive_atq_scores(evaluation)
+
+
+def evaluate_candidate_with_ai(job_data, candidate_data, stage=1, provider='anthropic', model=None, api_key=None,
+                              use_cache=True, structured_output=False):
     """
     Evaluate a single candidate using specified LLM provider with A-T-Q scoring
 
@@ -372,6 +503,9 @@ def evaluate_candidate_with_ai(job_data, candidate_data, stage=1, provider='anth
         provider: LLM provider to use ('anthropic' or 'openai')
         model: Specific model to use (if None, uses provider default)
         api_key: API key for the provider (if None, reads from environment)
+        use_cache: Reuse a cached response for a byte-identical prompt/provider/model (default: True)
+        structured_output: Ask the provider for JSON matching STAGE1_SCHEMA (tool use,
+            response_format or JSON mode); the text parser is only used if that fails validation
 
     Returns:
         Dictionary with evaluation results and usage metrics
@@ -388,8 +522,8 @@ def evaluate_candidate_with_ai(job_data, candidate_data, stage=1, provider='anth
     if stage == 2:
         raise NotImplementedError('Stage 2 evaluation not yet implemented in this module')
 
-    # Load skill instructions
-    skill_instructions = load_skill_instructions()
+    # Load skill instructions (cached until the skill file changes)
+    skill_instructions, skill_hash = load_skill()
 
     # Build prompt
     prompt = build_stage1_prompt(skill_instructions, job_data, candidate_data)
@@ -400,15 +534,31 @@ def evaluate_candidate_with_ai(job_data, candidate_data, stage=1, provider='anth
     except ValueError as e:
         raise ValueError(f'Failed to initialize {provider} provider: {str(e)}')
 
-    # Call LLM provider
+    structured = structured_output and llm_provider.supports_structured_output()
+    if structured:
+        prompt = PromptWithPrefix(prompt.prefix, prompt.suffix + STRUCTURED_OUTPUT_NOTE)
+
+    # Call LLM provider (or reuse a cached response for an identical prompt)
     try:
-        response_text, usage_metadata = llm_provider.evaluate(prompt)
+        response_text, usage_metadata = cached_evaluate(
+            llm_provider, prompt, use_cache=use_cache, extra_key={'skill_hash': skill_hash},
+            schema=STAGE1_SCHEMA if structured else None
+        )
     except Exception as e:
         raise Exception(f'API call failed: {str(e)}')
 
+    # Structured output that passes validation needs no text parsing
+    evaluation_data = None
+    structured_data = decode_structured(response_text, STAGE1_SCHEMA) if structured else None
+    if structured_data is not None:
+        evaluation_data = parse_stage1_json(structured_data)
+    elif structured:
+        print('Warning: Structured output failed schema validation; falling back to the text parser')
+
     # Parse response with error handling
     try:
-        evaluation_data = parse_stage1_response(response_text)
+        if evaluation_data is None:
+            evaluation_data = parse_stage1_response(response_text)
     except Exception as e:
         print(f'Warning: Failed to parse AI response: {str(e)}')
         print(f'Raw response (first 500 chars): {response_text[:500]}')
@@ -421,10 +571,15 @@ def evaluate_candidate_with_ai(job_data, candidate_data, stage=1, provider='anth
         'usage': {
             'input_tokens': usage_metadata['input_tokens'],
             'output_tokens': usage_metadata['output_tokens'],
-            'cost': usage_metadata['cost']
+            'cache_creation_input_tokens': usage_metadata.get('cache_creation_input_tokens', 0),
+            'cache_read_input_tokens': usage_metadata.get('cache_read_input_tokens', 0),
+            'cost': usage_metadata['cost'],
+            'cache_hit': usage_metadata.get('cache_hit', False)
         },
         'model': usage_metadata['model'],
         'provider': llm_provider.get_provider_name(),
         'scoring_model': 'ATQ',
+        'skill_hash': skill_hash,
+        'output_format': 'json' if structured_data is not None else 'text',
         'raw_response': response_text  # Include for debugging
     }
@@ -0,0 +1,280 @@
+"""
+Bounded Concurrent Batch Executor
+Runs one evaluation function over many candidates with a fixed number of workers
+
+Batch wall-clock time scales with the number of parallel slots the LLM backend
+can serve (for Ollama: OLLAMA_NUM_PARALLEL) instead of the number of candidates.
+Each item succeeds or fails independently and is timed on its own.
+
+The *_async variants drive coroutine functions (e.g. LLMProvider.aevaluate)
+from one shared event loop, bounded by a semaphore instead of a thread per
+in-flight request.
+"""
+import asyncio
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Sequence
+
+
+# Ollama serves one request per model at a time unless OLLAMA_NUM_PARALLEL is raised
+DEFAULT_PARALLELISM = 1
+# ...and keeps up to OLLAMA_MAX_LOADED_MODELS models in VRAM at once (its default for one GPU)
+DEFAULT_MAX_LOADED_MODELS = 3
+MAX_PARALLELISM = 16  # Hard cap so a request can't spawn unbounded threads
+MAX_ASYNC_CONCURRENCY = 256  # Coroutines are cheap, but the backend still has to serve them
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def get_ollama_parallelism() -> int:
+    """
+    Get the configured number of concurrent Ollama requests
+
+    Reads the same OLLAMA_NUM_PARALLEL variable the Ollama server uses, so a
+    single setting keeps client concurrency matched to server GPU slots.
+
+    Returns:
+        int: Parallelism between 1 and MAX_PARALLELISM
+    """
+    try:
+        value = int(os.environ.get('OLLAMA_NUM_PARALLEL', DEFAULT_PARALLELISM))
+    except ValueError:
+        value = DEFAULT_PARALLELISM
+    return clamp_parallelism(value)
+
+
+def get_ollama_max_loaded_models() -> int:
+    """
+    Get how many different Ollama models can be resident (and running) at once
+
+    Reads the OLLAMA_MAX_LOADED_MODELS variable the Ollama server uses. Running
+    more models than this concurrently just makes the server swap them in and
+    out of VRAM.
+
+    Returns:
+        int: Model slots between 1 and MAX_PARALLELISM
+    """
+    try:
+        value = int(os.environ.get('OLLAMA_MAX_LOADED_MODELS', DEFAULT_MAX_LOADED_MODELS))
+    except ValueError:
+        value = DEFAULT_MAX_LOADED_MODELS
+    return clamp_parallelism(value)
+
+
+def clamp_parallelism(value: Optional[int]) -> int:
+    """Clamp a requested parallelism to the range [1, MAX_PARALLELISM]"""
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_PARALLELISM
+    return max(1, min(MAX_PARALLELISM, value))
+
+
+def _run_one(fn: Callable[[Any], Any], index: int, item: Any) -> Dict[str, Any]:
+    """Run fn on a single item, capturing its result or error and timing"""
+    start_time = time.time()
+    try:
+        value = fn(item)
+        return {
+            'index': index,
+            'success': True,
+            'value': value,
+            'elapsed_seconds': round(time.time() - start_time, 2)
+        }
+    except Exception as e:
+        return {
+            'index': index,
+            'success': False,
+            'error': str(e),
+            'elapsed_seconds': round(time.time() - start_time, 2)
+        }
+
+
+def iter_batch_completed(
+    items: Sequence[Any],
+    fn: Callable[[Any], Any],
+    max_workers: int = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Run fn over items concurrently, yielding each outcome as soon as it finishes
+
+    Args:
+        items: Items to process (e.g. candidate dicts)
+        fn: Function called once per item; exceptions are captured per item
+        max_workers: Maximum concurrent calls (default: OLLAMA_NUM_PARALLEL)
+
+    Yields:
+        Dict with index (position in items), success, value or error, elapsed_seconds
+    """
+    if not items:
+        return
+
+    workers = clamp_parallelism(max_workers) if max_workers else get_ollama_parallelism()
+    workers = min(workers, len(items))
+
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='batch-eval')
+    try:
+        futures = [executor.submit(_run_one, fn, index, item) for index, item in enumerate(items)]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        # If the consumer stops early (e.g. a streaming client disconnects), drop queued items
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def run_batch(
+    items: Sequence[Any],
+    fn: Callable[[Any], Any],
+    max_workers: int = None
+) -> List[Dict[str, Any]]:
+    """
+    Run fn over items concurrently and return outcomes in input order
+
+    Args:
+        items: Items to process (e.g. candidate dicts)
+        fn: Function called once per item; exceptions are captured per item
+        max_workers: Maximum concurrent calls (default: OLLAMA_NUM_PARALLEL)
+
+    Returns:
+        List of outcome dicts (see iter_batch_completed), ordered like items
+    """
+    outcomes = [None] * len(items)
+    for outcome in iter_batch_completed(items, fn, max_workers=max_workers):
+        outcomes[outcome['index']] = outcome
+    return outcomes
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the process-wide event loop used for async batches
+
+    The loop runs forever in a daemon thread, so async HTTP clients and their
+    keep-alive connections are reused across requests.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name='batch-event-loop', daemon=True).start()
+            _loop = loop
+        return _loop
+
+
+async def _arun_one(afn: Callable[..., Awaitable[Any]], index: int, item: Any,
+                    semaphore: asyncio.Semaphore, progress: Optional[Callable[[Dict[str, Any]], None]]) -> Dict[str, Any]:
+    """Await afn on a single item once a slot is free, capturing its result or error and timing"""
+    async with semaphore:
+        start_time = time.time()
+        try:
+            if progress:
+                value = await afn(item, lambda payload: progress({'index': index, 'progress': payload}))
+            else:
+                value = await afn(item)
+            return {
+                'index': index,
+                'success': True,
+                'value': value,
+                'elapsed_seconds': round(time.time() - start_time, 2)
+            }
+        except Exception as e:
+            return {
+                'index': index,
+                'success': False,
+                'error': str(e),
+                'elapsed_seconds': round(time.time() - start_time, 2)
+            }
+
+
+async def _arun_all(items: Sequence[Any], afn: Callable[..., Awaitable[Any]], concurrency: int,
+                    deliver: Callable[[Dict[str, Any]], None], with_progress: bool = False) -> None:
+    """Run afn over all items with at most concurrency in flight, delivering outcomes as they finish"""
+    semaphore = asyncio.Semaphore(concurrency)
+    progress = deliver if with_progress else None
+    tasks = [asyncio.ensure_future(_arun_one(afn, index, item, semaphore, progress))
+             for index, item in enumerate(items)]
+    try:
+        for task in asyncio.as_completed(tasks):
+            deliver(await task)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def iter_batch_completed_async(
+    items: Sequence[Any],
+    afn: Callable[..., Awaitable[Any]],
+    max_concurrency: int = None,
+    with_progress: bool = False
+) -> Iterator[Dict[str, Any]]:
+    """
+    Run a coroutine function over items on the shared event loop, yielding each outcome as it finishes
+
+    Args:
+        items: Items to process (e.g. candidate dicts)
+        afn: Coroutine function called once per item; exceptions are captured per item
+        max_concurrency: Maximum calls in flight (default: OLLAMA_NUM_PARALLEL)
+        with_progress: Call afn(item, report) instead; each report(payload) is yielded
+            right away as {'index', 'progress': payload}, before the item's outcome
+
+    Yields:
+        Dict with index (position in items), success, value or error, elapsed_seconds
+        (plus progress records when with_progress is set)
+    """
+    if not items:
+        return
+
+    if max_concurrency:
+        try:
+            concurrency = max(1, min(MAX_ASYNC_CONCURRENCY, int(max_concurrency)))
+        except (TypeError, ValueError):
+            concurrency = DEFAULT_PARALLELISM
+    else:
+        concurrency = get_ollama_parallelism()
+
+    outcomes = queue.Queue()
+    future = asyncio.run_coroutine_threadsafe(
+        _arun_all(items, afn, concurrency, outcomes.put, with_progress), get_event_loop()
+    )
+    try:
+        for _ in range(len(items)):
+            while True:
+                try:
+                    outcome = outcomes.get(timeout=0.1)
+                except queue.Empty:
+                    if future.done():
+                        future.result()  # Surface an unexpected failure of the batch itself
+                        if outcomes.empty():
+                            return
+                    continue
+                yield outcome
+                if 'progress' not in outcome:
+                    break
+    finally:
+        # If the consumer stops early (e.g. a streaming client disconnects), cancel what's in flight
+        future.cancel()
+
+
+def run_batch_async(
+    items: Sequence[Any],
+    afn: Callable[[Any], Awaitable[Any]],
+    max_concurrency: int = None
+) -> List[Dict[str, Any]]:
+    """
+    Run a coroutine function over items on the shared event loop and return outcomes in input order
+
+    Args:
+        items: Items to process (e.g. candidate dicts)
+        afn: Coroutine function called once per item; exceptions are captured per item
+        max_concurrency: Maximum calls in flight (default: OLLAMA_NUM_PARALLEL)
+
+    Returns:
+        List of outcome dicts (see iter_batch_completed_async), ordered like items
+    """
+    outcomes = [None] * len(items)
+    for outcome in iter_batch_completed_async(items, afn, max_concurrency=max_concurrency):
+        outcomes[outcome['index']] = outcome
+    return outcomes
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Stage 1 Parser Benchmark
+Times parse_stage1_response over a corpus of recorded model responses, e.g.
+before re-parsing stored raw_response payloads after a schema change
+
+The corpus is a .jsonl file (one object per line with raw_response or
+response_text), a .txt file with one response, or a directory of .txt files.
+Without --corpus a synthetic corpus of text and JSON responses is used.
+
+Run from the command line:
+    python benchmark_stage1_parser.py [--corpus responses.jsonl] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import List, Optional
+
+from ai_evaluator import parse_stage1_response
+
+
+SAMPLE_RESPONSE = """SCORE: {score}
+A_SCORE: {a}
+T_SCORE: {t}
+Q_SCORE: {q}
+RECOMMENDATION: {recommendation}
+
+ACCOMPLISHMENTS_ANALYSIS:
+Comparable Work: {a} - Led similar programs at a regional nonprofit
+Comparable Scale: {t} - Budget of $2M and a team of 12
+Impact Evidence: {q} - Grew participation 40% in two years
+
+TRAJECTORY_ANALYSIS:
+Growth Pattern: {a} - Coordinator to director in six years
+Progression Velocity: {t} - Promotions every two to three years
+Intentionality: {q} - Each move broadened scope
+
+QUALIFICATIONS_ANALYSIS:
+Must-Haves Met: 3/4 - Degree, experience, location met; certification unmet
+Preferreds Met: 1/2 - Bilingual; no grant writing mentioned
+
+KEY_STRENGTHS:
+- Built a volunteer program from scratch
+- Managed a multi-site budget
+- Strong community partnerships
+
+OBSERVATIONS:
+- Eight-month gap in 2019, explained as a relocation
+- Recent role is a lateral move into a larger organization
+
+INTERVIEW_QUESTIONS:
+1. Walk me through the volunteer program you built.
+2. How did you manage the budget across sites?
+3. What drew you to this role now?
+
+REASONING:
+The candidate has done comparable work at a similar scale, with quantified
+results in participation growth.
+
+Their trajectory shows steady growth with intentional moves. The missing
+certification is a factual gap that can be addressed after hire."""
+
+
+def synthetic_corpus(size: int, seed: int = 0) -> List[str]:
+    """Varied text responses, with every tenth one as structured JSON"""
+    rng = random.Random(seed)
+    corpus = []
+    for index in range(size):
+        a, t, q = rng.randint(40, 100), rng.randint(40, 100), rng.randint(40, 100)
+        score = int(a * 0.5 + t * 0.3 + q * 0.2)
+        recommendation = ('ADVANCE TO INTERVIEW' if score >= 85
+                          else 'PHONE SCREEN FIRST' if score >= 70 else 'DECLINE')
+        if index % 10 == 9:
+            corpus.append(json.dumps({
+                'score': score, 'a_score': a, 't_score': t, 'q_score': q,
+                'recommendation': recommendation,
+                'key_strengths': ['Built a volunteer program'],
+                'reasoning': 'Comparable work at a similar scale.'
+            }))
+        else:
+            corpus.append(SAMPLE_RESPONSE.format(score=score, a=a, t=t, q=q, recommendation=recommendation))
+    return corpus
+
+
+def load_corpus(path: str) -> List[str]:
+    """Read recorded responses from a .jsonl file, a .txt file or a directory of .txt files"""
+    if os.path.isdir(path):
+        corpus = []
+        for name in sorted(os.listdir(path)):
+            if name.endswith('.txt'):
+                with open(os.path.join(path, name), encoding='utf-8') as f:
+                    corpus.append(f.read())
+        return corpus
+
+    with open(path, encoding='utf-8') as f:
+        if not path.endswith('.jsonl'):
+            return [f.read()]
+        corpus = []
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                text = record.get('raw_response') or record.get('response_text')
+                if text:
+                    corpus.append(text)
+        return corpus
+
+
+def benchmark(corpus: List[str], repeat: int = 5) -> dict:
+    """
+    Parse the whole corpus repeat times and keep the fastest pass
+
+    Returns:
+        Dict with responses, best_seconds, per_response_us and responses_per_second
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in corpus:
+            parse_stage1_response(text)
+        best = min(best, time.perf_counter() - start)
+
+    return {
+        'responses': len(corpus),
+        'best_seconds': round(best, 4),
+        'per_response_us': round(best / max(len(corpus), 1) * 1e6, 1),
+        'responses_per_second': int(len(corpus) / best) if best > 0 else None
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark parse_stage1_response over recorded responses')
+    parser.add_argument('--corpus', default=None, help='.jsonl / .txt file or directory of .txt responses')
+    parser.add_argument('--size', type=int, default=5000, help='Synthetic corpus size when --corpus is omitted')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed passes over the corpus (best is reported)')
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus(args.size)
+    if not corpus:
+        print('No responses found in corpus', file=sys.stderr)
+        return 1
+
+    print(json.dumps(benchmark(corpus, args.repeat), indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Bulk Regex Screening
+Pre-screens very large applicant lists (e.g. an ATS export) with the regex
+evaluator, spreading the CPU work across a pool of processes
+
+Candidates are read lazily and sent to the pool in chunks. Each worker
+process builds the JobMatcher once, so the job is parsed once per process
+rather than once per candidate. Results come back in input order, and the
+summary is accumulated as they arrive instead of from the full result list.
+
+Run from the command line:
+    python bulk_screening.py --job job.json --candidates applicants.jsonl > results.ndjson
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from evaluator_logic import JobMatcher, SummaryAccumulator
+
+
+DEFAULT_CHUNK_SIZE = 500
+MAX_CHUNK_SIZE = 5000
+CHUNKS_IN_FLIGHT_PER_PROCESS = 2  # Keeps workers busy without reading the whole input up front
+
+_worker_matcher = None
+
+
+def get_process_count() -> int:
+    """Number of screening processes (BULK_SCREEN_PROCESSES, default: CPU count)"""
+    default = os.cpu_count() or 1
+    try:
+        return max(1, int(os.environ.get('BULK_SCREEN_PROCESSES', default)))
+    except ValueError:
+        return default
+
+
+def _chunked(items: Iterable[Dict[str, Any]], chunk_size: int) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+    """Yield (start_index, chunk) pairs without materializing the input"""
+    chunk = []
+    start = 0
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield start, chunk
+            start += len(chunk)
+            chunk = []
+    if chunk:
+        yield start, chunk
+
+
+def _init_worker(job: Dict[str, Any]) -> None:
+    """Build the job's matcher once in each worker process"""
+    global _worker_matcher
+    _worker_matcher = JobMatcher(job)
+
+
+def _screen_chunk(start: int, candidates: List[Dict[str, Any]], matcher: Optional[JobMatcher] = None) -> List[Dict[str, Any]]:
+    """Evaluate one chunk; each result carries its position in the input"""
+    matcher = matcher or _worker_matcher
+    results = []
+    for offset, candidate in enumerate(candidates):
+        result = matcher.evaluate(candidate)
+        result['index'] = start + offset
+        if candidate.get('id') is not None:
+            result['candidate_id'] = candidate.get('id')
+        results.append(result)
+    return results
+
+
+def iter_screen_chunks(
+    job: Dict[str, Any],
+    candidates: Iterable[Dict[str, Any]],
+    processes: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Screen candidates against a job, yielding chunks of results in input order
+
+    Args:
+        job: Job with requirements, education, licenses fields
+        candidates: Iterable of candidates with name and text fields (read lazily)
+        processes: Worker processes (default: BULK_SCREEN_PROCESSES); 1 runs in-process
+        chunk_size: Candidates per task sent to a worker
+
+    Yields:
+        Lists of evaluate_candidate results, each with an added 'index'
+    """
+    processes = get_process_count() if processes is None else max(1, processes)
+    chunk_size = max(1, min(chunk_size, MAX_CHUNK_SIZE))
+    chunks = _chunked(candidates, chunk_size)
+
+    if processes == 1:
+        matcher = JobMatcher(job)
+        for start, chunk in chunks:
+            yield _screen_chunk(start, chunk, matcher)
+        return
+
+    # spawn (not fork) so workers don't inherit the server's threads or open connections
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=processes, mp_context=context,
+                             initializer=_init_worker, initargs=(job,)) as executor:
+        pending = deque()
+        for start, chunk in chunks:
+            pending.append(executor.submit(_screen_chunk, start, chunk))
+            if len(pending) >= processes * CHUNKS_IN_FLIGHT_PER_PROCESS:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def screen_candidates(
+    job: Dict[str, Any],
+    candidates: Iterable[Dict[str, Any]],
+    processes: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Screen candidates and return all results plus the summary
+
+    Returns:
+        Tuple of (results sorted by score descending, generate_summary-style summary)
+    """
+    accumulator = SummaryAccumulator()
+    results = []
+    for chunk in iter_screen_chunks(job, candidates, processes, chunk_size):
+        for result in chunk:
+            accumulator.add(result)
+        results.extend(chunk)
+    results.sort(key=lambda x: x['score'], reverse=True)
+    return results, accumulator.summary()
+
+
+# ============ Command Line ============
+
+def read_candidates(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Read candidates lazily from a JSON Lines or CSV file
+
+    JSONL: one {"name": ..., "text": ...} object per line.
+    CSV: a header row with at least name and text columns (resume_text is accepted for text).
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.lower().endswith('.csv'):
+            csv.field_size_limit(sys.maxsize)
+            for row in csv.DictReader(f):
+                row.setdefault('text', row.pop('resume_text', ''))
+                yield row
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Bulk regex screening of candidates against a job')
+    parser.add_argument('--job', required=True, help='Job JSON file (requirements, education, licenses)')
+    parser.add_argument('--candidates', required=True, help='Candidates as .jsonl or .csv')
+    parser.add_argument('--processes', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Candidates per worker task')
+    parser.add_argument('--output', default='-', help='Where to write NDJSON results (default: stdout)')
+    args = parser.parse_args(argv)
+
+    with open(args.job, encoding='utf-8') as f:
+        job = json.load(f)
+
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    accumulator = SummaryAccumulator()
+    try:
+        for chunk in iter_screen_chunks(job, read_candidates(args.candidates), args.processes, args.chunk_size):
+            for result in chunk:
+                accumulator.add(result)
+                out.write(json.dumps(result) + '\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print(json.dumps(accumulator.summary(), indent=2), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
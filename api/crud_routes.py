@@ -2,9 +2,33 @@
 CRUD Routes for Jobs and Candidates
 RESTful API endpoints for database operations
 """
+import tempfile
+
 from flask import request, jsonify
+from werkzeug.exceptions import RequestEntityTooLarge
 from auth import require_auth
 import database as db
+from resume_ingest import MAX_UPLOAD_BYTES, IngestError, iter_parsed_files, stage_upload
+
+
+PAGINATION_PARAMS = ('limit', 'cursor', 'fields', 'pipeline_status', 'min_score', 'max_score')
+
+
+def _split_param(value):
+    """Split a comma-separated query parameter into a list (None if absent)"""
+    if not value:
+        return None
+    return [part.strip() for part in value.split(',') if part.strip()]
+
+
+def _check_job_access(job_id):
+    """Return an error response if the current user can't access the job, else None"""
+    owner_id = db.get_job_owner(job_id)
+    if owner_id is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    if owner_id != request.user['id']:
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+    return None
 
 
 def register_crud_routes(app):
@@ -57,12 +81,9 @@ def register_crud_routes(app):
         if request.method == 'OPTIONS':
             return '', 200
 
-        job = db.get_job(job_id)
-        if not job:
-            return jsonify({'success': False, 'error': 'Job not found'}), 404
-
-        if job['user_id'] != request.user['id']:
-            return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+        error = _check_job_access(job_id)
+        if error:
+            return error
 
         data = request.json or {}
         updated_job = db.update_job(job_id, data)
@@ -75,12 +96,9 @@ def register_crud_routes(app):
         if request.method == 'OPTIONS':
             return '', 200
 
-        job = db.get_job(job_id)
-        if not job:
-            return jsonify({'success': False, 'error': 'Job not found'}), 404
-
-        if job['user_id'] != request.user['id']:
-            return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+        error = _check_job_access(job_id)
+        if error:
+            return error
 
         db.delete_job(job_id)
         return jsonify({'success': True})
@@ -95,11 +113,9 @@ def register_crud_routes(app):
             return '', 200
 
         # Verify job ownership
-        job = db.get_job(job_id)
-        if not job:
-            return jsonify({'success': False, 'error': 'Job not found'}), 404
-        if job['user_id'] != request.user['id']:
-            return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+        error = _check_job_access(job_id)
+        if error:
+            return error
 
         requirements = db.get_requirements_for_job(job_id)
         return jsonify({'success': True, 'requirements': requirements})
@@ -112,11 +128,9 @@ def register_crud_routes(app):
             return '', 200
 
         # Verify job ownership
-        job = db.get_job(job_id)
-        if not job:
-            return jsonify({'success': False, 'error': 'Job not found'}), 404
-        if job['user_id'] != request.user['id']:
-            return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+        error = _check_job_access(job_id)
+        if error:
+            return error
 
         data = request.json or {}
         requirement = db.create_requirement(job_id, data)
@@ -129,13 +143,12 @@ def register_crud_routes(app):
         if request.method == 'OPTIONS':
             return '', 200
 
-        requirement = db.get_requirement(requirement_id)
+        requirement, owner_id = db.get_requirement_with_owner(requirement_id)
         if not requirement:
             return jsonify({'success': False, 'error': 'Requirement not found'}), 404
 
         # Verify ownership via job
-        job = db.get_job(requirement['job_id'])
-        if not job or job['user_id'] != request.user['id']:
+        if owner_id != request.user['id']:
             return jsonify({'success': False, 'error': 'Unauthorized'}), 403
 
         return jsonify({'success': True, 'requirement': requirement})
@@ -147,13 +160,12 @@ def register_crud_routes(app):
         if request.method == 'OPTIONS':
             return '', 200
 
-        requirement = db.get_requirement(requirement_id)
+        requirement, owner_id = db.get_requirement_with_owner(requirement_id)
         if not requirement:
             return jsonify({'success': False, 'error': 'Requirement not found'}), 404
 
         # Verify ownership via job
-        job = db.get_job(requirement['job_id'])
-        if not job or job['user_id'] != request.user['id']:
+        if owner_id != request.user['id']:
             return jsonify({'success': False, 'error': 'Unauthorized'}), 403
 
         data = request.json or {}
@@ -167,13 +179,12 @@ def register_crud_routes(app):
         if request.method == 'OPTIONS':
             return '', 200
 
-        requirement = db.get_requirement(requirement_id)
+        requirement, owner_id = db.get_requirement_with_owner(requirement_id)
         if not requirement:
             return jsonify({'success': False, 'error': 'Requirement not found'}), 404
 
         # Verify ownership via job
-        job = db.get_job(requirement['job_id'])
-        if not job or job['user_id'] != request.user['id']:
+        if owner_id != request.user['id']:
             return jsonify({'success': False, 'error': 'Unauthorized'}), 403
 
         db.delete_requirement(requirement_id)
@@ -187,11 +198,9 @@ def register_crud_routes(app):
             return '', 200
 
         # Verify job ownership
-        job = db.get_job(job_id)
-        if not job:
-            return jsonify({'success': False, 'error': 'Job not found'}), 404
-        if job['user_id'] != request.user['id']:
-            return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+        error = _check_job_access(job_id)
+        if error:
+            return error
 
         data = request.json or {}
         requirement_ids = data.get('requirement_ids', [])
@@ -204,19 +213,41 @@ def register_crud_routes(app):
     @app.route('/api/jobs/<job_id>/candidates', methods=['GET', 'OPTIONS'])
     @require_auth
     def list_candidates(job_id):
-        """Get all candidates for a job"""
+        """
+        Get candidates for a job
+
+        Without query parameters returns every candidate. Any of these switch to
+        keyset pagination (next_cursor is null on the last page):
+            limit, cursor, fields (comma-separated columns),
+            pipeline_status (comma-separated), min_score, max_score
+        """
         if request.method == 'OPTIONS':
             return '', 200
 
         # Verify job ownership
-        job = db.get_job(job_id)
-        if not job:
-            return jsonify({'success': False, 'error': 'Job not found'}), 404
-        if job['user_id'] != request.user['id']:
-            return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+        error = _check_job_access(job_id)
+        if error:
+            return error
+
+        args = request.args
+        if not any(key in args for key in PAGINATION_PARAMS):
+            candidates = db.get_candidates_for_job(job_id)
+            return jsonify({'success': True, 'candidates': candidates})
+
+        try:
+            candidates, next_cursor = db.list_candidates_page(
+                job_id,
+                fields=_split_param(args.get('fields')),
+                limit=int(args.get('limit', db.CANDIDATE_PAGE_SIZE)),
+                cursor=args.get('cursor'),
+                pipeline_statuses=_split_param(args.get('pipeline_status')),
+                min_score=float(args['min_score']) if 'min_score' in args else None,
+                max_score=float(args['max_score']) if 'max_score' in args else None
+            )
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
 
-        candidates = db.get_candidates_for_job(job_id)
-        return jsonify({'success': True, 'candidates': candidates})
+        return jsonify({'success': True, 'candidates': candidates, 'next_cursor': next_cursor})
 
     @app.route('/api/candidates/<candidate_id>', methods=['GET', 'OPTIONS'])
     @require_auth
@@ -225,13 +256,12 @@ def register_crud_routes(app):
         if request.method == 'OPTIONS':
             return '', 200
 
-        candidate = db.get_candidate(candidate_id)
+        candidate, owner_id = db.get_candidate_with_owner(candidate_id)
         if not candidate:
             return jsonify({'success': False, 'error': 'Candidate not found'}), 404
 
         # Verify ownership via job
-        job = db.get_job(candidate['job_id'])
-        if not job or job['user_id'] != request.user['id']:
+        if owner_id != request.user['id']:
             return jsonify({'success': False, 'error': 'Unauthorized'}), 403
 
         return jsonify({'success': True, 'candidate': candidate})
@@ -244,16 +274,92 @@ def register_crud_routes(app):
             return '', 200
 
         # Verify job ownership
-        job = db.get_job(job_id)
-        if not job:
-            return jsonify({'success': False, 'error': 'Job not found'}), 404
-        if job['user_id'] != request.user['id']:
-            return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+        error = _check_job_access(job_id)
+        if error:
+            return error
 
         data = request.json or {}
         candidate = db.create_candidate(job_id, data)
         return jsonify({'success': True, 'candidate': candidate})
 
+    @app.route('/api/jobs/<job_id>/candidates/bulk', methods=['POST', 'OPTIONS'])
+    @require_auth
+    def bulk_create_candidates(job_id):
+        """
+        Create candidates from many resume files in one request
+
+        Accepts multipart/form-data with any number of file parts (.pdf, .docx,
+        .txt, or .zip archives of them), or a zip archive as the raw body
+        (Content-Type: application/zip). Files are parsed in parallel and the
+        candidates created in one transaction. Returns a result per file:
+        status "created" (with candidate_id and duplicate_of) or "failed" (with error).
+        """
+        if request.method == 'OPTIONS':
+            return '', 200
+
+        # Verify job ownership
+        error = _check_job_access(job_id)
+        if error:
+            return error
+
+        # Checked up front when the size is declared; enforced while reading otherwise
+        # (werkzeug raises 413 once more than this has been read)
+        if request.content_length is not None and request.content_length > MAX_UPLOAD_BYTES:
+            return jsonify({'success': False, 'error': f'Upload too large (max {MAX_UPLOAD_BYTES} bytes)'}), 413
+        request.max_content_length = MAX_UPLOAD_BYTES
+
+        with tempfile.TemporaryDirectory(prefix='resume-ingest-') as directory:
+            entries = []
+            try:
+                if request.mimetype == 'multipart/form-data':
+                    for _, upload in request.files.items(multi=True):
+                        stage_upload(upload.filename, upload.stream, directory, entries)
+                elif request.mimetype in ('application/zip', 'application/x-zip-compressed'):
+                    stage_upload('upload.zip', request.stream, directory, entries)
+                else:
+                    return jsonify({
+                        'success': False,
+                        'error': 'Upload resumes as multipart/form-data or a zip archive (application/zip)'
+                    }), 400
+            except IngestError as e:
+                return jsonify({'success': False, 'error': str(e)}), 400
+            except RequestEntityTooLarge:
+                return jsonify({'success': False, 'error': f'Upload too large (max {MAX_UPLOAD_BYTES} bytes)'}), 413
+
+            if not entries:
+                return jsonify({'success': False, 'error': 'No files uploaded'}), 400
+
+            parsed = list(iter_parsed_files(entries))
+
+        created = iter(db.bulk_create_candidates(
+            job_id, [result['candidate'] for result in parsed if 'candidate' in result]
+        ))
+        results = []
+        for result in parsed:
+            if 'candidate' not in result:
+                results.append({'filename': result['filename'], 'status': 'failed', 'error': result['error']})
+                continue
+            candidate = next(created)
+            results.append({
+                'filename': result['filename'],
+                'status': 'created',
+                'candidate_id': candidate['id'],
+                'name': candidate['name'],
+                'duplicate_of': candidate['duplicate_of']
+            })
+
+        succeeded = [result for result in results if result['status'] == 'created']
+        return jsonify({
+            'success': True,
+            'results': results,
+            'summary': {
+                'total': len(results),
+                'created': len(succeeded),
+                'duplicates': sum(1 for result in succeeded if result['duplicate_of']),
+                'failed': len(results) - len(succeeded)
+            }
+        })
+
     @app.route('/api/candidates/<candidate_id>', methods=['PUT', 'OPTIONS'])
     @require_auth
     def update_candidate(candidate_id):
@@ -261,13 +367,12 @@ def register_crud_routes(app):
         if request.method == 'OPTIONS':
             return '', 200
 
-        candidate = db.get_candidate(candidate_id)
+        candidate, owner_id = db.get_candidate_with_owner(candidate_id)
         if not candidate:
             return jsonify({'success': False, 'error': 'Candidate not found'}), 404
 
         # Verify ownership via job
-        job = db.get_job(candidate['job_id'])
-        if not job or job['user_id'] != request.user['id']:
+        if owner_id != request.user['id']:
             return jsonify({'success': False, 'error': 'Unauthorized'}), 403
 
         data = request.json or {}
@@ -281,13 +386,12 @@ def register_crud_routes(app):
         if request.method == 'OPTIONS':
             return '', 200
 
-        candidate = db.get_candidate(candidate_id)
+        candidate, owner_id = db.get_candidate_with_owner(candidate_id)
         if not candidate:
             return jsonify({'success': False, 'error': 'Candidate not found'}), 404
 
         # Verify ownership via job
-        job = db.get_job(candidate['job_id'])
-        if not job or job['user_id'] != request.user['id']:
+        if owner_id != request.user['id']:
             return jsonify({'success': False, 'error': 'Unauthorized'}), 403
 
         db.delete_candidate(candidate_id)
@@ -300,13 +404,12 @@ def register_crud_routes(app):
         if request.method == 'OPTIONS':
             return '', 200
 
-        candidate = db.get_candidate(candidate_id)
+        candidate, owner_id = db.get_candidate_with_owner(candidate_id)
         if not candidate:
             return jsonify({'success': False, 'error': 'Candidate not found'}), 404
 
         # Verify ownership via job
-        job = db.get_job(candidate['job_id'])
-        if not job or job['user_id'] != request.user['id']:
+        if owner_id != request.user['id']:
             return jsonify({'success': False, 'error': 'Unauthorized'}), 403
 
         data = request.json or {}
@@ -335,13 +438,12 @@ def register_crud_routes(app):
         if request.method == 'OPTIONS':
             return '', 200
 
-        candidate = db.get_candidate(candidate_id)
+        candidate, owner_id = db.get_candidate_with_owner(candidate_id)
         if not candidate:
             return jsonify({'success': False, 'error': 'Candidate not found'}), 404
 
         # Verify ownership via job
-        job = db.get_job(candidate['job_id'])
-        if not job or job['user_id'] != request.user['id']:
+        if owner_id != request.user['id']:
             return jsonify({'success': False, 'error': 'Unauthorized'}), 403
 
         evaluations = db.get_evaluations_for_candidate(candidate_id)
@@ -354,15 +456,18 @@ def register_crud_routes(app):
         if request.method == 'OPTIONS':
             return '', 200
 
-        candidate = db.get_candidate(candidate_id)
+        candidate, owner_id = db.get_candidate_with_owner(candidate_id)
         if not candidate:
             return jsonify({'success': False, 'error': 'Candidate not found'}), 404
 
         # Verify ownership via job
-        job = db.get_job(candidate['job_id'])
-        if not job or job['user_id'] != request.user['id']:
+        if owner_id != request.user['id']:
             return jsonify({'success': False, 'error': 'Unauthorized'}), 403
 
         data = request.json or {}
+        if data.get('evaluation_stage', 'stage1') == 'stage1' and not data.get('skill_hash'):
+            # Clients that don't send it evaluated with the skill instructions loaded now
+            from ai_evaluator import get_skill_hash
+            data = {**data, 'skill_hash': get_skill_hash()}
         evaluation = db.create_evaluation(candidate_id, data)
         return jsonify({'success': True, 'evaluation': evaluation})
@@ -3,14 +3,19 @@ SQLite Database Access Module
 Provides database connectivity for Python API endpoints
 """
 import os
+import base64
 import sqlite3
 import json
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
+import threading
 import uuid
 
+from resume_normalizer import find_near_duplicate, normalize_resume_text, resume_fingerprint
+
 # Database file location - shared with frontend
 DB_PATH = Path(__file__).parent.parent / "frontend" / "data" / "recruiter.db"
 
@@ -21,16 +26,112 @@ LOCAL_USER_EMAIL = 'local@localhost'
 LOCAL_USER_NAME = 'Local User'
 
 
-@contextmanager
-def get_db():
-    """Context manager for database connections"""
-    conn = sqlite3.connect(str(DB_PATH))
+# Connection settings
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 8))  # Idle connections kept for reuse
+DB_BUSY_TIMEOUT_MS = int(os.environ.get('DB_BUSY_TIMEOUT_MS', 10000))  # Wait this long for a lock
+DB_MMAP_SIZE = int(os.environ.get('DB_MMAP_SIZE', 64 * 1024 * 1024))  # Memory-mapped I/O bytes
+
+_pool_lock = threading.Lock()
+_pool_key = None  # (database path, process id) the idle connections belong to
+_idle_connections: List[sqlite3.Connection] = []
+_local = threading.local()
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    """Open and configure a new connection"""
+    conn = sqlite3.connect(path, timeout=DB_BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
     conn.row_factory = sqlite3.Row  # Enable dict-like access
     conn.execute("PRAGMA foreign_keys = ON")
+    # WAL lets readers proceed during writes; NORMAL sync is durable in WAL mode except on power loss
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}")
+    conn.execute(f"PRAGMA mmap_size = {DB_MMAP_SIZE}")
+    return conn
+
+
+def _checkout(key) -> sqlite3.Connection:
+    """Take an idle connection for this database and process, or open a new one"""
+    global _pool_key, _idle_connections
+    with _pool_lock:
+        if _pool_key != key:
+            # DB_PATH changed (tests) or we are in a forked child: drop the old pool.
+            # Connections inherited across a fork must not be touched, so only close our own.
+            if _pool_key is not None and _pool_key[1] == os.getpid():
+                for conn in _idle_connections:
+                    conn.close()
+            _pool_key = key
+            _idle_connections = []
+        if _idle_connections:
+            return _idle_connections.pop()
+    return _connect(key[0])
+
+
+def _checkin(key, conn: sqlite3.Connection) -> None:
+    """Return a connection to the pool, discarding any uncommitted work"""
+    try:
+        if conn.in_transaction:
+            conn.rollback()
+    except sqlite3.Error:
+        conn.close()
+        return
+
+    with _pool_lock:
+        if _pool_key == key and len(_idle_connections) < DB_POOL_SIZE:
+            _idle_connections.append(conn)
+            return
+    conn.close()
+
+
+@contextmanager
+def get_db():
+    """
+    Context manager for database connections
+
+    Connections are pooled and configured once (WAL, busy timeout, mmap). Nested
+    calls on the same thread share the outer connection, so a function that
+    re-reads what it just wrote doesn't open another one. Uncommitted changes
+    are rolled back when the outermost block exits, as closing used to do.
+    """
+    key = (str(DB_PATH), os.getpid())
+    held = getattr(_local, 'held', None)
+    if held is not None and held[0] == key:
+        yield held[1]
+        return
+
+    conn = _checkout(key)
+    _local.held = (key, conn)
     try:
         yield conn
     finally:
-        conn.close()
+        _local.held = held
+        _checkin(key, conn)
+
+
+_table_columns_cache: Dict[Tuple[str, int, str], frozenset] = {}
+
+
+def _table_columns(conn: sqlite3.Connection, table: str) -> frozenset:
+    """
+    Column names of a table, read once per database and process
+
+    Optional columns are added by the ensure_* migrations at startup, which
+    refresh the cache with _refresh_table_columns; a table that doesn't exist
+    yet isn't cached.
+    """
+    key = (str(DB_PATH), os.getpid(), table)
+    columns = _table_columns_cache.get(key)
+    if columns is None:
+        columns = frozenset(row['name'] for row in conn.execute(f"PRAGMA table_info({table})"))
+        if columns:
+            _table_columns_cache[key] = columns
+    return columns
+
+
+def _refresh_table_columns(conn: sqlite3.Connection, table: str) -> frozenset:
+    """Re-read a table's column names after altering it"""
+    _table_columns_cache.pop((str(DB_PATH), os.getpid(), table), None)
+    return _table_columns(conn, table)
 
 
 def dict_from_row(row: sqlite3.Row) -> Dict[str, Any]:
@@ -42,7 +143,8 @@ def dict_from_row(row: sqlite3.Row) -> Dict[str, Any]:
         'quick_score_analysis', 'strengths', 'concerns',
         'interview_questions', 'observations',
         'accomplishments_analysis', 'trajectory_analysis', 'qualifications_analysis',
-        'quick_tags'  # New pipeline status tags field
+        'quick_tags',  # New pipeline status tags field
+        'payload', 'candidate_data', 'result'  # Evaluation job queue fields
     ]
     for field in json_fields:
         if field in result and result[field]:
@@ -99,6 +201,7 @@ def create_job(user_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
             data.get('status', 'active')
         ))
         conn.commit()
+    _remember_job_owner(job_id, user_id)
     return get_job(job_id)
 
 
@@ -131,6 +234,94 @@ def delete_job(job_id: str) -> None:
     with get_db() as conn:
         conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
         conn.commit()
+    _remember_job_owner(job_id, None)
+
+
+# ============ Ownership Functions ============
+# Authorization checks only need the owning user_id. These read it through
+# primary keys (joined to the child row where needed) instead of loading the
+# whole job with its requirements, and remember it for the rest of the request
+# when a request scope is active.
+
+_request_cache: ContextVar[Optional[Dict[Any, Any]]] = ContextVar('db_request_cache', default=None)
+
+
+def begin_request_scope():
+    """
+    Start a request-scoped cache of ownership lookups
+
+    Returns:
+        Token to pass to end_request_scope
+    """
+    return _request_cache.set({})
+
+
+def end_request_scope(token) -> None:
+    """Discard the request-scoped cache started by begin_request_scope"""
+    try:
+        _request_cache.reset(token)
+    except ValueError:
+        # Token from another context (e.g. a streamed response torn down elsewhere)
+        _request_cache.set(None)
+
+
+def _remember_job_owner(job_id: str, owner_id: Optional[str]) -> None:
+    """Record a job's owner in the request cache, if one is active"""
+    cache = _request_cache.get()
+    if cache is not None:
+        cache[('job_owner', job_id)] = owner_id
+
+
+def get_job_owner(job_id: str) -> Optional[str]:
+    """Get the user_id that owns a job, or None if the job doesn't exist"""
+    cache = _request_cache.get()
+    key = ('job_owner', job_id)
+    if cache is not None and key in cache:
+        return cache[key]
+
+    with get_db() as conn:
+        row = conn.execute("SELECT user_id FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    owner_id = row['user_id'] if row else None
+    _remember_job_owner(job_id, owner_id)
+    return owner_id
+
+
+def _get_child_with_owner(table: str, row_id: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Load a row of a job-owned table together with its job's owner in one query"""
+    with get_db() as conn:
+        row = conn.execute(f"""
+            SELECT t.*, j.user_id AS job_owner_id
+            FROM {table} t
+            LEFT JOIN jobs j ON j.id = t.job_id
+            WHERE t.id = ?
+        """, (row_id,)).fetchone()
+    if not row:
+        return None, None
+
+    record = dict_from_row(row)
+    owner_id = record.pop('job_owner_id')
+    _remember_job_owner(record['job_id'], owner_id)
+    return record, owner_id
+
+
+def get_candidate_with_owner(candidate_id: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Get a candidate and the user_id that owns its job
+
+    Returns:
+        Tuple of (candidate or None, owner user_id or None)
+    """
+    return _get_child_with_owner('candidates', candidate_id)
+
+
+def get_requirement_with_owner(requirement_id: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Get a requirement and the user_id that owns its job
+
+    Returns:
+        Tuple of (requirement or None, owner user_id or None)
+    """
+    return _get_child_with_owner('requirements', requirement_id)
 
 
 # ============ Requirements Functions ============
@@ -266,8 +457,171 @@ def get_candidates_for_job(job_id: str) -> List[Dict[str, Any]]:
         return [dict_from_row(row) for row in cursor.fetchall()]
 
 
+CANDIDATE_PAGE_SIZE = 50
+CANDIDATE_MAX_PAGE_SIZE = 500
+
+# Listing order: score (unscored last), newest first, id as tie-breaker.
+# Must match idx_candidates_job_listing / idx_candidates_job_status_listing.
+_CANDIDATE_SORT_SCORE = "COALESCE(quick_score, -1)"
+
+
+def ensure_candidate_listing_indexes() -> None:
+    """Create composite indexes backing list_candidates_page (see migrations/003)"""
+    with get_db() as conn:
+        conn.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_candidates_job_listing
+            ON candidates(job_id, {_CANDIDATE_SORT_SCORE} DESC, created_at DESC, id DESC)
+        """)
+        columns = {row['name'] for row in conn.execute("PRAGMA table_info(candidates)")}
+        if 'pipeline_status' in columns:
+            conn.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_candidates_job_status_listing
+                ON candidates(job_id, pipeline_status, {_CANDIDATE_SORT_SCORE} DESC, created_at DESC, id DESC)
+            """)
+        conn.commit()
+
+
+def _encode_candidate_cursor(sort_score: float, created_at: Optional[str], candidate_id: str) -> str:
+    """Opaque cursor pointing just after a candidate in listing order"""
+    raw = json.dumps([sort_score, created_at, candidate_id])
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def _decode_candidate_cursor(cursor: str) -> List[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+    except (ValueError, UnicodeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != 3:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def list_candidates_page(
+    job_id: str,
+    fields: Optional[List[str]] = None,
+    limit: int = CANDIDATE_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    pipeline_statuses: Optional[List[str]] = None,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Get one page of a job's candidates using keyset pagination
+
+    Args:
+        job_id: Job to list candidates for
+        fields: Candidate columns to return (default: all); 'id' is always included
+        limit: Page size (capped at CANDIDATE_MAX_PAGE_SIZE)
+        cursor: next_cursor from the previous page
+        pipeline_statuses: Only candidates in these pipeline statuses
+        min_score: Only candidates with quick_score >= min_score
+        max_score: Only candidates with quick_score <= max_score
+
+    Returns:
+        Tuple of (candidates, next_cursor or None on the last page)
+
+    Raises:
+        ValueError: Unknown field or malformed cursor
+    """
+    limit = max(1, min(int(limit), CANDIDATE_MAX_PAGE_SIZE))
+
+    with get_db() as conn:
+        columns = _table_columns(conn, 'candidates')
+        if fields:
+            unknown = [field for field in fields if field not in columns]
+            if unknown:
+                raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+            selected = ['id'] + [field for field in fields if field != 'id']
+        else:
+            selected = columns
+
+        where = ["job_id = ?"]
+        params: List[Any] = [job_id]
+        if pipeline_statuses:
+            where.append(f"pipeline_status IN ({', '.join('?' for _ in pipeline_statuses)})")
+            params.extend(pipeline_statuses)
+        if min_score is not None:
+            where.append("quick_score >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            where.append("quick_score <= ?")
+            params.append(max_score)
+        if cursor:
+            where.append(f"({_CANDIDATE_SORT_SCORE}, created_at, id) < (?, ?, ?)")
+            params.extend(_decode_candidate_cursor(cursor))
+
+        # Fetch one extra row to know whether another page exists
+        rows = conn.execute(f"""
+            SELECT {', '.join(selected)}, {_CANDIDATE_SORT_SCORE} AS _sort_score, created_at AS _sort_created_at
+            FROM candidates
+            WHERE {' AND '.join(where)}
+            ORDER BY {_CANDIDATE_SORT_SCORE} DESC, created_at DESC, id DESC
+            LIMIT ?
+        """, params + [limit + 1]).fetchall()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = _encode_candidate_cursor(last['_sort_score'], last['_sort_created_at'], last['id'])
+
+    candidates = []
+    for row in rows:
+        candidate = dict_from_row(row)
+        candidate.pop('_sort_score')
+        candidate.pop('_sort_created_at')
+        candidates.append(candidate)
+    return candidates, next_cursor
+
+
+def ensure_candidate_resume_columns() -> None:
+    """Add the normalized resume and fingerprint columns if they're missing (see migrations/005)"""
+    with get_db() as conn:
+        columns = {row['name'] for row in conn.execute("PRAGMA table_info(candidates)")}
+        if not columns:
+            return
+        for column in ('resume_text_clean', 'resume_fingerprint', 'duplicate_of'):
+            if column not in columns:
+                conn.execute(f"ALTER TABLE candidates ADD COLUMN {column} TEXT")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_candidates_job_fingerprint ON candidates(job_id, resume_fingerprint)"
+        )
+        conn.commit()
+        _refresh_table_columns(conn, 'candidates')
+
+
+def _resume_fields(conn: sqlite3.Connection, job_id: str, resume_text: Optional[str],
+                   candidate_id: str) -> Dict[str, Any]:
+    """
+    Normalized text, fingerprint and duplicate_of for a candidate's resume
+
+    Returns an empty dict on databases without the migration 005 columns.
+    duplicate_of is the earliest application to the same job with a
+    near-identical fingerprint (or the application that one duplicates).
+    """
+    if 'resume_fingerprint' not in _table_columns(conn, 'candidates'):
+        return {}
+
+    clean = normalize_resume_text(resume_text) or None
+    fingerprint = resume_fingerprint(clean)
+    duplicate_of = None
+    if fingerprint:
+        rows = conn.execute("""
+            SELECT id, resume_fingerprint, duplicate_of FROM candidates
+            WHERE job_id = ? AND resume_fingerprint IS NOT NULL AND id != ?
+            ORDER BY created_at, id
+        """, (job_id, candidate_id)).fetchall()
+        match = find_near_duplicate(fingerprint, [(row['id'], row['resume_fingerprint']) for row in rows])
+        if match:
+            original = next(row for row in rows if row['id'] == match)
+            duplicate_of = original['duplicate_of'] or match
+
+    return {'resume_text_clean': clean, 'resume_fingerprint': fingerprint, 'duplicate_of': duplicate_of}
+
+
 def create_candidate(job_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
-    """Create a new candidate"""
+    """Create a new candidate, storing its normalized resume and flagging duplicate applications"""
     candidate_id = str(uuid.uuid4())
     with get_db() as conn:
         conn.execute("""
@@ -282,10 +636,60 @@ def create_candidate(job_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
             data.get('resume_text'),
             data.get('resume_file_path')
         ))
+        resume_fields = _resume_fields(conn, job_id, data.get('resume_text'), candidate_id)
+        if resume_fields:
+            conn.execute(
+                "UPDATE candidates SET resume_text_clean = ?, resume_fingerprint = ?, duplicate_of = ? WHERE id = ?",
+                (resume_fields['resume_text_clean'], resume_fields['resume_fingerprint'],
+                 resume_fields['duplicate_of'], candidate_id)
+            )
         conn.commit()
     return get_candidate(candidate_id)
 
 
+def bulk_create_candidates(job_id: str, candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Create many candidates in one transaction
+
+    Each gets the same normalized resume and duplicate detection as
+    create_candidate; a resume that appears twice in the batch is flagged
+    against the first. Nothing is saved if any insert fails.
+
+    Returns:
+        List of {'id', 'name', 'duplicate_of'} in input order
+    """
+    created = []
+    with get_db() as conn:
+        for data in candidates:
+            candidate_id = str(uuid.uuid4())
+            conn.execute("""
+                INSERT INTO candidates (id, job_id, name, email, phone, resume_text, resume_file_path)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (
+                candidate_id,
+                job_id,
+                data.get('name', ''),
+                data.get('email'),
+                data.get('phone'),
+                data.get('resume_text'),
+                data.get('resume_file_path')
+            ))
+            resume_fields = _resume_fields(conn, job_id, data.get('resume_text'), candidate_id)
+            if resume_fields:
+                conn.execute(
+                    "UPDATE candidates SET resume_text_clean = ?, resume_fingerprint = ?, duplicate_of = ? WHERE id = ?",
+                    (resume_fields['resume_text_clean'], resume_fields['resume_fingerprint'],
+                     resume_fields['duplicate_of'], candidate_id)
+                )
+            created.append({
+                'id': candidate_id,
+                'name': data.get('name', ''),
+                'duplicate_of': resume_fields.get('duplicate_of')
+            })
+        conn.commit()
+    return created
+
+
 def update_candidate(candidate_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
     """Update candidate fields"""
     with get_db() as conn:
@@ -309,6 +713,14 @@ def update_candidate(candidate_id: str, updates: Dict[str, Any]) -> Dict[str, An
                 update_fields.append(f"{key} = ?")
                 values.append(updates[key])
 
+        # A new resume gets a new normalized text, fingerprint and duplicate check
+        if 'resume_text' in updates:
+            row = conn.execute("SELECT job_id FROM candidates WHERE id = ?", (candidate_id,)).fetchone()
+            if row:
+                for key, value in _resume_fields(conn, row['job_id'], updates['resume_text'], candidate_id).items():
+                    update_fields.append(f"{key} = ?")
+                    values.append(value)
+
         # Handle quick_tags specially (JSON)
         if 'quick_tags' in updates:
             update_fields.append("quick_tags = ?")
@@ -387,6 +799,40 @@ def update_candidate_quick_score(
         conn.commit()
 
 
+def get_duplicate_quick_score(candidate_id: str, model: str, job_hash: str) -> Optional[Dict[str, Any]]:
+    """
+    Stored quick-score result of the application a candidate duplicates
+
+    Only reused when it can't differ from a fresh score: same model, same job
+    content, and the same normalized resume text (a near-duplicate with an
+    added role is re-scored).
+
+    Args:
+        candidate_id: Candidate flagged with duplicate_of
+        model: Ollama model the result must have been produced with
+        job_hash: Hash of the job the result must have been produced for (saved in the result)
+
+    Returns:
+        The original's quick-score result (as saved by update_candidate_quick_score), or None
+    """
+    with get_db() as conn:
+        if 'duplicate_of' not in _table_columns(conn, 'candidates'):
+            return None
+        row = conn.execute("""
+            SELECT original.quick_score_analysis
+            FROM candidates AS duplicate
+            JOIN candidates AS original ON original.id = duplicate.duplicate_of
+            WHERE duplicate.id = ? AND original.quick_score_model = ? AND original.quick_score_analysis IS NOT NULL
+                AND original.resume_text_clean = duplicate.resume_text_clean
+        """, (candidate_id, model)).fetchone()
+    if row is None:
+        return None
+    result = dict_from_row(row)['quick_score_analysis']
+    if not isinstance(result, dict) or result.get('job_hash') != job_hash:
+        return None
+    return result
+
+
 def update_candidate_stage1_score(
     candidate_id: str,
     score: float,
@@ -442,6 +888,16 @@ def get_evaluations_for_candidate(candidate_id: str) -> List[Dict[str, Any]]:
         return [dict_from_row(row) for row in cursor.fetchall()]
 
 
+def ensure_evaluation_skill_hash_column() -> None:
+    """Add evaluations.skill_hash if it's missing (see migrations/004)"""
+    with get_db() as conn:
+        columns = {row['name'] for row in conn.execute("PRAGMA table_info(evaluations)")}
+        if columns and 'skill_hash' not in columns:
+            conn.execute("ALTER TABLE evaluations ADD COLUMN skill_hash TEXT")
+            conn.commit()
+        _refresh_table_columns(conn, 'evaluations')
+
+
 def create_evaluation(candidate_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
     """Create a new evaluation record"""
     evaluation_id = str(uuid.uuid4())
@@ -488,6 +944,14 @@ def create_evaluation(candidate_id: str, data: Dict[str, Any]) -> Dict[str, Any]
             next_version,
             data.get('evaluation_stage', 'stage1')
         ))
+
+        # Record which skill instructions produced the evaluation, on databases that have the column
+        if data.get('skill_hash'):
+            if 'skill_hash' in _table_columns(conn, 'evaluations'):
+                conn.execute(
+                    "UPDATE evaluations SET skill_hash = ? WHERE id = ?",
+                    (data['skill_hash'], evaluation_id)
+                )
         conn.commit()
 
     return get_evaluation(evaluation_id)
@@ -671,3 +1135,333 @@ def update_user_setting(user_id: str, key: str, value: str) -> None:
             """, (value, user_id, key))
 
         conn.commit()
+
+
+# ============ Evaluation Job Queue Functions ============
+
+EVAL_JOB_KINDS = ['quick', 'ai', 'regex']
+
+
+def ensure_eval_job_tables_exist() -> None:
+    """
+    Create the evaluation job queue tables if they don't exist.
+    This is called at app startup and when queue workers start.
+    """
+    with get_db() as conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS eval_jobs (
+                id TEXT PRIMARY KEY NOT NULL,
+                user_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'queued',
+                payload TEXT NOT NULL,
+                total INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP NOT NULL,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP NOT NULL,
+                completed_at TEXT
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS eval_job_items (
+                id TEXT PRIMARY KEY NOT NULL,
+                eval_job_id TEXT NOT NULL,
+                item_index INTEGER NOT NULL,
+                candidate_data TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                result TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                worker_id TEXT,
+                started_at TEXT,
+                finished_at TEXT,
+                FOREIGN KEY (eval_job_id) REFERENCES eval_jobs(id) ON DELETE CASCADE
+            )
+        """)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_eval_job_items_status ON eval_job_items(status, eval_job_id, item_index)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_eval_job_items_job ON eval_job_items(eval_job_id, item_index)"
+        )
+        conn.commit()
+
+
+def create_eval_job(
+    user_id: str,
+    kind: str,
+    job_data: Dict[str, Any],
+    candidates: List[Dict[str, Any]],
+    options: Dict[str, Any] = None
+) -> Dict[str, Any]:
+    """Create an evaluation job with one pending item per candidate"""
+    if kind not in EVAL_JOB_KINDS:
+        raise ValueError(f"Invalid eval job kind: {kind}")
+
+    eval_job_id = str(uuid.uuid4())
+    payload = {'job': job_data, 'options': options or {}}
+
+    with get_db() as conn:
+        conn.execute("""
+            INSERT INTO eval_jobs (id, user_id, kind, status, payload, total)
+            VALUES (?, ?, ?, 'queued', ?, ?)
+        """, (eval_job_id, user_id, kind, json.dumps(payload), len(candidates)))
+        conn.executemany("""
+            INSERT INTO eval_job_items (id, eval_job_id, item_index, candidate_data)
+            VALUES (?, ?, ?, ?)
+        """, [
+            (str(uuid.uuid4()), eval_job_id, index, json.dumps(candidate))
+            for index, candidate in enumerate(candidates)
+        ])
+        conn.commit()
+
+    return get_eval_job(eval_job_id)
+
+
+def get_eval_job(eval_job_id: str) -> Optional[Dict[str, Any]]:
+    """Get an evaluation job with done/failed/pending/running counts"""
+    with get_db() as conn:
+        cursor = conn.execute("SELECT * FROM eval_jobs WHERE id = ?", (eval_job_id,))
+        row = cursor.fetchone()
+        if not row:
+            return None
+
+        eval_job = dict_from_row(row)
+        counts = {'pending': 0, 'running': 0, 'done': 0, 'failed': 0}
+        cursor = conn.execute("""
+            SELECT status, COUNT(*) as count FROM eval_job_items
+            WHERE eval_job_id = ? GROUP BY status
+        """, (eval_job_id,))
+        for count_row in cursor.fetchall():
+            counts[count_row['status']] = count_row['count']
+        eval_job.update(counts)
+        return eval_job
+
+
+def get_eval_job_items(eval_job_id: str) -> List[Dict[str, Any]]:
+    """Get all items of an evaluation job in submission order"""
+    with get_db() as conn:
+        cursor = conn.execute(
+            "SELECT * FROM eval_job_items WHERE eval_job_id = ? ORDER BY item_index ASC",
+            (eval_job_id,)
+        )
+        return [dict_from_row(row) for row in cursor.fetchall()]
+
+
+def claim_next_eval_job_item(
+    worker_id: str,
+    prefer_model: Optional[str] = None,
+    default_model: Optional[str] = None,
+    affinity_seconds: float = 300
+) -> Optional[Dict[str, Any]]:
+    """
+    Atomically claim the oldest pending item for a worker.
+    Returns the item with its parent job's kind, payload and user_id, or None if the queue is empty.
+
+    With prefer_model, pending 'quick' items for that model (jobs without a model
+    count as default_model) go first, so a worker keeps using the model Ollama
+    already has loaded. Jobs waiting longer than affinity_seconds still go first
+    so other models aren't starved.
+    """
+    now = datetime.utcnow().isoformat() + 'Z'
+    with get_db() as conn:
+        # BEGIN IMMEDIATE takes the write lock up front so two workers can't claim the same item
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = conn.execute("""
+                SELECT i.*, j.kind, j.payload, j.user_id
+                FROM eval_job_items i
+                JOIN eval_jobs j ON j.id = i.eval_job_id
+                WHERE i.status = 'pending'
+                ORDER BY
+                    CASE
+                        WHEN ? IS NULL THEN 0
+                        WHEN j.created_at < datetime('now', ?) THEN 0
+                        WHEN j.kind = 'quick'
+                            AND COALESCE(json_extract(j.payload, '$.options.model'), ?) = ? THEN 0
+                        ELSE 1
+                    END,
+                    j.created_at ASC, i.item_index ASC
+                LIMIT 1
+            """, (prefer_model, f'-{int(affinity_seconds)} seconds', default_model, prefer_model))
+            row = cursor.fetchone()
+            if not row:
+                conn.rollback()
+                return None
+
+            conn.execute("""
+                UPDATE eval_job_items
+                SET status = 'running', worker_id = ?, started_at = ?, attempts = attempts + 1
+                WHERE id = ?
+            """, (worker_id, now, row['id']))
+            conn.execute("""
+                UPDATE eval_jobs SET status = 'running', updated_at = ?
+                WHERE id = ? AND status = 'queued'
+            """, (now, row['eval_job_id']))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    item = dict_from_row(row)
+    item['status'] = 'running'
+    item['worker_id'] = worker_id
+    item['attempts'] += 1
+    return item
+
+
+def _finish_eval_job_item(item_id: str, status: str, result: Any, error: Optional[str]) -> None:
+    """Record an item's outcome and mark the parent job completed when nothing is left"""
+    now = datetime.utcnow().isoformat() + 'Z'
+    with get_db() as conn:
+        conn.execute("""
+            UPDATE eval_job_items
+            SET status = ?, result = ?, error = ?, finished_at = ?
+            WHERE id = ?
+        """, (status, json.dumps(result) if result is not None else None, error, now, item_id))
+        conn.execute("""
+            UPDATE eval_jobs
+            SET status = CASE WHEN NOT EXISTS (
+                    SELECT 1 FROM eval_job_items
+                    WHERE eval_job_id = eval_jobs.id AND status IN ('pending', 'running')
+                ) THEN 'completed' ELSE status END,
+                completed_at = CASE WHEN NOT EXISTS (
+                    SELECT 1 FROM eval_job_items
+                    WHERE eval_job_id = eval_jobs.id AND status IN ('pending', 'running')
+                ) THEN ? ELSE completed_at END,
+                updated_at = ?
+            WHERE id = (SELECT eval_job_id FROM eval_job_items WHERE id = ?)
+        """, (now, now, item_id))
+        conn.commit()
+
+
+def complete_eval_job_item(item_id: str, result: Dict[str, Any]) -> None:
+    """Persist a successful item result"""
+    _finish_eval_job_item(item_id, 'done', result, None)
+
+
+def fail_eval_job_item(item_id: str, error: str) -> None:
+    """Persist an item failure"""
+    _finish_eval_job_item(item_id, 'failed', None, error)
+
+
+def get_running_eval_job_items() -> List[Dict[str, Any]]:
+    """Get items currently claimed by a worker (id, worker_id, started_at, attempts)"""
+    with get_db() as conn:
+        cursor = conn.execute("""
+            SELECT id, eval_job_id, worker_id, started_at, attempts
+            FROM eval_job_items WHERE status = 'running'
+        """)
+        return [dict_from_row(row) for row in cursor.fetchall()]
+
+
+def requeue_eval_job_items(item_ids: List[str]) -> None:
+    """Return orphaned running items to the pending state"""
+    if not item_ids:
+        return
+    with get_db() as conn:
+        conn.executemany("""
+            UPDATE eval_job_items
+            SET status = 'pending', worker_id = NULL, started_at = NULL
+            WHERE id = ? AND status = 'running'
+        """, [(item_id,) for item_id in item_ids])
+        conn.commit()
+
+
+# ============ LLM Response Cache Functions ============
+
+def ensure_llm_cache_table_exists() -> None:
+    """Create the LLM response cache table if it doesn't exist"""
+    with get_db() as conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                cache_key TEXT PRIMARY KEY NOT NULL,
+                provider TEXT NOT NULL,
+                model TEXT,
+                response_text TEXT NOT NULL,
+                usage TEXT,
+                size_bytes INTEGER NOT NULL DEFAULT 0,
+                hit_count INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP NOT NULL,
+                last_used_at TEXT DEFAULT CURRENT_TIMESTAMP NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_created_at ON llm_cache(created_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used_at ON llm_cache(last_used_at)")
+        conn.commit()
+
+
+def get_llm_cache_entry(cache_key: str, max_age_seconds: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """Get a cached LLM response by key (ignoring entries older than max_age_seconds) and record the hit"""
+    with get_db() as conn:
+        query = "SELECT * FROM llm_cache WHERE cache_key = ?"
+        params: List[Any] = [cache_key]
+        if max_age_seconds is not None:
+            query += " AND created_at >= datetime('now', ?)"
+            params.append(f'-{int(max_age_seconds)} seconds')
+
+        row = conn.execute(query, params).fetchone()
+        if not row:
+            return None
+
+        conn.execute("""
+            UPDATE llm_cache SET hit_count = hit_count + 1, last_used_at = datetime('now')
+            WHERE cache_key = ?
+        """, (cache_key,))
+        conn.commit()
+
+        entry = dict(row)
+        entry['usage'] = json.loads(entry['usage']) if entry['usage'] else {}
+        return entry
+
+
+def put_llm_cache_entry(
+    cache_key: str,
+    provider: str,
+    model: Optional[str],
+    response_text: str,
+    usage: Dict[str, Any]
+) -> None:
+    """Store (or replace) a cached LLM response"""
+    usage_json = json.dumps(usage)
+    size_bytes = len(response_text.encode('utf-8')) + len(usage_json)
+    with get_db() as conn:
+        conn.execute("""
+            INSERT OR REPLACE INTO llm_cache
+                (cache_key, provider, model, response_text, usage, size_bytes, created_at, last_used_at)
+            VALUES (?, ?, ?, ?, ?, ?, datetime('now'), datetime('now'))
+        """, (cache_key, provider, model, response_text, usage_json, size_bytes))
+        conn.commit()
+
+
+def evict_llm_cache(max_age_seconds: Optional[int] = None, max_bytes: Optional[int] = None) -> int:
+    """
+    Evict expired entries, then least recently used entries until the cache fits in max_bytes.
+    Returns the number of entries removed.
+    """
+    removed = 0
+    with get_db() as conn:
+        if max_age_seconds is not None:
+            cursor = conn.execute(
+                "DELETE FROM llm_cache WHERE created_at < datetime('now', ?)",
+                (f'-{int(max_age_seconds)} seconds',)
+            )
+            removed += cursor.rowcount
+
+        if max_bytes is not None:
+            total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) AS total FROM llm_cache").fetchone()['total']
+            if total > max_bytes:
+                # Walk entries from least recently used, deleting until under budget
+                to_delete = []
+                cursor = conn.execute(
+                    "SELECT cache_key, size_bytes FROM llm_cache ORDER BY last_used_at ASC, created_at ASC"
+                )
+                for row in cursor:
+                    if total <= max_bytes:
+                        break
+                    to_delete.append((row['cache_key'],))
+                    total -= row['size_bytes']
+                conn.executemany("DELETE FROM llm_cache WHERE cache_key = ?", to_delete)
+                removed += len(to_delete)
+
+        conn.commit()
+    return removed
@@ -0,0 +1,94 @@
+"""
+Evaluation Job Routes
+Submit long-running evaluations to the persistent queue and poll their progress
+"""
+from flask import request, jsonify
+from auth import require_auth
+import database as db
+
+
+def register_eval_job_routes(app):
+    """Register evaluation job queue routes with Flask app"""
+
+    @app.route('/api/eval_jobs', methods=['POST', 'OPTIONS'])
+    @require_auth
+    def submit_eval_job():
+        """Queue an evaluation of many candidates and return its job id"""
+        if request.method == 'OPTIONS':
+            return '', 200
+
+        data = request.json or {}
+        kind = data.get('kind', 'quick')
+        job = data.get('job', {})
+        candidates = data.get('candidates', [])
+
+        if not job or not candidates:
+            return jsonify({'success': False, 'error': 'Missing job or candidates data'}), 400
+
+        if kind not in db.EVAL_JOB_KINDS:
+            return jsonify({
+                'success': False,
+                'error': f"Invalid kind: {kind}. Supported: {', '.join(db.EVAL_JOB_KINDS)}"
+            }), 400
+
+        # Saved candidates are read and scored by the worker, so they must be the user's own
+        for candidate in candidates:
+            if isinstance(candidate, dict) and candidate.get('id'):
+                _, owner_id = db.get_candidate_with_owner(candidate['id'])
+                if owner_id is not None and owner_id != request.user['id']:
+                    return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+
+        options = {key: data[key] for key in ['model', 'provider', 'stage'] if key in data}
+        eval_job = db.create_eval_job(request.user['id'], kind, job, candidates, options)
+
+        return jsonify({
+            'success': True,
+            'eval_job_id': eval_job['id'],
+            'total': eval_job['total'],
+            'status': eval_job['status']
+        }), 202
+
+    @app.route('/api/eval_jobs/<eval_job_id>', methods=['GET', 'OPTIONS'])
+    @require_auth
+    def get_eval_job_progress(eval_job_id):
+        """Get progress counts for a queued evaluation (add ?include_results=true for results)"""
+        if request.method == 'OPTIONS':
+            return '', 200
+
+        eval_job = db.get_eval_job(eval_job_id)
+        if not eval_job:
+            return jsonify({'success': False, 'error': 'Evaluation job not found'}), 404
+        if eval_job['user_id'] != request.user['id']:
+            return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+
+        response = {
+            'success': True,
+            'eval_job': {
+                'id': eval_job['id'],
+                'kind': eval_job['kind'],
+                'status': eval_job['status'],
+                'total': eval_job['total'],
+                'done': eval_job['done'],
+                'failed': eval_job['failed'],
+                'pending': eval_job['pending'],
+                'running': eval_job['running'],
+                'created_at': eval_job['created_at'],
+                'updated_at': eval_job['updated_at'],
+                'completed_at': eval_job['completed_at']
+            }
+        }
+
+        if request.args.get('include_results', '').lower() in ('1', 'true', 'yes'):
+            response['results'] = [
+                {
+                    'index': item['item_index'],
+                    'candidate_id': item['candidate_data'].get('id'),
+                    'status': item['status'],
+                    'result': item['result'],
+                    'error': item['error']
+                }
+                for item in db.get_eval_job_items(eval_job_id)
+                if item['status'] in ('done', 'failed')
+            ]
+
+        return jsonify(response)
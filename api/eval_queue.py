@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Persistent Evaluation Job Queue
+Runs evaluation work outside the HTTP request, backed by the SQLite database
+
+A submitted job is stored as one row per candidate in eval_job_items. Local
+worker processes claim pending items one at a time, run the evaluation and
+persist each result as soon as it is ready, so progress survives a browser
+refresh or a server restart.
+
+Run standalone workers:
+    python eval_queue.py --workers 2
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import socket
+import time
+import traceback
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import database as db
+
+
+DEFAULT_WORKERS = 2
+IDLE_POLL_SECONDS = 1.0
+MAX_ATTEMPTS = 3  # Items orphaned this many times (worker crashed) are marked failed
+# A worker keeps taking quick items for the Ollama model it last ran (avoiding model
+# swaps) unless another job has waited longer than this
+MODEL_AFFINITY_SECONDS = float(os.environ.get('EVAL_QUEUE_MODEL_AFFINITY_SECONDS', 300))
+
+
+def get_worker_count() -> int:
+    """Number of queue worker processes to start (EVAL_QUEUE_WORKERS)"""
+    try:
+        return max(0, int(os.environ.get('EVAL_QUEUE_WORKERS', DEFAULT_WORKERS)))
+    except ValueError:
+        return DEFAULT_WORKERS
+
+
+def make_worker_id() -> str:
+    """Identify a worker by host and process id so orphaned items can be detected"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+# ============ Item Handlers ============
+
+_RESUME_KEYS = ('resume_text', 'resumeText', 'text')
+
+
+def _with_clean_resume(candidate: Dict[str, Any], user_id: str) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """
+    Swap in the stored normalized resume for a saved candidate
+
+    Only when the submitted text is the stored raw resume (or missing), so an
+    edited resume in the request is never replaced.
+
+    Args:
+        candidate: Candidate data from the eval job
+        user_id: User who submitted the eval job
+
+    Returns:
+        Tuple of (candidate data to evaluate, stored candidate row or None)
+
+    Raises:
+        PermissionError: If the saved candidate belongs to another user's job
+    """
+    row, owner_id = db.get_candidate_with_owner(candidate['id']) if candidate.get('id') else (None, None)
+    if row and owner_id != user_id:
+        raise PermissionError('Candidate belongs to another user')
+    clean = row.get('resume_text_clean') if row else None
+    if not clean:
+        return candidate, row
+
+    submitted = [key for key in _RESUME_KEYS if candidate.get(key)]
+    if any(candidate[key] != row.get('resume_text') for key in submitted):
+        return candidate, row
+
+    candidate = dict(candidate)
+    for key in submitted or ['resume_text']:
+        candidate[key] = clean
+    return candidate, row
+
+
+def _job_hash(job: Dict[str, Any]) -> str:
+    """Hash of the job content a quick score was produced for"""
+    return hashlib.sha256(json.dumps(job, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+
+
+def _run_regex_item(job: Dict[str, Any], candidate: Dict[str, Any], options: Dict[str, Any],
+                    user_id: str) -> Dict[str, Any]:
+    """Regex keyword evaluation"""
+    from evaluator_logic import evaluate_candidate
+    candidate, _ = _with_clean_resume(candidate, user_id)
+    return evaluate_candidate(job, candidate)
+
+
+def _run_quick_item(job: Dict[str, Any], candidate: Dict[str, Any], options: Dict[str, Any],
+                    user_id: str) -> Dict[str, Any]:
+    """
+    Quick A-T-Q score with local Ollama; saved to the candidate row when it exists
+
+    A duplicate application with the same normalized resume reuses the
+    original's score when it came from the same model for the same job content.
+    """
+    from ollama_provider import OllamaProvider, run_quick_score
+
+    provider = OllamaProvider(model=options.get('model'))
+    candidate, row = _with_clean_resume(candidate, user_id)
+    job_hash = _job_hash(job)
+
+    reused = None
+    if row and row.get('duplicate_of'):
+        reused = db.get_duplicate_quick_score(row['id'], provider.model, job_hash)
+    if reused is not None:
+        result = {**reused, 'candidate_id': row['id'], 'reused_from': row['duplicate_of']}
+    else:
+        result = {**run_quick_score(provider, job, candidate), 'job_hash': job_hash}
+
+    if row:
+        db.update_candidate_quick_score(row['id'], result['score'], result['model'], result)
+
+    return result
+
+
+def _run_ai_item(job: Dict[str, Any], candidate: Dict[str, Any], options: Dict[str, Any],
+                 user_id: str) -> Dict[str, Any]:
+    """
+    Stage 1 A-T-Q evaluation with Anthropic/OpenAI
+
+    For a saved candidate, an evaluations row (with the skill hash) is stored
+    and the candidate's Stage 1 scores are updated.
+    """
+    from ai_evaluator import evaluate_candidate_with_ai
+    from stage1_batch import save_stage1_result
+
+    candidate, row = _with_clean_resume(candidate, user_id)
+    result = evaluate_candidate_with_ai(
+        job,
+        candidate,
+        stage=options.get('stage', 1),
+        provider=options.get('provider', 'anthropic'),
+        model=options.get('model')
+    )
+
+    if row:
+        record = save_stage1_result(
+            row['id'],
+            result['evaluation'],
+            {**result['usage'], 'model': result['model']},
+            result['provider'],
+            result['skill_hash']
+        )
+        result = {**result, 'evaluation_id': record['id']}
+
+    return result
+
+
+# Handlers take (job, candidate, options, user_id of the eval job) and return the result
+ITEM_HANDLERS: Dict[str, Callable[[Dict[str, Any], Dict[str, Any], Dict[str, Any], str], Dict[str, Any]]] = {
+    'regex': _run_regex_item,
+    'quick': _run_quick_item,
+    'ai': _run_ai_item,
+}
+
+
+def _item_model(item: Dict[str, Any]) -> Optional[str]:
+    """Ollama model a quick item runs on (None for other kinds)"""
+    if item['kind'] != 'quick':
+        return None
+    from ollama_provider import OllamaProvider
+    return item['payload'].get('options', {}).get('model') or OllamaProvider.DEFAULT_MODEL
+
+
+def process_item(item: Dict[str, Any]) -> None:
+    """Run one claimed item and persist its result or error"""
+    handler = ITEM_HANDLERS.get(item['kind'])
+    if handler is None:
+        db.fail_eval_job_item(item['id'], f"Unsupported eval job kind: {item['kind']}")
+        return
+
+    payload = item['payload']
+    start_time = time.time()
+    try:
+        result = handler(payload['job'], item['candidate_data'], payload.get('options', {}), item['user_id'])
+    except Exception as e:
+        print(f"Eval job item {item['id']} failed: {e}")
+        db.fail_eval_job_item(item['id'], str(e))
+        return
+
+    result = dict(result)
+    result['elapsed_seconds'] = round(time.time() - start_time, 2)
+    db.complete_eval_job_item(item['id'], result)
+
+
+# ============ Worker Loop ============
+
+def run_worker(stop_after_idle: bool = False, poll_interval: float = IDLE_POLL_SECONDS) -> int:
+    """
+    Claim and process queue items until stopped
+
+    Args:
+        stop_after_idle: Return as soon as the queue is empty (used by tests and one-off drains)
+        poll_interval: Seconds to sleep when no work is pending
+
+    Returns:
+        int: Number of items processed
+    """
+    from ollama_provider import OllamaProvider
+
+    db.ensure_eval_job_tables_exist()
+    worker_id = make_worker_id()
+    processed = 0
+    current_model = None
+
+    while True:
+        try:
+            item = db.claim_next_eval_job_item(
+                worker_id, prefer_model=current_model, default_model=OllamaProvider.DEFAULT_MODEL,
+                affinity_seconds=MODEL_AFFINITY_SECONDS
+            )
+        except Exception as e:
+            print(f"Eval queue worker {worker_id} could not claim work: {e}")
+            item = None
+
+        if item is None:
+            if stop_after_idle:
+                return processed
+            time.sleep(poll_interval)
+            continue
+
+        current_model = _item_model(item) or current_model
+        try:
+            process_item(item)
+        except Exception:
+            # Persisting the outcome failed; leave the item for orphan recovery
+            traceback.print_exc()
+        processed += 1
+
+
+def _is_worker_alive(worker_id: str) -> bool:
+    """Check whether the process that claimed an item is still running on this host"""
+    if not worker_id or ':' not in worker_id:
+        return False
+    host, _, pid = worker_id.rpartition(':')
+    if host != socket.gethostname():
+        return True  # Can't see other hosts' processes; assume alive
+    try:
+        os.kill(int(pid), 0)
+    except (ValueError, ProcessLookupError):
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def recover_orphaned_items() -> int:
+    """
+    Requeue items left 'running' by workers that no longer exist (e.g. after a restart)
+
+    Returns:
+        int: Number of items requeued or failed
+    """
+    orphaned = [item for item in db.get_running_eval_job_items() if not _is_worker_alive(item['worker_id'])]
+
+    exhausted = [item for item in orphaned if item['attempts'] >= MAX_ATTEMPTS]
+    for item in exhausted:
+        db.fail_eval_job_item(item['id'], f'Worker stopped during evaluation {item["attempts"]} times')
+
+    db.requeue_eval_job_items([item['id'] for item in orphaned if item['attempts'] < MAX_ATTEMPTS])
+    return len(orphaned)
+
+
+def start_workers(count: int = None) -> List[multiprocessing.Process]:
+    """
+    Start local worker processes after recovering any orphaned items
+
+    Args:
+        count: Number of worker processes (default: EVAL_QUEUE_WORKERS)
+
+    Returns:
+        List of started daemon processes
+    """
+    count = get_worker_count() if count is None else count
+    db.ensure_eval_job_tables_exist()
+    recovered = recover_orphaned_items()
+    if recovered:
+        print(f"♻️  Requeued {recovered} evaluation item(s) left running by a previous server")
+
+    # spawn (not fork) so workers don't inherit the server's threads or open connections
+    context = multiprocessing.get_context('spawn')
+    processes = []
+    for _ in range(count):
+        process = context.Process(target=run_worker, daemon=True)
+        process.start()
+        processes.append(process)
+    return processes
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run evaluation queue workers')
+    parser.add_argument('--workers', type=int, default=get_worker_count(), help='Number of worker processes')
+    parser.add_argument('--drain', action='store_true', help='Exit once the queue is empty (single process)')
+    args = parser.parse_args()
+
+    if args.drain:
+        db.ensure_eval_job_tables_exist()
+        recover_orphaned_items()
+        print(f'Processed {run_worker(stop_after_idle=True)} item(s)')
+    else:
+        workers = start_workers(args.workers)
+        print(f'✅ Started {len(workers)} evaluation queue worker(s). Press Ctrl+C to stop')
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            print('\nWorkers stopped')
@@ -3,11 +3,12 @@
 Flask-based API server - WORKING replacement for broken dev_server.py
 Properly handles requests and returns responses without BrokenPipe errors
 """
-from flask import Flask, request, jsonify
+from flask import Flask, g, request, jsonify
 from flask_cors import CORS
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 import os
+import time
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -16,13 +17,26 @@ env_path = Path(__file__).parent / '.env'
 load_dotenv(dotenv_path=env_path)
 
 # Import shared evaluation logic (DRY principle - no duplication)
-from evaluator_logic import evaluate_candidate, generate_summary
+from evaluator_logic import JobMatcher, SummaryAccumulator, evaluate_candidate, generate_summary
+from bulk_screening import iter_screen_chunks, get_process_count, DEFAULT_CHUNK_SIZE
 from ai_evaluator import evaluate_candidate_with_ai
 from extract_job_info import extract_job_info
 from parse_performance_profile import parse_performance_profile
-from ollama_provider import OllamaProvider, build_quick_score_prompt, parse_quick_score_response
+from ollama_provider import (
+    OllamaProvider, build_quick_score_prompt, parse_quick_score_response, run_quick_score, arun_quick_score,
+    warm_up_models, QUICK_SCORE_FIELDS, QUICK_SCORE_REQUIRED_FIELDS
+)
+from ollama_health import get_health_monitor, start_health_monitor
+from resume_budget import get_context_tokens
+from llm_cache import acached_evaluate
+from batch_executor import (
+    run_batch_async, iter_batch_completed_async, clamp_parallelism, get_ollama_parallelism,
+    get_ollama_max_loaded_models
+)
+from streaming import get_stream_format, stream_records
 from auth import register_auth_routes
 from crud_routes import register_crud_routes
+from eval_job_routes import register_eval_job_routes
 
 app = Flask(__name__)
 CORS(app, supports_credentials=True)  # Enable CORS with credentials for cookies
@@ -30,6 +44,23 @@ CORS(app, supports_credentials=True)  # Enable CORS with credentials for cookies
 # Register routes
 register_auth_routes(app)
 register_crud_routes(app)
+register_eval_job_routes(app)
+
+
+@app.before_request
+def begin_db_request_scope():
+    """Cache ownership lookups for the duration of one request"""
+    from database import begin_request_scope
+    g.db_request_scope = begin_request_scope()
+
+
+@app.teardown_request
+def end_db_request_scope(exc):
+    token = g.pop('db_request_scope', None)
+    if token is not None:
+        from database import end_request_scope
+        end_request_scope(token)
+
 
 # Rate limiting to prevent abuse
 limiter = Limiter(
@@ -42,7 +73,13 @@ limiter = Limiter(
 @app.route('/api/evaluate_regex', methods=['POST', 'OPTIONS'])
 @limiter.limit("20 per minute")  # More restrictive for evaluation endpoint
 def evaluate_regex():
-    """Evaluate candidates using regex keyword matching"""
+    """
+    Evaluate candidates using regex keyword matching
+
+    Set "stream": true (NDJSON) or "sse" in the body, or send an Accept header of
+    application/x-ndjson or text/event-stream, to receive each result as it is
+    scored followed by a final {"type": "summary"} record
+    """
     if request.method == 'OPTIONS':
         return '', 200
 
@@ -57,10 +94,16 @@ def evaluate_regex():
                 'error': 'Missing job or candidates data'
             }), 400
 
-        # Evaluate all candidates
+        # Evaluate all candidates, parsing the job once
+        matcher = JobMatcher(job)
+
+        stream_format = get_stream_format(data, request.headers.get('Accept', ''))
+        if stream_format:
+            return stream_records(_iter_regex_records(job, candidates, matcher), stream_format)
+
         results = []
         for candidate in candidates:
-            result = evaluate_candidate(job, candidate)
+            result = evaluate_candidate(job, candidate, matcher)
             results.append(result)
 
         # Sort by score descending
@@ -84,6 +127,62 @@ def evaluate_regex():
             'error': str(e)
         }), 500
 
+
+def _iter_regex_records(job, candidates, matcher):
+    """Yield one result record per candidate in input order, then the summary"""
+    accumulator = SummaryAccumulator()
+    for index, candidate in enumerate(candidates):
+        result = evaluate_candidate(job, candidate, matcher)
+        accumulator.add(result)
+        yield {'type': 'result', 'index': index, **result}
+    yield {'type': 'summary', 'success': True, 'summary': accumulator.summary()}
+
+
+@app.route('/api/evaluate_regex/bulk', methods=['POST', 'OPTIONS'])
+@limiter.limit("5 per minute")
+def evaluate_regex_bulk():
+    """
+    Screen a large candidate list with regex matching across worker processes
+
+    Streams NDJSON (or SSE with "stream": "sse"): one {"type": "result"} record
+    per candidate in input order, a {"type": "progress"} record with the running
+    summary after each chunk, then a final {"type": "summary"} record
+    """
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    data = request.json or {}
+    job = data.get('job', {})
+    candidates = data.get('candidates', [])
+
+    if not job or not candidates:
+        return jsonify({
+            'success': False,
+            'error': 'Missing job or candidates data'
+        }), 400
+
+    max_processes = get_process_count()
+    try:
+        processes = max(1, min(int(data.get('processes', max_processes)), max_processes))
+        chunk_size = int(data.get('chunk_size', DEFAULT_CHUNK_SIZE))
+    except (TypeError, ValueError):
+        return jsonify({
+            'success': False,
+            'error': 'processes and chunk_size must be integers'
+        }), 400
+
+    def records():
+        accumulator = SummaryAccumulator()
+        for chunk in iter_screen_chunks(job, candidates, processes, chunk_size):
+            for result in chunk:
+                accumulator.add(result)
+                yield {'type': 'result', **result}
+            yield {'type': 'progress', 'summary': accumulator.summary()}
+        yield {'type': 'summary', 'success': True, 'summary': accumulator.summary()}
+
+    return stream_records(records(), get_stream_format(data, request.headers.get('Accept', '')) or 'ndjson')
+
+
 @app.route('/api/evaluate_candidate', methods=['POST', 'OPTIONS'])
 @limiter.limit("100 per minute")  # Generous limit for local dev (Vercel will have its own limits)
 def evaluate_with_ai():
@@ -114,7 +213,10 @@ def evaluate_with_ai():
             model = get_user_setting(LOCAL_USER_ID, setting_key, 'claude-3-5-haiku-20241022')
 
         # Call AI evaluator with model and provider
-        result = evaluate_candidate_with_ai(job, candidate, stage, provider=provider, model=model)
+        result = evaluate_candidate_with_ai(
+            job, candidate, stage, provider=provider, model=model, use_cache=data.get('use_cache', True),
+            structured_output=bool(data.get('structured_output', False))
+        )
 
         return jsonify(result)
 
@@ -193,6 +295,22 @@ def get_available_models():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@app.route('/api/providers/stats', methods=['GET', 'OPTIONS'])
+def get_provider_statistics():
+    """Provider registry and HTTP connection-reuse statistics (for tuning keep-alive and pool sizes)"""
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    try:
+        from llm_providers import get_provider_stats
+        return jsonify({'success': True, **get_provider_stats()})
+    except Exception as e:
+        print(f"Error fetching provider stats: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 @app.route('/api/extract_job_info', methods=['POST', 'OPTIONS'])
 @limiter.limit("50 per minute")
 def extract_info():
@@ -264,15 +382,16 @@ def ollama_status():
         return '', 200
 
     try:
-        provider = OllamaProvider()
-        is_available = provider.is_available()
-        available_models = provider.get_available_models() if is_available else []
+        # The health monitor's probe already lists the installed models, so this is usually a cache hit
+        monitor = get_health_monitor()
+        is_available = monitor.check()
 
         return jsonify({
             'success': True,
             'available': is_available,
-            'models': available_models,
-            'configured_models': OllamaProvider.AVAILABLE_MODELS
+            'models': monitor.models if is_available else [],
+            'configured_models': OllamaProvider.AVAILABLE_MODELS,
+            'health': monitor.status()
         })
 
     except Exception as e:
@@ -286,6 +405,41 @@ def ollama_status():
         })
 
 
+@app.route('/api/ollama/warmup', methods=['POST', 'OPTIONS'])
+@limiter.limit("10 per minute")
+def ollama_warmup():
+    """Preload Ollama models (default: the configured models) so the first evaluations start warm"""
+    if request.method == 'OPTIONS':
+        return '', 200
+
+    try:
+        data = request.get_json(silent=True) or {}
+
+        if not OllamaProvider().is_available():
+            return jsonify({
+                'success': False,
+                'error': 'Ollama is not running. Please start Ollama first.',
+                'ollama_available': False
+            }), 503
+
+        warmed = warm_up_models(data.get('models'))
+        return jsonify({
+            'success': all(result['success'] for result in warmed['results']),
+            'results': warmed['results'],
+            'skipped': warmed['skipped'],
+            'ollama_available': True
+        })
+
+    except Exception as e:
+        print(f"Error warming up Ollama models: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @app.route('/api/evaluate_quick', methods=['POST', 'OPTIONS'])
 @limiter.limit("50 per minute")
 def evaluate_quick():
@@ -316,12 +470,11 @@ def evaluate_quick():
                 'ollama_available': False
             }), 503
 
-        # Build prompt and run evaluation
-        prompt = build_quick_score_prompt(job, candidate)
-        response_text, usage = provider.evaluate(prompt)
-
-        # Parse the response with full analysis
-        result = parse_quick_score_response(response_text, model=model)
+        # Build prompt, run evaluation (reusing a cached response for an identical prompt) and parse it
+        result = run_quick_score(
+            provider, job, candidate, use_cache=data.get('use_cache', True),
+            structured_output=bool(data.get('structured_output', False))
+        )
 
         return jsonify({
             'success': True,
@@ -332,7 +485,8 @@ def evaluate_quick():
             'methodology': result['methodology'],
             'evaluated_at': result['evaluated_at'],
             'model': model,
-            'usage': usage,
+            'output_format': result['output_format'],
+            'usage': result['usage'],
             'ollama_available': True
         })
 
@@ -350,7 +504,18 @@ def evaluate_quick():
 @app.route('/api/evaluate_quick/batch', methods=['POST', 'OPTIONS'])
 @limiter.limit("10 per minute")  # More restrictive for batch
 def evaluate_quick_batch():
-    """Batch quick evaluation using local Ollama LLM"""
+    """
+    Batch quick evaluation using local Ollama LLM
+
+    Supports the same streaming modes as /api/evaluate_regex; streamed results
+    arrive in completion order and carry their 'index' in the request
+
+    Optional fields (text output only):
+        progress: When streaming, also emit a 'progress' record with each score
+            as soon as the model has generated it
+        stop_early: Stop generating once the scores and reasoning are in (true),
+            or once just the scores are in ('scores', which leaves reasoning empty)
+    """
     if request.method == 'OPTIONS':
         return '', 200
 
@@ -377,37 +542,41 @@ def evaluate_quick_batch():
                 'ollama_available': False
             }), 503
 
-        # Evaluate each candidate
-        results = []
-        for candidate in candidates:
-            try:
-                prompt = build_quick_score_prompt(job, candidate)
-                response_text, usage = provider.evaluate(prompt)
-                result = parse_quick_score_response(response_text, model=model)
-
-                results.append({
-                    'candidate_id': candidate.get('id'),
-                    'success': True,
-                    'score': result['score'],
-                    'reasoning': result['reasoning'],
-                    'requirements_identified': result['requirements_identified'],
-                    'match_analysis': result['match_analysis'],
-                    'methodology': result['methodology'],
-                    'evaluated_at': result['evaluated_at'],
-                    'model': model,
-                    'usage': usage
-                })
-            except Exception as e:
-                results.append({
-                    'candidate_id': candidate.get('id'),
-                    'success': False,
-                    'error': str(e)
-                })
+        # Parallelism defaults to the Ollama server's OLLAMA_NUM_PARALLEL setting
+        parallelism = clamp_parallelism(data.get('parallelism')) if data.get('parallelism') else get_ollama_parallelism()
+
+        use_cache = data.get('use_cache', True)
+        structured_output = bool(data.get('structured_output', False))
+        stop_early = data.get('stop_early', False)
+        stop_fields = QUICK_SCORE_FIELDS if stop_early == 'scores' else (
+            QUICK_SCORE_REQUIRED_FIELDS if stop_early else None
+        )
+
+        async def score(candidate, report=None):
+            return await arun_quick_score(provider, job, candidate, use_cache=use_cache,
+                                          structured_output=structured_output,
+                                          on_update=report, stop_fields=stop_fields)
+
+        stream_format = get_stream_format(data, request.headers.get('Accept', ''))
+        if stream_format:
+            with_progress = bool(data.get('progress', False)) and not structured_output
+            return stream_records(
+                _iter_quick_batch_records(candidates, score, model, parallelism, with_progress),
+                stream_format
+            )
+
+        # Evaluate candidates concurrently on the shared event loop; each one succeeds or fails independently
+        batch_start = time.time()
+        outcomes = run_batch_async(candidates, score, max_concurrency=parallelism)
+
+        results = [_quick_batch_result(candidate, outcome) for candidate, outcome in zip(candidates, outcomes)]
 
         return jsonify({
             'success': True,
             'results': results,
             'model': model,
+            'parallelism': parallelism,
+            'elapsed_seconds': round(time.time() - batch_start, 2),
             'ollama_available': True
         })
 
@@ -422,10 +591,63 @@ def evaluate_quick_batch():
         }), 500
 
 
+def _quick_batch_result(candidate, outcome):
+    """Turn a batch outcome into the per-candidate result returned to the client"""
+    if outcome['success']:
+        return {
+            'success': True,
+            **outcome['value'],
+            'elapsed_seconds': outcome['elapsed_seconds']
+        }
+    return {
+        'candidate_id': candidate.get('id'),
+        'success': False,
+        'error': outcome['error'],
+        'elapsed_seconds': outcome['elapsed_seconds']
+    }
+
+
+def _iter_quick_batch_records(candidates, score, model, parallelism, with_progress=False):
+    """Yield one result record per candidate as soon as it is scored, then a summary"""
+    batch_start = time.time()
+    succeeded = 0
+    outcomes = iter_batch_completed_async(candidates, score, max_concurrency=parallelism, with_progress=with_progress)
+    for outcome in outcomes:
+        if 'progress' in outcome:
+            yield {
+                'type': 'progress',
+                'index': outcome['index'],
+                'candidate_id': candidates[outcome['index']].get('id'),
+                **outcome['progress']
+            }
+            continue
+        result = _quick_batch_result(candidates[outcome['index']], outcome)
+        succeeded += 1 if result['success'] else 0
+        yield {'type': 'result', 'index': outcome['index'], **result}
+
+    yield {
+        'type': 'summary',
+        'success': True,
+        'total': len(candidates),
+        'succeeded': succeeded,
+        'failed': len(candidates) - succeeded,
+        'model': model,
+        'parallelism': parallelism,
+        'elapsed_seconds': round(time.time() - batch_start, 2),
+        'ollama_available': True
+    }
+
+
 @app.route('/api/evaluate_quick/compare', methods=['POST', 'OPTIONS'])
 @limiter.limit("20 per minute")
 def evaluate_quick_compare():
-    """Compare multiple Ollama models on the same candidate"""
+    """
+    Compare multiple Ollama models on the same candidate
+
+    Models run concurrently, up to the number the server keeps loaded at once.
+    Supports the same streaming modes as /api/evaluate_quick/batch, with one
+    record per model in completion order.
+    """
     if request.method == 'OPTIONS':
         return '', 200
 
@@ -450,40 +672,36 @@ def evaluate_quick_compare():
                 'ollama_available': False
             }), 503
 
-        # Build prompt once (same for all models)
-        prompt = build_quick_score_prompt(job, candidate)
+        # Build prompt once (same for all models), sized for the smallest context among them
+        context_tokens = min((get_context_tokens(model) for model in models), default=None)
+        prompt = build_quick_score_prompt(job, candidate, context_tokens=context_tokens)
+        use_cache = data.get('use_cache', True)
 
-        # Run each model
-        results = []
-        for model in models:
-            try:
-                provider = OllamaProvider(model=model)
-                response_text, usage = provider.evaluate(prompt)
-                result = parse_quick_score_response(response_text, model=model)
-
-                results.append({
-                    'model': model,
-                    'success': True,
-                    'score': result['score'],
-                    'reasoning': result['reasoning'],
-                    'requirements_identified': result['requirements_identified'],
-                    'match_analysis': result['match_analysis'],
-                    'methodology': result['methodology'],
-                    'evaluated_at': result['evaluated_at'],
-                    'elapsed_seconds': usage.get('elapsed_seconds', 0),
-                    'usage': usage
-                })
-            except Exception as e:
-                results.append({
-                    'model': model,
-                    'success': False,
-                    'error': str(e)
-                })
+        # Each model needs its own VRAM slot, so run at most OLLAMA_MAX_LOADED_MODELS at once
+        parallelism = clamp_parallelism(data.get('parallelism')) if data.get('parallelism') else get_ollama_max_loaded_models()
+        parallelism = min(parallelism, max(len(models), 1))
+
+        async def score(model):
+            provider = OllamaProvider(model=model)
+            response_text, usage = await acached_evaluate(provider, prompt, use_cache=use_cache)
+            return parse_quick_score_response(response_text, model=model), usage
+
+        stream_format = get_stream_format(data, request.headers.get('Accept', ''))
+        if stream_format:
+            return stream_records(
+                _iter_compare_records(models, score, candidate.get('id'), parallelism),
+                stream_format
+            )
+
+        compare_start = time.time()
+        outcomes = run_batch_async(models, score, max_concurrency=parallelism)
 
         return jsonify({
             'success': True,
             'candidate_id': candidate.get('id'),
-            'results': results,
+            'results': [_compare_result(model, outcome) for model, outcome in zip(models, outcomes)],
+            'parallelism': parallelism,
+            'elapsed_seconds': round(time.time() - compare_start, 2),
             'ollama_available': True
         })
 
@@ -498,6 +716,56 @@ def evaluate_quick_compare():
         }), 500
 
 
+def _compare_result(model, outcome):
+    """Turn one model's outcome into the per-model comparison result"""
+    if not outcome['success']:
+        return {
+            'model': model,
+            'success': False,
+            'error': outcome['error'],
+            'elapsed_seconds': outcome['elapsed_seconds']
+        }
+
+    result, usage = outcome['value']
+    return {
+        'model': model,
+        'success': True,
+        'score': result['score'],
+        'reasoning': result['reasoning'],
+        'requirements_identified': result['requirements_identified'],
+        'match_analysis': result['match_analysis'],
+        'methodology': result['methodology'],
+        'evaluated_at': result['evaluated_at'],
+        'elapsed_seconds': usage.get('elapsed_seconds', 0),
+        # Time spent swapping the model into memory versus generating
+        'load_seconds': usage.get('load_seconds', 0),
+        'eval_seconds': usage.get('eval_seconds', 0),
+        'usage': usage
+    }
+
+
+def _iter_compare_records(models, score, candidate_id, parallelism):
+    """Yield one result record per model as soon as it finishes, then a summary"""
+    compare_start = time.time()
+    succeeded = 0
+    for outcome in iter_batch_completed_async(models, score, max_concurrency=parallelism):
+        result = _compare_result(models[outcome['index']], outcome)
+        succeeded += 1 if result['success'] else 0
+        yield {'type': 'result', 'index': outcome['index'], **result}
+
+    yield {
+        'type': 'summary',
+        'success': True,
+        'candidate_id': candidate_id,
+        'total': len(models),
+        'succeeded': succeeded,
+        'failed': len(models) - succeeded,
+        'parallelism': parallelism,
+        'elapsed_seconds': round(time.time() - compare_start, 2),
+        'ollama_available': True
+    }
+
+
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
@@ -509,9 +777,30 @@ if __name__ == '__main__':
     port = int(os.environ.get('PORT', 8000))
 
     # Initialize database for single-user mode
-    from database import ensure_local_user_exists, ensure_settings_table_exists
+    from database import (
+        ensure_local_user_exists, ensure_settings_table_exists, ensure_eval_job_tables_exist,
+        ensure_candidate_listing_indexes, ensure_evaluation_skill_hash_column, ensure_candidate_resume_columns
+    )
     ensure_local_user_exists()
     ensure_settings_table_exists()
+    ensure_eval_job_tables_exist()
+    ensure_candidate_listing_indexes()
+    ensure_evaluation_skill_hash_column()
+    ensure_candidate_resume_columns()
+
+    # Start evaluation queue workers (only once when the debug reloader is active)
+    if not debug_mode or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        from eval_queue import start_workers
+        queue_workers = start_workers()
+        print(f'⚙️  Evaluation queue workers: {len(queue_workers)}')
+
+        # Keep Ollama's status fresh in the background so request-time availability checks hit the cache
+        start_health_monitor()
+
+        # Preload the configured Ollama models in the background so the first quick scores start warm
+        if os.environ.get('OLLAMA_WARMUP_ON_START', 'false').lower() == 'true':
+            import threading
+            threading.Thread(target=warm_up_models, name='ollama-warmup', daemon=True).start()
 
     print('✅ Flask API server starting...')
     print(f'📍 Running on http://localhost:{port}')
@@ -525,12 +814,17 @@ if __name__ == '__main__':
     print('   GET  /api/auth/session - Get current session')
     print('   Evaluation:')
     print('   POST /api/evaluate_regex - Regex evaluation')
+    print('   POST /api/evaluate_regex/bulk - Multi-process regex screening (NDJSON stream)')
     print('   POST /api/evaluate_candidate - AI evaluation (Anthropic/OpenAI)')
     print('   POST /api/evaluate_quick - Quick score (Ollama local)')
     print('   POST /api/evaluate_quick/batch - Batch quick score')
     print('   POST /api/evaluate_quick/compare - Model comparison')
+    print('   POST /api/eval_jobs - Queue a background evaluation')
+    print('   GET  /api/eval_jobs/<id> - Evaluation job progress')
     print('   Utilities:')
     print('   GET  /api/ollama/status - Check Ollama status')
+    print('   POST /api/ollama/warmup - Preload Ollama models')
+    print('   GET  /api/providers/stats - LLM connection-reuse stats')
     print('   POST /api/extract_job_info - Extract job info from description')
     print('   POST /api/parse_performance_profile - Parse uploaded Performance Profile')
     print('   GET  /health - Health check')
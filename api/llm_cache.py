@@ -0,0 +1,259 @@
+"""
+Content-Addressed LLM Response Cache
+Reuses a previous LLM response when the exact same prompt is sent to the same
+provider, model and temperature again
+
+Entries live in the llm_cache table of the SQLite database and are evicted by
+age (LLM_CACHE_MAX_AGE_DAYS) and total size (LLM_CACHE_MAX_MB). Any database
+problem degrades to an uncached call rather than failing the evaluation.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import database as db
+
+
+CACHE_ENABLED = os.environ.get('LLM_CACHE_ENABLED', 'true').lower() == 'true'
+MAX_AGE_SECONDS = int(float(os.environ.get('LLM_CACHE_MAX_AGE_DAYS', 30)) * 86400)
+MAX_BYTES = int(float(os.environ.get('LLM_CACHE_MAX_MB', 200)) * 1024 * 1024)
+EVICT_EVERY_N_WRITES = 50  # Amortize eviction scans across writes
+
+_lock = threading.Lock()
+_initialized_paths = set()
+_writes_since_eviction = 0
+
+
+def make_cache_key(
+    prompt: str,
+    provider: str,
+    model: Optional[str],
+    temperature: Optional[float],
+    extra: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Build a content-addressed cache key
+
+    Args:
+        prompt: Full prompt text sent to the model
+        provider: Provider name ('anthropic', 'openai', 'ollama')
+        model: Model id
+        temperature: Sampling temperature used for the call
+        extra: Any other inputs that change the response (e.g. output mode)
+
+    Returns:
+        str: SHA-256 hex digest of the canonical JSON of all inputs
+    """
+    material = json.dumps({
+        'prompt': prompt,
+        'provider': provider,
+        'model': model,
+        'temperature': temperature,
+        'extra': extra or {}
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+def _ensure_table() -> None:
+    """Create the cache table once per database path"""
+    path = str(db.DB_PATH)
+    if path in _initialized_paths:
+        return
+    with _lock:
+        if path not in _initialized_paths:
+            db.ensure_llm_cache_table_exists()
+            _initialized_paths.add(path)
+
+
+def get_cached_response(cache_key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """Look up a cached (response_text, usage) pair; returns None on miss or storage error"""
+    try:
+        _ensure_table()
+        entry = db.get_llm_cache_entry(cache_key, max_age_seconds=MAX_AGE_SECONDS)
+    except sqlite3.Error as e:
+        print(f'Warning: LLM cache lookup failed: {e}')
+        return None
+    if entry is None:
+        return None
+    return entry['response_text'], entry['usage']
+
+
+def store_response(cache_key: str, provider: str, model: Optional[str], response_text: str, usage: Dict[str, Any]) -> None:
+    """Store a response and periodically evict old or excess entries"""
+    global _writes_since_eviction
+    try:
+        _ensure_table()
+        db.put_llm_cache_entry(cache_key, provider, model, response_text, usage)
+        with _lock:
+            _writes_since_eviction += 1
+            should_evict = _writes_since_eviction >= EVICT_EVERY_N_WRITES
+            if should_evict:
+                _writes_since_eviction = 0
+        if should_evict:
+            db.evict_llm_cache(max_age_seconds=MAX_AGE_SECONDS, max_bytes=MAX_BYTES)
+    except sqlite3.Error as e:
+        print(f'Warning: LLM cache write failed: {e}')
+
+
+def cached_evaluate(
+    llm_provider,
+    prompt: str,
+    use_cache: bool = True,
+    extra_key: Optional[Dict[str, Any]] = None,
+    schema: Optional[Dict[str, Any]] = None
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Call llm_provider.evaluate(prompt), reusing a cached response when available
+
+    Args:
+        llm_provider: Provider instance (AnthropicProvider, OpenAIProvider, OllamaProvider)
+        prompt: The evaluation prompt
+        use_cache: Set False to force a fresh model call (the result is still stored)
+        extra_key: Additional inputs to fold into the cache key
+        schema: Request structured output matching this JSON schema (llm_provider.evaluate_structured)
+
+    Returns:
+        Tuple of (response_text, usage_metadata). usage_metadata['cache_hit'] tells
+        whether the model was called; hits report zero tokens and zero cost.
+    """
+    provider_name, model, cache_key = _cache_identity(llm_provider, prompt, extra_key, schema)
+
+    if CACHE_ENABLED and use_cache:
+        cached = get_cached_response(cache_key)
+        if cached is not None:
+            return _hit(*cached)
+
+    if schema is not None:
+        response_text, usage = llm_provider.evaluate_structured(prompt, schema)
+    else:
+        response_text, usage = llm_provider.evaluate(prompt)
+    usage = dict(usage)
+    usage['cache_hit'] = False
+
+    if CACHE_ENABLED and response_text:
+        store_response(cache_key, provider_name, model, response_text, usage)
+
+    return response_text, usage
+
+
+async def acached_evaluate(
+    llm_provider,
+    prompt: str,
+    use_cache: bool = True,
+    extra_key: Optional[Dict[str, Any]] = None,
+    schema: Optional[Dict[str, Any]] = None
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Async counterpart of cached_evaluate, awaiting llm_provider.aevaluate
+
+    Cache reads and writes run in a worker thread so SQLite never blocks the event loop.
+
+    Returns:
+        Tuple of (response_text, usage_metadata), as cached_evaluate
+    """
+    provider_name, model, cache_key = _cache_identity(llm_provider, prompt, extra_key, schema)
+
+    if CACHE_ENABLED and use_cache:
+        cached = await asyncio.to_thread(get_cached_response, cache_key)
+        if cached is not None:
+            return _hit(*cached)
+
+    if schema is not None:
+        response_text, usage = await llm_provider.aevaluate_structured(prompt, schema)
+    else:
+        response_text, usage = await llm_provider.aevaluate(prompt)
+    usage = dict(usage)
+    usage['cache_hit'] = False
+
+    if CACHE_ENABLED and response_text:
+        await asyncio.to_thread(store_response, cache_key, provider_name, model, response_text, usage)
+
+    return response_text, usage
+
+
+def cached_evaluate_stream(
+    llm_provider,
+    prompt: str,
+    on_text,
+    should_stop=None,
+    use_cache: bool = True
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Call llm_provider.evaluate_stream(prompt, on_text, should_stop), reusing a cached response when available
+
+    A cached response is passed to on_text in one piece. Responses cut short by
+    should_stop are not cached, since they aren't what a full call would return.
+
+    Returns:
+        Tuple of (response_text, usage_metadata), as cached_evaluate
+    """
+    provider_name, model, cache_key = _cache_identity(llm_provider, prompt, None, None)
+
+    if CACHE_ENABLED and use_cache:
+        cached = get_cached_response(cache_key)
+        if cached is not None:
+            on_text(cached[0])
+            return _hit(*cached)
+
+    response_text, usage = llm_provider.evaluate_stream(prompt, on_text, should_stop)
+    usage = dict(usage)
+    usage['cache_hit'] = False
+
+    if CACHE_ENABLED and response_text and not usage.get('stopped_early'):
+        store_response(cache_key, provider_name, model, response_text, usage)
+
+    return response_text, usage
+
+
+async def acached_evaluate_stream(
+    llm_provider,
+    prompt: str,
+    on_text,
+    should_stop=None,
+    use_cache: bool = True
+) -> Tuple[str, Dict[str, Any]]:
+    """Async counterpart of cached_evaluate_stream, awaiting llm_provider.aevaluate_stream"""
+    provider_name, model, cache_key = _cache_identity(llm_provider, prompt, None, None)
+
+    if CACHE_ENABLED and use_cache:
+        cached = await asyncio.to_thread(get_cached_response, cache_key)
+        if cached is not None:
+            on_text(cached[0])
+            return _hit(*cached)
+
+    response_text, usage = await llm_provider.aevaluate_stream(prompt, on_text, should_stop)
+    usage = dict(usage)
+    usage['cache_hit'] = False
+
+    if CACHE_ENABLED and response_text and not usage.get('stopped_early'):
+        await asyncio.to_thread(store_response, cache_key, provider_name, model, response_text, usage)
+
+    return response_text, usage
+
+
+def _cache_identity(llm_provider, prompt: str, extra_key: Optional[Dict[str, Any]],
+                    schema: Optional[Dict[str, Any]]) -> Tuple[str, Optional[str], str]:
+    """Provider name, model and cache key of a call"""
+    provider_name = llm_provider.get_provider_name()
+    model = getattr(llm_provider, 'model', None)
+    if schema is not None:
+        extra_key = {**(extra_key or {}), 'schema': schema}
+    cache_key = make_cache_key(prompt, provider_name, model, getattr(llm_provider, 'temperature', None), extra_key)
+    return provider_name, model, cache_key
+
+
+def _hit(response_text: str, usage: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """A cached response with usage zeroed out, since the model wasn't called"""
+    usage = dict(usage)
+    usage.update({'input_tokens': 0, 'output_tokens': 0, 'cost': 0.0, 'cache_hit': True})
+    for key in ('cache_creation_input_tokens', 'cache_read_input_tokens'):
+        if key in usage:
+            usage[key] = 0
+    for key in ('elapsed_seconds', 'load_seconds', 'prompt_eval_seconds', 'eval_seconds'):
+        if key in usage:
+            usage[key] = 0.0
+    return response_text, usage
@@ -1,11 +1,69 @@
 """
 LLM Provider Abstraction Layer
 Supports multiple LLM providers (Anthropic Claude, OpenAI) for candidate evaluations
+
+get_provider returns process-wide provider instances, and all Anthropic (or
+OpenAI) clients share one keep-alive HTTP connection pool, so consecutive
+evaluations reuse connections instead of paying a TLS handshake each time.
+
+Anthropic and OpenAI calls go through a RateLimiter per API key, which keeps
+requests and tokens per minute within the provider's limits (configured, or
+learned from rate-limit response headers) and retries 429s and transient
+errors with jittered exponential backoff.
 """
+import asyncio
+import hashlib
+import json
+import math
 import os
+import random
+import threading
+import time
+import weakref
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Tuple
+from collections import OrderedDict
+from typing import Dict, Any, Iterator, Optional, Tuple
 import anthropic
+import httpx
+
+
+# Message Batches are billed at half the synchronous price
+BATCH_PRICE_FACTOR = 0.5
+
+# Prompt caching: writing a prefix costs more than plain input, reading it back much less
+ANTHROPIC_CACHE_WRITE_PRICE_FACTOR = 1.25
+ANTHROPIC_CACHE_READ_PRICE_FACTOR = 0.1
+OPENAI_CACHE_READ_PRICE_FACTOR = 0.5
+
+# Shared HTTP connection pools (one per provider)
+HTTP_MAX_CONNECTIONS = int(os.environ.get('LLM_HTTP_MAX_CONNECTIONS', 100))
+HTTP_KEEPALIVE_SECONDS = float(os.environ.get('LLM_HTTP_KEEPALIVE_SECONDS', 30))
+
+# Cached provider instances and rate limiters, each kept for the most recently used API keys/models
+REGISTRY_MAX_ENTRIES = int(os.environ.get('LLM_REGISTRY_MAX_ENTRIES', 64))
+
+# Client-side rate limiting and retries (per-provider RPM/TPM caps come from
+# ANTHROPIC_RPM / ANTHROPIC_TPM / OPENAI_RPM / OPENAI_TPM, if set)
+LLM_MAX_RETRIES = int(os.environ.get('LLM_MAX_RETRIES', 5))
+RETRY_BASE_SECONDS = 1.0
+RETRY_MAX_SECONDS = 60.0
+CHARS_PER_TOKEN = 4  # Rough average for English prose
+EXPECTED_OUTPUT_TOKENS = 1024  # Reserved per call until the real usage is known
+
+
+class PromptWithPrefix(str):
+    """
+    A prompt whose leading part is shared by many calls (e.g. skill + job block)
+
+    Behaves exactly like the full prompt string. Providers with prompt caching
+    send the prefix as a separately cacheable block.
+    """
+
+    def __new__(cls, prefix: str, suffix: str):
+        prompt = super().__new__(cls, prefix + suffix)
+        prompt.prefix = prefix
+        prompt.suffix = suffix
+        return prompt
 
 
 class LLMProvider(ABC):
@@ -25,29 +83,105 @@ class LLMProvider(ABC):
         """
         pass
 
+    async def aevaluate(self, prompt: str) -> Tuple[str, Dict[str, Any]]:
+        """
+        Async counterpart of evaluate (runs evaluate in a worker thread unless overridden)
+
+        Providers override this with their async client so many calls can be in
+        flight on one event loop without a thread each.
+        """
+        return await asyncio.to_thread(self.evaluate, prompt)
+
+    async def aevaluate_structured(self, prompt: str, schema: Dict[str, Any],
+                                   name: str = 'record_evaluation') -> Tuple[str, Dict[str, Any]]:
+        """Async counterpart of evaluate_structured"""
+        return await asyncio.to_thread(self.evaluate_structured, prompt, schema, name)
+
     @abstractmethod
     def get_provider_name(self) -> str:
         """Return the provider name (e.g., 'anthropic', 'openai')"""
         pass
 
+    def supports_structured_output(self) -> bool:
+        """Whether evaluate_structured is available"""
+        return False
+
+    def evaluate_structured(self, prompt: str, schema: Dict[str, Any],
+                            name: str = 'record_evaluation') -> Tuple[str, Dict[str, Any]]:
+        """
+        Evaluate with the response constrained to a JSON schema
+
+        Args:
+            prompt: The formatted evaluation prompt
+            schema: JSON schema of the expected object (see structured_output.py)
+            name: Name for the schema/tool (letters, digits, _ and -)
+
+        Returns:
+            Tuple of (JSON object text, usage_metadata)
+        """
+        raise NotImplementedError(f'{self.get_provider_name()} does not support structured output')
+
+    def supports_batch(self) -> bool:
+        """Whether submit_batch / get_batch_status / iter_batch_results are available"""
+        return False
+
+    def submit_batch(self, prompts: Dict[str, str]) -> str:
+        """
+        Submit many prompts for asynchronous processing
+
+        Args:
+            prompts: Mapping of custom_id (letters, digits, _ and -, max 64 chars) to prompt
+
+        Returns:
+            Batch id to poll with get_batch_status
+        """
+        raise NotImplementedError(f'{self.get_provider_name()} does not support batch evaluation')
+
+    def get_batch_status(self, batch_id: str) -> Dict[str, Any]:
+        """
+        Get batch progress
+
+        Returns:
+            Dict with id, status ('in_progress', 'canceling' or 'ended') and per-outcome counts
+        """
+        raise NotImplementedError(f'{self.get_provider_name()} does not support batch evaluation')
+
+    def iter_batch_results(self, batch_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the results of an ended batch (in no particular order)
+
+        Yields:
+            Dict with custom_id, success, and either response_text + usage or error
+        """
+        raise NotImplementedError(f'{self.get_provider_name()} does not support batch evaluation')
+
 
 class AnthropicProvider(LLMProvider):
     """Anthropic Claude provider implementation"""
 
-    def __init__(self, api_key: str = None, model: str = "claude-3-5-haiku-20241022"):
+    def __init__(self, api_key: str = None, model: str = "claude-3-5-haiku-20241022", temperature: float = 1.0,
+                 prompt_caching: bool = True, http_client: Optional[httpx.Client] = None):
         """
         Initialize Anthropic provider
 
         Args:
             api_key: Anthropic API key (if None, reads from ANTHROPIC_API_KEY env var)
             model: Claude model to use (default: claude-3-5-haiku-20241022)
+            temperature: Sampling temperature (default: 1.0, the API default)
+            prompt_caching: Mark the shared prefix of a PromptWithPrefix as cacheable (default: True)
+            http_client: httpx client to send requests through (default: the client's own pool)
         """
         self.api_key = api_key or os.environ.get('ANTHROPIC_API_KEY')
         if not self.api_key:
             raise ValueError('Missing ANTHROPIC_API_KEY')
 
         self.model = model
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        self.temperature = temperature
+        self.prompt_caching = prompt_caching
+        # Retries are left to the rate limiter so 429s back off once, for every caller
+        self.client = anthropic.Anthropic(api_key=self.api_key, http_client=http_client, max_retries=0)
+        self._async_clients = weakref.WeakKeyDictionary()  # event loop -> AsyncAnthropic
+        self.rate_limiter = get_rate_limiter('anthropic', self.api_key)
 
     def _get_model_pricing(self, model: str) -> Dict[str, float]:
         """Get pricing for a specific model from PROVIDER_CONFIGS"""
@@ -58,33 +192,175 @@ class AnthropicProvider(LLMProvider):
         # Fallback to Sonnet 4.5 pricing if model not found
         return {'input': 3.00, 'output': 15.00}
 
-    def evaluate(self, prompt: str) -> Tuple[str, Dict[str, Any]]:
-        """Call Claude API for evaluation"""
-        message = self.client.messages.create(
-            model=self.model,
-            max_tokens=4096,
-            messages=[
-                {"role": "user", "content": prompt}
+    def _request_params(self, prompt: str) -> Dict[str, Any]:
+        """Messages API parameters for one evaluation prompt"""
+        content = prompt
+        if self.prompt_caching and isinstance(prompt, PromptWithPrefix) and prompt.prefix:
+            # Cache breakpoint after the shared prefix; later calls with the same prefix read it from cache
+            content = [
+                {"type": "text", "text": prompt.prefix, "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": prompt.suffix}
             ]
-        )
 
-        response_text = message.content[0].text
+        return {
+            'model': self.model,
+            'max_tokens': 4096,
+            'temperature': self.temperature,
+            'messages': [
+                {"role": "user", "content": content}
+            ]
+        }
+
+    def _usage_metadata(self, usage, price_factor: float = 1.0) -> Dict[str, Any]:
+        """Token counts and cost for a response's usage block"""
+        # input_tokens excludes tokens written to or read from the prompt cache
+        cache_write_tokens = getattr(usage, 'cache_creation_input_tokens', None) or 0
+        cache_read_tokens = getattr(usage, 'cache_read_input_tokens', None) or 0
 
         # Calculate cost dynamically based on model
         pricing = self._get_model_pricing(self.model)
-        input_cost = (message.usage.input_tokens / 1_000_000) * pricing['input']
-        output_cost = (message.usage.output_tokens / 1_000_000) * pricing['output']
-        total_cost = input_cost + output_cost
+        input_cost = (
+            usage.input_tokens +
+            cache_write_tokens * ANTHROPIC_CACHE_WRITE_PRICE_FACTOR +
+            cache_read_tokens * ANTHROPIC_CACHE_READ_PRICE_FACTOR
+        ) / 1_000_000 * pricing['input']
+        output_cost = (usage.output_tokens / 1_000_000) * pricing['output']
+        total_cost = (input_cost + output_cost) * price_factor
 
-        usage_metadata = {
-            'input_tokens': message.usage.input_tokens,
-            'output_tokens': message.usage.output_tokens,
+        return {
+            'input_tokens': usage.input_tokens,
+            'output_tokens': usage.output_tokens,
+            'cache_creation_input_tokens': cache_write_tokens,
+            'cache_read_input_tokens': cache_read_tokens,
             'cost': round(total_cost, 4),
             'model': self.model
         }
 
+    def evaluate(self, prompt: str) -> Tuple[str, Dict[str, Any]]:
+        """Call Claude API for evaluation"""
+        params = self._request_params(prompt)
+        message = self.rate_limiter.call(
+            lambda: self.client.messages.create(**params), estimate_tokens(prompt), _anthropic_tokens_used
+        )
+
+        response_text = message.content[0].text
+        usage_metadata = self._usage_metadata(message.usage)
+
         return response_text, usage_metadata
 
+    def _async_client(self) -> anthropic.AsyncAnthropic:
+        """AsyncAnthropic client for the running event loop (async connections can't cross loops)"""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = anthropic.AsyncAnthropic(
+                api_key=self.api_key, http_client=_shared_async_http_client('anthropic'), max_retries=0
+            )
+            self._async_clients[loop] = client
+        return client
+
+    async def aevaluate(self, prompt: str) -> Tuple[str, Dict[str, Any]]:
+        """Call Claude API for evaluation without blocking the event loop"""
+        params = self._request_params(prompt)
+        message = await self.rate_limiter.acall(
+            lambda: self._async_client().messages.create(**params), estimate_tokens(prompt), _anthropic_tokens_used
+        )
+        return message.content[0].text, self._usage_metadata(message.usage)
+
+    def supports_structured_output(self) -> bool:
+        return True
+
+    def _structured_params(self, prompt: str, schema: Dict[str, Any], name: str) -> Dict[str, Any]:
+        """Request parameters forcing a single tool whose input_schema is the evaluation schema"""
+        params = self._request_params(prompt)
+        params['tools'] = [{'name': name, 'description': 'Record the candidate evaluation', 'input_schema': schema}]
+        params['tool_choice'] = {'type': 'tool', 'name': name}
+        return params
+
+    @staticmethod
+    def _structured_text(message) -> str:
+        """JSON text of the tool input (or the plain text if the model didn't call the tool)"""
+        tool_input = next(
+            (block.input for block in message.content if getattr(block, 'type', None) == 'tool_use'),
+            None
+        )
+        if tool_input is not None:
+            return json.dumps(tool_input)
+        return ''.join(getattr(block, 'text', '') for block in message.content)
+
+    def evaluate_structured(self, prompt: str, schema: Dict[str, Any],
+                            name: str = 'record_evaluation') -> Tuple[str, Dict[str, Any]]:
+        """Call Claude with a single forced tool whose input_schema is the evaluation schema"""
+        params = self._structured_params(prompt, schema, name)
+        message = self.rate_limiter.call(
+            lambda: self.client.messages.create(**params), estimate_tokens(prompt), _anthropic_tokens_used
+        )
+        return self._structured_text(message), self._usage_metadata(message.usage)
+
+    async def aevaluate_structured(self, prompt: str, schema: Dict[str, Any],
+                                   name: str = 'record_evaluation') -> Tuple[str, Dict[str, Any]]:
+        """Async counterpart of evaluate_structured"""
+        params = self._structured_params(prompt, schema, name)
+        message = await self.rate_limiter.acall(
+            lambda: self._async_client().messages.create(**params), estimate_tokens(prompt), _anthropic_tokens_used
+        )
+        return self._structured_text(message), self._usage_metadata(message.usage)
+
+    def _batches(self):
+        """Message Batches resource (under beta in older SDK versions)"""
+        if hasattr(self.client.messages, 'batches'):
+            return self.client.messages.batches
+        return self.client.beta.messages.batches
+
+    def supports_batch(self) -> bool:
+        return True
+
+    def submit_batch(self, prompts: Dict[str, str]) -> str:
+        """Submit prompts as one Message Batch"""
+        requests = [
+            {'custom_id': custom_id, 'params': self._request_params(prompt)}
+            for custom_id, prompt in prompts.items()
+        ]
+        # Batch requests don't count against the per-minute token budget
+        batch = self.rate_limiter.call(lambda: self._batches().create(requests=requests), 0)
+        return batch.id
+
+    def get_batch_status(self, batch_id: str) -> Dict[str, Any]:
+        """Get Message Batch progress"""
+        batch = self.rate_limiter.call(lambda: self._batches().retrieve(batch_id), 0)
+        counts = batch.request_counts
+        return {
+            'id': batch.id,
+            'status': batch.processing_status,
+            'processing': counts.processing,
+            'succeeded': counts.succeeded,
+            'errored': counts.errored,
+            'canceled': counts.canceled,
+            'expired': counts.expired
+        }
+
+    def iter_batch_results(self, batch_id: str) -> Iterator[Dict[str, Any]]:
+        """Stream Message Batch results"""
+        for entry in self._batches().results(batch_id):
+            result = entry.result
+            if result.type == 'succeeded':
+                usage_metadata = self._usage_metadata(result.message.usage, price_factor=BATCH_PRICE_FACTOR)
+                usage_metadata['batch'] = True
+                yield {
+                    'custom_id': entry.custom_id,
+                    'success': True,
+                    'response_text': result.message.content[0].text,
+                    'usage': usage_metadata
+                }
+            else:
+                error = getattr(result, 'error', None)
+                detail = getattr(error, 'error', None)
+                yield {
+                    'custom_id': entry.custom_id,
+                    'success': False,
+                    'error': getattr(detail, 'message', None) or f'Batch request {result.type}'
+                }
+
     def get_provider_name(self) -> str:
         return 'anthropic'
 
@@ -92,52 +368,121 @@ class AnthropicProvider(LLMProvider):
 class OpenAIProvider(LLMProvider):
     """OpenAI provider implementation"""
 
-    def __init__(self, api_key: str = None, model: str = "gpt-4o"):
+    def __init__(self, api_key: str = None, model: str = "gpt-4o", temperature: float = 0.7,
+                 http_client: Optional[httpx.Client] = None):
         """
         Initialize OpenAI provider
 
         Args:
             api_key: OpenAI API key (if None, reads from OPENAI_API_KEY env var)
             model: OpenAI model to use (default: gpt-4o)
+            temperature: Sampling temperature (default: 0.7)
+            http_client: httpx client to send requests through (default: the client's own pool)
         """
         self.api_key = api_key or os.environ.get('OPENAI_API_KEY')
         if not self.api_key:
             raise ValueError('Missing OPENAI_API_KEY')
 
         self.model = model
+        self.temperature = temperature
+        self._async_clients = weakref.WeakKeyDictionary()  # event loop -> AsyncOpenAI
+        self.rate_limiter = get_rate_limiter('openai', self.api_key)
 
         # Import OpenAI client (lazy import to avoid requiring it if not used)
         try:
             from openai import OpenAI
-            self.client = OpenAI(api_key=self.api_key)
+            # Retries are left to the rate limiter so 429s back off once, for every caller
+            self.client = OpenAI(api_key=self.api_key, http_client=http_client, max_retries=0)
         except ImportError:
             raise ImportError('openai package not installed. Run: pip install openai')
 
     def evaluate(self, prompt: str) -> Tuple[str, Dict[str, Any]]:
         """Call OpenAI API for evaluation"""
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
+        params = self._request_params(prompt)
+        response = self.rate_limiter.call(
+            lambda: self.client.chat.completions.create(**params), estimate_tokens(prompt), _openai_tokens_used
+        )
+        return self._parse_completion(response)
+
+    def _async_client(self):
+        """AsyncOpenAI client for the running event loop (async connections can't cross loops)"""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            from openai import AsyncOpenAI
+            client = AsyncOpenAI(api_key=self.api_key, http_client=_shared_async_http_client('openai'), max_retries=0)
+            self._async_clients[loop] = client
+        return client
+
+    async def aevaluate(self, prompt: str) -> Tuple[str, Dict[str, Any]]:
+        """Call OpenAI API for evaluation without blocking the event loop"""
+        params = self._request_params(prompt)
+        response = await self.rate_limiter.acall(
+            lambda: self._async_client().chat.completions.create(**params), estimate_tokens(prompt), _openai_tokens_used
+        )
+        return self._parse_completion(response)
+
+    def supports_structured_output(self) -> bool:
+        return True
+
+    @staticmethod
+    def _response_format(schema: Dict[str, Any], name: str) -> Dict[str, Any]:
+        return {'type': 'json_schema', 'json_schema': {'name': name, 'schema': schema}}
+
+    def evaluate_structured(self, prompt: str, schema: Dict[str, Any],
+                            name: str = 'record_evaluation') -> Tuple[str, Dict[str, Any]]:
+        """Call OpenAI with response_format set to the evaluation schema"""
+        params = {**self._request_params(prompt), 'response_format': self._response_format(schema, name)}
+        response = self.rate_limiter.call(
+            lambda: self.client.chat.completions.create(**params), estimate_tokens(prompt), _openai_tokens_used
+        )
+        return self._parse_completion(response)
+
+    async def aevaluate_structured(self, prompt: str, schema: Dict[str, Any],
+                                   name: str = 'record_evaluation') -> Tuple[str, Dict[str, Any]]:
+        """Async counterpart of evaluate_structured"""
+        params = {**self._request_params(prompt), 'response_format': self._response_format(schema, name)}
+        response = await self.rate_limiter.acall(
+            lambda: self._async_client().chat.completions.create(**params), estimate_tokens(prompt), _openai_tokens_used
+        )
+        return self._parse_completion(response)
+
+    def _request_params(self, prompt: str) -> Dict[str, Any]:
+        """Chat completion parameters for one evaluation prompt"""
+        return {
+            'model': self.model,
+            'messages': [
                 {"role": "system", "content": "You are an expert recruiter evaluating candidates for job positions."},
                 {"role": "user", "content": prompt}
             ],
-            max_tokens=4096,
-            temperature=0.7
-        )
+            'max_tokens': 4096,
+            'temperature': self.temperature
+        }
 
+    def _parse_completion(self, response) -> Tuple[str, Dict[str, Any]]:
+        """Response text and usage metadata of a chat completion"""
         response_text = response.choices[0].message.content
 
         # Calculate cost based on model pricing
         # GPT-4o pricing (as of Jan 2025): $2.50/1M input, $10.00/1M output
         # GPT-4o-mini: $0.15/1M input, $0.60/1M output
+        # OpenAI caches long shared prompt prefixes automatically; cached tokens are discounted
+        details = getattr(response.usage, 'prompt_tokens_details', None)
+        cached_tokens = getattr(details, 'cached_tokens', None) or 0
+
         pricing = self._get_model_pricing(self.model)
-        input_cost = (response.usage.prompt_tokens / 1_000_000) * pricing['input']
+        input_cost = (
+            (response.usage.prompt_tokens - cached_tokens) +
+            cached_tokens * OPENAI_CACHE_READ_PRICE_FACTOR
+        ) / 1_000_000 * pricing['input']
         output_cost = (response.usage.completion_tokens / 1_000_000) * pricing['output']
         total_cost = input_cost + output_cost
 
         usage_metadata = {
             'input_tokens': response.usage.prompt_tokens,
             'output_tokens': response.usage.completion_tokens,
+            'cache_creation_input_tokens': 0,
+            'cache_read_input_tokens': cached_tokens,
             'cost': round(total_cost, 4),
             'model': self.model
         }
@@ -159,32 +504,426 @@ class OpenAIProvider(LLMProvider):
         return 'openai'
 
 
-def get_provider(provider_name: str, api_key: str = None, model: str = None) -> LLMProvider:
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a prompt (about CHARS_PER_TOKEN characters per token)"""
+    return math.ceil(len(text or '') / CHARS_PER_TOKEN)
+
+
+def _anthropic_tokens_used(message) -> int:
+    usage = message.usage
+    return (usage.input_tokens + usage.output_tokens +
+            (getattr(usage, 'cache_creation_input_tokens', None) or 0))
+
+
+def _openai_tokens_used(response) -> int:
+    return response.usage.prompt_tokens + response.usage.completion_tokens
+
+
+try:
+    from openai import APIConnectionError as _OpenAIConnectionError
+    _CONNECTION_ERRORS = (anthropic.APIConnectionError, _OpenAIConnectionError)
+except ImportError:
+    _CONNECTION_ERRORS = (anthropic.APIConnectionError,)
+
+# Timeouts, lock conflicts, rate limits, server errors and Anthropic's "overloaded"
+_RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+
+# Rate-limit response headers: kind -> (limit header, remaining header)
+_RATE_LIMIT_HEADERS = {
+    'anthropic': {
+        'requests': ('anthropic-ratelimit-requests-limit', 'anthropic-ratelimit-requests-remaining'),
+        'tokens': ('anthropic-ratelimit-tokens-limit', 'anthropic-ratelimit-tokens-remaining')
+    },
+    'openai': {
+        'requests': ('x-ratelimit-limit-requests', 'x-ratelimit-remaining-requests'),
+        'tokens': ('x-ratelimit-limit-tokens', 'x-ratelimit-remaining-tokens')
+    }
+}
+
+
+def _is_retryable(error: Exception) -> bool:
+    status = getattr(error, 'status_code', None)
+    if status is not None:
+        return status in _RETRYABLE_STATUS
+    return isinstance(error, _CONNECTION_ERRORS)
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds the server asked us to wait (retry-after-ms / retry-after), if any"""
+    headers = getattr(getattr(error, 'response', None), 'headers', None)
+    if not headers:
+        return None
+    try:
+        if headers.get('retry-after-ms'):
+            return float(headers['retry-after-ms']) / 1000
+        if headers.get('retry-after'):
+            return float(headers['retry-after'])
+    except ValueError:
+        pass  # HTTP-date form; fall back to exponential backoff
+    return None
+
+
+def _header_int(headers, name: str) -> Optional[int]:
+    try:
+        return int(headers[name])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute budget for one provider API key
+
+    Both budgets are token buckets that refill continuously. Each call reserves
+    one request and its estimated tokens, waiting while either bucket is short,
+    and the reservation is corrected once the response reports real usage.
+    Limits start from the configured RPM/TPM (if any) and follow the provider's
+    rate-limit headers; with neither, calls are only subject to 429 backoff.
+    A 429 pauses every caller sharing the limiter, not just the one that hit it.
     """
-    Factory function to get an LLM provider instance
+
+    def __init__(self, name: str, rpm: Optional[int] = None, tpm: Optional[int] = None,
+                 max_retries: int = None):
+        """
+        Args:
+            name: Provider name, for headers and stats
+            rpm: Requests per minute cap (None = learn from response headers)
+            tpm: Tokens per minute cap (None = learn from response headers)
+            max_retries: Retries of a retryable failure (default: LLM_MAX_RETRIES)
+        """
+        self.name = name
+        self.max_retries = LLM_MAX_RETRIES if max_retries is None else max_retries
+        self._lock = threading.Lock()
+        self._configured = {'requests': rpm, 'tokens': tpm}
+        self._limits = dict(self._configured)
+        self._available = {kind: float(limit or 0) for kind, limit in self._limits.items()}
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._stats = {'calls': 0, 'throttled': 0, 'wait_seconds': 0.0, 'retries': 0, 'rate_limited': 0}
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        for kind, limit in self._limits.items():
+            if limit:
+                self._available[kind] = min(limit, self._available[kind] + elapsed * limit / 60)
+
+    def _reserve(self, tokens: int) -> float:
+        """Take one request and tokens from the buckets, or return the seconds to wait first"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = self._paused_until - now
+            if wait > 0:
+                return wait
+
+            needed = {'requests': 1, 'tokens': tokens}
+            for kind, limit in self._limits.items():
+                if limit:
+                    # A call larger than the whole budget waits for a full bucket rather than forever
+                    shortfall = min(needed[kind], limit) - self._available[kind]
+                    wait = max(wait, shortfall * 60 / limit)
+            if wait > 0:
+                return wait
+
+            for kind, limit in self._limits.items():
+                if limit:
+                    self._available[kind] -= min(needed[kind], limit)
+            self._stats['calls'] += 1
+            return 0.0
+
+    def _waited(self, seconds: float) -> None:
+        with self._lock:
+            self._stats['throttled'] += 1
+            self._stats['wait_seconds'] += seconds
+
+    def acquire(self, tokens: int) -> None:
+        """Block until the budgets allow one more call of about tokens tokens"""
+        while True:
+            wait = self._reserve(tokens)
+            if not wait:
+                return
+            self._waited(wait)
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: int) -> None:
+        """Async counterpart of acquire"""
+        while True:
+            wait = self._reserve(tokens)
+            if not wait:
+                return
+            self._waited(wait)
+            await asyncio.sleep(wait)
+
+    def settle(self, reserved: int, used: int) -> None:
+        """Correct a reservation once the response reports the tokens actually used"""
+        with self._lock:
+            limit = self._limits['tokens']
+            if limit:
+                # As in _reserve, no single call counts for more than one full bucket
+                self._available['tokens'] += min(reserved, limit) - min(used, limit)
+
+    def update_from_headers(self, headers) -> None:
+        """Adopt the limits and remaining budget reported in a response's rate-limit headers"""
+        names = _RATE_LIMIT_HEADERS.get(self.name, {})
+        with self._lock:
+            self._refill(time.monotonic())
+            for kind, (limit_header, remaining_header) in names.items():
+                limit = _header_int(headers, limit_header)
+                remaining = _header_int(headers, remaining_header)
+                if limit:
+                    configured = self._configured[kind]
+                    learned = min(configured, limit) if configured else limit
+                    if not self._limits[kind]:
+                        self._available[kind] = learned
+                    self._limits[kind] = learned
+                if remaining is not None and self._limits[kind]:
+                    # The server's count lags our in-flight reservations, so keep the lower of the two
+                    self._available[kind] = min(self._available[kind], remaining)
+
+    def backoff(self, attempt: int, error: Exception) -> float:
+        """
+        Seconds to wait before retrying a failed call
+
+        Uses the server's retry-after when given, otherwise exponential backoff
+        with jitter so concurrent callers don't retry in lockstep. A 429 also
+        pauses every caller of this limiter for that long.
+        """
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            delay = retry_after + random.uniform(0, min(1.0, retry_after / 4 + 0.1))
+        else:
+            ceiling = min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** attempt)
+            delay = random.uniform(ceiling / 2, ceiling)
+
+        with self._lock:
+            self._stats['retries'] += 1
+            if getattr(error, 'status_code', None) == 429:
+                self._stats['rate_limited'] += 1
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        return delay
+
+    def call(self, fn, tokens: int, tokens_used=None):
+        """
+        Run fn within the budgets, retrying retryable failures
+
+        Args:
+            fn: Zero-argument function making the API call
+            tokens: Estimated input tokens of the call
+            tokens_used: Function returning the real token count from fn's result
+
+        Returns:
+            fn's result
+        """
+        reserved = tokens + EXPECTED_OUTPUT_TOKENS if tokens else 0
+        for attempt in range(self.max_retries + 1):
+            self.acquire(reserved)
+            try:
+                result = fn()
+            except Exception as e:
+                if attempt == self.max_retries or not _is_retryable(e):
+                    raise
+                time.sleep(self.backoff(attempt, e))
+                continue
+            self._settle_result(reserved, result, tokens_used)
+            return result
+
+    async def acall(self, afn, tokens: int, tokens_used=None):
+        """Async counterpart of call; afn returns an awaitable"""
+        reserved = tokens + EXPECTED_OUTPUT_TOKENS if tokens else 0
+        for attempt in range(self.max_retries + 1):
+            await self.aacquire(reserved)
+            try:
+                result = await afn()
+            except Exception as e:
+                if attempt == self.max_retries or not _is_retryable(e):
+                    raise
+                await asyncio.sleep(self.backoff(attempt, e))
+                continue
+            self._settle_result(reserved, result, tokens_used)
+            return result
+
+    def _settle_result(self, reserved: int, result, tokens_used) -> None:
+        if tokens_used is None or not reserved:
+            return
+        try:
+            used = int(tokens_used(result))
+        except (AttributeError, TypeError, ValueError):
+            return
+        self.settle(reserved, used)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                'rpm_limit': self._limits['requests'],
+                'tpm_limit': self._limits['tokens'],
+                'requests_available': int(self._available['requests']) if self._limits['requests'] else None,
+                'tokens_available': int(self._available['tokens']) if self._limits['tokens'] else None,
+                **self._stats,
+                'wait_seconds': round(self._stats['wait_seconds'], 2)
+            }
+
+
+_rate_limiters: 'OrderedDict[Tuple[str, str], RateLimiter]' = OrderedDict()  # Least recently used first
+_rate_limiters_lock = threading.Lock()
+
+
+def _env_limit(name: str) -> Optional[int]:
+    try:
+        return int(os.environ[name]) or None
+    except (KeyError, ValueError):
+        return None
+
+
+def get_rate_limiter(provider_name: str, api_key: str) -> RateLimiter:
+    """
+    Get the rate limiter shared by every caller using one provider API key
 
     Args:
-        provider_name: Provider name ('anthropic', 'openai', or 'ollama')
-        api_key: API key for the provider (optional, reads from env if None)
-        model: Model name (optional, uses provider default if None)
+        provider_name: 'anthropic' or 'openai'
+        api_key: API key (limits are per key, so only its hash is kept)
 
     Returns:
-        LLMProvider instance
+        RateLimiter capped by <PROVIDER>_RPM / <PROVIDER>_TPM if set; only the
+        REGISTRY_MAX_ENTRIES most recently used keys keep theirs
+    """
+    key = (provider_name, hashlib.sha256((api_key or '').encode('utf-8')).hexdigest()[:16])
+    with _rate_limiters_lock:
+        if key in _rate_limiters:
+            _rate_limiters.move_to_end(key)
+        else:
+            prefix = provider_name.upper()
+            _rate_limiters[key] = RateLimiter(
+                provider_name, rpm=_env_limit(f'{prefix}_RPM'), tpm=_env_limit(f'{prefix}_TPM')
+            )
+            while len(_rate_limiters) > REGISTRY_MAX_ENTRIES:
+                _rate_limiters.popitem(last=False)
+        return _rate_limiters[key]
 
-    Raises:
-        ValueError: If provider_name is not supported
+
+def _request_api_key(request: httpx.Request) -> str:
+    key = request.headers.get('x-api-key') or request.headers.get('authorization', '')
+    return key[len('Bearer '):] if key.startswith('Bearer ') else key
+
+
+def _rate_limit_hooks(provider_name: str, is_async: bool = False) -> Dict[str, list]:
+    """httpx event hooks feeding rate-limit response headers to the key's limiter"""
+    def update(response: httpx.Response) -> None:
+        get_rate_limiter(provider_name, _request_api_key(response.request)).update_from_headers(response.headers)
+
+    async def aupdate(response: httpx.Response) -> None:
+        update(response)
+
+    return {'response': [aupdate if is_async else update]}
+
+
+class _CountingTransport(httpx.HTTPTransport):
     """
-    provider_name = provider_name.lower()
+    HTTP transport that counts requests and newly opened connections
+
+    New connections are seen through the request "trace" extension, which
+    reports each TCP connect; a trace set by the caller still receives every event.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.requests = 0
+        self.connections_opened = 0
+        self._stats_lock = threading.Lock()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        caller_trace = request.extensions.get('trace')
+
+        def trace(event_name: str, info: Dict[str, Any]) -> None:
+            if event_name == 'connection.connect_tcp.complete':
+                with self._stats_lock:
+                    self.connections_opened += 1
+            if caller_trace is not None:
+                caller_trace(event_name, info)
+
+        request.extensions['trace'] = trace
+        try:
+            return super().handle_request(request)
+        finally:
+            with self._stats_lock:
+                self.requests += 1
+
+    def _open_connections(self) -> Optional[int]:
+        """Connections currently in the pool; None if this httpx version doesn't expose them"""
+        connections = getattr(getattr(self, '_pool', None), 'connections', None)
+        try:
+            return len(connections)
+        except TypeError:
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                'requests': self.requests,
+                'connections_opened': self.connections_opened,
+                'open_connections': self._open_connections(),
+                'reuse_ratio': round(1 - self.connections_opened / self.requests, 3) if self.requests else None
+            }
+
 
+# Process-wide provider registry; providers and HTTP clients are safe to share between threads
+_registry_lock = threading.Lock()
+_providers: 'OrderedDict[Tuple, LLMProvider]' = OrderedDict()  # Least recently used first
+_http_clients: Dict[str, Tuple[httpx.Client, _CountingTransport]] = {}
+_async_http_clients = weakref.WeakKeyDictionary()  # event loop -> {provider name: httpx.AsyncClient}
+_registry_stats = {'created': 0, 'reused': 0}
+
+_PROVIDER_ENV = {
+    'anthropic': ('ANTHROPIC_API_KEY', 'ANTHROPIC_BASE_URL'),
+    'openai': ('OPENAI_API_KEY', 'OPENAI_BASE_URL'),
+}
+
+
+def _shared_http_client(provider_name: str) -> httpx.Client:
+    """Keep-alive HTTP client shared by every provider instance of one provider (call with _registry_lock held)"""
+    if provider_name not in _http_clients:
+        transport = _CountingTransport(limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_SECONDS
+        ))
+        client_class = anthropic.DefaultHttpxClient
+        if provider_name == 'openai':
+            from openai import DefaultHttpxClient as client_class
+        client = client_class(transport=transport, event_hooks=_rate_limit_hooks(provider_name))
+        _http_clients[provider_name] = (client, transport)
+    return _http_clients[provider_name][0]
+
+
+def _shared_async_http_client(provider_name: str) -> httpx.AsyncClient:
+    """Keep-alive async HTTP client shared by every provider instance on the running event loop"""
+    loop = asyncio.get_running_loop()
+    with _registry_lock:
+        clients = _async_http_clients.setdefault(loop, {})
+        if provider_name not in clients:
+            client_class = anthropic.DefaultAsyncHttpxClient
+            if provider_name == 'openai':
+                from openai import DefaultAsyncHttpxClient as client_class
+            clients[provider_name] = client_class(limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_SECONDS
+            ), event_hooks=_rate_limit_hooks(provider_name, is_async=True))
+        return clients[provider_name]
+
+
+def _new_provider(provider_name: str, api_key: str = None, model: str = None,
+                  http_client: Optional[httpx.Client] = None) -> 'LLMProvider':
     if provider_name == 'anthropic':
         if model:
-            return AnthropicProvider(api_key=api_key, model=model)
-        return AnthropicProvider(api_key=api_key)
+            return AnthropicProvider(api_key=api_key, model=model, http_client=http_client)
+        return AnthropicProvider(api_key=api_key, http_client=http_client)
 
     elif provider_name == 'openai':
         if model:
-            return OpenAIProvider(api_key=api_key, model=model)
-        return OpenAIProvider(api_key=api_key)
+            return OpenAIProvider(api_key=api_key, model=model, http_client=http_client)
+        return OpenAIProvider(api_key=api_key, http_client=http_client)
 
     elif provider_name == 'ollama':
         from ollama_provider import OllamaProvider
@@ -194,6 +933,87 @@ def get_provider(provider_name: str, api_key: str = None, model: str = None) ->
         raise ValueError(f"Unsupported provider: {provider_name}. Supported: 'anthropic', 'openai', 'ollama'")
 
 
+def get_provider(provider_name: str, api_key: str = None, model: str = None) -> LLMProvider:
+    """
+    Get an LLM provider instance
+
+    Instances are cached per (provider, model, API key hash, base URL) and
+    shared across threads, keeping the REGISTRY_MAX_ENTRIES most recently used;
+    Anthropic and OpenAI instances also share one keep-alive HTTP connection
+    pool per provider.
+
+    Args:
+        provider_name: Provider name ('anthropic', 'openai', or 'ollama')
+        api_key: API key for the provider (optional, reads from env if None)
+        model: Model name (optional, uses provider default if None)
+
+    Returns:
+        LLMProvider instance
+
+    Raises:
+        ValueError: If provider_name is not supported
+    """
+    provider_name = provider_name.lower()
+
+    key_env, base_url_env = _PROVIDER_ENV.get(provider_name, (None, None))
+    resolved_key = api_key or (os.environ.get(key_env) if key_env else None)
+    key_hash = hashlib.sha256(resolved_key.encode('utf-8')).hexdigest() if resolved_key else None
+    cache_key = (provider_name, model, key_hash, os.environ.get(base_url_env) if base_url_env else None)
+
+    with _registry_lock:
+        provider = _providers.get(cache_key)
+        if provider is not None:
+            _providers.move_to_end(cache_key)
+            _registry_stats['reused'] += 1
+            return provider
+
+        http_client = _shared_http_client(provider_name) if provider_name in _PROVIDER_ENV else None
+        provider = _new_provider(provider_name, api_key=api_key, model=model, http_client=http_client)
+        _providers[cache_key] = provider
+        while len(_providers) > REGISTRY_MAX_ENTRIES:
+            _providers.popitem(last=False)  # Its HTTP client is shared, so there's nothing to close
+        _registry_stats['created'] += 1
+        return provider
+
+
+def get_provider_stats() -> Dict[str, Any]:
+    """
+    Provider registry and connection-reuse statistics
+
+    Returns:
+        Dict with cached/created/reused provider counts; per provider, HTTP
+        requests, connections opened, currently open connections and reuse ratio;
+        and per API key, rate limits, remaining budget, throttling and retries
+    """
+    with _registry_lock:
+        stats = {
+            'providers': {'cached': len(_providers), **_registry_stats},
+            'http': {name: transport.stats() for name, (_, transport) in _http_clients.items()}
+        }
+    with _rate_limiters_lock:
+        stats['rate_limits'] = {
+            f'{name}:{key_hash[:8]}': limiter.stats() for (name, key_hash), limiter in _rate_limiters.items()
+        }
+
+    from ollama_provider import get_session_stats
+    ollama = get_session_stats()
+    if ollama:
+        stats['http']['ollama'] = ollama
+    return stats
+
+
+def clear_provider_cache() -> None:
+    """Drop cached providers and rate limiters and close the shared HTTP clients"""
+    with _registry_lock:
+        _providers.clear()
+        for client, _ in _http_clients.values():
+            client.close()
+        _http_clients.clear()
+        _registry_stats.update(created=0, reused=0)
+    with _rate_limiters_lock:
+        _rate_limiters.clear()
+
+
 # Provider configurations (default models and display names)
 PROVIDER_CONFIGS = {
     'anthropic': {
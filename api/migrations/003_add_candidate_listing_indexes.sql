@@ -0,0 +1,9 @@
+-- Migration 003: Composite indexes for paginated candidate listing
+-- Backs keyset pagination on /api/jobs/<job_id>/candidates, which orders by
+-- score (unscored last), newest first, then id, optionally filtered by pipeline status
+
+CREATE INDEX IF NOT EXISTS idx_candidates_job_listing
+ON candidates(job_id, COALESCE(quick_score, -1) DESC, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_candidates_job_status_listing
+ON candidates(job_id, pipeline_status, COALESCE(quick_score, -1) DESC, created_at DESC, id DESC);
@@ -0,0 +1,5 @@
+-- Migration 004: Record the skill instructions behind each evaluation
+-- skill_hash is the SHA-256 of the recruiting-evaluation skill text that was in
+-- the prompt, so scores can be traced back to (and reproduced with) that version
+
+ALTER TABLE evaluations ADD COLUMN skill_hash TEXT;
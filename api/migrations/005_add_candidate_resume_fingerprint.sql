@@ -0,0 +1,11 @@
+-- Migration 005: Normalized resume text and duplicate detection
+-- resume_text_clean is resume_text with PDF/DOCX artifacts removed (see resume_normalizer.py);
+-- it is what evaluations read. resume_fingerprint is a 64-bit SimHash (16 hex digits) of it,
+-- and duplicate_of points at the earlier application to the same job with a near-identical
+-- fingerprint, whose evaluations can be reused.
+
+ALTER TABLE candidates ADD COLUMN resume_text_clean TEXT;
+ALTER TABLE candidates ADD COLUMN resume_fingerprint TEXT;
+ALTER TABLE candidates ADD COLUMN duplicate_of TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_candidates_job_fingerprint ON candidates(job_id, resume_fingerprint);
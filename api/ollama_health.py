@@ -0,0 +1,267 @@
+"""
+Ollama Health Monitor
+Shared, cached view of whether the Ollama server is up
+
+Endpoints check Ollama before doing any work. Probing /api/tags on every
+request costs a round-trip, and when Ollama is down it costs the whole probe
+timeout. One OllamaHealthMonitor per base URL answers those checks instead:
+
+- A healthy result is cached for OLLAMA_HEALTH_TTL_SECONDS, and a background
+  thread (start_health_monitor) re-probes before it goes stale
+- Concurrent checks share one in-flight probe instead of each sending their own
+- After OLLAMA_HEALTH_FAILURE_THRESHOLD consecutive failures the circuit opens:
+  checks fail immediately for a cooldown that doubles (up to
+  HEALTH_MAX_COOLDOWN_SECONDS) while Ollama stays down, then a single probe
+  decides whether to close it again
+
+Failed connections from real generate calls count as failures too, and
+successful ones refresh the cached status.
+"""
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+HEALTH_TTL_SECONDS = float(os.environ.get('OLLAMA_HEALTH_TTL_SECONDS', 10))
+HEALTH_INTERVAL_SECONDS = float(os.environ.get('OLLAMA_HEALTH_INTERVAL_SECONDS', 5))
+HEALTH_FAILURE_THRESHOLD = int(os.environ.get('OLLAMA_HEALTH_FAILURE_THRESHOLD', 2))
+HEALTH_COOLDOWN_SECONDS = float(os.environ.get('OLLAMA_HEALTH_COOLDOWN_SECONDS', 5))
+HEALTH_MAX_COOLDOWN_SECONDS = 60.0
+PROBE_TIMEOUT_SECONDS = 2
+
+_monitors = {}
+_monitors_lock = threading.Lock()
+
+
+class OllamaHealthMonitor:
+    """Cached, coalesced availability checks with a circuit breaker, for one Ollama server"""
+
+    def __init__(self, base_url: str, ttl: float = None, failure_threshold: int = None,
+                 cooldown: float = None):
+        """
+        Initialize the monitor
+
+        Args:
+            base_url: Ollama API base URL
+            ttl: Seconds a healthy result is reused (default: OLLAMA_HEALTH_TTL_SECONDS)
+            failure_threshold: Consecutive failures that open the circuit (default: OLLAMA_HEALTH_FAILURE_THRESHOLD)
+            cooldown: Initial seconds the circuit stays open (default: OLLAMA_HEALTH_COOLDOWN_SECONDS)
+        """
+        self.base_url = base_url
+        self.ttl = HEALTH_TTL_SECONDS if ttl is None else ttl
+        self.failure_threshold = max(1, HEALTH_FAILURE_THRESHOLD if failure_threshold is None else failure_threshold)
+        self.base_cooldown = HEALTH_COOLDOWN_SECONDS if cooldown is None else cooldown
+
+        self._lock = threading.Lock()
+        self._available = None
+        self._models = []
+        self._error = None
+        self._checked_at = None
+        self._consecutive_failures = 0
+        self._cooldown = self.base_cooldown
+        self._open_until = None
+        self._probe_done = None  # threading.Event while a probe is in flight
+
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats = {'checks': 0, 'probes': 0, 'cache_hits': 0, 'coalesced': 0, 'fast_failures': 0,
+                       'circuit_opened': 0}
+
+    def check(self, force: bool = False) -> bool:
+        """
+        Whether Ollama is reachable
+
+        Args:
+            force: Probe even if a cached healthy result is still fresh
+
+        Returns:
+            bool: True if the last (or a new) probe succeeded
+        """
+        with self._lock:
+            self._stats['checks'] += 1
+            now = time.monotonic()
+            if self._open_until is not None and now < self._open_until:
+                self._stats['fast_failures'] += 1
+                return False
+            if not force and self._available and now - self._checked_at < self.ttl:
+                self._stats['cache_hits'] += 1
+                return True
+            probe_done = self._probe_done
+            if probe_done is None:
+                probe_done = self._probe_done = threading.Event()
+                owner = True
+            else:
+                self._stats['coalesced'] += 1
+                owner = False
+
+        if not owner:
+            probe_done.wait(PROBE_TIMEOUT_SECONDS + 1)
+            with self._lock:
+                return bool(self._available)
+
+        try:
+            available, models, error = self._probe()
+        except Exception as e:
+            available, models, error = False, [], str(e)
+        with self._lock:
+            self._stats['probes'] += 1
+            self._probe_done = None
+            if available:
+                self._models = models
+            self._record(available, error)
+        probe_done.set()
+        return available
+
+    @property
+    def models(self) -> List[str]:
+        """Model names reported by the last successful probe"""
+        with self._lock:
+            return list(self._models)
+
+    def record_success(self) -> None:
+        """A real request reached Ollama: refresh the cached status"""
+        with self._lock:
+            self._record(True, None)
+
+    def record_failure(self, error: str) -> None:
+        """A real request could not connect to Ollama"""
+        with self._lock:
+            self._record(False, error)
+
+    def _record(self, available: bool, error: Optional[str]) -> None:
+        """Update status and circuit state (caller holds the lock)"""
+        now = time.monotonic()
+        self._available = available
+        self._error = error
+        self._checked_at = now
+        if available:
+            self._consecutive_failures = 0
+            self._cooldown = self.base_cooldown
+            self._open_until = None
+            return
+
+        self._consecutive_failures += 1
+        if self._open_until is not None:
+            # A trial after the cooldown failed: stay open, for longer
+            self._cooldown = min(self._cooldown * 2, HEALTH_MAX_COOLDOWN_SECONDS)
+            self._open_until = now + self._cooldown
+        elif self._consecutive_failures >= self.failure_threshold:
+            self._open_until = now + self._cooldown
+            self._stats['circuit_opened'] += 1
+
+    def _probe(self):
+        """GET /api/tags once; returns (available, model names, error)"""
+        import requests
+        from ollama_provider import get_session
+
+        try:
+            response = get_session().get(f"{self.base_url}/api/tags", timeout=PROBE_TIMEOUT_SECONDS)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            return False, [], f"Cannot connect to Ollama at {self.base_url}: {e.__class__.__name__}"
+        if response.status_code != 200:
+            return False, [], f"Ollama API error: {response.status_code}"
+        try:
+            models = [model['name'] for model in response.json().get('models', [])]
+        except ValueError:
+            models = []
+        return True, models, None
+
+    def circuit_state(self) -> str:
+        """'closed', 'open' (failing fast) or 'half_open' (next check probes)"""
+        with self._lock:
+            return self._circuit_state(time.monotonic())
+
+    def _circuit_state(self, now: float) -> str:
+        if self._open_until is None:
+            return 'closed'
+        return 'open' if now < self._open_until else 'half_open'
+
+    def status(self) -> Dict[str, Any]:
+        """Cached status and counters, without probing"""
+        with self._lock:
+            now = time.monotonic()
+            return {
+                'base_url': self.base_url,
+                'available': self._available,
+                'models': list(self._models),
+                'error': self._error,
+                'checked_seconds_ago': round(now - self._checked_at, 2) if self._checked_at is not None else None,
+                'circuit': self._circuit_state(now),
+                'retry_in_seconds': round(max(0.0, self._open_until - now), 2) if self._open_until else None,
+                'consecutive_failures': self._consecutive_failures,
+                'background_probe': self._thread is not None and self._thread.is_alive(),
+                **self._stats
+            }
+
+    def start(self, interval: float = None) -> None:
+        """Re-probe every interval seconds in a daemon thread, so request-time checks hit the cache"""
+        interval = HEALTH_INTERVAL_SECONDS if interval is None else interval
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, args=(interval,),
+                                            name='ollama-health', daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background probe"""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(PROBE_TIMEOUT_SECONDS + 1)
+        self._thread = None
+
+    def _run(self, interval: float) -> None:
+        while not self._stop.is_set():
+            self.check(force=True)  # While the circuit is open this returns at once
+            self._stop.wait(interval)
+
+
+def get_health_monitor(base_url: str = None) -> OllamaHealthMonitor:
+    """
+    Get the shared monitor for an Ollama server
+
+    Args:
+        base_url: Ollama API base URL (default: OllamaProvider.DEFAULT_BASE_URL)
+
+    Returns:
+        OllamaHealthMonitor: One instance per base URL for the whole process
+    """
+    if base_url is None:
+        from ollama_provider import OllamaProvider
+        base_url = OllamaProvider.DEFAULT_BASE_URL
+    with _monitors_lock:
+        monitor = _monitors.get(base_url)
+        if monitor is None:
+            monitor = _monitors[base_url] = OllamaHealthMonitor(base_url)
+        return monitor
+
+
+def start_health_monitor(base_url: str = None, interval: float = None) -> Optional[OllamaHealthMonitor]:
+    """
+    Start background probing for an Ollama server
+
+    Args:
+        base_url: Ollama API base URL (default: OllamaProvider.DEFAULT_BASE_URL)
+        interval: Seconds between probes (default: OLLAMA_HEALTH_INTERVAL_SECONDS; 0 disables)
+
+    Returns:
+        The monitor, or None if background probing is disabled
+    """
+    interval = HEALTH_INTERVAL_SECONDS if interval is None else interval
+    if interval <= 0:
+        return None
+    monitor = get_health_monitor(base_url)
+    monitor.start(interval)
+    return monitor
+
+
+def clear_health_monitors() -> None:
+    """Stop and forget all monitors (for tests and config reloads)"""
+    with _monitors_lock:
+        monitors = list(_monitors.values())
+        _monitors.clear()
+    for monitor in monitors:
+        monitor.stop()
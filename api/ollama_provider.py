@@ -7,12 +7,107 @@ Uses A-T-Q (Accomplishments-Trajectory-Qualifications) scoring model:
 - T (Trajectory): 30% - Growth pattern, progression velocity, intentionality
 - Q (Qualifications): 20% - Must-haves (including location) and preferreds
 """
+import asyncio
+import json
+import os
 import requests
 import re
-from typing import Dict, Any, Tuple, List
+import threading
+import weakref
+import httpx
+from typing import Dict, Any, Callable, Optional, Sequence, Tuple, List
 from datetime import datetime
 import time
 
+from ollama_health import get_health_monitor
+from resume_budget import count_tokens, fit_resume, get_context_tokens, resume_token_budget
+from structured_output import QUICK_SCORE_SCHEMA, decode_structured, load_json_object, schema_instructions
+
+
+# One keep-alive session for all Ollama calls; its connection pool is thread-safe
+OLLAMA_POOL_SIZE = int(os.environ.get('OLLAMA_POOL_SIZE', 16))
+
+# How long Ollama keeps a model in memory after a request ("30m", "1h", seconds, or -1 for
+# forever). Ollama's own default of 5m makes models alternating in /compare reload every time.
+OLLAMA_KEEP_ALIVE = os.environ.get('OLLAMA_KEEP_ALIVE', '30m')
+
+QUICK_SCORE_NUM_PREDICT = 1024  # Output cap for quick scoring, reserved out of the context window
+
+_session = None
+_session_lock = threading.Lock()
+_async_clients = weakref.WeakKeyDictionary()  # event loop -> httpx.AsyncClient
+_evicted_pool_stats = {'requests': 0, 'connections_opened': 0}  # Pools dropped from the session's LRU
+
+
+def get_session() -> requests.Session:
+    """Shared requests session with a connection pool sized for concurrent batch scoring"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=OLLAMA_POOL_SIZE)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                adapter.poolmanager.pools.dispose_func = _count_evicted_pool
+                _session = session
+    return _session
+
+
+def _count_evicted_pool(pool) -> None:
+    """Keep an evicted host pool's counts so session statistics never go backwards"""
+    with _session_lock:
+        _evicted_pool_stats['requests'] += pool.num_requests
+        _evicted_pool_stats['connections_opened'] += pool.num_connections
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Keep-alive async client for the running event loop, with the same pool size as the session"""
+    loop = asyncio.get_running_loop()
+    with _session_lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(limits=httpx.Limits(
+                max_connections=OLLAMA_POOL_SIZE, max_keepalive_connections=OLLAMA_POOL_SIZE
+            ))
+            _async_clients[loop] = client
+        return client
+
+
+def parse_keep_alive(value: Any) -> Any:
+    """Ollama keep_alive value: plain numbers become seconds, anything else is a duration string"""
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            return value.strip()
+    return value
+
+
+def get_session_stats() -> Optional[Dict[str, Any]]:
+    """
+    Connection-reuse statistics of the shared session
+
+    Returns:
+        Dict with requests, connections_opened and reuse_ratio, or None if no request was made yet
+    """
+    if _session is None:
+        return None
+    pools = _session.get_adapter('http://').poolmanager.pools
+    with _session_lock:
+        requests_made = _evicted_pool_stats['requests']
+        connections_opened = _evicted_pool_stats['connections_opened']
+    for pool_key in list(pools.keys()):
+        pool = pools.get(pool_key)
+        if pool is not None:
+            requests_made += pool.num_requests
+            connections_opened += pool.num_connections
+    return {
+        'requests': requests_made,
+        'connections_opened': connections_opened,
+        'reuse_ratio': round(1 - connections_opened / requests_made, 3) if requests_made else None
+    }
+
 
 class OllamaProvider:
     """Ollama local LLM provider for quick scoring"""
@@ -27,29 +122,38 @@ class OllamaProvider:
         {'id': 'llama3', 'name': 'Llama 3 (Best)', 'description': 'Highest quality, slower'},
     ]
 
-    def __init__(self, model: str = None, base_url: str = None):
+    def __init__(self, model: str = None, base_url: str = None, temperature: float = 0.7,
+                 keep_alive: Any = None):
         """
         Initialize Ollama provider
 
         Args:
             model: Ollama model to use (default: mistral)
             base_url: Ollama API base URL (default: http://localhost:11434)
+            temperature: Sampling temperature (default: 0.7)
+            keep_alive: How long Ollama keeps the model loaded after each request (default: OLLAMA_KEEP_ALIVE)
         """
         self.model = model or self.DEFAULT_MODEL
         self.base_url = base_url or self.DEFAULT_BASE_URL
+        self.temperature = temperature
+        self.keep_alive = parse_keep_alive(OLLAMA_KEEP_ALIVE if keep_alive is None else keep_alive)
+        # Sent with every request (warm-up included): a different num_ctx makes Ollama reload the model
+        self.num_ctx = get_context_tokens(self.model)
 
     def is_available(self) -> bool:
-        """Check if Ollama is running and accessible"""
-        try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=2)
-            return response.status_code == 200
-        except (requests.ConnectionError, requests.Timeout):
-            return False
+        """
+        Check if Ollama is running and accessible
+
+        Answered by the shared health monitor for base_url: a recent healthy
+        probe is reused, and while Ollama is known to be down this returns
+        False without waiting on a connection.
+        """
+        return get_health_monitor(self.base_url).check()
 
     def get_available_models(self) -> List[str]:
         """Get list of models available in local Ollama installation"""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = get_session().get(f"{self.base_url}/api/tags", timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 return [model['name'] for model in data.get('models', [])]
@@ -57,6 +161,50 @@ class OllamaProvider:
         except (requests.ConnectionError, requests.Timeout):
             return []
 
+    def get_loaded_models(self) -> List[str]:
+        """Get the models Ollama currently holds in memory (/api/ps)"""
+        try:
+            response = get_session().get(f"{self.base_url}/api/ps", timeout=5)
+            if response.status_code == 200:
+                return [model['name'] for model in response.json().get('models', [])]
+            return []
+        except (requests.ConnectionError, requests.Timeout):
+            return []
+
+    def warm_up(self) -> Dict[str, Any]:
+        """
+        Load the model into memory without generating anything
+
+        A generate request with no prompt makes Ollama load the model and keep
+        it for keep_alive, so the first real evaluation doesn't pay the load.
+
+        Returns:
+            Dict with model, success, load_seconds and elapsed_seconds (or error)
+        """
+        start_time = time.time()
+        try:
+            response = get_session().post(
+                f"{self.base_url}/api/generate",
+                json={"model": self.model, "keep_alive": self.keep_alive, "options": {"num_ctx": self.num_ctx}},
+                timeout=300  # Loading a large model from disk can take minutes
+            )
+            if response.status_code != 200:
+                raise Exception(f"Ollama API error: {response.status_code} - {response.text}")
+            data = response.json()
+            return {
+                'model': self.model,
+                'success': True,
+                'load_seconds': round(data.get('load_duration', 0) / 1e9, 3),
+                'elapsed_seconds': round(time.time() - start_time, 2)
+            }
+        except Exception as e:
+            return {
+                'model': self.model,
+                'success': False,
+                'error': str(e),
+                'elapsed_seconds': round(time.time() - start_time, 2)
+            }
+
     def evaluate(self, prompt: str) -> Tuple[str, Dict[str, Any]]:
         """
         Run evaluation using Ollama
@@ -67,53 +215,250 @@ class OllamaProvider:
         Returns:
             Tuple of (response_text, usage_metadata)
         """
+        return self._generate({"prompt": prompt})
+
+    def supports_structured_output(self) -> bool:
+        return True
+
+    def evaluate_structured(self, prompt: str, schema: Dict[str, Any],
+                            name: str = 'record_evaluation') -> Tuple[str, Dict[str, Any]]:
+        """
+        Run evaluation in Ollama's JSON mode
+
+        format=json only guarantees valid JSON, so the schema is spelled out in
+        the prompt and the caller validates the result.
+        """
+        return self._generate({"prompt": prompt + schema_instructions(schema), "format": "json"})
+
+    async def aevaluate(self, prompt: str) -> Tuple[str, Dict[str, Any]]:
+        """Run evaluation using Ollama without blocking the event loop"""
+        return await self._agenerate({"prompt": prompt})
+
+    async def aevaluate_structured(self, prompt: str, schema: Dict[str, Any],
+                                   name: str = 'record_evaluation') -> Tuple[str, Dict[str, Any]]:
+        """Async counterpart of evaluate_structured"""
+        return await self._agenerate({"prompt": prompt + schema_instructions(schema), "format": "json"})
+
+    def evaluate_stream(self, prompt: str, on_text: Callable[[str], None] = None,
+                        should_stop: Callable[[], bool] = None) -> Tuple[str, Dict[str, Any]]:
+        """
+        Run evaluation with streamed generation
+
+        Args:
+            prompt: The evaluation prompt
+            on_text: Called with each piece of generated text as it arrives
+            should_stop: Checked after each piece; returning True closes the
+                stream, which makes Ollama stop generating
+
+        Returns:
+            Tuple of (response_text, usage_metadata). usage_metadata['stopped_early']
+            is True if should_stop ended generation (output_tokens is then the
+            number of streamed pieces, and input_tokens isn't reported).
+        """
+        start_time = time.time()
+        stream = _GenerationStream(on_text, should_stop)
+
+        try:
+            with get_session().post(
+                f"{self.base_url}/api/generate",
+                json=self._generate_payload({"prompt": prompt}, stream=True),
+                stream=True,
+                timeout=60  # Between streamed pieces
+            ) as response:
+                if response.status_code != 200:
+                    raise Exception(f"Ollama API error: {response.status_code} - {response.text}")
+                get_health_monitor(self.base_url).record_success()
+                for line in response.iter_lines():
+                    if stream.add(line):
+                        break
+
+        except requests.Timeout:
+            raise Exception(f"Ollama request timed out after 60 seconds")
+        except requests.ConnectionError:
+            get_health_monitor(self.base_url).record_failure('Connection refused')
+            raise Exception(f"Cannot connect to Ollama at {self.base_url}. Is Ollama running?")
+
+        return stream.text(), stream.usage(self, start_time)
+
+    async def aevaluate_stream(self, prompt: str, on_text: Callable[[str], None] = None,
+                               should_stop: Callable[[], bool] = None) -> Tuple[str, Dict[str, Any]]:
+        """Async counterpart of evaluate_stream"""
+        start_time = time.time()
+        stream = _GenerationStream(on_text, should_stop)
+
+        try:
+            async with get_async_client().stream(
+                'POST',
+                f"{self.base_url}/api/generate",
+                json=self._generate_payload({"prompt": prompt}, stream=True),
+                timeout=60
+            ) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    raise Exception(f"Ollama API error: {response.status_code} - {response.text}")
+                get_health_monitor(self.base_url).record_success()
+                async for line in response.aiter_lines():
+                    if stream.add(line):
+                        break
+
+        except httpx.TimeoutException:
+            raise Exception(f"Ollama request timed out after 60 seconds")
+        except httpx.ConnectError:
+            get_health_monitor(self.base_url).record_failure('Connection refused')
+            raise Exception(f"Cannot connect to Ollama at {self.base_url}. Is Ollama running?")
+
+        return stream.text(), stream.usage(self, start_time)
+
+    def _generate_payload(self, request_fields: Dict[str, Any], stream: bool = False) -> Dict[str, Any]:
+        """Body of a /api/generate request"""
+        return {
+            "model": self.model,
+            **request_fields,
+            "stream": stream,
+            "keep_alive": self.keep_alive,
+            "options": {
+                "temperature": self.temperature,
+                "num_predict": QUICK_SCORE_NUM_PREDICT,  # Limit output for quick scoring
+                "num_ctx": self.num_ctx,
+            }
+        }
+
+    def _usage_metadata(self, data: Dict[str, Any], start_time: float) -> Dict[str, Any]:
+        """Usage metadata from the token counts and timings Ollama returns"""
+        return {
+            'input_tokens': data.get('prompt_eval_count', 0),
+            'output_tokens': data.get('eval_count', 0),
+            'cost': 0.0,  # Local = free
+            'model': self.model,
+            'elapsed_seconds': round(time.time() - start_time, 2),
+            # Ollama reports durations in nanoseconds; load time is the model being swapped into memory
+            'load_seconds': round(data.get('load_duration', 0) / 1e9, 3),
+            'prompt_eval_seconds': round(data.get('prompt_eval_duration', 0) / 1e9, 3),
+            'eval_seconds': round(data.get('eval_duration', 0) / 1e9, 3),
+            'provider': 'ollama'
+        }
+
+    def _generate(self, request_fields: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """POST /api/generate with the given prompt/format fields and collect usage"""
         start_time = time.time()
 
         try:
-            response = requests.post(
+            response = get_session().post(
                 f"{self.base_url}/api/generate",
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.7,
-                        "num_predict": 1024,  # Limit output for quick scoring
-                    }
-                },
+                json=self._generate_payload(request_fields),
                 timeout=60  # 60 second timeout for generation
             )
 
             if response.status_code != 200:
                 raise Exception(f"Ollama API error: {response.status_code} - {response.text}")
+            get_health_monitor(self.base_url).record_success()
 
             data = response.json()
-            response_text = data.get('response', '')
+            return data.get('response', ''), self._usage_metadata(data, start_time)
 
-            elapsed_time = time.time() - start_time
+        except requests.Timeout:
+            raise Exception(f"Ollama request timed out after 60 seconds")
+        except requests.ConnectionError:
+            get_health_monitor(self.base_url).record_failure('Connection refused')
+            raise Exception(f"Cannot connect to Ollama at {self.base_url}. Is Ollama running?")
 
-            # Ollama provides token counts in response
-            usage_metadata = {
-                'input_tokens': data.get('prompt_eval_count', 0),
-                'output_tokens': data.get('eval_count', 0),
-                'cost': 0.0,  # Local = free
-                'model': self.model,
-                'elapsed_seconds': round(elapsed_time, 2),
-                'provider': 'ollama'
-            }
+    async def _agenerate(self, request_fields: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Async counterpart of _generate"""
+        start_time = time.time()
 
-            return response_text, usage_metadata
+        try:
+            response = await get_async_client().post(
+                f"{self.base_url}/api/generate",
+                json=self._generate_payload(request_fields),
+                timeout=60
+            )
 
-        except requests.Timeout:
+            if response.status_code != 200:
+                raise Exception(f"Ollama API error: {response.status_code} - {response.text}")
+            get_health_monitor(self.base_url).record_success()
+
+            data = response.json()
+            return data.get('response', ''), self._usage_metadata(data, start_time)
+
+        except httpx.TimeoutException:
             raise Exception(f"Ollama request timed out after 60 seconds")
-        except requests.ConnectionError:
+        except httpx.ConnectError:
+            get_health_monitor(self.base_url).record_failure('Connection refused')
             raise Exception(f"Cannot connect to Ollama at {self.base_url}. Is Ollama running?")
 
     def get_provider_name(self) -> str:
         return 'ollama'
 
 
-def build_quick_score_prompt(job_data: Dict[str, Any], candidate_data: Dict[str, Any]) -> str:
+class _GenerationStream:
+    """Collects the NDJSON pieces of a streamed /api/generate response"""
+
+    def __init__(self, on_text: Optional[Callable[[str], None]], should_stop: Optional[Callable[[], bool]]):
+        self.on_text = on_text
+        self.should_stop = should_stop
+        self.parts = []
+        self.final = None
+        self.stopped_early = False
+
+    def add(self, line) -> bool:
+        """Handle one streamed line; returns True when reading should stop"""
+        if not line:
+            return False
+        data = json.loads(line)
+        if data.get('error'):
+            raise Exception(f"Ollama API error: {data['error']}")
+
+        piece = data.get('response', '')
+        if piece:
+            self.parts.append(piece)
+            if self.on_text:
+                self.on_text(piece)
+        if data.get('done'):
+            self.final = data
+            return True
+        if self.should_stop and self.should_stop():
+            self.stopped_early = True
+            return True
+        return False
+
+    def text(self) -> str:
+        return ''.join(self.parts)
+
+    def usage(self, provider: 'OllamaProvider', start_time: float) -> Dict[str, Any]:
+        usage = provider._usage_metadata(self.final or {}, start_time)
+        if self.stopped_early:
+            usage['output_tokens'] = len(self.parts)  # Ollama streams about one token per piece
+            usage['stopped_early'] = True
+        return usage
+
+
+def warm_up_models(models: List[str] = None, base_url: str = None, max_models: int = None) -> Dict[str, Any]:
+    """
+    Preload models so the first evaluations don't pay the cold load
+
+    Models are loaded one at a time. Only as many as Ollama keeps loaded at
+    once are warmed, since warming more would evict the earlier ones.
+
+    Args:
+        models: Model ids (default: the configured AVAILABLE_MODELS)
+        base_url: Ollama API base URL (default: http://localhost:11434)
+        max_models: Model slots (default: OLLAMA_MAX_LOADED_MODELS)
+
+    Returns:
+        Dict with per-model results and the models skipped for lack of slots
+    """
+    from batch_executor import get_ollama_max_loaded_models
+
+    models = models or [model['id'] for model in OllamaProvider.AVAILABLE_MODELS]
+    slots = max_models or get_ollama_max_loaded_models()
+    return {
+        'results': [OllamaProvider(model=model, base_url=base_url).warm_up() for model in models[:slots]],
+        'skipped': models[slots:]
+    }
+
+
+def build_quick_score_prompt(job_data: Dict[str, Any], candidate_data: Dict[str, Any],
+                             structured: bool = False, context_tokens: int = None) -> str:
     """
     Build a prompt for quick scoring using A-T-Q model
 
@@ -125,6 +470,9 @@ def build_quick_score_prompt(job_data: Dict[str, Any], candidate_data: Dict[str,
     Args:
         job_data: Job details (title, requirements)
         candidate_data: Candidate details (resume text, skills)
+        structured: Leave out the text answer format (the provider asks for QUICK_SCORE_SCHEMA instead)
+        context_tokens: Context window of the model the prompt is for (default: OLLAMA_NUM_CTX);
+            the resume is fitted into what the rest of the prompt and the answer leave free
 
     Returns:
         Formatted prompt string
@@ -142,11 +490,7 @@ def build_quick_score_prompt(job_data: Dict[str, Any], candidate_data: Dict[str,
     if not resume_text:
         resume_text = "No resume text available"
 
-    # Truncate resume if too long (for faster processing)
-    if len(resume_text) > 4000:
-        resume_text = resume_text[:4000] + "\n\n[Resume truncated for quick evaluation]"
-
-    prompt = f"""You are a recruiter doing initial screening using the A-T-Q scoring model.
+    template = f"""You are a recruiter doing initial screening using the A-T-Q scoring model.
 
 JOB: {job_title}
 
@@ -157,7 +501,7 @@ PREFERRED REQUIREMENTS:
 {preferred_text}
 
 CANDIDATE RESUME:
-{resume_text}
+{{resume}}
 
 ---
 
@@ -174,7 +518,10 @@ Scoring rubric:
 - 0-39: Poor match
 
 DO NOT penalize gaps or job changes automatically - assess them in context.
-Location is a requirement (met/unmet), NOT a risk penalty.
+Location is a requirement (met/unmet), NOT a risk penalty."""
+
+    if not structured:
+        template += """
 
 Provide your assessment in this EXACT format:
 
@@ -196,140 +543,398 @@ SCORE: [0-100] (overall = A*0.5 + T*0.3 + Q*0.2)
 
 REASONING: [2-3 sentences focusing on what the candidate HAS accomplished, not just credentials]"""
 
-    return prompt
-
-
-def parse_quick_score_response(response_text: str, model: str = None) -> Dict[str, Any]:
+    # Size the resume to the model's context instead of a fixed character cut
+    if context_tokens is None:
+        context_tokens = get_context_tokens()
+    budget = resume_token_budget(context_tokens, count_tokens(template), QUICK_SCORE_NUM_PREDICT)
+    head, _, tail = template.rpartition('{resume}')  # Only static text follows the resume
+    return head + fit_resume(resume_text, budget) + tail
+
+
+def run_quick_score(
+    provider: 'OllamaProvider',
+    job_data: Dict[str, Any],
+    candidate_data: Dict[str, Any],
+    use_cache: bool = True,
+    structured_output: bool = False,
+    on_update: Callable[[Dict[str, int]], None] = None,
+    stop_fields: Optional[Sequence[str]] = None
+) -> Dict[str, Any]:
     """
-    Parse the quick score response from Ollama with A-T-Q analysis
+    Score one candidate end to end: build the prompt, call Ollama, parse the response
 
     Args:
-        response_text: Raw response from Ollama
-        model: The model used for evaluation (for metadata)
+        provider: OllamaProvider configured with the model to use
+        job_data: Job details (title, requirements)
+        candidate_data: Candidate details (id, resume text)
+        use_cache: Reuse a cached response for an identical prompt (default: True)
+        structured_output: Ask for JSON matching QUICK_SCORE_SCHEMA instead of the text format
+        on_update: Stream the generation and call this with each score field as soon as it is parsed
+        stop_fields: Stream the generation and stop it once these fields are parsed
+            (e.g. QUICK_SCORE_FIELDS or QUICK_SCORE_REQUIRED_FIELDS)
+
+    Streaming applies to the text format only; structured output is always generated in full.
 
     Returns:
-        Dict with score, a_score, t_score, q_score, reasoning, requirements_identified, and match_analysis
+        Dict in the quick-score API response shape (score, reasoning, analysis, usage)
     """
-    result = {
-        'score': None,
-        'a_score': None,
-        't_score': None,
-        'q_score': None,
-        'reasoning': '',
-        'requirements_identified': {
-            'must_have': [],
-            'preferred': []
-        },
-        'match_analysis': [],
-        'methodology': 'A(50%) + T(30%) + Q(20%)',
-        'evaluated_at': datetime.utcnow().isoformat() + 'Z',
-        'model': model
+    from llm_cache import cached_evaluate, cached_evaluate_stream
+
+    prompt = build_quick_score_prompt(job_data, candidate_data, structured=structured_output,
+                                      context_tokens=provider.num_ctx)
+    if not structured_output and (on_update or stop_fields):
+        parser = QuickScoreParser(model=provider.model)
+        _, usage = cached_evaluate_stream(
+            provider, prompt, _feeder(parser, on_update), _stopper(parser, stop_fields), use_cache=use_cache
+        )
+        return _quick_score_output(provider, candidate_data, parser.finish(), usage, 'text')
+
+    schema = QUICK_SCORE_SCHEMA if structured_output else None
+    response_text, usage = cached_evaluate(provider, prompt, use_cache=use_cache, schema=schema)
+    try:
+        return _quick_score_result(provider, candidate_data, response_text, usage, structured_output)
+    except ValueError:
+        if not usage.get('cache_hit'):
+            raise
+    # An unusable cached answer: ask the model again (which also replaces the cache entry)
+    response_text, usage = cached_evaluate(provider, prompt, use_cache=False, schema=schema)
+    return _quick_score_result(provider, candidate_data, response_text, usage, structured_output)
+
+
+async def arun_quick_score(
+    provider: 'OllamaProvider',
+    job_data: Dict[str, Any],
+    candidate_data: Dict[str, Any],
+    use_cache: bool = True,
+    structured_output: bool = False,
+    on_update: Callable[[Dict[str, int]], None] = None,
+    stop_fields: Optional[Sequence[str]] = None
+) -> Dict[str, Any]:
+    """
+    Async counterpart of run_quick_score, for batches driven from one event loop
+
+    Returns:
+        Dict in the quick-score API response shape (see run_quick_score)
+    """
+    from llm_cache import acached_evaluate, acached_evaluate_stream
+
+    prompt = build_quick_score_prompt(job_data, candidate_data, structured=structured_output,
+                                      context_tokens=provider.num_ctx)
+    if not structured_output and (on_update or stop_fields):
+        parser = QuickScoreParser(model=provider.model)
+        _, usage = await acached_evaluate_stream(
+            provider, prompt, _feeder(parser, on_update), _stopper(parser, stop_fields), use_cache=use_cache
+        )
+        return _quick_score_output(provider, candidate_data, parser.finish(), usage, 'text')
+
+    schema = QUICK_SCORE_SCHEMA if structured_output else None
+    response_text, usage = await acached_evaluate(provider, prompt, use_cache=use_cache, schema=schema)
+    try:
+        return _quick_score_result(provider, candidate_data, response_text, usage, structured_output)
+    except ValueError:
+        if not usage.get('cache_hit'):
+            raise
+    # An unusable cached answer: ask the model again (which also replaces the cache entry)
+    response_text, usage = await acached_evaluate(provider, prompt, use_cache=False, schema=schema)
+    return _quick_score_result(provider, candidate_data, response_text, usage, structured_output)
+
+
+def _feeder(parser: 'QuickScoreParser', on_update) -> Callable[[str], None]:
+    """on_text callback feeding the parser and publishing newly parsed scores"""
+    def on_text(text: str) -> None:
+        updates = parser.feed(text)
+        if updates and on_update:
+            on_update(updates)
+    return on_text
+
+
+def _stopper(parser: 'QuickScoreParser', stop_fields) -> Optional[Callable[[], bool]]:
+    if not stop_fields:
+        return None
+    return lambda: parser.has(stop_fields)
+
+
+def _quick_score_result(provider: 'OllamaProvider', candidate_data: Dict[str, Any], response_text: str,
+                        usage: Dict[str, Any], structured_output: bool) -> Dict[str, Any]:
+    """
+    Parse a quick-score response into the API response shape
+
+    Structured output that fails schema validation is decoded leniently
+    (parse_quick_score_json); it's never handed to the text parser, since the
+    structured prompt doesn't ask for the text format.
+
+    Raises:
+        ValueError: If structured output isn't a JSON object or lacks usable scores
+    """
+    if not structured_output:
+        return _quick_score_output(provider, candidate_data,
+                                   parse_quick_score_response(response_text, model=provider.model), usage, 'text')
+
+    data = decode_structured(response_text, QUICK_SCORE_SCHEMA)
+    if data is None:
+        data = load_json_object(response_text)
+        if data is None:
+            raise ValueError(f'{provider.model} returned structured output that is not a JSON object')
+        print(f'Warning: {provider.model} returned structured output that fails schema validation; coercing fields')
+    return _quick_score_output(provider, candidate_data, parse_quick_score_json(data, model=provider.model),
+                               usage, 'json')
+
+
+def _quick_score_output(provider: 'OllamaProvider', candidate_data: Dict[str, Any], result: Dict[str, Any],
+                        usage: Dict[str, Any], output_format: str) -> Dict[str, Any]:
+    """Build the quick-score API response shape from a parsed result"""
+    return {
+        'candidate_id': candidate_data.get('id'),
+        'score': result['score'],
+        'a_score': result['a_score'],
+        't_score': result['t_score'],
+        'q_score': result['q_score'],
+        'reasoning': result['reasoning'],
+        'requirements_identified': result['requirements_identified'],
+        'match_analysis': result['match_analysis'],
+        'methodology': result['methodology'],
+        'evaluated_at': result['evaluated_at'],
+        'model': provider.model,
+        'output_format': output_format,
+        'usage': usage
     }
 
-    lines = response_text.strip().split('\n')
-    current_section = None
 
-    for line in lines:
+# Fields whose lines carry a 0-100 score, by line prefix
+_QUICK_SCORE_FIELDS = (('A_SCORE:', 'a_score'), ('T_SCORE:', 't_score'), ('Q_SCORE:', 'q_score'), ('SCORE:', 'score'))
+_QUICK_SECTIONS = (
+    ('MUST-HAVE IDENTIFIED:', 'must_have'),
+    ('PREFERRED IDENTIFIED:', 'preferred'),
+    ('MATCH ANALYSIS:', 'match_analysis')
+)
+
+# Stop conditions for streamed generation: the four scores, optionally with the reasoning line
+QUICK_SCORE_FIELDS = ('a_score', 't_score', 'q_score', 'score')
+QUICK_SCORE_REQUIRED_FIELDS = QUICK_SCORE_FIELDS + ('reasoning',)
+
+
+class QuickScoreParser:
+    """
+    Incremental parser for quick-score responses
+
+    Feed it text as the model generates it. Complete lines are parsed right
+    away, so scores are known as soon as their lines end, long before the
+    whole response is done. finish() returns the same result as
+    parse_quick_score_response on the full text.
+    """
+
+    def __init__(self, model: str = None):
+        self.result = {
+            'score': None,
+            'a_score': None,
+            't_score': None,
+            'q_score': None,
+            'reasoning': '',
+            'requirements_identified': {
+                'must_have': [],
+                'preferred': []
+            },
+            'match_analysis': [],
+            'methodology': 'A(50%) + T(30%) + Q(20%)',
+            'evaluated_at': datetime.utcnow().isoformat() + 'Z',
+            'model': model
+        }
+        self.reasoning_complete = False  # The REASONING line has ended
+        self._section = None
+        self._pending = ''
+        self._chunks = []
+
+    def feed(self, text: str) -> Dict[str, int]:
+        """
+        Add generated text
+
+        Returns:
+            Dict of score fields parsed from the lines this text completed (empty if none)
+        """
+        self._chunks.append(text)
+        *lines, self._pending = (self._pending + text).split('\n')
+        updates = {}
+        for line in lines:
+            self._parse_line(line, updates)
+            if self._section == 'reasoning':
+                self.reasoning_complete = True
+        return updates
+
+    def has(self, fields) -> bool:
+        """Whether every field in fields has been parsed ('reasoning' once its line has ended)"""
+        return all(
+            self.reasoning_complete if field == 'reasoning' else self.result[field] is not None
+            for field in fields
+        )
+
+    def finish(self) -> Dict[str, Any]:
+        """Parse the last line and fill in missing scores"""
+        self._parse_line(self._pending, {})
+        self._pending = ''
+        result = self.result
+
+        # Clean up reasoning
+        result['reasoning'] = result['reasoning'].strip()
+
+        # Calculate overall score from A-T-Q if not found
+        if result['score'] is None:
+            a = result['a_score'] or 0
+            t = result['t_score'] or 0
+            q = result['q_score'] or 0
+            if a > 0 or t > 0 or q > 0:
+                result['score'] = int((a * 0.50) + (t * 0.30) + (q * 0.20))
+
+        # Fallback: try to find a score if SCORE: wasn't found
+        if result['score'] is None:
+            numbers = re.findall(r'\b(\d{1,3})\b', ''.join(self._chunks))
+            for num in numbers:
+                n = int(num)
+                if 0 <= n <= 100:
+                    result['score'] = n
+                    break
+
+        # If still no score, default to 50 (neutral)
+        if result['score'] is None:
+            result['score'] = 50
+            result['reasoning'] = result['reasoning'] or "Could not parse evaluation response"
+
+        return result
+
+    def _parse_line(self, line: str, updates: Dict[str, int]) -> None:
+        result = self.result
         line = line.strip()
         if not line:
-            continue
+            return
 
         # Detect section headers
         upper_line = line.upper()
-        if upper_line.startswith('MUST-HAVE IDENTIFIED:'):
-            current_section = 'must_have'
-            continue
-        elif upper_line.startswith('PREFERRED IDENTIFIED:'):
-            current_section = 'preferred'
-            continue
-        elif upper_line.startswith('MATCH ANALYSIS:'):
-            current_section = 'match_analysis'
-            continue
-        elif upper_line.startswith('A_SCORE:'):
-            current_section = None
-            score_str = line.split(':', 1)[1].strip()
-            numbers = re.findall(r'\d+', score_str)
-            if numbers:
-                score = int(numbers[0])
-                result['a_score'] = max(0, min(100, score))
-            continue
-        elif upper_line.startswith('T_SCORE:'):
-            current_section = None
-            score_str = line.split(':', 1)[1].strip()
-            numbers = re.findall(r'\d+', score_str)
-            if numbers:
-                score = int(numbers[0])
-                result['t_score'] = max(0, min(100, score))
-            continue
-        elif upper_line.startswith('Q_SCORE:'):
-            current_section = None
-            score_str = line.split(':', 1)[1].strip()
-            numbers = re.findall(r'\d+', score_str)
-            if numbers:
-                score = int(numbers[0])
-                result['q_score'] = max(0, min(100, score))
-            continue
-        elif upper_line.startswith('SCORE:'):
-            current_section = None
-            score_str = line.split(':', 1)[1].strip()
-            numbers = re.findall(r'\d+', score_str)
-            if numbers:
-                score = int(numbers[0])
-                result['score'] = max(0, min(100, score))
-            continue
-        elif upper_line.startswith('REASONING:'):
-            current_section = 'reasoning'
+        for prefix, section in _QUICK_SECTIONS:
+            if upper_line.startswith(prefix):
+                self._section = section
+                return
+        for prefix, field in _QUICK_SCORE_FIELDS:
+            if upper_line.startswith(prefix):
+                self._section = None
+                numbers = re.findall(r'\d+', line.split(':', 1)[1].strip())
+                if numbers:
+                    result[field] = updates[field] = max(0, min(100, int(numbers[0])))
+                return
+        if upper_line.startswith('REASONING:'):
+            self._section = 'reasoning'
             result['reasoning'] = line.split(':', 1)[1].strip()
-            continue
+            return
 
         # Parse content based on current section
-        if current_section == 'must_have' and line.startswith('-'):
+        if self._section in ('must_have', 'preferred') and line.startswith('-'):
             req = line[1:].strip()
             if req:
-                result['requirements_identified']['must_have'].append(req)
+                result['requirements_identified'][self._section].append(req)
 
-        elif current_section == 'preferred' and line.startswith('-'):
-            req = line[1:].strip()
-            if req:
-                result['requirements_identified']['preferred'].append(req)
-
-        elif current_section == 'match_analysis' and line.startswith('-'):
+        elif self._section == 'match_analysis' and line.startswith('-'):
             # Parse: "- requirement: STATUS - evidence"
-            content = line[1:].strip()
-            match_entry = parse_match_line(content)
+            match_entry = parse_match_line(line[1:].strip())
             if match_entry:
                 result['match_analysis'].append(match_entry)
 
-        elif current_section == 'reasoning':
+        elif self._section == 'reasoning':
             # Multi-line reasoning support
             result['reasoning'] += ' ' + line
 
-    # Clean up reasoning
-    result['reasoning'] = result['reasoning'].strip()
-
-    # Calculate overall score from A-T-Q if not found
-    if result['score'] is None:
-        a = result['a_score'] or 0
-        t = result['t_score'] or 0
-        q = result['q_score'] or 0
-        if a > 0 or t > 0 or q > 0:
-            result['score'] = int((a * 0.50) + (t * 0.30) + (q * 0.20))
-
-    # Fallback: try to find a score if SCORE: wasn't found
-    if result['score'] is None:
-        numbers = re.findall(r'\b(\d{1,3})\b', response_text)
-        for num in numbers:
-            n = int(num)
-            if 0 <= n <= 100:
-                result['score'] = n
-                break
-
-    # If still no score, default to 50 (neutral)
-    if result['score'] is None:
-        result['score'] = 50
-        result['reasoning'] = result['reasoning'] or "Could not parse evaluation response"
-
-    return result
+
+def parse_quick_score_response(response_text: str, model: str = None) -> Dict[str, Any]:
+    """
+    Parse the quick score response from Ollama with A-T-Q analysis
+
+    Args:
+        response_text: Raw response from Ollama
+        model: The model used for evaluation (for metadata)
+
+    Returns:
+        Dict with score, a_score, t_score, q_score, reasoning, requirements_identified, and match_analysis
+    """
+    parser = QuickScoreParser(model=model)
+    parser.feed(response_text)
+    return parser.finish()
+
+
+def _coerce_score(value: Any) -> Optional[int]:
+    """0-100 score from a JSON value (int, float or numeric string), or None if it isn't a number"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, str):
+        match = re.search(r'-?\d+(\.\d+)?', value)
+        value = float(match.group()) if match else None
+    if not isinstance(value, (int, float)):
+        return None
+    return int(value)
+
+
+def _clean_strings(values: Any) -> List[str]:
+    if not isinstance(values, list):
+        return []
+    return [str(value).strip() for value in values if str(value).strip()]
+
+
+def parse_quick_score_json(data: Dict[str, Any], model: str = None) -> Dict[str, Any]:
+    """
+    Build the quick score result from structured output
+
+    Output that passed QUICK_SCORE_SCHEMA validation is used as is. Otherwise
+    fields are coerced: numeric strings become numbers, A/T/Q scores are
+    clamped to 0-100, an overall score that is missing or out of range is
+    recomputed from A/T/Q, and malformed optional fields are dropped.
+
+    Args:
+        data: Decoded JSON object
+        model: The model used for evaluation (for metadata)
+
+    Returns:
+        Dict in the same shape as parse_quick_score_response
+
+    Raises:
+        ValueError: If an A, T or Q score is missing or not a number
+    """
+    scores = {}
+    for field in ('a_score', 't_score', 'q_score'):
+        value = _coerce_score(data.get(field))
+        if value is None:
+            raise ValueError(f'Structured quick score has no usable {field}')
+        scores[field] = min(100, max(0, value))
+    score = _coerce_score(data.get('score'))
+    if score is None or not 0 <= score <= 100:
+        score = int(scores['a_score'] * 0.5 + scores['t_score'] * 0.3 + scores['q_score'] * 0.2)
+
+    requirements = data.get('requirements_identified')
+    if not isinstance(requirements, dict):
+        requirements = {}
+    entries = data.get('match_analysis')
+    match_analysis = []
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict) or not str(entry.get('requirement') or '').strip():
+            continue
+        status = str(entry.get('status') or '').strip().upper().replace('-', '_').replace(' ', '_')
+        if status not in ('MET', 'NOT_MET', 'PARTIAL'):
+            continue
+        match_analysis.append({
+            'requirement': str(entry['requirement']).strip(),
+            'status': status,
+            'evidence': str(entry.get('evidence') or '').strip()
+        })
+
+    reasoning = data.get('reasoning')
+    return {
+        'score': score,
+        **scores,
+        'reasoning': reasoning.strip() if isinstance(reasoning, str) else '',
+        'requirements_identified': {
+            'must_have': _clean_strings(requirements.get('must_have')),
+            'preferred': _clean_strings(requirements.get('preferred'))
+        },
+        'match_analysis': match_analysis,
+        'methodology': 'A(50%) + T(30%) + Q(20%)',
+        'evaluated_at': datetime.utcnow().isoformat() + 'Z',
+        'model': model
+    }
 
 
 def parse_match_line(content: str) -> Dict[str, Any]:
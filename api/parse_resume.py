@@ -6,9 +6,9 @@ from http.server import BaseHTTPRequestHandler
 import json
 import base64
 import io
-import pdfplumber
 from docx import Document
 from http_utils import ResponseHelper, get_allowed_origins, is_origin_allowed
+from pdf_extract import extract_pdf_text
 
 
 class handler(BaseHTTPRequestHandler):
@@ -45,24 +45,25 @@ class handler(BaseHTTPRequestHandler):
             except json.JSONDecodeError as e:
                 self._send_error(400, f'Invalid JSON: {str(e)}')
                 return
+            del post_data
 
             # Extract file data and type
-            file_data_base64 = data.get('file_data')
+            file_data_base64 = data.pop('file_data', None)
             file_type = data.get('file_type', 'pdf')  # 'pdf' or 'docx'
 
             if not file_data_base64:
                 self._send_error(400, 'Missing file_data')
                 return
 
-            # Decode base64 file data
+            # Decode base64 file data; only the decoded bytes are kept from here on
             file_bytes = base64.b64decode(file_data_base64)
-            file_stream = io.BytesIO(file_bytes)
+            del file_data_base64
 
             # Parse based on file type
             if file_type.lower() == 'pdf':
-                text = self._parse_pdf(file_stream)
+                text = self._parse_pdf(file_bytes)
             elif file_type.lower() in ['docx', 'doc']:
-                text = self._parse_docx(file_stream)
+                text = self._parse_docx(io.BytesIO(file_bytes))
             else:
                 self._send_error(400, f'Unsupported file type: {file_type}')
                 return
@@ -77,17 +78,13 @@ class handler(BaseHTTPRequestHandler):
         except Exception as e:
             self._send_error(500, str(e))
 
-    def _parse_pdf(self, file_stream):
-        """Extract text from PDF file"""
-        text_parts = []
-
-        with pdfplumber.open(file_stream) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text_parts.append(page_text)
-
-        return '\n\n'.join(text_parts)
+    def _parse_pdf(self, file_bytes):
+        """Extract text from PDF file (see pdf_extract for the fast path, worker pool and time budget)"""
+        result = extract_pdf_text(file_bytes)
+        if result['timed_out']:
+            print(f"PDF parse hit the time budget after {result['elapsed_seconds']}s "
+                  f"({result['page_count']} pages); returning partial text")
+        return result['text']
 
     def _parse_docx(self, file_stream):
         """Extract text from DOCX file"""
@@ -0,0 +1,176 @@
+"""
+PDF Text Extraction Engine
+Extracts resume text from PDFs quickly, in parallel where it pays, within a time budget
+
+1. Fast path: every page's text layer is read with pdfium (pypdfium2, C code,
+   no layout analysis), in-process. This is enough for almost all resumes.
+2. Pages where the fast path finds (almost) no text are re-extracted with
+   pdfplumber's full layout analysis. When at least PDF_PARSE_MIN_POOL_PAGES
+   pages need it, that runs in a pool of spawned worker processes, one range
+   of pages per process, so large documents are split across CPUs; fewer
+   pages are parsed in-process, since starting workers costs more than it saves.
+3. The whole document gets PDF_PARSE_TIME_BUDGET_SECONDS. When it runs out,
+   the pool is terminated (killing any worker stuck on a pathological page)
+   and the text extracted so far is returned with timed_out set.
+
+In-process work (the fast path, and layout parsing below the pool threshold)
+only checks the budget between pages, so a single page that hangs inside
+pdfium or pdfplumber is not interrupted. Callers that need a hard limit per
+document run extract_pdf_text in a worker they can kill (see resume_ingest).
+
+Without pypdfium2 every page takes the layout path.
+"""
+import io
+import math
+import multiprocessing
+import os
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+
+PDF_PARSE_TIME_BUDGET_SECONDS = float(os.environ.get('PDF_PARSE_TIME_BUDGET_SECONDS', 30))
+MIN_FAST_PAGE_CHARS = 20  # Fewer characters than this from the text layer: try the layout path
+MIN_POOL_PAGES = int(os.environ.get('PDF_PARSE_MIN_POOL_PAGES', 4))  # Fewer layout pages are parsed in-process
+PAGE_SEPARATOR = '\n\n'
+
+
+def get_process_count() -> int:
+    """Worker processes for layout extraction (PDF_PARSE_PROCESSES, default: CPU count, at most 4)"""
+    default = min(4, os.cpu_count() or 1)
+    try:
+        return max(1, int(os.environ.get('PDF_PARSE_PROCESSES', default)))
+    except ValueError:
+        return default
+
+
+def _fast_page_texts(data: bytes, deadline: float) -> List[Optional[str]]:
+    """Text layer of each page via pdfium; None for pages not reached before the deadline"""
+    document = pdfium.PdfDocument(data)
+    try:
+        texts = [None] * len(document)
+        for index in range(len(document)):
+            if time.monotonic() > deadline:
+                break
+            page = document[index]
+            textpage = page.get_textpage()
+            try:
+                texts[index] = textpage.get_text_bounded().replace('\r\n', '\n').replace('\r', '\n').strip()
+            finally:
+                textpage.close()
+                page.close()
+        return texts
+    finally:
+        document.close()
+
+
+def _page_count(data: bytes) -> int:
+    import pdfplumber
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        return len(pdf.pages)
+
+
+def _layout_page_texts(data: bytes, page_indexes: Sequence[int],
+                       deadline: Optional[float] = None) -> List[Tuple[int, str]]:
+    """pdfplumber (full layout analysis) text of the given pages, stopping at the deadline"""
+    import pdfplumber
+
+    texts = []
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        for index in page_indexes:
+            if deadline is not None and time.monotonic() > deadline:
+                break
+            page = pdf.pages[index]
+            texts.append((index, (page.extract_text() or '').strip()))
+            page.close()  # Drop the page's cached layout objects
+    return texts
+
+
+def _split_ranges(indexes: List[int], parts: int) -> List[List[int]]:
+    """Split page indexes into up to parts contiguous runs of similar size"""
+    size = math.ceil(len(indexes) / parts)
+    return [indexes[i:i + size] for i in range(0, len(indexes), size)]
+
+
+def _run_layout_pool(data: bytes, indexes: List[int], processes: int,
+                     deadline: float) -> Tuple[Dict[int, str], bool]:
+    """Layout-extract pages across worker processes; returns (texts by page, timed_out)"""
+    # spawn (not fork) so workers don't inherit the server's threads or open connections
+    context = multiprocessing.get_context('spawn')
+    ranges = _split_ranges(indexes, processes)
+    pool = context.Pool(processes=len(ranges))
+    texts = {}
+    timed_out = False
+    try:
+        pending = [pool.apply_async(_layout_page_texts, (data, page_range)) for page_range in ranges]
+        for result in pending:
+            remaining = deadline - time.monotonic()
+            try:
+                texts.update(result.get(timeout=max(0.0, remaining)))
+            except multiprocessing.TimeoutError:
+                timed_out = True
+                break
+    finally:
+        # terminate (not close) so a worker stuck on a pathological page is killed
+        pool.terminate()
+        pool.join()
+    return texts, timed_out
+
+
+def extract_pdf_text(data: bytes, time_budget: float = None, processes: int = None) -> Dict[str, Any]:
+    """
+    Extract the text of a PDF
+
+    Args:
+        data: PDF file contents
+        time_budget: Seconds allowed for the whole document (default: PDF_PARSE_TIME_BUDGET_SECONDS)
+        processes: Worker processes for layout extraction (default: PDF_PARSE_PROCESSES);
+            with 1, or fewer than MIN_POOL_PAGES pages to lay out, extraction runs
+            in-process, where the budget is only checked between pages
+
+    Returns:
+        Dict with text (pages joined by blank lines), page_count, fast_pages,
+        layout_pages, timed_out and elapsed_seconds
+    """
+    start_time = time.monotonic()
+    budget = PDF_PARSE_TIME_BUDGET_SECONDS if time_budget is None else time_budget
+    deadline = start_time + budget
+    processes = get_process_count() if processes is None else max(1, processes)
+
+    if pdfium is not None:
+        texts = _fast_page_texts(data, deadline)
+    else:
+        texts = [None] * _page_count(data)
+    fast_pages = sum(1 for text in texts if text is not None and len(text) >= MIN_FAST_PAGE_CHARS)
+
+    # Pages the text layer didn't cover (or weren't reached) get the layout path
+    needs_layout = [index for index, text in enumerate(texts) if text is None or len(text) < MIN_FAST_PAGE_CHARS]
+    timed_out = time.monotonic() > deadline
+    layout_texts = {}
+    if needs_layout and not timed_out:
+        if processes == 1 or len(needs_layout) < MIN_POOL_PAGES:
+            layout_texts = dict(_layout_page_texts(data, needs_layout, deadline))
+            timed_out = len(layout_texts) < len(needs_layout)
+        else:
+            layout_texts, timed_out = _run_layout_pool(data, needs_layout, min(processes, len(needs_layout)), deadline)
+
+    pages = []
+    for index, text in enumerate(texts):
+        layout_text = layout_texts.get(index)
+        if layout_text and len(layout_text) > len(text or ''):
+            text = layout_text
+        if text:
+            pages.append(text)
+
+    return {
+        'text': PAGE_SEPARATOR.join(pages),
+        'page_count': len(texts),
+        'fast_pages': fast_pages,
+        'layout_pages': sum(1 for text in layout_texts.values() if text),
+        'timed_out': timed_out,
+        'elapsed_seconds': round(time.monotonic() - start_time, 2)
+    }
@@ -0,0 +1,209 @@
+"""
+Resume Token Budgeting
+Fits resume text into the context window left over by a quick-score prompt
+
+A fixed character cut keeps whatever comes first: contact details, a long
+summary or a skills dump can push the most recent roles out, while short
+resumes still carry page headers, references and blank space into the prompt.
+fit_resume instead:
+
+1. Cleans the text with resume_normalizer.normalize_resume_text (whitespace,
+   page numbers, repeated headers/footers; repeated job titles are kept)
+2. Drops low-value sections (references, hobbies, declarations)
+3. If the resume is still over budget, keeps whole sections by value
+   (experience first), cuts the most valuable section that didn't fit down
+   to the remaining budget, and puts them back in their original order
+
+There is no tokenizer dependency: count_tokens is a deterministic,
+deliberately generous estimate, so the same resume and budget always give
+the same text (and LLM cache key).
+"""
+import math
+import os
+import re
+from typing import List, Optional, Tuple
+
+from resume_normalizer import normalize_resume_text
+
+
+# Context window requested from Ollama (options.num_ctx); Ollama's own default is smaller
+# than most resumes need once the prompt and the answer are included
+DEFAULT_NUM_CTX = int(os.environ.get('OLLAMA_NUM_CTX', 4096))
+
+# Largest context each model family supports; the requested num_ctx is capped to this
+MODEL_CONTEXT_TOKENS = {
+    'phi3': 4096,
+    'mistral': 32768,
+    'llama3': 8192,
+}
+
+SAFETY_MARGIN_TOKENS = 128  # Estimation error, chat template and structured-output instructions
+MIN_RESUME_TOKENS = 256
+
+TRUNCATION_NOTE = '[Resume truncated for quick evaluation]'
+
+_TOKEN_PATTERN = re.compile(r'[A-Za-z]+|\d+|[^\sA-Za-z\d]')
+
+# Section headings, mapped to a priority (lower = kept first when over budget; None = dropped first)
+_SECTION_PRIORITY = (
+    (('experience', 'employment', 'work history', 'professional background', 'career history'), 0),
+    (('summary', 'profile', 'objective', 'about me'), 2),
+    (('skills', 'technical skills', 'core competencies', 'technologies'), 3),
+    (('education', 'academic'), 4),
+    (('projects', 'publications', 'patents'), 5),
+    (('certifications', 'licenses', 'awards', 'honors', 'achievements'), 6),
+    (('references', 'referees', 'hobbies', 'interests', 'personal details', 'personal information',
+      'declaration'), None),
+)
+HEADER_PRIORITY = 1  # Text before the first heading: name, title, usually a short summary
+OTHER_PRIORITY = 7
+
+
+def count_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens text takes up
+
+    Words count one token per four letters, numbers one per three digits and
+    punctuation one each, which errs high for the Llama/Mistral/Phi tokenizers.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        int: Estimated token count
+    """
+    tokens = 0
+    for piece in _TOKEN_PATTERN.findall(text):
+        if piece[0].isalpha():
+            tokens += math.ceil(len(piece) / 4)
+        elif piece[0].isdigit():
+            tokens += math.ceil(len(piece) / 3)
+        else:
+            tokens += 1
+    return tokens
+
+
+def get_context_tokens(model: Optional[str] = None) -> int:
+    """
+    Context window to request for a model
+
+    Args:
+        model: Ollama model name, with or without a tag (e.g. 'llama3:8b')
+
+    Returns:
+        int: OLLAMA_NUM_CTX, capped at the model family's maximum when known
+    """
+    if model:
+        family = model.split(':', 1)[0].lower()
+        limit = MODEL_CONTEXT_TOKENS.get(family)
+        if limit:
+            return min(DEFAULT_NUM_CTX, limit)
+    return DEFAULT_NUM_CTX
+
+
+def resume_token_budget(context_tokens: int, prompt_tokens: int, output_tokens: int) -> int:
+    """
+    Tokens available for the resume
+
+    Args:
+        context_tokens: Model context window (num_ctx)
+        prompt_tokens: Tokens used by the rest of the prompt
+        output_tokens: Tokens reserved for the answer (num_predict)
+
+    Returns:
+        int: Budget, at least MIN_RESUME_TOKENS
+    """
+    return max(MIN_RESUME_TOKENS, context_tokens - prompt_tokens - output_tokens - SAFETY_MARGIN_TOKENS)
+
+
+def _heading_priority(line: str) -> Tuple[bool, Optional[int]]:
+    """Whether line is a section heading, and the section's priority"""
+    if len(line) > 40:
+        return False, None
+    label = line.strip(' :-=*#_|').lower()
+    for names, priority in _SECTION_PRIORITY:
+        if label in names:
+            return True, priority
+    if line.isupper() and any(c.isalpha() for c in line) and len(line.split()) <= 4:
+        return True, OTHER_PRIORITY
+    return False, None
+
+
+def _split_sections(lines: List[str]) -> List[Tuple[Optional[int], List[str]]]:
+    """Split lines into (priority, lines) sections at each heading"""
+    sections = [(HEADER_PRIORITY, [])]
+    for line in lines:
+        is_heading, priority = _heading_priority(line) if line else (False, None)
+        if is_heading:
+            sections.append((priority, [line]))
+        else:
+            sections[-1][1].append(line)
+    return [(priority, section) for priority, section in sections if any(section)]
+
+
+def fit_resume(text: str, max_tokens: int) -> str:
+    """
+    Shrink resume text to at most max_tokens (as estimated by count_tokens)
+
+    Args:
+        text: Resume text
+        max_tokens: Token budget for the resume
+
+    Returns:
+        str: Cleaned resume, ending with TRUNCATION_NOTE if any content had to be cut
+    """
+    cleaned = normalize_resume_text(text)
+    if count_tokens(cleaned) <= max_tokens:
+        return cleaned
+    lines = cleaned.split('\n')
+
+    sections = [(priority, section) for priority, section in _split_sections(lines) if priority is not None]
+    cleaned = '\n'.join(line for _, section in sections for line in section).rstrip('\n')
+    if count_tokens(cleaned) <= max_tokens:
+        return cleaned
+
+    # Whole sections first, by priority; ties go to the earlier section (resumes list the latest
+    # roles first). Apart from experience, a section may only take a quarter of the budget whole,
+    # so a long skills dump can't crowd out the roles. Then cut the best skipped section to fit.
+    budget = max_tokens - count_tokens(TRUNCATION_NOTE) - 1
+    order = sorted(range(len(sections)), key=lambda i: (sections[i][0], i))
+    sizes = [sum(count_tokens(line) + 1 for line in section) for _, section in sections]  # +1 per newline
+    kept = [None] * len(sections)
+    for index in order:
+        if sizes[index] <= budget and (sections[index][0] == 0 or sizes[index] <= max_tokens // 4):
+            kept[index] = sections[index][1]
+            budget -= sizes[index]
+
+    for index in order:
+        if kept[index] is None:
+            kept[index] = _cut_section(sections[index][1], budget)
+            break
+
+    fitted = [line for section in kept if section for line in section]
+    while fitted and not fitted[-1]:
+        fitted.pop()
+    return '\n'.join(fitted + ['', TRUNCATION_NOTE])
+
+
+def _cut_section(section: List[str], budget: int) -> Optional[List[str]]:
+    """Leading lines of a section that fit budget, the last one cut at a word boundary"""
+    partial = []
+    for line in section:
+        tokens = count_tokens(line) + 1
+        if tokens <= budget:
+            partial.append(line)
+            budget -= tokens
+            continue
+        words = []
+        for word in line.split(' '):
+            budget -= count_tokens(word)
+            if budget < 1:
+                break
+            words.append(word)
+        if words:
+            partial.append(' '.join(words))
+        break
+    # A heading on its own is just noise
+    if not partial or (len(partial) == 1 and _heading_priority(partial[0])[0]):
+        return None
+    return partial
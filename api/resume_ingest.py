@@ -0,0 +1,274 @@
+"""
+Bulk Resume Ingestion
+Turns an upload of many resume files (multipart parts or a zip archive) into candidates
+
+1. stage_upload copies each uploaded file to a temporary directory in fixed-size
+   chunks; a zip archive is expanded entry by entry, so neither the upload nor
+   an archive member is ever held in memory whole. The request body
+   (MAX_UPLOAD_BYTES), each file (MAX_FILE_BYTES) and all staged files
+   together (MAX_UNPACKED_BYTES) are capped, so an upload can't fill the disk.
+2. iter_parsed_files extracts the text of the staged files across a pool of
+   processes (INGEST_PROCESSES) and yields one result per file in input order.
+   Each file gets INGEST_FILE_TIMEOUT_SECONDS; one that runs over is failed
+   and its worker killed, so a pathological PDF can't stall the request.
+3. The caller creates the candidates that parsed in one transaction
+   (database.bulk_create_candidates) and reports a status for every file.
+"""
+import multiprocessing
+import os
+import re
+import time
+import zipfile
+from collections import deque
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
+
+from pdf_extract import extract_pdf_text
+
+
+RESUME_EXTENSIONS = ('.pdf', '.docx', '.txt')
+MAX_INGEST_FILES = int(os.environ.get('INGEST_MAX_FILES', 1000))
+MAX_FILE_BYTES = int(os.environ.get('INGEST_MAX_FILE_BYTES', 20_000_000))
+MAX_UPLOAD_BYTES = int(os.environ.get('INGEST_MAX_UPLOAD_BYTES', 200_000_000))  # Whole request body
+MAX_UNPACKED_BYTES = int(os.environ.get('INGEST_MAX_UNPACKED_BYTES', 500_000_000))  # All staged files together
+COPY_CHUNK_BYTES = 1024 * 1024
+FILE_TIMEOUT_SECONDS = float(os.environ.get('INGEST_FILE_TIMEOUT_SECONDS', 60))
+POLL_SECONDS = 0.05
+
+_EMAIL = re.compile(r'[\w.+-]+@[\w-]+(\.[\w-]+)+')
+_PHONE = re.compile(r'\+?\d[\d\s().-]{7,}\d')
+_NAME_NOISE = re.compile(r'\b(resume|cv|curriculum vitae|final|updated|v\d+|\d+)\b', re.IGNORECASE)
+
+
+class IngestError(ValueError):
+    """An upload that can't be ingested at all (as opposed to one bad file in it)"""
+
+
+def get_process_count() -> int:
+    """Number of parsing processes (INGEST_PROCESSES, default: CPU count, at most 4)"""
+    default = min(4, os.cpu_count() or 1)
+    try:
+        return max(1, int(os.environ.get('INGEST_PROCESSES', default)))
+    except ValueError:
+        return default
+
+
+def _copy_limited(source: BinaryIO, path: str, limit: int) -> Optional[int]:
+    """Copy source to path in chunks; returns the size, or None (and no file) if it's larger than limit"""
+    written = 0
+    with open(path, 'wb') as target:
+        while True:
+            chunk = source.read(COPY_CHUNK_BYTES)
+            if not chunk:
+                return written
+            written += len(chunk)
+            if written > limit:
+                break
+            target.write(chunk)
+    os.remove(path)
+    return None
+
+
+def _extension(filename: str) -> str:
+    return os.path.splitext(filename or '')[1].lower()
+
+
+def stage_upload(filename: str, stream: BinaryIO, directory: str, entries: List[Dict[str, Any]]) -> None:
+    """
+    Copy one uploaded file into directory, appending a staging entry per resume
+
+    A .zip upload adds an entry for each file inside it (folders and macOS
+    metadata are skipped). Files are stored under generated names, so archive
+    paths can't escape directory.
+
+    Args:
+        filename: Name the client gave the file
+        stream: Readable binary stream of the file
+        directory: Temporary directory to stage into
+        entries: Staging entries so far ({'filename', 'path', 'size'} or {'filename', 'error'})
+
+    Raises:
+        IngestError: If the upload holds more than MAX_INGEST_FILES files, a zip
+            archive is over MAX_UPLOAD_BYTES, or the staged files together
+            would exceed MAX_UNPACKED_BYTES
+    """
+    def add(name, source):
+        if len(entries) >= MAX_INGEST_FILES:
+            raise IngestError(f'Too many files (max {MAX_INGEST_FILES})')
+        if _extension(name) not in RESUME_EXTENSIONS:
+            entries.append({'filename': name, 'error': f'Unsupported file type (use {", ".join(RESUME_EXTENSIONS)})'})
+            return
+        remaining = MAX_UNPACKED_BYTES - sum(entry.get('size', 0) for entry in entries)
+        path = os.path.join(directory, f'{len(entries):05d}{_extension(name)}')
+        size = _copy_limited(source, path, min(MAX_FILE_BYTES, remaining))
+        if size is not None:
+            entries.append({'filename': name, 'path': path, 'size': size})
+        elif remaining < MAX_FILE_BYTES:
+            raise IngestError(f'Files too large in total (max {MAX_UNPACKED_BYTES} bytes unpacked)')
+        else:
+            entries.append({'filename': name, 'error': f'File too large (max {MAX_FILE_BYTES} bytes)'})
+
+    if _extension(filename) != '.zip':
+        add(filename, stream)
+        return
+
+    archive_path = os.path.join(directory, f'upload-{len(entries):05d}.zip')
+    if _copy_limited(stream, archive_path, MAX_UPLOAD_BYTES) is None:
+        raise IngestError(f'Upload too large (max {MAX_UPLOAD_BYTES} bytes)')
+    try:
+        with zipfile.ZipFile(archive_path) as archive:
+            for info in archive.infolist():
+                name = info.filename
+                if info.is_dir() or name.startswith('__MACOSX/') or os.path.basename(name).startswith('.'):
+                    continue
+                with archive.open(info) as member:
+                    add(name, member)
+    except zipfile.BadZipFile:
+        entries.append({'filename': filename, 'error': 'Not a valid zip archive'})
+    finally:
+        os.remove(archive_path)
+
+
+def extract_resume_text(path: str) -> str:
+    """
+    Extract the text of a staged resume file
+
+    Args:
+        path: File path; the extension picks the parser (.pdf, .docx or .txt)
+
+    Returns:
+        str: Extracted text (empty for files without a text layer, e.g. scans)
+    """
+    extension = _extension(path)
+    if extension == '.pdf':
+        with open(path, 'rb') as f:
+            data = f.read()
+        # Files are already spread across processes; each one is parsed in-process
+        return extract_pdf_text(data, processes=1)['text']
+    if extension == '.docx':
+        from docx import Document
+        doc = Document(path)
+        return '\n\n'.join(paragraph.text for paragraph in doc.paragraphs if paragraph.text.strip())
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return f.read().strip()
+
+
+def _candidate_name(filename: str, text: str) -> str:
+    """Candidate name from the file name ("jane_doe_resume.pdf" -> "Jane Doe"), else the first line"""
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    name = ' '.join(_NAME_NOISE.sub(' ', re.sub(r'[_\-.]+', ' ', stem)).split())
+    if name:
+        return name.title()
+    first_line = next((line.strip() for line in text.split('\n') if line.strip()), '')
+    return first_line[:80]
+
+
+def _parse_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Parse one staging entry into a candidate (or an error)"""
+    if 'error' in entry:
+        return entry
+    try:
+        text = extract_resume_text(entry['path'])
+    except Exception as e:
+        return {'filename': entry['filename'], 'error': f'Could not parse file: {e}'}
+    if not text:
+        return {'filename': entry['filename'], 'error': 'No text found (scanned or empty file)'}
+
+    email = _EMAIL.search(text)
+    phone = _PHONE.search(text)
+    return {
+        'filename': entry['filename'],
+        'candidate': {
+            'name': _candidate_name(entry['filename'], text),
+            'email': email.group(0) if email else None,
+            'phone': phone.group(0).strip() if phone else None,
+            'resume_text': text,
+            'resume_file_path': os.path.basename(entry['filename'])
+        }
+    }
+
+
+def _in_worker(entry: Dict[str, Any]) -> bool:
+    """Whether an entry is parsed in a worker process (PDF/DOCX); plain text is read in-process"""
+    return 'error' not in entry and _extension(entry['path']) != '.txt'
+
+
+def iter_parsed_files(
+    entries: List[Dict[str, Any]],
+    processes: Optional[int] = None,
+    timeout: Optional[float] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Parse staged files, yielding results in input order
+
+    PDF and DOCX files are parsed in worker processes, one file per worker at
+    a time. A file still running after timeout seconds is marked failed and
+    the pool is terminated (the only way to stop a worker stuck inside a
+    parser); files that were running alongside it start over in a new pool.
+
+    Args:
+        entries: Staging entries from stage_upload
+        processes: Worker processes (default: INGEST_PROCESSES)
+        timeout: Seconds allowed per file, including worker start-up (default: INGEST_FILE_TIMEOUT_SECONDS)
+
+    Yields:
+        {'filename', 'candidate'} for parsed files, {'filename', 'error'} for the rest
+    """
+    processes = get_process_count() if processes is None else max(1, processes)
+    timeout = FILE_TIMEOUT_SECONDS if timeout is None else timeout
+    pending = deque(index for index, entry in enumerate(entries) if _in_worker(entry))
+    processes = min(processes, len(pending))
+
+    # spawn (not fork) so workers don't inherit the server's threads or open connections
+    context = multiprocessing.get_context('spawn')
+    pool = None
+    running = {}  # index -> (AsyncResult, deadline)
+    finished = {}
+    next_index = 0
+    try:
+        while True:
+            while next_index < len(entries):
+                if next_index in finished:
+                    yield finished.pop(next_index)
+                elif not _in_worker(entries[next_index]):
+                    yield _parse_entry(entries[next_index])
+                else:
+                    break
+                next_index += 1
+            if next_index == len(entries):
+                return
+
+            if pool is None:
+                pool = context.Pool(processes=processes)
+            while pending and len(running) < processes:
+                index = pending.popleft()
+                running[index] = (pool.apply_async(_parse_entry, (entries[index],)), time.monotonic() + timeout)
+
+            result, deadline = min(running.values(), key=lambda task: task[1])
+            result.wait(max(0.0, min(POLL_SECONDS, deadline - time.monotonic())))
+
+            now = time.monotonic()
+            timed_out = []
+            for index, (result, deadline) in list(running.items()):
+                if result.ready():
+                    del running[index]
+                    try:
+                        finished[index] = result.get()
+                    except Exception as e:
+                        finished[index] = {'filename': entries[index]['filename'], 'error': f'Could not parse file: {e}'}
+                elif now >= deadline:
+                    del running[index]
+                    timed_out.append(index)
+
+            if timed_out:
+                for index in timed_out:
+                    finished[index] = {'filename': entries[index]['filename'],
+                                       'error': f'Timed out after {timeout:g} seconds'}
+                pool.terminate()
+                pool.join()
+                pool = None
+                pending.extendleft(sorted(running, reverse=True))
+                running.clear()
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
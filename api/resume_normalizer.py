@@ -0,0 +1,167 @@
+"""
+Resume Text Normalization and Fingerprinting
+Cleans extracted resume text at ingestion and detects duplicate applications
+
+Text pulled out of PDFs and DOCX files carries layout artifacts: words
+hyphenated across line breaks, the name/contact header and "Page 2 of 3"
+repeated on every page, bullet glyphs, ligatures, non-breaking and
+zero-width spaces, and long runs of blank lines. normalize_resume_text removes
+them so the stored text is shorter for every LLM call and substring scan;
+the original is kept unchanged next to it.
+
+resume_fingerprint is a 64-bit SimHash over the words of the normalized
+text. Re-submissions of the same resume (re-exported, lightly edited, or
+uploaded twice) land within NEAR_DUPLICATE_DISTANCE bits of each other, so a
+duplicate application can reuse the evaluations of the first one.
+"""
+import hashlib
+import re
+import unicodedata
+from collections import Counter
+from typing import Iterable, Optional, Tuple
+
+
+FINGERPRINT_BITS = 64
+# Max differing bits for two resumes to count as the same. With single words as features, a
+# 1% edit stays within this ~95% of the time, while resumes sharing half their words differ by 10+
+NEAR_DUPLICATE_DISTANCE = 6
+HEADER_LINES = 2
+
+_INVISIBLE = dict.fromkeys(map(ord, '\u00ad\u200b\u200c\u200d\u2060\ufeff'))  # Soft hyphen, zero-width
+_BULLET = re.compile(r'^[\u2022\u2023\u2043\u2219\u25aa\u25ab\u25cf\u25cb\u25e6\u25a0\u25a1\u25c6\u27a2'
+                     r'\u2713\u2714\u2756\u00b7*\-\u2013\u2014>]+\s*')
+_HYPHENATED = re.compile(r'(\w)-[ \t]*\n[ \t]*(?=[a-z])')
+_PAGE_LINE = re.compile(r'^(page\s*)?\d+(\s*(of|/)\s*\d+)?$', re.IGNORECASE)
+_WORD = re.compile(r'\w+')
+_FOOTER = re.compile(r'@|\bpage\b|\bresume\b|\bcurriculum vitae\b|\bconfidential\b|\+?\d[\d\s().-]{7,}\d',
+                     re.IGNORECASE)
+
+
+def normalize_resume_text(text: Optional[str]) -> str:
+    """
+    Clean extracted resume text
+
+    - Unicode NFKC (ligatures like "ﬁ" become "fi"), no soft hyphens or zero-width characters
+    - Words hyphenated across a line break are joined ("engi-\\nneering" -> "engineering"),
+      also when a dropped page-number or header/footer line sat between the halves
+    - Bullet glyphs become "- "
+    - Page-number lines are dropped, as are repeats of the first lines (the
+      name/contact header) and of footer-like lines (email, phone, "page",
+      "resume"); the first occurrence is kept
+    - Runs of spaces/tabs become one space, with at most one blank line in a row
+
+    Args:
+        text: Raw resume text (None is treated as empty)
+
+    Returns:
+        str: Normalized text; deterministic, and unchanged by a second pass
+    """
+    if not text:
+        return ''
+
+    text = _normalize_once(text)
+    # Dropping a line can bring the two halves of a hyphenated word together; join them too
+    while _HYPHENATED.search(text):
+        text = _normalize_once(text)
+    return text
+
+
+def _normalize_once(text: str) -> str:
+    """One cleaning pass of normalize_resume_text"""
+    text = unicodedata.normalize('NFKC', text).translate(_INVISIBLE)
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    text = _HYPHENATED.sub(r'\1', text)
+
+    header = []  # The first lines (name, contact), which PDFs repeat at the top of every page
+    seen = set()
+    lines = []
+    for raw in text.split('\n'):
+        line = ' '.join(raw.split())
+        if not line:
+            if lines and lines[-1]:
+                lines.append('')
+            continue
+        if _PAGE_LINE.match(line):
+            continue
+
+        bullet = _BULLET.match(line)
+        if bullet and bullet.end() < len(line):
+            line = '- ' + line[bullet.end():]
+        elif len(line) <= 80:
+            # Repeated job titles are real content; only repeated header/footer lines are dropped
+            key = line.lower()
+            if key in seen and (key in header or _FOOTER.search(line)):
+                continue
+            seen.add(key)
+            if len(header) < HEADER_LINES:
+                header.append(key)
+        lines.append(line)
+
+    while lines and not lines[-1]:
+        lines.pop()
+    return '\n'.join(lines)
+
+
+def resume_fingerprint(text: Optional[str]) -> Optional[str]:
+    """
+    SimHash of a resume's normalized words
+
+    Each word (repeats included) votes on every bit, so word order and
+    formatting don't matter, and a small edit flips only a few bits.
+
+    Args:
+        text: Resume text (raw or already normalized; both give the same fingerprint)
+
+    Returns:
+        str: 16 hex digits, or None for text without words
+    """
+    words = _WORD.findall(normalize_resume_text(text).lower())
+    if not words:
+        return None
+
+    weights = [0] * FINGERPRINT_BITS
+    for word, count in Counter(words).items():
+        value = int.from_bytes(hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += count if value >> bit & 1 else -count
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return f'{fingerprint:016x}'
+
+
+def fingerprint_distance(a: str, b: str) -> int:
+    """Number of differing bits between two fingerprints"""
+    return bin(int(a, 16) ^ int(b, 16)).count('1')
+
+
+def find_near_duplicate(
+    fingerprint: Optional[str],
+    candidates: Iterable[Tuple[str, Optional[str]]],
+    max_distance: int = NEAR_DUPLICATE_DISTANCE
+) -> Optional[str]:
+    """
+    First (id, fingerprint) pair within max_distance of fingerprint
+
+    Args:
+        fingerprint: Fingerprint to look up
+        candidates: (id, fingerprint) pairs, in the order they should win ties
+        max_distance: Max differing bits
+
+    Returns:
+        str: id of the closest match (earliest on ties), or None
+    """
+    if not fingerprint:
+        return None
+    best_id, best_distance = None, max_distance + 1
+    for candidate_id, other in candidates:
+        if not other:
+            continue
+        distance = fingerprint_distance(fingerprint, other)
+        if distance < best_distance:
+            best_id, best_distance = candidate_id, distance
+            if distance == 0:
+                break
+    return best_id
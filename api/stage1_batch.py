@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Stage 1 Batch Evaluation
+Re-scores many candidates for one job through a provider's batch API
+(Anthropic Message Batches) instead of one synchronous call per candidate
+
+Batches are processed asynchronously, usually within minutes and at most 24
+hours, and are billed at half price, which suits overnight re-scoring of a
+whole pipeline. Each result goes through parse_stage1_response and, for
+candidates stored in the database, into create_evaluation and the candidate's
+Stage 1 score columns.
+
+Run from the command line:
+    python stage1_batch.py --job-id <job_id> [--model claude-3-5-haiku-20241022]
+"""
+import argparse
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import database as db
+from ai_evaluator import load_skill, build_stage1_prompt, parse_stage1_response
+from llm_providers import LLMProvider, get_provider
+
+
+DEFAULT_POLL_SECONDS = 60
+DEFAULT_TIMEOUT_SECONDS = 24 * 60 * 60  # Batches expire after 24 hours
+
+
+def build_batch_prompts(
+    job_data: Dict[str, Any],
+    candidates: List[Dict[str, Any]]
+) -> Tuple[Dict[str, str], Dict[str, Dict[str, Any]], str]:
+    """
+    Build one Stage 1 prompt per candidate
+
+    Returns:
+        Tuple of (custom_id -> prompt, custom_id -> candidate, skill hash).
+        custom_ids are positional ('c0', 'c1', ...) because candidate ids may
+        not exist or may not fit the provider's custom_id format.
+    """
+    skill_instructions, skill_hash = load_skill()
+    prompts = {}
+    candidates_by_id = {}
+    for index, candidate in enumerate(candidates):
+        custom_id = f'c{index}'
+        prompts[custom_id] = build_stage1_prompt(skill_instructions, job_data, candidate)
+        candidates_by_id[custom_id] = candidate
+    return prompts, candidates_by_id, skill_hash
+
+
+def wait_for_batch(
+    llm_provider: LLMProvider,
+    batch_id: str,
+    poll_interval: float = DEFAULT_POLL_SECONDS,
+    timeout: float = DEFAULT_TIMEOUT_SECONDS,
+    sleep: Callable[[float], None] = time.sleep
+) -> Dict[str, Any]:
+    """
+    Poll until a batch has ended
+
+    Returns:
+        Final batch status (see LLMProvider.get_batch_status)
+
+    Raises:
+        TimeoutError: If the batch hasn't ended within timeout seconds
+    """
+    deadline = time.time() + timeout
+    while True:
+        status = llm_provider.get_batch_status(batch_id)
+        if status['status'] == 'ended':
+            return status
+        if time.time() >= deadline:
+            raise TimeoutError(f"Batch {batch_id} still {status['status']} after {timeout} seconds")
+        print(f"⏳ Batch {batch_id}: {status['processing']} processing, {status['succeeded']} succeeded")
+        sleep(poll_interval)
+
+
+def save_stage1_result(
+    candidate_id: str,
+    evaluation: Dict[str, Any],
+    usage: Dict[str, Any],
+    provider_name: str,
+    skill_hash: Optional[str] = None
+) -> Dict[str, Any]:
+    """Store a parsed Stage 1 evaluation and update the candidate's Stage 1 scores"""
+    record = db.create_evaluation(candidate_id, {
+        **evaluation,
+        'scoring_model': 'ATQ',
+        'llm_provider': provider_name,
+        'llm_model': usage.get('model'),
+        'input_tokens': usage.get('input_tokens'),
+        'output_tokens': usage.get('output_tokens'),
+        'cost': usage.get('cost'),
+        'evaluation_stage': 'stage1',
+        'skill_hash': skill_hash
+    })
+    db.update_candidate_stage1_score(
+        candidate_id,
+        evaluation['score'],
+        evaluation['a_score'],
+        evaluation['t_score'],
+        evaluation['q_score'],
+        recommendation=evaluation['recommendation']
+    )
+    return record
+
+
+def collect_stage1_results(
+    llm_provider: LLMProvider,
+    batch_id: str,
+    candidates_by_id: Dict[str, Dict[str, Any]],
+    save: bool = True,
+    skill_hash: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Parse every result of an ended batch, optionally saving it to the database
+
+    Returns:
+        One dict per candidate, in submission order, with candidate_id, success
+        and evaluation + usage (+ evaluation_id when saved) or error
+    """
+    provider_name = llm_provider.get_provider_name()
+    outcomes = {}
+
+    for item in llm_provider.iter_batch_results(batch_id):
+        candidate = candidates_by_id.get(item['custom_id'])
+        if candidate is None:
+            continue
+        outcome = {'candidate_id': candidate.get('id'), 'success': False}
+
+        if not item['success']:
+            outcome['error'] = item['error']
+        else:
+            try:
+                evaluation = parse_stage1_response(item['response_text'])
+                outcome.update({'success': True, 'evaluation': evaluation, 'usage': item['usage']})
+                if save and candidate.get('id') and db.get_candidate(candidate['id']):
+                    record = save_stage1_result(candidate['id'], evaluation, item['usage'], provider_name, skill_hash)
+                    outcome['evaluation_id'] = record['id']
+            except Exception as e:
+                print(f"Warning: Failed to process batch result {item['custom_id']}: {e}")
+                outcome.update({'success': False, 'error': str(e)})
+
+        outcomes[item['custom_id']] = outcome
+
+    # Requests missing from the results (e.g. the batch was canceled) are reported as failures
+    return [
+        outcomes.get(custom_id, {'candidate_id': candidate.get('id'), 'success': False, 'error': 'No result returned'})
+        for custom_id, candidate in candidates_by_id.items()
+    ]
+
+
+def run_stage1_batch(
+    job_data: Dict[str, Any],
+    candidates: List[Dict[str, Any]],
+    provider: str = 'anthropic',
+    model: Optional[str] = None,
+    api_key: Optional[str] = None,
+    poll_interval: float = DEFAULT_POLL_SECONDS,
+    timeout: float = DEFAULT_TIMEOUT_SECONDS,
+    save: bool = True
+) -> Dict[str, Any]:
+    """
+    Submit Stage 1 evaluations for many candidates as one batch and wait for the results
+
+    Args:
+        job_data: Job details (same shape as evaluate_candidate_with_ai)
+        candidates: Candidates with resume_text; those with a stored id are saved
+        provider: LLM provider name; must support batch evaluation
+        model: Model id (provider default if None)
+        api_key: Provider API key (reads from environment if None)
+        poll_interval: Seconds between status checks
+        timeout: Give up waiting after this many seconds
+        save: Store results with create_evaluation
+
+    Returns:
+        Dict with batch_id, status, results (see collect_stage1_results) and total cost
+
+    Raises:
+        ValueError: If the provider doesn't support batch evaluation
+    """
+    llm_provider = get_provider(provider, api_key=api_key, model=model)
+    if not llm_provider.supports_batch():
+        raise ValueError(f'{provider} does not support batch evaluation')
+
+    prompts, candidates_by_id, skill_hash = build_batch_prompts(job_data, candidates)
+    batch_id = llm_provider.submit_batch(prompts)
+    print(f'📦 Submitted batch {batch_id} with {len(prompts)} candidate(s)')
+
+    status = wait_for_batch(llm_provider, batch_id, poll_interval=poll_interval, timeout=timeout)
+    results = collect_stage1_results(llm_provider, batch_id, candidates_by_id, save=save, skill_hash=skill_hash)
+
+    return {
+        'batch_id': batch_id,
+        'skill_hash': skill_hash,
+        'status': status,
+        'results': results,
+        'succeeded': sum(1 for r in results if r['success']),
+        'failed': sum(1 for r in results if not r['success']),
+        'cost': round(sum(r['usage']['cost'] for r in results if r['success']), 4)
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Re-score all candidates of a job with a Stage 1 batch')
+    parser.add_argument('--job-id', required=True, help='Job whose candidates should be evaluated')
+    parser.add_argument('--provider', default='anthropic', help='LLM provider (must support batches)')
+    parser.add_argument('--model', default=None, help='Model id (provider default if omitted)')
+    parser.add_argument('--poll-interval', type=float, default=DEFAULT_POLL_SECONDS, help='Seconds between status checks')
+    args = parser.parse_args()
+
+    job = db.get_job(args.job_id)
+    if not job:
+        raise SystemExit(f'Job not found: {args.job_id}')
+    job_candidates = db.get_candidates_for_job(args.job_id)
+
+    summary = run_stage1_batch(job, job_candidates, provider=args.provider, model=args.model,
+                               poll_interval=args.poll_interval)
+    print(f"✅ Batch {summary['batch_id']}: {summary['succeeded']} succeeded, "
+          f"{summary['failed']} failed, cost ${summary['cost']}")
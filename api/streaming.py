@@ -0,0 +1,77 @@
+"""
+Streaming Response Helpers
+Send batch evaluation results one record at a time as NDJSON or Server-Sent Events
+instead of a single JSON payload at the end
+
+Every record is a dict with a 'type' key ('result', 'progress', 'summary' or
+'error'). NDJSON writes one JSON object per line; SSE uses the type as the
+event name and the JSON object as the data.
+"""
+import json
+import traceback
+from typing import Any, Dict, Iterable, Optional
+
+from flask import Response, stream_with_context
+
+
+STREAM_FORMATS = ('ndjson', 'sse')
+
+MIMETYPES = {
+    'ndjson': 'application/x-ndjson',
+    'sse': 'text/event-stream'
+}
+
+
+def get_stream_format(data: Dict[str, Any], accept: str = '') -> Optional[str]:
+    """
+    Decide whether (and how) to stream a batch response
+
+    Args:
+        data: Request body; 'stream' may be true, 'ndjson' or 'sse'
+        accept: Request Accept header
+
+    Returns:
+        'ndjson', 'sse', or None for a regular JSON response
+    """
+    stream = data.get('stream')
+    if stream in STREAM_FORMATS:
+        return stream
+    if 'text/event-stream' in accept:
+        return 'sse'
+    if stream is True or 'application/x-ndjson' in accept:
+        return 'ndjson'
+    return None
+
+
+def format_record(record: Dict[str, Any], stream_format: str) -> str:
+    """Serialize one record for the given stream format"""
+    payload = json.dumps(record)
+    if stream_format == 'sse':
+        return f"event: {record.get('type', 'message')}\ndata: {payload}\n\n"
+    return payload + '\n'
+
+
+def stream_records(records: Iterable[Dict[str, Any]], stream_format: str = 'ndjson') -> Response:
+    """
+    Build a streaming response that sends each record as soon as it is produced
+
+    An exception while producing records is reported as a final 'error' record,
+    since the status code has already been sent.
+    """
+    def generate():
+        try:
+            for record in records:
+                yield format_record(record, stream_format)
+        except Exception as e:
+            print(f"Error while streaming: {e}")
+            traceback.print_exc()
+            yield format_record({'type': 'error', 'success': False, 'error': str(e)}, stream_format)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype=MIMETYPES[stream_format],
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'  # Disable proxy buffering so records arrive immediately
+        }
+    )
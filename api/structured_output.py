@@ -0,0 +1,194 @@
+"""
+Structured Output Schemas
+JSON schemas for A-T-Q evaluations requested as structured output (Anthropic
+tool use, OpenAI response_format, Ollama format=json), plus a small validator
+
+Validation covers the subset of JSON Schema used here: type, properties,
+required, items, enum, minimum and maximum. A response that fails validation
+is decoded leniently by the caller (parse_stage1_response,
+ollama_provider.parse_quick_score_json).
+"""
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+
+def _score(description: str) -> Dict[str, Any]:
+    return {'type': 'integer', 'minimum': 0, 'maximum': 100, 'description': description}
+
+
+def _string_list(description: str) -> Dict[str, Any]:
+    return {'type': 'array', 'items': {'type': 'string'}, 'description': description}
+
+
+# Same fields as ai_evaluator.parse_stage1_response's result
+STAGE1_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'score': _score('Overall score = A*0.5 + T*0.3 + Q*0.2'),
+        'a_score': _score('Accomplishments score'),
+        't_score': _score('Trajectory score'),
+        'q_score': _score('Qualifications score'),
+        'recommendation': {
+            'type': 'string',
+            'enum': ['ADVANCE TO INTERVIEW', 'PHONE SCREEN FIRST', 'DECLINE']
+        },
+        'accomplishments_analysis': {
+            'type': 'object',
+            'properties': {
+                'comparable_work': _score('Did similar work to the role requirements'),
+                'comparable_scale': _score('At similar size, complexity or budget'),
+                'impact_evidence': _score('Quantified results, not just duties')
+            }
+        },
+        'trajectory_analysis': {
+            'type': 'object',
+            'properties': {
+                'growth_pattern': _score('Increasing responsibility over time'),
+                'progression_velocity': _score('Reasonable advancement pace'),
+                'intentionality': _score('Moves make narrative sense')
+            }
+        },
+        'qualifications_analysis': {
+            'type': 'object',
+            'properties': {
+                'must_haves_met': {'type': 'string', 'description': 'X/Y - which must-haves are met or unmet'},
+                'preferreds_met': {'type': 'string', 'description': 'X/Y - which preferreds are met or unmet'}
+            }
+        },
+        'key_strengths': _string_list('Top strengths'),
+        'observations': _string_list('Contextual notes (gaps, moves) without penalizing'),
+        'interview_questions': _string_list('Questions to verify accomplishments, scale and fit'),
+        'reasoning': {'type': 'string', 'description': '2-3 paragraphs explaining the scores and recommendation'}
+    },
+    'required': ['score', 'a_score', 't_score', 'q_score', 'recommendation', 'reasoning']
+}
+
+# Same fields as ollama_provider.parse_quick_score_response's result
+QUICK_SCORE_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'a_score': _score('Accomplishments score'),
+        't_score': _score('Trajectory score'),
+        'q_score': _score('Qualifications score'),
+        'score': _score('Overall score = A*0.5 + T*0.3 + Q*0.2'),
+        'reasoning': {'type': 'string', 'description': '2-3 sentences on what the candidate has accomplished'},
+        'requirements_identified': {
+            'type': 'object',
+            'properties': {
+                'must_have': _string_list('Must-have requirements found in the job'),
+                'preferred': _string_list('Preferred requirements found in the job')
+            }
+        },
+        'match_analysis': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'properties': {
+                    'requirement': {'type': 'string'},
+                    'status': {'type': 'string', 'enum': ['MET', 'NOT_MET', 'PARTIAL']},
+                    'evidence': {'type': 'string'}
+                },
+                'required': ['requirement', 'status']
+            }
+        }
+    },
+    'required': ['a_score', 't_score', 'q_score', 'score', 'reasoning']
+}
+
+_JSON_TYPES = {
+    'object': dict,
+    'array': list,
+    'string': str,
+    'boolean': bool,
+    'number': (int, float),
+    'integer': (int, float)
+}
+
+_JSON_FENCE_RE = re.compile(r'^```(?:json)?\s*(.*?)\s*```$', re.DOTALL)
+
+
+def validate_structured(data: Any, schema: Dict[str, Any], path: str = '$') -> List[str]:
+    """
+    Check data against a schema
+
+    Returns:
+        List of error messages (empty if data is valid)
+    """
+    expected = schema.get('type')
+    if expected:
+        if isinstance(data, bool) and expected != 'boolean':
+            return [f'{path}: expected {expected}']
+        if not isinstance(data, _JSON_TYPES[expected]):
+            return [f'{path}: expected {expected}']
+        if expected == 'integer' and isinstance(data, float) and not data.is_integer():
+            return [f'{path}: expected integer']
+
+    errors = []
+    if 'enum' in schema and data not in schema['enum']:
+        errors.append(f'{path}: must be one of {schema["enum"]}')
+    if 'minimum' in schema and data < schema['minimum']:
+        errors.append(f'{path}: below minimum {schema["minimum"]}')
+    if 'maximum' in schema and data > schema['maximum']:
+        errors.append(f'{path}: above maximum {schema["maximum"]}')
+
+    if isinstance(data, dict):
+        for field in schema.get('required', []):
+            if field not in data:
+                errors.append(f'{path}.{field}: required')
+        for field, field_schema in schema.get('properties', {}).items():
+            if field in data:
+                errors.extend(validate_structured(data[field], field_schema, f'{path}.{field}'))
+    elif isinstance(data, list) and 'items' in schema:
+        for index, item in enumerate(data):
+            errors.extend(validate_structured(item, schema['items'], f'{path}[{index}]'))
+
+    return errors
+
+
+def decode_structured(response_text: str, schema: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Decode a structured response and validate it
+
+    Args:
+        response_text: JSON object text, optionally inside a ```json fence
+        schema: Schema the object must satisfy
+
+    Returns:
+        The decoded object, or None if it isn't valid JSON or fails validation
+    """
+    data = load_json_object(response_text)
+    if data is None or validate_structured(data, schema):
+        return None
+    return data
+
+
+def load_json_object(response_text: str) -> Optional[Dict[str, Any]]:
+    """
+    Decode a JSON object response without validating it
+
+    Args:
+        response_text: JSON object text, optionally inside a ```json fence
+
+    Returns:
+        The decoded object, or None if the text isn't a JSON object
+    """
+    text = (response_text or '').strip()
+    fenced = _JSON_FENCE_RE.match(text)
+    if fenced:
+        text = fenced.group(1)
+    if not text.startswith('{'):
+        return None
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def schema_instructions(schema: Dict[str, Any]) -> str:
+    """Prompt text asking for a JSON object matching schema (for providers that can't enforce one)"""
+    return (
+        '\n\nRespond ONLY with a JSON object matching this JSON schema '
+        '(no text before or after it):\n' + json.dumps(schema)
+    )
@@ -4,8 +4,10 @@ Integration tests for crud_routes.py - Flask API endpoints
 Tests all CRUD operations through HTTP endpoints
 """
 
+import io
 import pytest
 import tempfile
+import zipfile
 import shutil
 from pathlib import Path
 import json
@@ -13,6 +15,7 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).parent))
 
+import crud_routes
 import flask_server
 import database as db
 
@@ -331,6 +334,56 @@ class TestCRUDRoutes:
         assert data['candidate']['name'] == 'John Doe'
         assert data['candidate']['pipeline_status'] == 'new'
 
+    def test_bulk_create_candidates_from_multipart_and_zip(self, monkeypatch):
+        """Test POST /api/jobs/<job_id>/candidates/bulk"""
+        monkeypatch.setenv('INGEST_PROCESSES', '1')
+        db.ensure_candidate_resume_columns()
+        job_id = self.client.post('/api/jobs', json={'title': 'Test'}).get_json()['job']['id']
+
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, 'w') as zf:
+            zf.writestr('batch/john_smith.txt', 'John Smith\njohn@example.com\nBackend engineer')
+            zf.writestr('batch/notes.md', 'not a resume')
+        archive.seek(0)
+
+        response = self.client.post(f'/api/jobs/{job_id}/candidates/bulk', data={
+            'files': [
+                (io.BytesIO(b'Jane Doe\nPython engineer at Acme'), 'jane_doe.txt'),
+                (io.BytesIO(b'Jane Doe\nPython engineer at Acme'), 'jane_doe_resume_v2.txt'),
+                (archive, 'batch.zip'),
+                (io.BytesIO(b''), 'empty.txt'),
+            ]
+        }, content_type='multipart/form-data')
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['summary'] == {'total': 5, 'created': 3, 'duplicates': 1, 'failed': 2}
+        results = data['results']
+        assert [result['filename'] for result in results] == [
+            'jane_doe.txt', 'jane_doe_resume_v2.txt', 'batch/john_smith.txt', 'batch/notes.md', 'empty.txt'
+        ]
+        assert [result['status'] for result in results] == ['created', 'created', 'created', 'failed', 'failed']
+        assert results[1]['duplicate_of'] == results[0]['candidate_id']
+        assert results[2]['name'] == 'John Smith'
+
+        candidate = db.get_candidate(results[2]['candidate_id'])
+        assert candidate['email'] == 'john@example.com'
+        assert candidate['job_id'] == job_id
+
+        # A zip archive can also be the whole request body
+        archive.seek(0)
+        response = self.client.post(f'/api/jobs/{job_id}/candidates/bulk', data=archive.read(),
+                                    content_type='application/zip')
+        assert response.get_json()['summary']['created'] == 1
+
+        response = self.client.post(f'/api/jobs/{job_id}/candidates/bulk', json={'files': []})
+        assert response.status_code == 400
+
+        monkeypatch.setattr(crud_routes, 'MAX_UPLOAD_BYTES', 10)
+        response = self.client.post(f'/api/jobs/{job_id}/candidates/bulk', data=b'x' * 11,
+                                    content_type='application/zip')
+        assert response.status_code == 413
+
     def test_update_candidate_pipeline_status(self):
         """Test PATCH /api/candidates/<id>/pipeline-status"""
         # Create job and candidate
@@ -391,5 +444,160 @@ class TestCRUDRoutes:
         assert response.status_code == 200
 
 
+    # ========== Ownership Queries ==========
+
+    def _trace_statements(self):
+        """Record SQL run on the pooled connection the test client will reuse"""
+        statements = []
+        with db.get_db() as conn:
+            conn.set_trace_callback(statements.append)
+        return statements
+
+    def test_candidate_get_runs_one_query(self):
+        """GET /api/candidates/<id> loads the candidate and checks ownership in one query"""
+        job_id = self.client.post('/api/jobs', json={'title': 'Test'}).get_json()['job']['id']
+        cand_id = self.client.post(f'/api/jobs/{job_id}/candidates', json={
+            'name': 'Traced'
+        }).get_json()['candidate']['id']
+
+        statements = self._trace_statements()
+        response = self.client.get(f'/api/candidates/{cand_id}')
+
+        assert response.status_code == 200
+        assert len([sql for sql in statements if 'SELECT' in sql]) == 1
+
+    def test_job_route_checks_owner_without_loading_job(self):
+        """Job-level routes look up the owner once, not the whole job with requirements"""
+        job_id = self.client.post('/api/jobs', json={'title': 'Test'}).get_json()['job']['id']
+        for name in ['A', 'B', 'C']:
+            self.client.post(f'/api/jobs/{job_id}/candidates', json={'name': name})
+
+        statements = self._trace_statements()
+        response = self.client.get(f'/api/jobs/{job_id}/candidates')
+
+        assert len(response.get_json()['candidates']) == 3
+        assert len([sql for sql in statements if 'SELECT' in sql]) == 2
+        assert not any('FROM requirements' in sql for sql in statements)
+
+    def test_other_users_candidate_is_forbidden(self):
+        """Candidates on another user's job return 403"""
+        with db.get_db() as conn:
+            conn.execute("""
+                INSERT INTO users (id, email, password_hash, name)
+                VALUES ('other-user', 'other@example.com', 'x', 'Other')
+            """)
+            conn.commit()
+        job = db.create_job('other-user', {'title': 'Not yours'})
+        candidate = db.create_candidate(job['id'], {'name': 'Hidden'})
+
+        assert self.client.get(f"/api/candidates/{candidate['id']}").status_code == 403
+        assert self.client.get(f"/api/jobs/{job['id']}/candidates").status_code == 403
+        assert self.client.get('/api/candidates/missing').status_code == 404
+        assert self.client.get('/api/jobs/missing/candidates').status_code == 404
+
+    def test_stage1_evaluation_gets_the_current_skill_hash(self):
+        """Stage 1 evaluations posted without a skill hash record the one in use"""
+        from ai_evaluator import get_skill_hash
+        with db.get_db() as conn:
+            conn.execute("""
+                CREATE TABLE evaluations (
+                    id TEXT PRIMARY KEY, candidate_id TEXT, score REAL, scoring_model TEXT,
+                    a_score REAL, t_score REAL, q_score REAL,
+                    accomplishments_analysis TEXT, trajectory_analysis TEXT, qualifications_analysis TEXT,
+                    recommendation TEXT, reasoning TEXT, strengths TEXT, concerns TEXT,
+                    interview_questions TEXT, observations TEXT,
+                    llm_provider TEXT, llm_model TEXT, input_tokens INTEGER, output_tokens INTEGER, cost REAL,
+                    version INTEGER, evaluation_stage TEXT, skill_hash TEXT, created_at TEXT DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            conn.commit()
+        job_id = self.client.post('/api/jobs', json={'title': 'Test'}).get_json()['job']['id']
+        candidate_id = self.client.post(f'/api/jobs/{job_id}/candidates', json={
+            'name': 'Ann'
+        }).get_json()['candidate']['id']
+
+        filled = self.client.post(f'/api/candidates/{candidate_id}/evaluations', json={'score': 80})
+        sent = self.client.post(f'/api/candidates/{candidate_id}/evaluations', json={
+            'score': 70, 'skill_hash': 'abc123'
+        })
+
+        assert filled.get_json()['evaluation']['skill_hash'] == get_skill_hash()
+        assert sent.get_json()['evaluation']['skill_hash'] == 'abc123'
+
+
+    # ========== Candidate Listing ==========
+
+    def _create_scored_candidates(self):
+        """Create a job with seven candidates; two are unscored"""
+        job_id = self.client.post('/api/jobs', json={'title': 'Test'}).get_json()['job']['id']
+        scores = [90, None, 75, 75, 60, None, 40]
+        for i, score in enumerate(scores):
+            cand_id = self.client.post(f'/api/jobs/{job_id}/candidates', json={
+                'name': f'Candidate {i}', 'resume_text': 'long resume text'
+            }).get_json()['candidate']['id']
+            with db.get_db() as conn:
+                conn.execute(
+                    "UPDATE candidates SET quick_score = ?, pipeline_status = ? WHERE id = ?",
+                    (score, 'meets-reqs' if i % 2 == 0 else 'new', cand_id)
+                )
+                conn.commit()
+        return job_id
+
+    def test_list_candidates_keyset_pagination(self):
+        """Pages cover every candidate once, in score order with unscored last"""
+        job_id = self._create_scored_candidates()
+        db.ensure_candidate_listing_indexes()
+
+        seen = []
+        cursor = None
+        for _ in range(5):
+            url = f'/api/jobs/{job_id}/candidates?limit=3&fields=name,quick_score'
+            if cursor:
+                url += f'&cursor={cursor}'
+            data = self.client.get(url).get_json()
+            seen.extend(data['candidates'])
+            cursor = data['next_cursor']
+            if not cursor:
+                break
+
+        assert [c['quick_score'] for c in seen] == [90, 75, 75, 60, 40, None, None]
+        assert len({c['id'] for c in seen}) == 7
+        assert set(seen[0].keys()) == {'id', 'name', 'quick_score'}
+
+    def test_list_candidates_filters(self):
+        """pipeline_status and score range filters are applied server-side"""
+        job_id = self._create_scored_candidates()
+
+        data = self.client.get(
+            f'/api/jobs/{job_id}/candidates?pipeline_status=meets-reqs&min_score=50&fields=quick_score'
+        ).get_json()
+
+        assert [c['quick_score'] for c in data['candidates']] == [90, 75, 60]
+        assert data['next_cursor'] is None
+
+    def test_list_candidates_rejects_unknown_field(self):
+        """Unknown projection fields return 400"""
+        job_id = self._create_scored_candidates()
+
+        response = self.client.get(f'/api/jobs/{job_id}/candidates?fields=name,password')
+
+        assert response.status_code == 400
+
+    def test_list_candidates_uses_listing_index(self):
+        """The paginated query is served by the composite index"""
+        job_id = self._create_scored_candidates()
+        db.ensure_candidate_listing_indexes()
+
+        with db.get_db() as conn:
+            plan = ' '.join(row[3] for row in conn.execute("""
+                EXPLAIN QUERY PLAN
+                SELECT id FROM candidates WHERE job_id = ?
+                ORDER BY COALESCE(quick_score, -1) DESC, created_at DESC, id DESC LIMIT 10
+            """, (job_id,)))
+
+        assert 'idx_candidates_job_listing' in plan
+        assert 'TEMP B-TREE' not in plan
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -10,6 +10,7 @@ import shutil
 from pathlib import Path
 from datetime import datetime
 import json
+import sqlite3
 import sys
 
 # Add parent directory to path for imports
@@ -381,6 +382,196 @@ class TestDatabase:
 
         assert len(candidates) == 2
 
+    def test_get_candidate_with_owner(self):
+        """Test loading a candidate with its job's owner"""
+        job = db.create_job(self.user_id, {'title': 'Job'})
+        candidate = db.create_candidate(job['id'], {'name': 'Owned'})
+
+        loaded, owner_id = db.get_candidate_with_owner(candidate['id'])
+
+        assert loaded['name'] == 'Owned'
+        assert 'job_owner_id' not in loaded
+        assert owner_id == self.user_id
+        assert db.get_candidate_with_owner('missing') == (None, None)
+
+    def test_job_owner_cached_within_request_scope(self):
+        """Test that ownership lookups hit the database once per request scope"""
+        job = db.create_job(self.user_id, {'title': 'Job'})
+        statements = []
+
+        token = db.begin_request_scope()
+        try:
+            with db.get_db() as conn:
+                conn.set_trace_callback(statements.append)
+                assert db.get_job_owner(job['id']) == self.user_id
+                assert db.get_job_owner(job['id']) == self.user_id
+                conn.set_trace_callback(None)
+        finally:
+            db.end_request_scope(token)
+
+        assert len(statements) == 1
+        assert db.get_job_owner('missing') is None
+
+    def test_create_candidate_stores_normalized_resume_and_flags_duplicates(self):
+        """Test resume normalization and duplicate detection at ingestion"""
+        db.ensure_candidate_resume_columns()
+        job = db.create_job(self.user_id, {'title': 'Job'})
+        other_job = db.create_job(self.user_id, {'title': 'Other Job'})
+        resume = ("Jane Doe\njane@example.com\n\u2022  Built data   pipelines at Acme for eight years\n"
+                  "Page 1 of 2\nJane Doe\njane@example.com\n\u2022 Led the platform team of twelve engineers")
+
+        original = db.create_candidate(job['id'], {'name': 'Jane', 'resume_text': resume})
+        resubmitted = db.create_candidate(job['id'], {'name': 'Jane D.', 'resume_text': resume + '\n\n'})
+        elsewhere = db.create_candidate(other_job['id'], {'name': 'Jane', 'resume_text': resume})
+        different = db.create_candidate(job['id'], {'name': 'Bob', 'resume_text': 'Chef with a decade in restaurants'})
+
+        assert original['resume_text'] == resume
+        assert original['resume_text_clean'] == (
+            "Jane Doe\njane@example.com\n- Built data pipelines at Acme for eight years\n"
+            "- Led the platform team of twelve engineers"
+        )
+        assert len(original['resume_fingerprint']) == 16
+        assert original['duplicate_of'] is None
+        assert resubmitted['duplicate_of'] == original['id']
+        assert elsewhere['duplicate_of'] is None
+        assert different['duplicate_of'] is None
+
+        updated = db.update_candidate(different['id'], {'resume_text': resume})
+        assert updated['duplicate_of'] == original['id']
+
+    def test_duplicate_reuses_quick_score_from_same_model(self):
+        """Test looking up the original application's quick score"""
+        db.ensure_candidate_resume_columns()
+        job = db.create_job(self.user_id, {'title': 'Job'})
+        resume = 'Python engineer at Acme for eight years, led the payments platform and mentored four engineers'
+        original = db.create_candidate(job['id'], {'name': 'Jane', 'resume_text': resume})
+        duplicate = db.create_candidate(job['id'], {'name': 'Jane', 'resume_text': resume + '\n'})
+        extended = db.create_candidate(job['id'], {'name': 'Jane', 'resume_text': resume + ', now at Beta'})
+        assert extended['duplicate_of'] == original['id']
+
+        assert db.get_duplicate_quick_score(duplicate['id'], 'mistral', 'job-1') is None
+        stored = {'score': 80, 'model': 'mistral', 'job_hash': 'job-1'}
+        db.update_candidate_quick_score(original['id'], 80, 'mistral', stored)
+
+        assert db.get_duplicate_quick_score(duplicate['id'], 'mistral', 'job-1') == stored
+        assert db.get_duplicate_quick_score(duplicate['id'], 'phi3', 'job-1') is None
+        # Job content changed since the original was scored
+        assert db.get_duplicate_quick_score(duplicate['id'], 'mistral', 'job-2') is None
+        # Near-duplicate with different text is re-scored
+        assert db.get_duplicate_quick_score(extended['id'], 'mistral', 'job-1') is None
+        assert db.get_duplicate_quick_score(original['id'], 'mistral', 'job-1') is None
+
+    def test_bulk_create_candidates_in_one_transaction(self):
+        """Test bulk candidate creation, duplicate flagging within the batch, and rollback"""
+        db.ensure_candidate_resume_columns()
+        job = db.create_job(self.user_id, {'title': 'Job'})
+        existing = db.create_candidate(job['id'], {'name': 'Jane', 'resume_text': 'Python engineer at Acme'})
+
+        created = db.bulk_create_candidates(job['id'], [
+            {'name': 'Bob', 'resume_text': 'Chef with a decade in restaurants', 'resume_file_path': 'bob.pdf'},
+            {'name': 'Jane D.', 'resume_text': 'Python engineer at Acme'},
+            {'name': 'Bob B.', 'resume_text': 'Chef with a decade in restaurants'},
+        ])
+
+        assert [candidate['name'] for candidate in created] == ['Bob', 'Jane D.', 'Bob B.']
+        assert created[0]['duplicate_of'] is None
+        assert created[1]['duplicate_of'] == existing['id']
+        assert created[2]['duplicate_of'] == created[0]['id']
+        assert db.get_candidate(created[0]['id'])['resume_file_path'] == 'bob.pdf'
+        assert len(db.get_candidates_for_job(job['id'])) == 4
+
+        with pytest.raises(sqlite3.IntegrityError):
+            db.bulk_create_candidates(job['id'], [{'name': 'Ann', 'resume_text': 'Nurse'}, {'name': None}])
+        assert len(db.get_candidates_for_job(job['id'])) == 4
+
+    def test_column_checks_are_cached_after_migration(self):
+        """Test that inserts and lookups don't re-read table columns once the migration has run"""
+        job = db.create_job(self.user_id, {'title': 'Job'})
+        first = db.create_candidate(job['id'], {'name': 'Jane', 'resume_text': 'Python engineer'})
+        assert 'resume_fingerprint' not in first
+        db.ensure_candidate_resume_columns()
+
+        statements = []
+        with db.get_db() as conn:
+            conn.set_trace_callback(statements.append)
+            try:
+                created = db.bulk_create_candidates(job['id'], [
+                    {'name': 'Bob', 'resume_text': 'Chef'},
+                    {'name': 'Ann', 'resume_text': 'Nurse'},
+                ])
+                db.get_duplicate_quick_score(created[0]['id'], 'mistral', 'job-1')
+            finally:
+                conn.set_trace_callback(None)
+
+        # Columns added by the migration are seen without another PRAGMA
+        assert db.get_candidate(created[0]['id'])['resume_fingerprint']
+        assert not [statement for statement in statements if 'table_info' in statement]
+
+
+class TestConnectionPool:
+    """Connection pooling and pragmas in get_db"""
+
+    @pytest.fixture(autouse=True)
+    def setup_teardown(self):
+        """Point at a temporary database with a single counter table"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.original_db_path = db.DB_PATH
+        db.DB_PATH = Path(self.temp_dir) / "test.db"
+        with db.get_db() as conn:
+            conn.execute("CREATE TABLE counters (id INTEGER PRIMARY KEY, value INTEGER)")
+            conn.execute("INSERT INTO counters (id, value) VALUES (1, 0)")
+            conn.commit()
+
+        yield
+
+        shutil.rmtree(self.temp_dir)
+        db.DB_PATH = self.original_db_path
+
+    def test_pragmas_are_applied(self):
+        with db.get_db() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == db.DB_BUSY_TIMEOUT_MS
+
+    def test_connections_are_reused_and_shared_when_nested(self):
+        with db.get_db() as outer:
+            with db.get_db() as inner:
+                assert inner is outer
+        with db.get_db() as again:
+            assert again is outer
+
+    def test_uncommitted_changes_are_rolled_back(self):
+        with db.get_db() as conn:
+            conn.execute("UPDATE counters SET value = 99 WHERE id = 1")
+
+        with db.get_db() as conn:
+            assert conn.execute("SELECT value FROM counters WHERE id = 1").fetchone()[0] == 0
+
+    def test_concurrent_writers_do_not_hit_locked_errors(self):
+        import threading
+
+        errors = []
+
+        def writer():
+            try:
+                for _ in range(50):
+                    with db.get_db() as conn:
+                        conn.execute("UPDATE counters SET value = value + 1 WHERE id = 1")
+                        conn.commit()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=writer) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        with db.get_db() as conn:
+            assert conn.execute("SELECT value FROM counters WHERE id = 1").fetchone()[0] == 400
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -0,0 +1,221 @@
+"""
+Tests for the async provider interface and the event-loop batch executor
+"""
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+# Add api directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import llm_cache
+from batch_executor import get_event_loop, iter_batch_completed_async, run_batch_async
+from llm_cache import acached_evaluate
+from llm_providers import AnthropicProvider, LLMProvider, OpenAIProvider
+from ollama_provider import OllamaProvider, arun_quick_score
+
+
+class SlowStub(BaseHTTPRequestHandler):
+    """Answers Anthropic /v1/messages and Ollama /api/generate after a short delay"""
+
+    protocol_version = 'HTTP/1.1'
+    delay = 0.2
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        time.sleep(self.delay)
+        if self.path == '/api/generate':
+            payload = {'response': 'SCORE: 80', 'prompt_eval_count': 10, 'eval_count': 5,
+                       'load_duration': 1_500_000_000, 'eval_duration': 250_000_000}
+        else:
+            payload = {
+                'id': 'msg_1', 'type': 'message', 'role': 'assistant', 'model': request['model'],
+                'content': [{'type': 'text', 'text': 'SCORE: 80'}],
+                'stop_reason': 'end_turn', 'stop_sequence': None,
+                'usage': {'input_tokens': 10, 'output_tokens': 5}
+            }
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def stub_url():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowStub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+
+
+class EchoProvider(LLMProvider):
+    """Sync-only provider, to exercise the default aevaluate"""
+
+    model = 'echo'
+    temperature = 0.0
+
+    def evaluate(self, prompt):
+        return prompt.upper(), {'input_tokens': 1, 'output_tokens': 1, 'cost': 0.0}
+
+    def get_provider_name(self):
+        return 'echo'
+
+
+def test_async_batch_bounds_concurrency_and_keeps_order():
+    in_flight = 0
+    peak = 0
+
+    async def work(item):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        if item == 3:
+            raise ValueError('bad item')
+        return item * 2
+
+    start = time.time()
+    outcomes = run_batch_async(list(range(12)), work, max_concurrency=4)
+
+    assert peak == 4
+    assert time.time() - start < 0.5  # 3 waves of 0.05s, not 12
+    assert [o['index'] for o in outcomes] == list(range(12))
+    assert outcomes[3] == {'index': 3, 'success': False, 'error': 'bad item',
+                           'elapsed_seconds': outcomes[3]['elapsed_seconds']}
+    assert outcomes[5]['value'] == 10
+
+
+def test_async_batch_yields_in_completion_order_and_stops_early():
+    started = []
+
+    async def work(delay):
+        started.append(delay)
+        await asyncio.sleep(delay)
+        return delay
+
+    results = iter_batch_completed_async([0.3, 0.01, 0.3, 0.3], work, max_concurrency=2)
+    assert next(results)['value'] == 0.01
+    results.close()  # Consumer went away: queued items are never started
+
+    time.sleep(0.05)
+    assert len(started) == 3
+    assert run_batch_async([], work) == []
+
+
+def test_default_aevaluate_runs_sync_evaluate_in_a_thread():
+    text, usage = asyncio.run(EchoProvider().aevaluate('hello'))
+
+    assert text == 'HELLO'
+    assert usage['input_tokens'] == 1
+
+
+def test_anthropic_aevaluate_runs_concurrently(stub_url):
+    provider = AnthropicProvider(api_key='test-key', model='claude-3-5-haiku-20241022')
+
+    async def score(prompt):
+        return await provider.aevaluate(prompt)
+
+    with patch.dict(os.environ, {'ANTHROPIC_BASE_URL': stub_url}):
+        start = time.time()
+        outcomes = run_batch_async(['a', 'b', 'c', 'd'], score, max_concurrency=4)
+        elapsed = time.time() - start
+
+    assert all(o['success'] for o in outcomes), outcomes
+    assert outcomes[0]['value'][0] == 'SCORE: 80'
+    assert outcomes[0]['value'][1]['input_tokens'] == 10
+    assert elapsed < 0.6  # Four 0.2s calls overlapped
+
+
+def test_async_clients_are_per_event_loop(stub_url):
+    provider = AnthropicProvider(api_key='test-key')
+
+    async def client():
+        return provider._async_client()
+
+    with patch.dict(os.environ, {'ANTHROPIC_BASE_URL': stub_url}):
+        shared = asyncio.run_coroutine_threadsafe(client(), get_event_loop()).result()
+        assert asyncio.run_coroutine_threadsafe(client(), get_event_loop()).result() is shared
+        assert asyncio.run(client()) is not shared
+
+
+def test_openai_aevaluate_reports_usage():
+    provider = OpenAIProvider(api_key='test-key', model='gpt-4o-mini')
+    async_client = MagicMock()
+    async_client.chat.completions.create = AsyncMock(return_value=SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content='{"score": 80}'))],
+        usage=SimpleNamespace(prompt_tokens=1000, completion_tokens=100, prompt_tokens_details=None)
+    ))
+
+    with patch.object(provider, '_async_client', return_value=async_client):
+        text, usage = asyncio.run(provider.aevaluate_structured('prompt', {'type': 'object'}))
+
+    assert text == '{"score": 80}'
+    assert usage['input_tokens'] == 1000
+    params = async_client.chat.completions.create.call_args.kwargs
+    assert params['response_format']['json_schema']['schema'] == {'type': 'object'}
+    assert params['model'] == 'gpt-4o-mini'
+
+
+def test_ollama_aevaluate_and_quick_score(stub_url):
+    provider = OllamaProvider(model='mistral', base_url=stub_url)
+
+    text, usage = asyncio.run(provider.aevaluate('prompt'))
+    assert text == 'SCORE: 80'
+    assert usage['provider'] == 'ollama'
+    assert usage['output_tokens'] == 5
+    assert usage['load_seconds'] == 1.5
+    assert usage['eval_seconds'] == 0.25
+
+    async def score(candidate):
+        return await arun_quick_score(provider, {'title': 'Engineer'}, candidate, use_cache=False)
+
+    with patch.object(llm_cache, 'CACHE_ENABLED', False):
+        outcomes = run_batch_async([{'id': 'c1', 'resume_text': 'r'}, {'id': 'c2', 'resume_text': 's'}],
+                                   score, max_concurrency=2)
+
+    assert [o['value']['candidate_id'] for o in outcomes] == ['c1', 'c2']
+    assert outcomes[0]['value']['score'] == 80
+    assert outcomes[0]['value']['output_format'] == 'text'
+
+
+def test_ollama_aevaluate_reports_connection_errors():
+    provider = OllamaProvider(model='mistral', base_url='http://127.0.0.1:9')
+
+    with pytest.raises(Exception, match='Cannot connect to Ollama'):
+        asyncio.run(provider.aevaluate('prompt'))
+
+
+def test_acached_evaluate_serves_hits_without_calling_the_model():
+    provider = EchoProvider()
+    provider.aevaluate = AsyncMock(return_value=('SCORE: 80', {'input_tokens': 10, 'output_tokens': 5, 'cost': 0.01}))
+
+    with patch.object(llm_cache, 'CACHE_ENABLED', True), \
+            patch.object(llm_cache, 'get_cached_response', return_value=None), \
+            patch.object(llm_cache, 'store_response') as store:
+        text, usage = asyncio.run(acached_evaluate(provider, 'prompt'))
+    assert text == 'SCORE: 80'
+    assert usage['cache_hit'] is False
+    store.assert_called_once()
+
+    cached = ('SCORE: 80', {'input_tokens': 10, 'output_tokens': 5, 'cost': 0.01})
+    with patch.object(llm_cache, 'CACHE_ENABLED', True), \
+            patch.object(llm_cache, 'get_cached_response', return_value=cached):
+        _, usage = asyncio.run(acached_evaluate(provider, 'prompt'))
+    assert usage['cache_hit'] is True
+    assert usage['cost'] == 0.0
+    provider.aevaluate.assert_awaited_once()
@@ -0,0 +1,207 @@
+"""
+Unit tests for batch_executor.py and the concurrent quick-score batch endpoint
+"""
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+# Add api directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import batch_executor
+from batch_executor import run_batch, clamp_parallelism, get_ollama_max_loaded_models, get_ollama_parallelism
+
+
+class TestRunBatch(unittest.TestCase):
+    """Test cases for run_batch"""
+
+    def test_results_in_input_order(self):
+        """Outcomes come back in input order even when later items finish first"""
+        def slow_for_small(n):
+            time.sleep(0.05 * (5 - n))
+            return n * 10
+
+        outcomes = run_batch([0, 1, 2, 3, 4], slow_for_small, max_workers=5)
+
+        self.assertEqual([o['value'] for o in outcomes], [0, 10, 20, 30, 40])
+        self.assertEqual([o['index'] for o in outcomes], [0, 1, 2, 3, 4])
+
+    def test_failures_are_isolated(self):
+        """One failing item does not affect the others"""
+        def maybe_fail(n):
+            if n == 1:
+                raise ValueError('bad candidate')
+            return n
+
+        outcomes = run_batch([0, 1, 2], maybe_fail, max_workers=2)
+
+        self.assertTrue(outcomes[0]['success'])
+        self.assertFalse(outcomes[1]['success'])
+        self.assertEqual(outcomes[1]['error'], 'bad candidate')
+        self.assertTrue(outcomes[2]['success'])
+
+    def test_concurrency_is_bounded(self):
+        """No more than max_workers calls run at the same time"""
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+
+        def track(n):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(0.02)
+            with lock:
+                state['active'] -= 1
+            return n
+
+        run_batch(list(range(12)), track, max_workers=3)
+
+        self.assertLessEqual(state['peak'], 3)
+        self.assertGreater(state['peak'], 1)
+
+    def test_per_item_timing(self):
+        """Each outcome reports its own elapsed time"""
+        outcomes = run_batch([0.05], lambda s: time.sleep(s), max_workers=1)
+        self.assertGreaterEqual(outcomes[0]['elapsed_seconds'], 0.04)
+
+    def test_empty_batch(self):
+        """An empty batch returns an empty list"""
+        self.assertEqual(run_batch([], lambda x: x), [])
+
+
+class TestParallelismConfig(unittest.TestCase):
+    """Test cases for parallelism configuration"""
+
+    def test_reads_ollama_num_parallel(self):
+        with patch.dict(os.environ, {'OLLAMA_NUM_PARALLEL': '4'}):
+            self.assertEqual(get_ollama_parallelism(), 4)
+
+    def test_defaults_when_unset_or_invalid(self):
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertEqual(get_ollama_parallelism(), batch_executor.DEFAULT_PARALLELISM)
+        with patch.dict(os.environ, {'OLLAMA_NUM_PARALLEL': 'many'}):
+            self.assertEqual(get_ollama_parallelism(), batch_executor.DEFAULT_PARALLELISM)
+
+    def test_max_loaded_models(self):
+        with patch.dict(os.environ, {'OLLAMA_MAX_LOADED_MODELS': '2'}):
+            self.assertEqual(get_ollama_max_loaded_models(), 2)
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertEqual(get_ollama_max_loaded_models(), batch_executor.DEFAULT_MAX_LOADED_MODELS)
+
+    def test_clamp(self):
+        self.assertEqual(clamp_parallelism(0), 1)
+        self.assertEqual(clamp_parallelism(1000), batch_executor.MAX_PARALLELISM)
+        self.assertEqual(clamp_parallelism('3'), 3)
+
+
+class TestQuickBatchEndpoint(unittest.TestCase):
+    """Test the /api/evaluate_quick/batch endpoint with a mocked Ollama provider"""
+
+    def setUp(self):
+        from flask_server import app
+        app.config['TESTING'] = True
+        self.client = app.test_client()
+
+    def test_batch_runs_concurrently_and_keeps_order(self):
+        response_text = "A_SCORE: 80\nT_SCORE: 70\nQ_SCORE: 90\nSCORE: 79\nREASONING: Solid."
+
+        async def fake_aevaluate(prompt):
+            if 'broken resume' in prompt:
+                raise Exception('Ollama request timed out after 60 seconds')
+            await asyncio.sleep(0.1)
+            return response_text, {'input_tokens': 10, 'output_tokens': 5, 'cost': 0.0}
+
+        with patch('flask_server.OllamaProvider.is_available', return_value=True), \
+                patch('flask_server.OllamaProvider.aevaluate', side_effect=fake_aevaluate):
+            start = time.time()
+            response = self.client.post('/api/evaluate_quick/batch', json={
+                'job': {'title': 'Engineer'},
+                'candidates': [
+                    {'id': 'c1', 'resume_text': 'good resume'},
+                    {'id': 'c2', 'resume_text': 'broken resume'},
+                    {'id': 'c3', 'resume_text': 'another resume'},
+                    {'id': 'c4', 'resume_text': 'last resume'},
+                ],
+                'parallelism': 4
+            })
+            elapsed = time.time() - start
+
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual([r['candidate_id'] for r in data['results']], ['c1', 'c2', 'c3', 'c4'])
+        self.assertEqual([r['success'] for r in data['results']], [True, False, True, True])
+        self.assertEqual(data['results'][0]['score'], 79)
+        self.assertIn('elapsed_seconds', data['results'][0])
+        self.assertEqual(data['parallelism'], 4)
+        # Three 0.1s evaluations ran side by side rather than back to back
+        self.assertLess(elapsed, 0.25)
+
+
+
+class TestQuickCompareEndpoint(unittest.TestCase):
+    """Test the /api/evaluate_quick/compare endpoint with a mocked Ollama provider"""
+
+    RESPONSE = "A_SCORE: 80\nT_SCORE: 70\nQ_SCORE: 90\nSCORE: 79\nREASONING: Solid."
+
+    def setUp(self):
+        from flask_server import app
+        app.config['TESTING'] = True
+        self.client = app.test_client()
+
+    async def fake_aevaluate(self, provider, prompt):
+        if provider.model == 'broken':
+            raise Exception('model not found')
+        await asyncio.sleep({'phi3': 0.05, 'mistral': 0.15, 'llama3': 0.1}[provider.model])
+        return self.RESPONSE, {'input_tokens': 10, 'output_tokens': 5, 'cost': 0.0, 'elapsed_seconds': 0.1,
+                               'load_seconds': 2.5, 'eval_seconds': 0.4}
+
+    def post(self, body):
+        with patch('flask_server.OllamaProvider.is_available', return_value=True), \
+                patch('flask_server.OllamaProvider.aevaluate', autospec=True, side_effect=self.fake_aevaluate):
+            start = time.time()
+            response = self.client.post('/api/evaluate_quick/compare', json={
+                'job': {'title': 'Engineer'},
+                'candidate': {'id': 'c1', 'resume_text': 'resume'},
+                'use_cache': False,
+                **body
+            })
+            return response, time.time() - start
+
+    def test_models_run_concurrently(self):
+        with patch.dict(os.environ, {'OLLAMA_MAX_LOADED_MODELS': '3'}):
+            response, elapsed = self.post({'models': ['phi3', 'mistral', 'llama3', 'broken']})
+
+        data = response.get_json()
+        self.assertEqual([r['model'] for r in data['results']], ['phi3', 'mistral', 'llama3', 'broken'])
+        self.assertEqual([r['success'] for r in data['results']], [True, True, True, False])
+        self.assertEqual(data['results'][0]['score'], 79)
+        self.assertEqual(data['results'][0]['load_seconds'], 2.5)
+        self.assertEqual(data['results'][0]['eval_seconds'], 0.4)
+        self.assertEqual(data['parallelism'], 3)
+        # 0.05 + 0.15 + 0.1 run side by side
+        self.assertLess(elapsed, 0.28)
+
+    def test_parallelism_is_bounded_by_loaded_model_slots(self):
+        with patch.dict(os.environ, {'OLLAMA_MAX_LOADED_MODELS': '1'}):
+            response, elapsed = self.post({'models': ['phi3', 'mistral', 'llama3']})
+
+        self.assertEqual(response.get_json()['parallelism'], 1)
+        self.assertGreaterEqual(elapsed, 0.3)
+
+    def test_streams_models_in_completion_order(self):
+        response, _ = self.post({'models': ['mistral', 'phi3', 'llama3'], 'parallelism': 3, 'stream': True})
+
+        records = [json.loads(line) for line in response.get_data(as_text=True).splitlines() if line]
+        self.assertEqual([r['model'] for r in records[:-1]], ['phi3', 'llama3', 'mistral'])
+        self.assertEqual([r['index'] for r in records[:-1]], [1, 2, 0])
+        self.assertEqual(records[-1]['type'], 'summary')
+        self.assertEqual(records[-1]['succeeded'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
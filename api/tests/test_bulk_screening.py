@@ -0,0 +1,107 @@
+"""
+Tests for bulk_screening.py - multi-process regex screening
+"""
+import json
+import os
+import sys
+
+import pytest
+
+# Add api directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import bulk_screening
+import flask_server
+from evaluator_logic import SummaryAccumulator, evaluate_candidate, generate_summary
+
+
+JOB = {
+    'title': 'Engineer',
+    'requirements': ['python', 'react', 'sql', '3+ years experience'],
+    'education': "Bachelor's degree"
+}
+TEXTS = [
+    'python react sql developer, 5 years of experience, bachelor of science',
+    'react only',
+    'python and sql, 2 years experience, mba',
+    'nothing relevant',
+]
+CANDIDATES = [{'name': f'Candidate {i}', 'text': TEXTS[i % len(TEXTS)]} for i in range(23)]
+
+
+@pytest.fixture
+def client():
+    flask_server.app.config['TESTING'] = True
+    return flask_server.app.test_client()
+
+
+def test_summary_accumulator_matches_generate_summary():
+    results = [evaluate_candidate(JOB, c) for c in CANDIDATES]
+    accumulator = SummaryAccumulator()
+    for result in results:
+        accumulator.add(result)
+
+    results.sort(key=lambda x: x['score'], reverse=True)
+    assert accumulator.summary() == generate_summary(results)
+    assert SummaryAccumulator().summary() == generate_summary([])
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_results_match_sequential_evaluation_in_input_order(processes):
+    chunks = list(bulk_screening.iter_screen_chunks(JOB, iter(CANDIDATES), processes=processes, chunk_size=5))
+
+    assert [len(chunk) for chunk in chunks] == [5, 5, 5, 5, 3]
+    results = [result for chunk in chunks for result in chunk]
+    assert [r['index'] for r in results] == list(range(len(CANDIDATES)))
+    for result, candidate in zip(results, CANDIDATES):
+        expected = evaluate_candidate(JOB, candidate)
+        assert {k: v for k, v in result.items() if k != 'index'} == expected
+
+
+def test_screen_candidates_returns_sorted_results_and_summary():
+    results, summary = bulk_screening.screen_candidates(JOB, CANDIDATES, processes=1)
+
+    expected = sorted((evaluate_candidate(JOB, c) for c in CANDIDATES), key=lambda x: x['score'], reverse=True)
+    assert summary == generate_summary(expected)
+    assert [r['score'] for r in results] == [r['score'] for r in expected]
+
+
+def test_cli_reads_jsonl_and_csv(tmp_path, capsys):
+    job_path = tmp_path / 'job.json'
+    job_path.write_text(json.dumps(JOB))
+    jsonl_path = tmp_path / 'candidates.jsonl'
+    jsonl_path.write_text('\n'.join(json.dumps(c) for c in CANDIDATES[:4]) + '\n')
+    csv_path = tmp_path / 'candidates.csv'
+    csv_path.write_text('name,resume_text\nAnn,python react sql\nBob,react only\n')
+
+    out_path = tmp_path / 'out.ndjson'
+    assert bulk_screening.main(['--job', str(job_path), '--candidates', str(jsonl_path),
+                                '--processes', '1', '--output', str(out_path)]) == 0
+    lines = [json.loads(line) for line in out_path.read_text().splitlines()]
+    assert [line['name'] for line in lines] == [c['name'] for c in CANDIDATES[:4]]
+    assert json.loads(capsys.readouterr().err)['total_candidates'] == 4
+
+    assert bulk_screening.main(['--job', str(job_path), '--candidates', str(csv_path), '--processes', '1']) == 0
+    output = capsys.readouterr()
+    assert [json.loads(line)['name'] for line in output.out.splitlines()] == ['Ann', 'Bob']
+    assert json.loads(output.err)['total_candidates'] == 2
+
+
+def test_bulk_endpoint_streams_results_then_summary(client):
+    response = client.post('/api/evaluate_regex/bulk', json={
+        'job': JOB, 'candidates': CANDIDATES, 'processes': 1, 'chunk_size': 10
+    })
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    records = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    assert [r['type'] for r in records].count('result') == len(CANDIDATES)
+    assert [r['type'] for r in records].count('progress') == 3
+    assert records[-1]['type'] == 'summary'
+    assert records[-1]['summary']['total_candidates'] == len(CANDIDATES)
+
+
+def test_bulk_endpoint_requires_candidates(client):
+    response = client.post('/api/evaluate_regex/bulk', json={'job': JOB, 'candidates': []})
+    assert response.status_code == 400
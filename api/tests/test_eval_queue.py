@@ -0,0 +1,208 @@
+"""
+Tests for the persistent evaluation job queue (eval_queue.py, eval_job_routes.py)
+Uses a temporary SQLite database and runs the worker loop in-process
+"""
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add api directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import database as db
+import eval_queue
+import flask_server
+
+
+JOB = {'title': 'Engineer', 'requirements': ['python', 'react'], 'education': ''}
+CANDIDATES = [
+    {'name': 'Ann', 'text': 'python and react developer'},
+    {'name': 'Bob', 'text': 'react only'},
+    {'name': 'Cy', 'text': 'nothing relevant'},
+]
+
+
+@pytest.fixture(autouse=True)
+def temp_db():
+    """Point the database module at a fresh temporary database"""
+    temp_dir = tempfile.mkdtemp()
+    original_db_path = db.DB_PATH
+    db.DB_PATH = Path(temp_dir) / "test.db"
+    db.ensure_eval_job_tables_exist()
+    yield
+    db.DB_PATH = original_db_path
+    shutil.rmtree(temp_dir)
+
+
+@pytest.fixture
+def client():
+    flask_server.app.config['TESTING'] = True
+    return flask_server.app.test_client()
+
+
+def test_submit_returns_job_id_and_pending_counts(client):
+    response = client.post('/api/eval_jobs', json={'kind': 'regex', 'job': JOB, 'candidates': CANDIDATES})
+
+    assert response.status_code == 202
+    eval_job_id = response.get_json()['eval_job_id']
+
+    progress = client.get(f'/api/eval_jobs/{eval_job_id}').get_json()['eval_job']
+    assert progress['status'] == 'queued'
+    assert progress['total'] == 3
+    assert progress['pending'] == 3
+    assert progress['done'] == 0
+
+
+def test_worker_processes_items_and_persists_results(client):
+    response = client.post('/api/eval_jobs', json={'kind': 'regex', 'job': JOB, 'candidates': CANDIDATES})
+    eval_job_id = response.get_json()['eval_job_id']
+
+    processed = eval_queue.run_worker(stop_after_idle=True)
+    assert processed == 3
+
+    data = client.get(f'/api/eval_jobs/{eval_job_id}?include_results=true').get_json()
+    assert data['eval_job']['status'] == 'completed'
+    assert data['eval_job']['done'] == 3
+    assert data['eval_job']['pending'] == 0
+    assert [r['result']['name'] for r in data['results']] == ['Ann', 'Bob', 'Cy']
+    assert data['results'][0]['result']['matched_keywords'] == ['python', 'react']
+
+
+def test_failed_items_do_not_block_others(client):
+    response = client.post('/api/eval_jobs', json={'kind': 'regex', 'job': JOB, 'candidates': CANDIDATES})
+    eval_job_id = response.get_json()['eval_job_id']
+
+    def flaky(job, candidate, options, user_id):
+        if candidate['name'] == 'Bob':
+            raise Exception('model crashed')
+        return {'name': candidate['name']}
+
+    with patch.dict(eval_queue.ITEM_HANDLERS, {'regex': flaky}):
+        eval_queue.run_worker(stop_after_idle=True)
+
+    data = client.get(f'/api/eval_jobs/{eval_job_id}?include_results=true').get_json()
+    assert data['eval_job']['done'] == 2
+    assert data['eval_job']['failed'] == 1
+    assert data['results'][1]['error'] == 'model crashed'
+
+
+def test_orphaned_items_are_requeued():
+    eval_job = db.create_eval_job('local-user', 'regex', JOB, CANDIDATES[:1])
+
+    # Simulate a worker that claimed the item and then died with the server
+    item = db.claim_next_eval_job_item('no-such-host:999999')
+    assert item is not None
+    with patch('eval_queue.socket.gethostname', return_value='no-such-host'), \
+            patch('eval_queue.os.kill', side_effect=ProcessLookupError):
+        assert eval_queue.recover_orphaned_items() == 1
+
+    assert db.get_eval_job(eval_job['id'])['pending'] == 1
+    eval_queue.run_worker(stop_after_idle=True)
+    assert db.get_eval_job(eval_job['id'])['done'] == 1
+
+
+def test_invalid_kind_rejected(client):
+    response = client.post('/api/eval_jobs', json={'kind': 'magic', 'job': JOB, 'candidates': CANDIDATES})
+    assert response.status_code == 400
+
+
+def test_unknown_job_returns_404(client):
+    assert client.get('/api/eval_jobs/does-not-exist').status_code == 404
+
+
+def _save_foreign_candidate():
+    """A saved candidate on a job owned by another user"""
+    with db.get_db() as conn:
+        conn.execute("CREATE TABLE jobs (id TEXT PRIMARY KEY, user_id TEXT NOT NULL, title TEXT)")
+        conn.execute("""
+            CREATE TABLE candidates (id TEXT PRIMARY KEY, job_id TEXT NOT NULL, name TEXT,
+                                     resume_text TEXT, quick_score INTEGER)
+        """)
+        conn.execute("INSERT INTO jobs VALUES ('other-job', 'other-user', 'Other job')")
+        conn.execute("INSERT INTO candidates VALUES ('foreign', 'other-job', 'Zed', 'Private resume', NULL)")
+        conn.commit()
+
+
+def test_submit_refuses_another_users_candidates(client):
+    _save_foreign_candidate()
+    response = client.post('/api/eval_jobs', json={'kind': 'quick', 'job': JOB, 'candidates': [
+        CANDIDATES[0], {'id': 'foreign', 'name': 'Zed'}
+    ]})
+
+    assert response.status_code == 403
+    assert db.claim_next_eval_job_item('test-worker') is None
+
+
+def test_worker_refuses_another_users_candidates(client):
+    _save_foreign_candidate()
+    eval_job = db.create_eval_job('local-user', 'quick', JOB, [{'id': 'foreign', 'name': 'Zed'}])
+
+    with patch('ollama_provider.run_quick_score') as run_quick_score:
+        eval_queue.run_worker(stop_after_idle=True)
+
+    data = client.get(f"/api/eval_jobs/{eval_job['id']}?include_results=true").get_json()
+    assert data['results'][0]['status'] == 'failed'
+    assert data['results'][0]['result'] is None
+    run_quick_score.assert_not_called()
+    assert db.get_candidate('foreign')['quick_score'] is None
+
+
+def test_quick_items_use_clean_resume_and_reuse_duplicate_scores():
+    rows = {
+        'c1': {'id': 'c1', 'resume_text': 'raw  text', 'resume_text_clean': 'raw text', 'duplicate_of': None},
+        'c2': {'id': 'c2', 'resume_text': 'raw  text', 'resume_text_clean': 'raw text', 'duplicate_of': 'c1'},
+    }
+    stored = {'score': 80, 'model': 'mistral', 'reasoning': 'Strong', 'job_hash': eval_queue._job_hash(JOB)}
+    scored = []
+
+    def fake_run_quick_score(provider, job, candidate):
+        scored.append(candidate)
+        return {'candidate_id': candidate['id'], 'score': 80, 'model': provider.model}
+
+    with patch.object(db, 'get_candidate_with_owner',
+                      side_effect=lambda candidate_id: (rows.get(candidate_id), 'local-user')), \
+            patch.object(db, 'get_duplicate_quick_score', return_value=stored) as lookup, \
+            patch.object(db, 'update_candidate_quick_score') as update, \
+            patch('ollama_provider.run_quick_score', side_effect=fake_run_quick_score):
+        def run(candidate):
+            return eval_queue._run_quick_item(JOB, candidate, {'model': 'mistral'}, 'local-user')
+
+        first = run({'id': 'c1', 'resume_text': 'raw  text'})
+        edited = run({'id': 'c1', 'resume_text': 'edited'})
+        reused = run({'id': 'c2', 'resume_text': 'raw  text'})
+
+    assert [c['resume_text'] for c in scored] == ['raw text', 'edited']
+    assert first['score'] == 80
+    assert first['job_hash'] == eval_queue._job_hash(JOB)
+    assert lookup.call_args.args == ('c2', 'mistral', eval_queue._job_hash(JOB))
+    assert 'reused_from' not in edited
+    assert reused == {**stored, 'candidate_id': 'c2', 'reused_from': 'c1'}
+    assert update.call_count == 3
+
+
+def test_ai_items_store_an_evaluation_with_the_skill_hash():
+    row = {'id': 'c1', 'resume_text': 'resume', 'resume_text_clean': None}
+    evaluation = {'score': 82, 'a_score': 80, 't_score': 85, 'q_score': 84, 'recommendation': 'ADVANCE TO INTERVIEW'}
+    result = {
+        'success': True, 'evaluation': evaluation, 'model': 'claude-3-5-haiku-20241022', 'provider': 'anthropic',
+        'usage': {'input_tokens': 1000, 'output_tokens': 200, 'cost': 0.001}, 'skill_hash': 'skill-1'
+    }
+
+    with patch.object(db, 'get_candidate_with_owner', return_value=(row, 'local-user')), \
+            patch.object(db, 'create_evaluation', return_value={'id': 'eval-1'}) as create, \
+            patch.object(db, 'update_candidate_stage1_score') as update, \
+            patch('ai_evaluator.evaluate_candidate_with_ai', return_value=result):
+        saved = eval_queue._run_ai_item(JOB, {'id': 'c1', 'resume_text': 'resume'}, {}, 'local-user')
+
+    candidate_id, data = create.call_args.args
+    assert candidate_id == 'c1'
+    assert data['skill_hash'] == 'skill-1'
+    assert data['llm_model'] == 'claude-3-5-haiku-20241022'
+    assert data['evaluation_stage'] == 'stage1'
+    assert update.call_args.args == ('c1', 82, 80, 85, 84)
+    assert saved['evaluation_id'] == 'eval-1'
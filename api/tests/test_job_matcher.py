@@ -0,0 +1,69 @@
+"""
+Tests for JobMatcher in evaluator_logic.py - pre-compiled keyword matching
+"""
+import os
+import sys
+
+# Add api directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import evaluator_logic
+from evaluator_logic import JobMatcher, evaluate_candidate, score_education
+
+
+JOB = {
+    'title': 'Senior Software Engineer',
+    'requirements': ['Python', 'React', 'Python', '5+ years experience'],
+    'education': "Bachelor's degree"
+}
+
+
+def test_matches_substrings_like_plain_in():
+    matcher = JobMatcher({'requirements': ['java', 'javascript', 'script', 'go']})
+    found = matcher.find_terms('senior javascript engineer, google')
+
+    assert {'java', 'javascript', 'script', 'go'} <= found
+
+
+def test_trie_scan_finds_same_terms_as_in_scan():
+    requirements = [f'skill{i}' for i in range(evaluator_logic.TRIE_SCAN_MIN_TERMS)]
+    requirements += ['machine learning', 'learning', 'c++', 'node.js', 'node']
+    text = 'worked on machine learning in c++ and node.js with skill7 and skill123. master of science'
+
+    matcher = JobMatcher({'requirements': requirements})
+    assert matcher._pattern is not None
+
+    expected = {term for term in matcher._terms if term in text}
+    assert matcher.find_terms(text) == expected
+
+
+def test_duplicate_keywords_are_counted_like_before():
+    result = evaluate_candidate(JOB, {
+        'name': 'John Doe',
+        'text': 'Python developer with 7 years of experience. Bachelor of Science.'
+    })
+
+    assert result['matched_keywords'] == ['python', 'python']
+    assert 'react' in result['missing_keywords']
+    assert result['breakdown']['education_match'] == 20
+    assert result['experience_years_found'] == 7
+    assert result['experience_years_required'] == 5
+
+
+def test_reused_matcher_gives_same_result():
+    matcher = JobMatcher(JOB)
+    candidates = [
+        {'name': 'A', 'text': 'Python and React, 10 years of experience, PhD'},
+        {'name': 'B', 'text': 'High school graduate'},
+    ]
+
+    for candidate in candidates:
+        assert evaluate_candidate(JOB, candidate, matcher) == evaluate_candidate(JOB, candidate)
+
+
+def test_education_scoring_matches_score_education():
+    for required in ['PhD required', "Master's degree", 'Bachelor', 'Any degree']:
+        matcher = JobMatcher({'requirements': [], 'education': required})
+        for text in ['ph.d in physics', 'mba', 'b.s. in math', 'no degree']:
+            result = matcher.evaluate({'name': 'X', 'text': text})
+            assert result['breakdown']['education_match'] == score_education(required, text)
@@ -0,0 +1,117 @@
+"""
+Tests for llm_cache.py - content-addressed LLM response cache
+"""
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Add api directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import database as db
+import llm_cache
+from llm_cache import cached_evaluate, make_cache_key
+
+
+class FakeProvider:
+    """Counts calls instead of talking to a model"""
+
+    def __init__(self, model='test-model', temperature=0.7):
+        self.model = model
+        self.temperature = temperature
+        self.calls = 0
+
+    def evaluate(self, prompt):
+        self.calls += 1
+        return f'SCORE: 80 for {prompt}', {'input_tokens': 100, 'output_tokens': 20, 'cost': 0.01, 'model': self.model}
+
+    def get_provider_name(self):
+        return 'fake'
+
+
+@pytest.fixture(autouse=True)
+def temp_db():
+    """Point the database module at a fresh temporary database"""
+    temp_dir = tempfile.mkdtemp()
+    original_db_path = db.DB_PATH
+    db.DB_PATH = Path(temp_dir) / "test.db"
+    yield
+    db.DB_PATH = original_db_path
+    shutil.rmtree(temp_dir)
+
+
+def test_cache_key_depends_on_every_input():
+    base = make_cache_key('prompt', 'anthropic', 'haiku', 1.0)
+    assert base == make_cache_key('prompt', 'anthropic', 'haiku', 1.0)
+    assert base != make_cache_key('prompt!', 'anthropic', 'haiku', 1.0)
+    assert base != make_cache_key('prompt', 'openai', 'haiku', 1.0)
+    assert base != make_cache_key('prompt', 'anthropic', 'sonnet', 1.0)
+    assert base != make_cache_key('prompt', 'anthropic', 'haiku', 0.7)
+    assert base != make_cache_key('prompt', 'anthropic', 'haiku', 1.0, {'mode': 'json'})
+
+
+def test_second_identical_call_is_a_hit():
+    provider = FakeProvider()
+
+    text1, usage1 = cached_evaluate(provider, 'resume A')
+    text2, usage2 = cached_evaluate(provider, 'resume A')
+
+    assert provider.calls == 1
+    assert text1 == text2
+    assert usage1['cache_hit'] is False
+    assert usage1['input_tokens'] == 100
+    assert usage2['cache_hit'] is True
+    assert usage2['input_tokens'] == 0
+    assert usage2['cost'] == 0.0
+
+
+def test_different_model_or_prompt_misses():
+    cached_evaluate(FakeProvider(model='a'), 'resume A')
+
+    provider = FakeProvider(model='b')
+    _, usage = cached_evaluate(provider, 'resume A')
+    assert usage['cache_hit'] is False
+    _, usage = cached_evaluate(provider, 'resume B')
+    assert usage['cache_hit'] is False
+    assert provider.calls == 2
+
+
+def test_use_cache_false_forces_model_call():
+    provider = FakeProvider()
+    cached_evaluate(provider, 'resume A')
+    _, usage = cached_evaluate(provider, 'resume A', use_cache=False)
+    assert usage['cache_hit'] is False
+    assert provider.calls == 2
+
+
+def test_eviction_by_age_and_size():
+    db.ensure_llm_cache_table_exists()
+    db.put_llm_cache_entry('old', 'fake', 'm', 'x' * 100, {})
+    db.put_llm_cache_entry('lru', 'fake', 'm', 'y' * 100, {})
+    db.put_llm_cache_entry('recent', 'fake', 'm', 'z' * 100, {})
+    with db.get_db() as conn:
+        conn.execute("UPDATE llm_cache SET created_at = datetime('now', '-40 days') WHERE cache_key = 'old'")
+        conn.execute("UPDATE llm_cache SET last_used_at = datetime('now', '-1 day') WHERE cache_key = 'lru'")
+        conn.commit()
+
+    removed = db.evict_llm_cache(max_age_seconds=30 * 86400, max_bytes=150)
+
+    assert removed == 2
+    assert db.get_llm_cache_entry('old') is None
+    assert db.get_llm_cache_entry('lru') is None
+    assert db.get_llm_cache_entry('recent') is not None
+
+
+def test_storage_errors_fall_back_to_uncached_call():
+    db.DB_PATH = Path('/definitely/does/not/exist/test.db')
+    provider = FakeProvider()
+
+    text, usage = cached_evaluate(provider, 'resume A')
+
+    assert provider.calls == 1
+    assert usage['cache_hit'] is False
+    assert text.startswith('SCORE: 80')
@@ -0,0 +1,201 @@
+"""
+Tests for the shared Ollama health monitor (ollama_health.py)
+"""
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+# Add api directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import ollama_health
+from ollama_health import OllamaHealthMonitor, clear_health_monitors, get_health_monitor
+from ollama_provider import OllamaProvider
+
+
+class FakeClock:
+    """Stands in for the time module so cooldowns can be skipped instantly"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+class SlowTags(BaseHTTPRequestHandler):
+    """Answers /api/tags after a delay, counting requests"""
+
+    protocol_version = 'HTTP/1.1'
+    delay = 0.2
+    hits = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        SlowTags.hits += 1
+        time.sleep(self.delay)
+        body = json.dumps({'models': [{'name': 'mistral:latest'}, {'name': 'phi3:latest'}]}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestOllamaHealthMonitor(unittest.TestCase):
+    """Test caching, coalescing and the circuit breaker"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = patch.object(ollama_health, 'time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.monitor = OllamaHealthMonitor('http://ollama.test', ttl=10, failure_threshold=2, cooldown=5)
+        self.probe = patch.object(self.monitor, '_probe', return_value=(True, ['mistral'], None)).start()
+        self.addCleanup(patch.stopall)
+
+    def test_healthy_result_is_cached_for_ttl(self):
+        self.assertTrue(self.monitor.check())
+        self.clock.now += 9
+        self.assertTrue(self.monitor.check())
+        self.assertEqual(self.probe.call_count, 1)
+
+        self.clock.now += 2
+        self.assertTrue(self.monitor.check())
+        self.assertEqual(self.probe.call_count, 2)
+        self.assertEqual(self.monitor.models, ['mistral'])
+        self.assertEqual(self.monitor.status()['cache_hits'], 1)
+
+    def test_circuit_opens_and_fails_fast(self):
+        self.probe.return_value = (False, [], 'Cannot connect')
+
+        self.assertFalse(self.monitor.check())
+        self.assertEqual(self.monitor.circuit_state(), 'closed')
+        self.assertFalse(self.monitor.check())
+        self.assertEqual(self.monitor.circuit_state(), 'open')
+
+        for _ in range(10):
+            self.assertFalse(self.monitor.check())
+        self.assertEqual(self.probe.call_count, 2)
+        self.assertEqual(self.monitor.status()['fast_failures'], 10)
+
+    def test_failed_trial_doubles_cooldown_and_success_closes(self):
+        self.probe.return_value = (False, [], 'Cannot connect')
+        self.monitor.check()
+        self.monitor.check()
+
+        self.clock.now += 5
+        self.assertEqual(self.monitor.circuit_state(), 'half_open')
+        self.assertFalse(self.monitor.check())
+        self.assertEqual(self.monitor.status()['retry_in_seconds'], 10)
+
+        self.clock.now += 10
+        self.probe.return_value = (True, [], None)
+        self.assertTrue(self.monitor.check())
+        self.assertEqual(self.monitor.circuit_state(), 'closed')
+        self.assertEqual(self.monitor.status()['consecutive_failures'], 0)
+
+    def test_real_requests_update_the_status(self):
+        self.monitor.record_failure('Connection refused')
+        self.monitor.record_failure('Connection refused')
+        self.assertFalse(self.monitor.check())
+        self.probe.assert_not_called()
+
+        self.monitor.record_success()
+        self.assertTrue(self.monitor.check())
+        self.probe.assert_not_called()
+
+
+class TestProbeCoalescing(unittest.TestCase):
+    """Test concurrent checks against a real (slow) HTTP endpoint"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), SlowTags)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_port}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+
+    def setUp(self):
+        SlowTags.hits = 0
+        clear_health_monitors()
+        self.addCleanup(clear_health_monitors)
+
+    def test_concurrent_checks_share_one_probe(self):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(OllamaProvider(base_url=self.base_url).is_available()))
+                   for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [True] * 20)
+        self.assertEqual(SlowTags.hits, 1)
+        self.assertEqual(get_health_monitor(self.base_url).models, ['mistral:latest', 'phi3:latest'])
+
+    def test_down_server_fails_fast_once_the_circuit_opens(self):
+        provider = OllamaProvider(base_url='http://127.0.0.1:9')
+        for _ in range(ollama_health.HEALTH_FAILURE_THRESHOLD):
+            self.assertFalse(provider.is_available())
+
+        with patch.object(OllamaHealthMonitor, '_probe') as probe:
+            self.assertFalse(provider.is_available())
+        probe.assert_not_called()
+
+    def test_background_probe_keeps_the_cache_warm(self):
+        monitor = get_health_monitor(self.base_url)
+        monitor.start(interval=0.05)
+        deadline = time.time() + 2
+        while SlowTags.hits < 2 and time.time() < deadline:
+            time.sleep(0.01)
+
+        self.assertTrue(monitor.status()['background_probe'])
+        hits = SlowTags.hits
+        self.assertTrue(monitor.check())
+        self.assertLessEqual(SlowTags.hits, hits + 1)  # Served from cache (at most the background probe ran)
+        monitor.stop()
+        self.assertFalse(monitor.status()['background_probe'])
+
+    def test_generate_connection_errors_count_as_failures(self):
+        provider = OllamaProvider(base_url='http://127.0.0.1:9')
+
+        with self.assertRaises(Exception):
+            provider.evaluate('prompt')
+
+        self.assertEqual(get_health_monitor('http://127.0.0.1:9').status()['consecutive_failures'], 1)
+
+
+class TestStatusEndpoint(unittest.TestCase):
+    """Test /api/ollama/status served from the monitor"""
+
+    def setUp(self):
+        from flask_server import app
+        app.config['TESTING'] = True
+        self.client = app.test_client()
+        clear_health_monitors()
+        self.addCleanup(clear_health_monitors)
+
+    def test_status_reports_models_and_health(self):
+        with patch.object(OllamaHealthMonitor, '_probe', return_value=(True, ['mistral:latest'], None)) as probe:
+            first = self.client.get('/api/ollama/status').get_json()
+            second = self.client.get('/api/ollama/status').get_json()
+
+        self.assertTrue(first['available'])
+        self.assertEqual(second['models'], ['mistral:latest'])
+        self.assertEqual(second['health']['circuit'], 'closed')
+        self.assertEqual(probe.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,199 @@
+"""
+Tests for Ollama keep-alive, model warm-up and model-grouped queue scheduling
+Runs against a fake Ollama server that charges a load cost whenever a model
+isn't resident
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add api directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import database as db
+import eval_queue
+import flask_server
+import llm_cache
+from ollama_provider import OllamaProvider, parse_keep_alive, warm_up_models
+
+
+LOAD_SECONDS = 0.05
+QUICK_RESPONSE = "A_SCORE: 80\nT_SCORE: 70\nQ_SCORE: 90\nSCORE: 79\nREASONING: Solid."
+
+
+class FakeOllama(BaseHTTPRequestHandler):
+    """Keeps up to server.capacity models loaded (LRU) and sleeps LOAD_SECONDS to load one"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        state = self.server
+        with state.lock:
+            loaded = list(state.loaded)
+        if self.path == '/api/ps':
+            self._send({'models': [{'name': name} for name in loaded]})
+        else:
+            self._send({'models': [{'name': name} for name in ('phi3', 'mistral', 'llama3')]})
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        state = self.server
+        model = request['model']
+
+        with state.lock:
+            state.requests.append(request)
+            cold = model not in state.loaded
+            if cold:
+                state.loads.append(model)
+                time.sleep(LOAD_SECONDS)
+                state.loaded[model] = True
+                while len(state.loaded) > state.capacity:
+                    state.loaded.popitem(last=False)
+            state.loaded.move_to_end(model)
+            if request.get('keep_alive') == 0:
+                del state.loaded[model]
+
+        load_duration = int(LOAD_SECONDS * 1e9) if cold else 0
+        if 'prompt' not in request:
+            self._send({'model': model, 'done': True, 'load_duration': load_duration})
+        else:
+            self._send({'model': model, 'response': QUICK_RESPONSE, 'done': True,
+                        'prompt_eval_count': 10, 'eval_count': 5,
+                        'load_duration': load_duration, 'eval_duration': 10_000_000})
+
+
+@pytest.fixture
+def ollama():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeOllama)
+    server.lock = threading.Lock()
+    server.loaded = OrderedDict()
+    server.loads = []
+    server.requests = []
+    server.capacity = 1
+    server.url = f'http://127.0.0.1:{server.server_port}'
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    with patch.object(OllamaProvider, 'DEFAULT_BASE_URL', server.url), \
+            patch.object(llm_cache, 'CACHE_ENABLED', False):
+        yield server
+    server.shutdown()
+
+
+@pytest.fixture
+def temp_db():
+    temp_dir = tempfile.mkdtemp()
+    original_db_path = db.DB_PATH
+    db.DB_PATH = Path(temp_dir) / "test.db"
+    db.ensure_eval_job_tables_exist()
+    yield
+    db.DB_PATH = original_db_path
+    shutil.rmtree(temp_dir)
+
+
+def test_keep_alive_is_sent_with_every_request(ollama):
+    OllamaProvider(model='phi3').evaluate('prompt')
+    OllamaProvider(model='phi3', keep_alive='600').evaluate('prompt')
+
+    assert ollama.requests[0]['keep_alive'] == '30m'
+    assert ollama.requests[1]['keep_alive'] == 600
+    assert parse_keep_alive('-1') == -1
+    assert parse_keep_alive(' 1h ') == '1h'
+
+
+def test_warm_up_moves_the_load_out_of_the_first_evaluation(ollama):
+    provider = OllamaProvider(model='mistral')
+
+    warmed = provider.warm_up()
+    _, usage = provider.evaluate('prompt')
+
+    assert warmed['success'] is True
+    assert warmed['load_seconds'] == LOAD_SECONDS
+    assert 'prompt' not in ollama.requests[0]
+    assert usage['load_seconds'] == 0
+    assert provider.get_loaded_models() == ['mistral']
+
+
+def test_warm_up_models_only_fills_available_slots(ollama):
+    ollama.capacity = 2
+
+    warmed = warm_up_models(max_models=2)
+
+    assert [r['model'] for r in warmed['results']] == ['phi3', 'mistral']
+    assert warmed['skipped'] == ['llama3']
+    assert sorted(OllamaProvider().get_loaded_models()) == ['mistral', 'phi3']
+
+
+def test_warm_up_reports_unreachable_server():
+    result = OllamaProvider(model='phi3', base_url='http://127.0.0.1:9').warm_up()
+
+    assert result['success'] is False
+    assert result['error']
+
+
+def test_warmup_endpoint(ollama):
+    flask_server.app.config['TESTING'] = True
+    client = flask_server.app.test_client()
+
+    with patch.dict(os.environ, {'OLLAMA_MAX_LOADED_MODELS': '3'}):
+        data = client.post('/api/ollama/warmup', json={'models': ['llama3']}).get_json()
+
+    assert data['success'] is True
+    assert [r['model'] for r in data['results']] == ['llama3']
+    assert ollama.loads == ['llama3']
+
+
+def _queue_quick_jobs(models):
+    """One 3-candidate quick job per model, submitted a few seconds apart"""
+    candidates = [{'name': f'Candidate {i}', 'resume_text': 'resume'} for i in range(3)]
+    jobs = [
+        db.create_eval_job('local-user', 'quick', {'title': 'Engineer'}, candidates, {'model': model})
+        for model in models
+    ]
+    with db.get_db() as conn:
+        for age, job in enumerate(reversed(jobs), start=1):
+            conn.execute("UPDATE eval_jobs SET created_at = datetime('now', ?) WHERE id = ?",
+                         (f'-{age} seconds', job['id']))
+        conn.commit()
+    return jobs
+
+
+def test_queue_groups_quick_items_by_model(ollama, temp_db):
+    jobs = _queue_quick_jobs(['phi3', 'mistral', 'phi3'])
+
+    assert eval_queue.run_worker(stop_after_idle=True) == 9
+
+    # phi3 stays loaded for both phi3 jobs before mistral is loaded once
+    assert ollama.loads == ['phi3', 'mistral']
+    assert all(db.get_eval_job(job['id'])['done'] == 3 for job in jobs)
+
+
+def test_long_waiting_jobs_are_not_starved(ollama, temp_db):
+    jobs = _queue_quick_jobs(['phi3', 'mistral', 'phi3'])
+    with db.get_db() as conn:
+        for job, age in ((jobs[0], '-2 hours'), (jobs[1], '-1 hour')):
+            conn.execute("UPDATE eval_jobs SET created_at = datetime('now', ?) WHERE id = ?", (age, job['id']))
+        conn.commit()
+
+    eval_queue.run_worker(stop_after_idle=True)
+
+    assert ollama.loads == ['phi3', 'mistral', 'phi3']
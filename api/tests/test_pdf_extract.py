@@ -0,0 +1,138 @@
+"""
+Tests for PDF text extraction (pdf_extract.py): fast text-layer path, layout fallback and time budget
+"""
+import os
+import sys
+import time
+import unittest
+from unittest.mock import patch
+
+# Add api directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pdf_extract
+from pdf_extract import _split_ranges, extract_pdf_text
+
+
+def make_pdf(pages):
+    """Minimal PDF with one Helvetica text line per entry of each page's list of lines"""
+    objects = ['<< /Type /Catalog /Pages 2 0 R >>', None,
+               '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for lines in pages:
+        stream = 'BT /F1 12 Tf 72 720 Td 14 TL ' + ' '.join(f'({line}) Tj T*' for line in lines) + ' ET'
+        objects.append(f'<< /Length {len(stream)} >>\nstream\n{stream}\nendstream')
+        objects.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                       f'/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>')
+        kids.append(f'{len(objects)} 0 R')
+    objects[1] = f'<< /Type /Pages /Kids [{" ".join(kids)}] /Count {len(kids)} >>'
+
+    out = b'%PDF-1.4\n'
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f'{number} 0 obj\n{body}\nendobj\n'.encode('latin-1')
+    xref = len(out)
+    out += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode()
+    out += ''.join(f'{offset:010d} 00000 n \n' for offset in offsets).encode()
+    out += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode()
+    return out
+
+
+PAGES = [
+    ['Jane Doe', 'Senior Engineer at Acme Corp, 2019-2024'],
+    [],  # Blank (e.g. scanned) page
+    ['Education: BSc Computer Science, State University'],
+]
+EXPECTED_TEXT = ('Jane Doe\nSenior Engineer at Acme Corp, 2019-2024\n\n'
+                 'Education: BSc Computer Science, State University')
+
+
+@unittest.skipIf(pdf_extract.pdfium is None, 'pypdfium2 not installed')
+class TestFastPath(unittest.TestCase):
+    """Test that the text layer is used when it has the text"""
+
+    def test_text_pages_use_the_fast_path(self):
+        result = extract_pdf_text(make_pdf(PAGES), processes=1)
+
+        self.assertEqual(result['text'], EXPECTED_TEXT)
+        self.assertEqual(result['page_count'], 3)
+        self.assertEqual(result['fast_pages'], 2)
+        self.assertEqual(result['layout_pages'], 0)
+        self.assertFalse(result['timed_out'])
+
+    def test_pages_without_a_text_layer_fall_back_to_layout(self):
+        original = pdf_extract._fast_page_texts
+
+        def missing_first_page(data, deadline):
+            texts = original(data, deadline)
+            texts[0] = ''
+            return texts
+
+        with patch.object(pdf_extract, '_fast_page_texts', side_effect=missing_first_page):
+            result = extract_pdf_text(make_pdf(PAGES), processes=1)
+
+        self.assertEqual(result['text'], EXPECTED_TEXT)
+        self.assertEqual(result['fast_pages'], 1)
+        self.assertEqual(result['layout_pages'], 1)
+
+
+class TestLayoutPath(unittest.TestCase):
+    """Test layout extraction in-process and across worker processes"""
+
+    def test_worker_pool_matches_in_process_extraction(self):
+        pages = [[f'Company {i}, Engineer, {2024 - i}'] for i in range(6)]
+        data = make_pdf(pages)
+
+        with patch.object(pdf_extract, 'pdfium', None):
+            in_process = extract_pdf_text(data, processes=1)
+            pooled = extract_pdf_text(data, processes=3)
+
+        self.assertEqual(pooled['text'], in_process['text'])
+        self.assertEqual(pooled['text'], '\n\n'.join(f'Company {i}, Engineer, {2024 - i}' for i in range(6)))
+        self.assertEqual(pooled['layout_pages'], 6)
+        self.assertFalse(pooled['timed_out'])
+
+    def test_small_documents_skip_the_worker_pool(self):
+        with patch.object(pdf_extract, 'pdfium', None), \
+                patch.object(pdf_extract, '_run_layout_pool') as run_pool:
+            result = extract_pdf_text(make_pdf(PAGES), processes=4)
+
+        run_pool.assert_not_called()
+        self.assertEqual(result['text'], EXPECTED_TEXT)
+        self.assertEqual(result['layout_pages'], 2)
+
+    def test_split_ranges_keeps_page_order(self):
+        self.assertEqual(_split_ranges([0, 1, 2, 3, 4], 2), [[0, 1, 2], [3, 4]])
+        self.assertEqual(_split_ranges([4, 7], 4), [[4], [7]])
+
+
+class TestTimeBudget(unittest.TestCase):
+    """Test that a document that runs over budget returns partial text"""
+
+    def test_in_process_extraction_stops_at_the_deadline(self):
+        original = pdf_extract._layout_page_texts
+
+        def slow_layout(data, page_indexes, deadline=None):
+            texts = original(data, page_indexes[:1])  # First page, then the budget runs out
+            time.sleep(0.3)
+            return texts
+
+        with patch.object(pdf_extract, 'pdfium', None), \
+                patch.object(pdf_extract, '_layout_page_texts', side_effect=slow_layout):
+            result = extract_pdf_text(make_pdf(PAGES), time_budget=0.1, processes=1)
+
+        self.assertTrue(result['timed_out'])
+        self.assertEqual(result['text'], 'Jane Doe\nSenior Engineer at Acme Corp, 2019-2024')
+
+    def test_exhausted_budget_skips_the_layout_path(self):
+        with patch.object(pdf_extract, 'pdfium', None):
+            result = extract_pdf_text(make_pdf(PAGES), time_budget=0, processes=2)
+
+        self.assertTrue(result['timed_out'])
+        self.assertEqual(result['text'], '')
+        self.assertEqual(result['page_count'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
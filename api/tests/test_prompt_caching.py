@@ -0,0 +1,139 @@
+"""
+Tests for the cacheable Stage 1 prompt prefix and provider prompt caching
+"""
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+# Add api directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ai_evaluator import build_stage1_prompt, build_stage1_prompt_parts, evaluate_candidate_with_ai
+from llm_providers import AnthropicProvider, OpenAIProvider, PromptWithPrefix
+
+
+JOB = {
+    'title': 'Campus Minister',
+    'must_have_requirements': ['M.Div'],
+    'preferred_requirements': ['Bilingual'],
+    'summary': 'Lead campus ministry programs'
+}
+ANN = {'name': 'Ann', 'resume_text': 'Ten years of ministry leadership'}
+BOB = {'name': 'Bob', 'resume_text': 'Youth pastor'}
+
+
+def anthropic_message(text, **usage):
+    return SimpleNamespace(content=[SimpleNamespace(text=text)], usage=SimpleNamespace(**usage))
+
+
+class TestPromptParts(unittest.TestCase):
+    """Test splitting the Stage 1 prompt into shared prefix and per-candidate suffix"""
+
+    def test_prefix_is_shared_and_suffix_is_per_candidate(self):
+        ann_prefix, ann_suffix = build_stage1_prompt_parts('SKILL', JOB, ANN)
+        bob_prefix, bob_suffix = build_stage1_prompt_parts('SKILL', JOB, BOB)
+
+        self.assertEqual(ann_prefix, bob_prefix)
+        self.assertIn('Campus Minister', ann_prefix)
+        self.assertNotIn('Ann', ann_prefix)
+        self.assertIn('Ten years of ministry leadership', ann_suffix)
+        self.assertIn('Youth pastor', bob_suffix)
+
+    def test_full_prompt_is_prefix_plus_suffix(self):
+        prompt = build_stage1_prompt('SKILL', JOB, ANN)
+
+        self.assertIsInstance(prompt, PromptWithPrefix)
+        self.assertEqual(prompt, prompt.prefix + prompt.suffix)
+        self.assertTrue(prompt.startswith('SKILL\n\n---\n\nTASK: Perform Stage 1'))
+
+
+class TestAnthropicPromptCaching(unittest.TestCase):
+    """Test cache_control blocks and cached-token usage reporting"""
+
+    def setUp(self):
+        self.provider = AnthropicProvider(api_key='test-key', model='claude-3-5-haiku-20241022')
+        self.provider.client = MagicMock()
+
+    def test_prefix_is_marked_cacheable(self):
+        self.provider.client.messages.create.return_value = anthropic_message(
+            'SCORE: 80', input_tokens=300, output_tokens=100,
+            cache_creation_input_tokens=0, cache_read_input_tokens=2000
+        )
+
+        _, usage = self.provider.evaluate(build_stage1_prompt('SKILL', JOB, ANN))
+
+        content = self.provider.client.messages.create.call_args.kwargs['messages'][0]['content']
+        self.assertEqual(content[0]['cache_control'], {'type': 'ephemeral'})
+        self.assertIn('Campus Minister', content[0]['text'])
+        self.assertNotIn('cache_control', content[1])
+        self.assertIn('Ten years of ministry leadership', content[1]['text'])
+
+        self.assertEqual(usage['cache_read_input_tokens'], 2000)
+        self.assertEqual(usage['cache_creation_input_tokens'], 0)
+        # (300 + 2000 * 0.1) * $0.25/M + 100 * $1.25/M
+        self.assertAlmostEqual(usage['cost'], 0.0003, places=4)
+
+    def test_plain_prompts_are_sent_unchanged(self):
+        self.provider.client.messages.create.return_value = anthropic_message(
+            'SCORE: 80', input_tokens=10, output_tokens=5
+        )
+
+        _, usage = self.provider.evaluate('plain prompt')
+
+        content = self.provider.client.messages.create.call_args.kwargs['messages'][0]['content']
+        self.assertEqual(content, 'plain prompt')
+        self.assertEqual(usage['cache_read_input_tokens'], 0)
+
+    def test_caching_can_be_disabled(self):
+        provider = AnthropicProvider(api_key='test-key', prompt_caching=False)
+
+        params = provider._request_params(build_stage1_prompt('SKILL', JOB, ANN))
+
+        self.assertIsInstance(params['messages'][0]['content'], str)
+
+
+class TestOpenAICachedTokens(unittest.TestCase):
+    """Test reporting of OpenAI's automatic prefix caching"""
+
+    def test_cached_tokens_reported_and_discounted(self):
+        provider = OpenAIProvider(api_key='test-key', model='gpt-4o-mini')
+        provider.client = MagicMock()
+        provider.client.chat.completions.create.return_value = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content='SCORE: 80'))],
+            usage=SimpleNamespace(prompt_tokens=3000, completion_tokens=100,
+                                  prompt_tokens_details=SimpleNamespace(cached_tokens=2048))
+        )
+
+        _, usage = provider.evaluate('prompt')
+
+        self.assertEqual(usage['input_tokens'], 3000)
+        self.assertEqual(usage['cache_read_input_tokens'], 2048)
+        # (952 + 2048 * 0.5) * $0.15/M + 100 * $0.60/M
+        self.assertAlmostEqual(usage['cost'], 0.0004, places=4)
+
+
+class TestEvaluationUsage(unittest.TestCase):
+    """Test that evaluate_candidate_with_ai passes cached-token counts through"""
+
+    def test_usage_includes_cached_tokens(self):
+        provider = MagicMock()
+        provider.get_provider_name.return_value = 'anthropic'
+        provider.model = 'claude-3-5-haiku-20241022'
+        provider.temperature = 1.0
+        provider.evaluate.return_value = ('SCORE: 80\nA_SCORE: 80\nT_SCORE: 80\nQ_SCORE: 80', {
+            'input_tokens': 300, 'output_tokens': 100, 'cost': 0.001, 'model': provider.model,
+            'cache_creation_input_tokens': 0, 'cache_read_input_tokens': 2000
+        })
+
+        with patch('ai_evaluator.get_provider', return_value=provider), \
+                patch('llm_cache.CACHE_ENABLED', False):
+            result = evaluate_candidate_with_ai(JOB, ANN)
+
+        self.assertEqual(result['usage']['cache_read_input_tokens'], 2000)
+        self.assertEqual(result['usage']['cache_creation_input_tokens'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+"""
+Tests for the process-wide provider registry and shared keep-alive connections
+"""
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+# Add api directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import httpx
+
+import llm_providers
+import ollama_provider
+from llm_providers import clear_provider_cache, get_provider, get_provider_stats, get_rate_limiter
+
+
+class KeepAliveStub(BaseHTTPRequestHandler):
+    """Answers Anthropic /v1/messages and Ollama /api/generate over HTTP/1.1 keep-alive"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        if self.path == '/api/generate':
+            payload = {'response': 'SCORE: 80', 'prompt_eval_count': 10, 'eval_count': 5}
+        else:
+            payload = {
+                'id': 'msg_1', 'type': 'message', 'role': 'assistant', 'model': 'claude-3-5-haiku-20241022',
+                'content': [{'type': 'text', 'text': 'SCORE: 80'}],
+                'stop_reason': 'end_turn', 'stop_sequence': None,
+                'usage': {'input_tokens': 10, 'output_tokens': 5}
+            }
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def stub_url():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveStub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry():
+    clear_provider_cache()
+    with patch.dict(os.environ, {'ANTHROPIC_API_KEY': 'key-a', 'OPENAI_API_KEY': 'key-o'}):
+        yield
+    clear_provider_cache()
+
+
+def test_instances_are_cached_per_provider_model_and_key():
+    first = get_provider('anthropic', model='claude-3-5-haiku-20241022')
+
+    assert get_provider('Anthropic', model='claude-3-5-haiku-20241022') is first
+    assert get_provider('anthropic', model='claude-3-5-haiku-20241022', api_key='key-a') is first
+    assert get_provider('anthropic', model='claude-3-5-haiku-20241022', api_key='key-b') is not first
+    assert get_provider('anthropic', model='claude-haiku-4-5-20251001') is not first
+    assert get_provider_stats()['providers'] == {'cached': 3, 'created': 3, 'reused': 2}
+
+
+def test_instances_share_one_http_client_per_provider():
+    haiku = get_provider('anthropic', model='claude-3-5-haiku-20241022')
+    sonnet = get_provider('anthropic', model='claude-3-5-sonnet-20241022', api_key='key-b')
+    gpt = get_provider('openai', model='gpt-4o-mini')
+
+    assert haiku.client._client is sonnet.client._client
+    assert gpt.client._client is not haiku.client._client
+
+
+def test_registry_is_thread_safe():
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        providers = list(executor.map(lambda _: get_provider('openai', model='gpt-4o-mini'), range(64)))
+
+    assert all(provider is providers[0] for provider in providers)
+    assert get_provider_stats()['providers']['created'] == 1
+
+
+def test_registry_keeps_the_most_recently_used_entries():
+    with patch.object(llm_providers, 'REGISTRY_MAX_ENTRIES', 2):
+        first = get_provider('anthropic', api_key='key-1')
+        second = get_provider('anthropic', api_key='key-2')
+        assert get_provider('anthropic', api_key='key-1') is first
+        get_provider('anthropic', api_key='key-3')
+
+        assert get_provider_stats()['providers']['cached'] == 2
+        assert get_provider('anthropic', api_key='key-1') is first
+        assert get_provider('anthropic', api_key='key-2') is not second
+
+        limiter = get_rate_limiter('openai', 'key-1')
+        get_rate_limiter('openai', 'key-2')
+        get_rate_limiter('openai', 'key-3')
+        assert len(get_provider_stats()['rate_limits']) == 2
+        assert get_rate_limiter('openai', 'key-1') is not limiter
+
+
+def test_missing_api_key_is_not_cached():
+    with patch.dict(os.environ, {'ANTHROPIC_API_KEY': ''}):
+        with pytest.raises(ValueError):
+            get_provider('anthropic')
+
+    assert get_provider_stats()['providers']['cached'] == 0
+
+
+def test_anthropic_calls_reuse_one_connection(stub_url):
+    with patch.dict(os.environ, {'ANTHROPIC_BASE_URL': stub_url}):
+        provider = get_provider('anthropic', model='claude-3-5-haiku-20241022')
+        for _ in range(3):
+            get_provider('anthropic', model='claude-3-5-haiku-20241022').evaluate('prompt')
+
+    stats = get_provider_stats()['http']['anthropic']
+    assert provider.client.base_url.host == '127.0.0.1'
+    assert stats['requests'] == 3
+    assert stats['connections_opened'] == 1
+    assert stats['reuse_ratio'] == pytest.approx(0.667, abs=0.001)
+
+
+def test_connection_counting_keeps_the_callers_trace(stub_url):
+    transport = llm_providers._CountingTransport()
+    events = []
+    with httpx.Client(transport=transport) as client:
+        for _ in range(2):
+            client.post(f'{stub_url}/api/generate', json={}, extensions={'trace': lambda name, info: events.append(name)})
+
+    assert transport.stats()['requests'] == 2
+    assert transport.stats()['connections_opened'] == 1
+    assert events.count('connection.connect_tcp.complete') == 1
+
+    # Stats don't depend on httpx internals
+    del transport._pool
+    assert transport.stats()['open_connections'] is None
+
+
+def test_ollama_calls_share_a_session(stub_url):
+    before = ollama_provider.get_session_stats() or {'requests': 0, 'connections_opened': 0}
+
+    for model in ('phi3', 'mistral', 'phi3'):
+        ollama_provider.OllamaProvider(model=model, base_url=stub_url).evaluate('prompt')
+
+    after = get_provider_stats()['http']['ollama']
+    assert after['requests'] - before['requests'] == 3
+    assert after['connections_opened'] - before['connections_opened'] == 1
@@ -0,0 +1,249 @@
+"""
+Tests for streamed Ollama generation and incremental quick-score parsing
+"""
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+# Add api directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import llm_cache
+from ollama_provider import (
+    QUICK_SCORE_FIELDS, QUICK_SCORE_REQUIRED_FIELDS, OllamaProvider, QuickScoreParser, arun_quick_score,
+    parse_quick_score_response, run_quick_score
+)
+
+
+RESPONSE = (
+    "MUST-HAVE IDENTIFIED:\n- Python\n- React\n"
+    "PREFERRED IDENTIFIED:\n- AWS\n"
+    "MATCH ANALYSIS:\n- Python: strong\n- React: partial\n"
+    "A_SCORE: 82\nT_SCORE: 70\nQ_SCORE: 64\nSCORE: 75\n"
+    "REASONING: Strong Python background with some React exposure.\n"
+    + "Additional detail that the UI does not need. " * 40
+)
+
+
+def pieces(text, size=3):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class StreamingOllama(BaseHTTPRequestHandler):
+    """Streams RESPONSE from /api/generate as NDJSON pieces, like Ollama does with stream: true"""
+
+    protocol_version = 'HTTP/1.1'
+    delay = 0.002
+    sent = []  # Pieces written per request, until the client hung up
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        assert request['stream'] is True
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        records = [{'response': piece, 'done': False} for piece in pieces(RESPONSE)]
+        records.append({'response': '', 'done': True, 'prompt_eval_count': 40, 'eval_count': len(records),
+                        'eval_duration': 500_000_000})
+        count = 0
+        try:
+            for record in records:
+                line = (json.dumps(record) + '\n').encode('utf-8')
+                self.wfile.write(f'{len(line):x}\r\n'.encode('ascii') + line + b'\r\n')
+                self.wfile.flush()
+                count += 1
+                time.sleep(self.delay)
+            self.wfile.write(b'0\r\n\r\n')
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            StreamingOllama.sent.append(count)
+        self.close_connection = True
+
+
+class TestQuickScoreParser(unittest.TestCase):
+    """Test the incremental parser against the whole-response parser"""
+
+    def test_chunked_feed_matches_whole_response(self):
+        expected = parse_quick_score_response(RESPONSE, model='mistral')
+        for size in (1, 2, 7, 50, len(RESPONSE)):
+            parser = QuickScoreParser(model='mistral')
+            for piece in pieces(RESPONSE, size):
+                parser.feed(piece)
+            result = parser.finish()
+            result['evaluated_at'] = expected['evaluated_at']
+            self.assertEqual(result, expected, f'chunk size {size}')
+
+    def test_scores_are_published_when_their_line_ends(self):
+        parser = QuickScoreParser()
+
+        self.assertEqual(parser.feed('A_SCORE: 8'), {})
+        self.assertEqual(parser.feed('2\nT_SCORE: 70\nQ_'), {'a_score': 82, 't_score': 70})
+        self.assertFalse(parser.has(QUICK_SCORE_FIELDS))
+        self.assertEqual(parser.feed('SCORE: 64\nSCORE: 75\n'), {'q_score': 64, 'score': 75})
+        self.assertTrue(parser.has(QUICK_SCORE_FIELDS))
+
+        parser.feed('REASONING: Strong')
+        self.assertFalse(parser.has(QUICK_SCORE_REQUIRED_FIELDS))
+        parser.feed(' background.\n')
+        self.assertTrue(parser.has(QUICK_SCORE_REQUIRED_FIELDS))
+        self.assertEqual(parser.finish()['reasoning'], 'Strong background.')
+
+
+class TestEvaluateStream(unittest.TestCase):
+    """Test streamed generation against a fake Ollama server"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StreamingOllama)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_port}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+
+    def setUp(self):
+        StreamingOllama.sent.clear()
+        self.provider = OllamaProvider(model='mistral', base_url=self.base_url)
+
+    def wait_for_server(self):
+        deadline = time.time() + 2
+        while not StreamingOllama.sent and time.time() < deadline:
+            time.sleep(0.01)
+        return StreamingOllama.sent[0]
+
+    def test_full_stream_collects_text_and_usage(self):
+        received = []
+        text, usage = self.provider.evaluate_stream('prompt', on_text=received.append)
+
+        self.assertEqual(text, RESPONSE)
+        self.assertEqual(''.join(received), RESPONSE)
+        self.assertEqual(usage['input_tokens'], 40)
+        self.assertEqual(usage['eval_seconds'], 0.5)
+        self.assertNotIn('stopped_early', usage)
+
+    def test_stop_closes_the_stream(self):
+        parser = QuickScoreParser()
+        text, usage = self.provider.evaluate_stream(
+            'prompt', on_text=parser.feed, should_stop=lambda: parser.has(QUICK_SCORE_REQUIRED_FIELDS)
+        )
+
+        self.assertTrue(usage['stopped_early'])
+        self.assertTrue(text.endswith('React exposure.\n'))
+        self.assertEqual(usage['output_tokens'], len(pieces(text)))
+        # The server saw the disconnect instead of writing out the rest of the response
+        self.assertLess(self.wait_for_server(), len(pieces(RESPONSE)))
+
+    def test_quick_score_publishes_updates_and_stops(self):
+        updates = []
+        with patch.object(llm_cache, 'CACHE_ENABLED', False):
+            result = run_quick_score(self.provider, {'title': 'Engineer'}, {'id': 'c1', 'resume_text': 'r'},
+                                     on_update=updates.append, stop_fields=QUICK_SCORE_REQUIRED_FIELDS)
+
+        self.assertEqual(updates, [{'a_score': 82}, {'t_score': 70}, {'q_score': 64}, {'score': 75}])
+        self.assertEqual(result['score'], 75)
+        self.assertEqual(result['reasoning'], 'Strong Python background with some React exposure.')
+        self.assertEqual(result['requirements_identified']['must_have'], ['Python', 'React'])
+        self.assertTrue(result['usage']['stopped_early'])
+
+    def test_async_quick_score_stops_on_scores(self):
+        with patch.object(llm_cache, 'CACHE_ENABLED', False):
+            result = asyncio.run(arun_quick_score(self.provider, {'title': 'Engineer'}, {'id': 'c1'},
+                                                  stop_fields=QUICK_SCORE_FIELDS))
+
+        self.assertEqual((result['a_score'], result['t_score'], result['q_score'], result['score']), (82, 70, 64, 75))
+        self.assertEqual(result['reasoning'], '')
+        self.assertTrue(result['usage']['stopped_early'])
+
+    def test_stopped_responses_are_not_cached(self):
+        with patch.object(llm_cache, 'CACHE_ENABLED', True), \
+                patch.object(llm_cache, 'get_cached_response', return_value=None), \
+                patch.object(llm_cache, 'store_response') as store:
+            run_quick_score(self.provider, {'title': 'Engineer'}, {'id': 'c1'}, stop_fields=QUICK_SCORE_FIELDS)
+            store.assert_not_called()
+            run_quick_score(self.provider, {'title': 'Engineer'}, {'id': 'c1'}, on_update=lambda updates: None)
+            store.assert_called_once()
+
+    def test_cache_hit_replays_updates(self):
+        updates = []
+        cached = (RESPONSE, {'input_tokens': 40, 'output_tokens': 300, 'cost': 0.0})
+        with patch.object(llm_cache, 'CACHE_ENABLED', True), \
+                patch.object(llm_cache, 'get_cached_response', return_value=cached):
+            result = run_quick_score(self.provider, {'title': 'Engineer'}, {'id': 'c1'}, on_update=updates.append)
+
+        self.assertEqual(updates, [{'a_score': 82, 't_score': 70, 'q_score': 64, 'score': 75}])
+        self.assertTrue(result['usage']['cache_hit'])
+        self.assertEqual(StreamingOllama.sent, [])
+
+
+class TestQuickBatchProgress(unittest.TestCase):
+    """Test progress records and stop_early on /api/evaluate_quick/batch"""
+
+    def setUp(self):
+        from flask_server import app
+        app.config['TESTING'] = True
+        self.client = app.test_client()
+
+    def test_stream_emits_progress_before_results(self):
+        async def fake_aevaluate_stream(self, prompt, on_text=None, should_stop=None):
+            for piece in pieces(RESPONSE, 20):
+                on_text(piece)
+                await asyncio.sleep(0)
+                if should_stop and should_stop():
+                    return RESPONSE, {'input_tokens': 0, 'output_tokens': 1, 'cost': 0.0, 'stopped_early': True}
+            return RESPONSE, {'input_tokens': 10, 'output_tokens': 5, 'cost': 0.0}
+
+        with patch('flask_server.OllamaProvider.is_available', return_value=True), \
+                patch('flask_server.OllamaProvider.aevaluate_stream', autospec=True, side_effect=fake_aevaluate_stream):
+            response = self.client.post('/api/evaluate_quick/batch', json={
+                'job': {'title': 'Engineer'},
+                'candidates': [{'id': 'c1', 'resume_text': 'a'}, {'id': 'c2', 'resume_text': 'b'}],
+                'parallelism': 2,
+                'use_cache': False,
+                'stream': True,
+                'progress': True,
+                'stop_early': True
+            })
+            records = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+        for candidate_id in ('c1', 'c2'):
+            mine = [r for r in records if r.get('candidate_id') == candidate_id]
+            progress = [r for r in mine if r['type'] == 'progress']
+            self.assertEqual({k: v for r in progress for k, v in r.items() if k.endswith('score')},
+                             {'a_score': 82, 't_score': 70, 'q_score': 64, 'score': 75})
+            self.assertEqual(mine[-1]['type'], 'result')
+            self.assertTrue(mine[-1]['usage']['stopped_early'])
+        self.assertEqual(records[-1]['type'], 'summary')
+        self.assertEqual(records[-1]['succeeded'], 2)
+
+    def test_plain_batch_is_unchanged_without_options(self):
+        async def fake_aevaluate(prompt):
+            return RESPONSE, {'input_tokens': 10, 'output_tokens': 5, 'cost': 0.0}
+
+        with patch('flask_server.OllamaProvider.is_available', return_value=True), \
+                patch('flask_server.OllamaProvider.aevaluate', side_effect=fake_aevaluate), \
+                patch('flask_server.OllamaProvider.aevaluate_stream') as aevaluate_stream:
+            response = self.client.post('/api/evaluate_quick/batch', json={
+                'job': {'title': 'Engineer'},
+                'candidates': [{'id': 'c1', 'resume_text': 'a'}],
+                'use_cache': False
+            })
+
+        self.assertEqual(response.get_json()['results'][0]['score'], 75)
+        aevaluate_stream.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
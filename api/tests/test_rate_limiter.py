@@ -0,0 +1,279 @@
+"""
+Tests for the client-side RPM/TPM rate limiter and retry backoff
+"""
+import asyncio
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import anthropic
+import httpx
+import pytest
+
+# Add api directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import llm_providers
+from llm_providers import (
+    EXPECTED_OUTPUT_TOKENS, AnthropicProvider, RateLimiter, clear_provider_cache, estimate_tokens,
+    get_provider, get_provider_stats, get_rate_limiter
+)
+
+
+class FakeClock:
+    """Stands in for the time module so waits advance a virtual clock instantly"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    fake = FakeClock()
+    with patch.object(llm_providers, 'time', fake):
+        yield fake
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry():
+    clear_provider_cache()
+    yield
+    clear_provider_cache()
+
+
+def rate_limit_error(retry_after=None):
+    headers = {'retry-after': str(retry_after)} if retry_after is not None else {}
+    response = httpx.Response(429, headers=headers, request=httpx.Request('POST', 'https://api.anthropic.com'))
+    return anthropic.RateLimitError('rate limited', response=response, body=None)
+
+
+def test_estimate_tokens():
+    assert estimate_tokens('') == 0
+    assert estimate_tokens('abcd' * 100) == 100
+    assert estimate_tokens('abcde') == 2
+
+
+def test_requests_per_minute_paces_calls_at_the_limit(clock):
+    limiter = RateLimiter('anthropic', rpm=60)
+    start = clock.now
+
+    for _ in range(70):
+        limiter.call(lambda: 'ok', 0)
+
+    # The first 60 fit the full bucket, the next 10 refill at one per second
+    assert clock.now - start == pytest.approx(10, abs=0.01)
+    assert limiter.stats()['calls'] == 70
+    assert limiter.stats()['throttled'] == 10
+
+
+def test_tokens_per_minute_budget_uses_estimates_and_real_usage(clock):
+    limiter = RateLimiter('anthropic', tpm=10_000)
+    prompt_tokens = 2_000
+    reserved = prompt_tokens + EXPECTED_OUTPUT_TOKENS
+
+    for _ in range(3):
+        limiter.call(lambda: SimpleNamespace(used=reserved), prompt_tokens, lambda r: r.used)
+    assert clock.sleeps == []
+
+    # Three reservations left 10000 - 3 * 3024 tokens; a fourth call has to wait for the refill
+    limiter.call(lambda: SimpleNamespace(used=reserved), prompt_tokens, lambda r: r.used)
+    assert sum(clock.sleeps) == pytest.approx((4 * reserved - 10_000) * 60 / 10_000, abs=0.01)
+
+    # A response that used fewer tokens than reserved gives the difference back
+    before = limiter.stats()['tokens_available']
+    limiter.call(lambda: SimpleNamespace(used=100), 0)
+    limiter.settle(reserved, 100)
+    assert limiter.stats()['tokens_available'] == before + reserved - 100
+
+
+def test_oversized_call_waits_for_a_full_bucket_instead_of_forever(clock):
+    limiter = RateLimiter('openai', tpm=1_000)
+
+    limiter.call(lambda: 'ok', 50_000)
+    limiter.call(lambda: 'ok', 50_000)
+
+    assert sum(clock.sleeps) <= 61
+
+
+def test_limits_are_learned_from_headers(clock):
+    limiter = RateLimiter('anthropic')
+    limiter.update_from_headers({
+        'anthropic-ratelimit-requests-limit': '50',
+        'anthropic-ratelimit-requests-remaining': '0',
+        'anthropic-ratelimit-tokens-limit': '40000',
+        'anthropic-ratelimit-tokens-remaining': '39000'
+    })
+
+    stats = limiter.stats()
+    assert stats['rpm_limit'] == 50
+    assert stats['tpm_limit'] == 40000
+    assert stats['tokens_available'] == 39000
+
+    limiter.call(lambda: 'ok', 0)
+    assert sum(clock.sleeps) == pytest.approx(60 / 50, abs=0.01)
+
+
+def test_configured_limit_caps_learned_limit():
+    limiter = RateLimiter('openai', rpm=100)
+    limiter.update_from_headers({'x-ratelimit-limit-requests': '500', 'x-ratelimit-remaining-requests': '499'})
+
+    assert limiter.stats()['rpm_limit'] == 100
+
+
+def test_429_is_retried_after_retry_after_and_pauses_other_callers(clock):
+    limiter = RateLimiter('anthropic')
+    calls = []
+
+    def flaky():
+        calls.append(clock.now)
+        if len(calls) == 1:
+            raise rate_limit_error(retry_after=2)
+        return 'ok'
+
+    assert limiter.call(flaky, 100) == 'ok'
+    assert calls[1] - calls[0] >= 2
+    assert limiter.stats()['rate_limited'] == 1
+    assert limiter.stats()['retries'] == 1
+
+    # The pause applies to the whole limiter
+    limiter._paused_until = clock.now + 5
+    limiter.call(lambda: 'ok', 0)
+    assert clock.sleeps[-1] == pytest.approx(5)
+
+
+def test_backoff_is_exponential_with_jitter():
+    limiter = RateLimiter('anthropic')
+    error = anthropic.InternalServerError(
+        'overloaded', response=httpx.Response(529, request=httpx.Request('POST', 'https://x')), body=None
+    )
+
+    delays = [limiter.backoff(3, error) for _ in range(50)]
+
+    assert all(4 <= d <= 8 for d in delays)
+    assert len(set(delays)) > 1
+    assert limiter.backoff(20, error) <= llm_providers.RETRY_MAX_SECONDS
+
+
+def test_non_retryable_errors_are_raised_immediately(clock):
+    limiter = RateLimiter('anthropic')
+    bad_request = anthropic.BadRequestError(
+        'bad', response=httpx.Response(400, request=httpx.Request('POST', 'https://x')), body=None
+    )
+
+    with pytest.raises(anthropic.BadRequestError):
+        limiter.call(MagicMock(side_effect=bad_request), 0)
+    with pytest.raises(ValueError):
+        limiter.call(MagicMock(side_effect=ValueError('boom')), 0)
+    assert clock.sleeps == []
+
+
+def test_retries_are_bounded(clock):
+    limiter = RateLimiter('anthropic', max_retries=2)
+    fn = MagicMock(side_effect=rate_limit_error(retry_after=1))
+
+    with pytest.raises(anthropic.RateLimitError):
+        limiter.call(fn, 0)
+    assert fn.call_count == 3
+
+
+def test_async_call_retries():
+    limiter = RateLimiter('anthropic')
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise rate_limit_error(retry_after=0)
+        return 'ok'
+
+    assert asyncio.run(limiter.acall(flaky, 10)) == 'ok'
+    assert len(attempts) == 3
+
+
+def test_provider_retries_rate_limited_calls(clock):
+    provider = AnthropicProvider(api_key='test-key', model='claude-3-5-haiku-20241022')
+    provider.client = MagicMock()
+    provider.client.messages.create.side_effect = [
+        rate_limit_error(retry_after=3),
+        SimpleNamespace(content=[SimpleNamespace(text='SCORE: 80')],
+                        usage=SimpleNamespace(input_tokens=10, output_tokens=5))
+    ]
+
+    text, _ = provider.evaluate('prompt')
+
+    assert text == 'SCORE: 80'
+    assert provider.client.messages.create.call_count == 2
+    assert provider.rate_limiter.stats()['retries'] == 1
+    assert clock.sleeps[0] >= 3
+
+
+def test_sdk_retries_are_disabled():
+    provider = AnthropicProvider(api_key='test-key')
+
+    assert provider.client.max_retries == 0
+
+
+def test_limiters_are_shared_per_api_key():
+    assert get_rate_limiter('anthropic', 'key-a') is get_rate_limiter('anthropic', 'key-a')
+    assert get_rate_limiter('anthropic', 'key-a') is not get_rate_limiter('anthropic', 'key-b')
+    assert get_rate_limiter('anthropic', 'key-a') is not get_rate_limiter('openai', 'key-a')
+
+    with patch.dict(os.environ, {'OPENAI_RPM': '30', 'OPENAI_TPM': '9000'}):
+        stats = get_rate_limiter('openai', 'key-c').stats()
+    assert (stats['rpm_limit'], stats['tpm_limit']) == (30, 9000)
+
+
+class RateLimitedStub(BaseHTTPRequestHandler):
+    """Anthropic /v1/messages stub reporting rate-limit headers"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        body = json.dumps({
+            'id': 'msg_1', 'type': 'message', 'role': 'assistant', 'model': 'claude-3-5-haiku-20241022',
+            'content': [{'type': 'text', 'text': 'SCORE: 80'}],
+            'stop_reason': 'end_turn', 'stop_sequence': None,
+            'usage': {'input_tokens': 10, 'output_tokens': 5}
+        }).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('anthropic-ratelimit-requests-limit', '50')
+        self.send_header('anthropic-ratelimit-requests-remaining', '49')
+        self.send_header('anthropic-ratelimit-tokens-limit', '40000')
+        self.send_header('anthropic-ratelimit-tokens-remaining', '39985')
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def test_shared_client_feeds_response_headers_to_the_limiter():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), RateLimitedStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with patch.dict(os.environ, {'ANTHROPIC_API_KEY': 'key-h',
+                                     'ANTHROPIC_BASE_URL': f'http://127.0.0.1:{server.server_port}'}):
+            provider = get_provider('anthropic', model='claude-3-5-haiku-20241022')
+            provider.evaluate('prompt')
+    finally:
+        server.shutdown()
+
+    stats = provider.rate_limiter.stats()
+    assert stats['rpm_limit'] == 50
+    assert stats['tpm_limit'] == 40000
+    assert len(get_provider_stats()['rate_limits']) == 1
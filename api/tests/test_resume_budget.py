@@ -0,0 +1,113 @@
+"""
+Tests for token-aware resume fitting (resume_budget.py) in quick-score prompts
+"""
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+# Add api directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import resume_budget
+from ollama_provider import OllamaProvider, build_quick_score_prompt
+from resume_budget import TRUNCATION_NOTE, count_tokens, fit_resume, get_context_tokens
+
+
+ROLES = "\n".join(
+    f"Company {i}, Engineer, {2024 - i}-{2025 - i}\n"
+    f"- Led project {i} serving millions of users with Python, Kafka and PostgreSQL."
+    for i in range(40)
+)
+RESUME = (
+    "Jane Doe\nSenior Engineer | jane@example.com\n\n\n"
+    "SKILLS\n" + "Python, Go, Kubernetes, Terraform, AWS, GCP. " * 40 + "\n\n"
+    "EXPERIENCE\n" + ROLES + "\n\n"
+    "EDUCATION\nBSc Computer Science, State University\n\n"
+    "REFERENCES\nJohn Smith, former manager, 555-0100\n"
+)
+
+
+class TestFitResume(unittest.TestCase):
+    """Test cleaning, section dropping and prioritized truncation"""
+
+    def test_short_resume_is_only_cleaned(self):
+        text = "Jane Doe   \t Engineer\n\n\n\nJane Doe - Resume\nPage 1 of 2\nEXPERIENCE\nAcme\nJane Doe - Resume\n2\n"
+
+        self.assertEqual(fit_resume(text, 1000), "Jane Doe Engineer\n\nJane Doe - Resume\nEXPERIENCE\nAcme")
+
+    def test_repeated_job_titles_are_kept(self):
+        text = ("Jane Doe\njane@example.com\nEXPERIENCE\nSenior Software Engineer\nAcme, 2020-2024\n"
+                "Senior Software Engineer\nBeta, 2016-2020")
+
+        self.assertEqual(fit_resume(text, 1000), text)
+
+    def test_low_value_sections_go_first(self):
+        text = "EXPERIENCE\nAcme, Engineer\n\nHOBBIES\nChess and hiking\n\nReferences:\nAvailable upon request"
+        full_tokens = count_tokens(text)
+
+        fitted = fit_resume(text, full_tokens - 1)
+        self.assertEqual(fitted, "EXPERIENCE\nAcme, Engineer")
+        self.assertNotIn(TRUNCATION_NOTE, fitted)
+
+    def test_recent_roles_survive_a_long_skills_section(self):
+        fitted = fit_resume(RESUME, 600)
+
+        self.assertLessEqual(count_tokens(fitted), 600)
+        self.assertTrue(fitted.endswith(TRUNCATION_NOTE))
+        self.assertIn('Company 0, Engineer, 2024-2025', fitted)
+        self.assertIn('BSc Computer Science', fitted)
+        self.assertNotIn('Company 39', fitted)
+        self.assertNotIn('John Smith', fitted)
+        # Sections stay in their original order
+        self.assertLess(fitted.index('Jane Doe'), fitted.index('EXPERIENCE'))
+        self.assertLess(fitted.index('EXPERIENCE'), fitted.index('EDUCATION'))
+
+    def test_text_without_line_breaks_is_cut_at_a_word(self):
+        fitted = fit_resume("word " * 5000, 300)
+
+        self.assertLessEqual(count_tokens(fitted), 300)
+        self.assertTrue(fitted.startswith('word word'))
+
+    def test_result_is_deterministic(self):
+        self.assertEqual(fit_resume(RESUME, 700), fit_resume(RESUME, 700))
+
+
+class TestQuickScorePromptBudget(unittest.TestCase):
+    """Test that prompts are sized to the model's context window"""
+
+    def test_context_is_capped_per_model_family(self):
+        with patch.object(resume_budget, 'DEFAULT_NUM_CTX', 16384):
+            self.assertEqual(get_context_tokens('phi3:mini'), 4096)
+            self.assertEqual(get_context_tokens('llama3'), 8192)
+            self.assertEqual(get_context_tokens('mistral'), 16384)
+            self.assertEqual(get_context_tokens('qwen2'), 16384)
+
+    def test_prompt_fits_context_with_room_for_the_answer(self):
+        long_resume = RESUME * 5
+        for context_tokens in (2048, 4096, 8192):
+            prompt = build_quick_score_prompt({'title': 'Engineer'}, {'resume_text': long_resume},
+                                              context_tokens=context_tokens)
+            self.assertLessEqual(count_tokens(prompt) + 1024, context_tokens)
+            self.assertIn('Company 0,', prompt)
+            self.assertTrue(prompt.rstrip().endswith('not just credentials]'))
+
+        small = build_quick_score_prompt({'title': 'Engineer'}, {'resume_text': long_resume}, context_tokens=2048)
+        large = build_quick_score_prompt({'title': 'Engineer'}, {'resume_text': long_resume}, context_tokens=8192)
+        self.assertLess(len(small), len(large))
+
+    def test_job_text_cannot_collide_with_the_resume_slot(self):
+        prompt = build_quick_score_prompt({'title': 'Engineer {resume}'}, {'resume_text': 'Acme'})
+
+        self.assertIn('JOB: Engineer {resume}', prompt)
+        self.assertIn('CANDIDATE RESUME:\nAcme\n', prompt)
+
+    def test_num_ctx_is_sent_to_ollama(self):
+        provider = OllamaProvider(model='phi3')
+
+        self.assertEqual(provider._generate_payload({'prompt': 'p'})['options']['num_ctx'], provider.num_ctx)
+        self.assertEqual(provider.num_ctx, get_context_tokens('phi3'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+"""
+Tests for bulk resume ingestion (resume_ingest.py): staging uploads and zip archives, parallel parsing
+"""
+import io
+import os
+import sys
+import tempfile
+import unittest
+import zipfile
+from unittest.mock import patch
+
+# Add api directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import resume_ingest
+from resume_ingest import IngestError, _candidate_name, iter_parsed_files, stage_upload
+from test_pdf_extract import make_pdf
+
+
+def make_zip(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        for name, data in files.items():
+            archive.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+
+class TestStageUpload(unittest.TestCase):
+    """Test copying uploads and zip entries to the staging directory"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = self.temp_dir.name
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_zip_entries_are_staged_under_generated_names(self):
+        entries = []
+        archive = make_zip({
+            'applicants/jane_doe.txt': 'Jane Doe, engineer',
+            '../../etc/evil.txt': 'outside',
+            '__MACOSX/applicants/._jane_doe.txt': 'metadata',
+            'applicants/.DS_Store': 'metadata',
+            'applicants/photo.png': 'png',
+        })
+
+        stage_upload('batch.zip', archive, self.directory, entries)
+
+        self.assertEqual([entry['filename'] for entry in entries],
+                         ['applicants/jane_doe.txt', '../../etc/evil.txt', 'applicants/photo.png'])
+        self.assertIn('Unsupported file type', entries[2]['error'])
+        for entry in entries[:2]:
+            self.assertEqual(os.path.dirname(entry['path']), self.directory)
+        with open(entries[0]['path']) as f:
+            self.assertEqual(f.read(), 'Jane Doe, engineer')
+        # Only the staged resumes are left; the archive itself is removed
+        self.assertEqual(sorted(os.listdir(self.directory)), ['00000.txt', '00001.txt'])
+
+    def test_oversized_files_and_bad_archives_are_reported_per_file(self):
+        entries = []
+        with patch.object(resume_ingest, 'MAX_FILE_BYTES', 10), patch.object(resume_ingest, 'COPY_CHUNK_BYTES', 4):
+            stage_upload('big.txt', io.BytesIO(b'x' * 11), self.directory, entries)
+            stage_upload('small.txt', io.BytesIO(b'x' * 10), self.directory, entries)
+        stage_upload('broken.zip', io.BytesIO(b'not a zip'), self.directory, entries)
+
+        self.assertIn('File too large', entries[0]['error'])
+        self.assertIn('path', entries[1])
+        self.assertEqual(entries[2], {'filename': 'broken.zip', 'error': 'Not a valid zip archive'})
+        self.assertEqual(os.listdir(self.directory), ['00001.txt'])
+
+    def test_total_unpacked_and_archive_sizes_are_capped(self):
+        entries = []
+        with patch.object(resume_ingest, 'MAX_UNPACKED_BYTES', 25), patch.object(resume_ingest, 'MAX_FILE_BYTES', 20):
+            stage_upload('a.txt', io.BytesIO(b'x' * 20), self.directory, entries)
+            with self.assertRaises(IngestError):
+                stage_upload('batch.zip', make_zip({'b.txt': 'x' * 6}), self.directory, entries)
+        self.assertEqual(entries[0]['size'], 20)
+
+        with patch.object(resume_ingest, 'MAX_UPLOAD_BYTES', 50):
+            with self.assertRaises(IngestError):
+                stage_upload('batch.zip', make_zip({'c.txt': 'x' * 100}), self.directory, [])
+        self.assertEqual(os.listdir(self.directory), ['00000.txt'])
+
+    def test_too_many_files_is_rejected(self):
+        entries = []
+        with patch.object(resume_ingest, 'MAX_INGEST_FILES', 2):
+            with self.assertRaises(IngestError):
+                stage_upload('batch.zip', make_zip({f'{i}.txt': 'resume' for i in range(3)}),
+                             self.directory, entries)
+
+
+class TestParseFiles(unittest.TestCase):
+    """Test parsing staged files in-process and across worker processes"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.entries = []
+        uploads = [
+            ('jane_doe_resume.pdf', make_pdf([['Jane Doe', 'jane@example.com +1 (555) 010-2000']])),
+            ('john-smith-cv-2024.txt', b'John Smith\nBackend engineer'),
+            ('scan.pdf', make_pdf([[]])),
+        ]
+        for filename, data in uploads:
+            stage_upload(filename, io.BytesIO(data), self.temp_dir.name, self.entries)
+        self.entries.append({'filename': 'photo.png', 'error': 'Unsupported file type'})
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_results_in_input_order_with_contact_details(self):
+        results = list(iter_parsed_files(self.entries, processes=1))
+
+        self.assertEqual([result['filename'] for result in results],
+                         ['jane_doe_resume.pdf', 'john-smith-cv-2024.txt', 'scan.pdf', 'photo.png'])
+        self.assertEqual(results[0]['candidate'], {
+            'name': 'Jane Doe',
+            'email': 'jane@example.com',
+            'phone': '+1 (555) 010-2000',
+            'resume_text': 'Jane Doe\njane@example.com +1 (555) 010-2000',
+            'resume_file_path': 'jane_doe_resume.pdf'
+        })
+        self.assertEqual(results[1]['candidate']['name'], 'John Smith')
+        self.assertIn('No text found', results[2]['error'])
+        self.assertEqual(results[3]['error'], 'Unsupported file type')
+
+    def test_results_do_not_depend_on_process_count(self):
+        self.assertEqual(list(iter_parsed_files(self.entries, processes=2)),
+                         list(iter_parsed_files(self.entries, processes=1)))
+
+    def test_files_over_the_timeout_fail_without_blocking_the_rest(self):
+        results = list(iter_parsed_files(self.entries, processes=2, timeout=0))
+
+        self.assertEqual(results[0], {'filename': 'jane_doe_resume.pdf', 'error': 'Timed out after 0 seconds'})
+        self.assertEqual(results[1]['candidate']['name'], 'John Smith')  # Plain text is read in-process
+        self.assertEqual(results[2]['error'], 'Timed out after 0 seconds')
+        self.assertEqual(results[3]['error'], 'Unsupported file type')
+
+    def test_name_falls_back_to_first_line(self):
+        self.assertEqual(_candidate_name('resume.pdf', '\n Jane Doe \nEngineer'), 'Jane Doe')
+        self.assertEqual(_candidate_name('applicants/mary_o_brien.docx', ''), 'Mary O Brien')
+
+
+if __name__ == '__main__':
+    unittest.main()
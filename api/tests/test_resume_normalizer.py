@@ -0,0 +1,110 @@
+"""
+Tests for resume text normalization and SimHash fingerprints (resume_normalizer.py)
+"""
+import os
+import sys
+import unittest
+
+# Add api directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from resume_normalizer import (
+    NEAR_DUPLICATE_DISTANCE, find_near_duplicate, fingerprint_distance, normalize_resume_text, resume_fingerprint
+)
+
+
+PDF_TEXT = (
+    "Jane Doe\n"
+    "jane@example.com | (555) 010-2000\n"
+    "Senior Software Engineer\n"
+    "Acme Corp, 2019-2024\n"
+    "•   Built real-time data pipe-\nlines processing 2M events/day\n"
+    "▪ Migrated the ﬁnance service to Kubernetes​\n"
+    "\n\n\n"
+    "Page 1 of 2\n"
+    "Jane Doe\n"
+    "jane@example.com | (555) 010-2000\n"
+    "Senior Software Engineer\n"
+    "Beta Inc, 2015-2019\n"
+    "- Led a team of 6 engineers\n"
+    "2\n"
+)
+
+RESUME = """Jane Doe
+Staff engineer with twelve years of experience building distributed systems.
+Acme Corp 2019-2024: led the data platform team, shipped a streaming pipeline handling two million events per day,
+cut infrastructure cost by thirty percent and mentored eight engineers.
+Beta Inc 2015-2019: built the billing service in Go, owned on-call for payments and introduced contract testing.
+Education: BSc Computer Science, State University.
+Skills: Go, Python, Kafka, Kubernetes, PostgreSQL, Terraform."""
+
+
+class TestNormalizeResumeText(unittest.TestCase):
+    """Test removal of PDF/DOCX extraction artifacts"""
+
+    def test_pdf_artifacts_are_removed(self):
+        self.assertEqual(normalize_resume_text(PDF_TEXT), (
+            "Jane Doe\n"
+            "jane@example.com | (555) 010-2000\n"
+            "Senior Software Engineer\n"
+            "Acme Corp, 2019-2024\n"
+            "- Built real-time data pipelines processing 2M events/day\n"
+            "- Migrated the finance service to Kubernetes\n"
+            "\n"
+            "Senior Software Engineer\n"
+            "Beta Inc, 2015-2019\n"
+            "- Led a team of 6 engineers"
+        ))
+
+    def test_is_idempotent_and_handles_empty_text(self):
+        cleaned = normalize_resume_text(PDF_TEXT)
+
+        self.assertEqual(normalize_resume_text(cleaned), cleaned)
+        # Spaces around the break, and a page number between the halves, are joined in one pass
+        for text in ('Software engi- \nneering', 'Software engi-\nPage 2 of 3\nneering'):
+            self.assertEqual(normalize_resume_text(text), 'Software engineering')
+            self.assertEqual(resume_fingerprint(text), resume_fingerprint(normalize_resume_text(text)))
+        self.assertEqual(normalize_resume_text(None), '')
+        self.assertEqual(normalize_resume_text(' \n\n '), '')
+
+    def test_real_hyphens_and_repeated_bullets_are_kept(self):
+        text = "Full-stack developer\nself-\nTaught\n- Wrote tests\n- Wrote tests"
+
+        self.assertEqual(normalize_resume_text(text), "Full-stack developer\nself-\nTaught\n- Wrote tests\n- Wrote tests")
+
+
+class TestResumeFingerprint(unittest.TestCase):
+    """Test near-duplicate detection with SimHash"""
+
+    def test_formatting_changes_do_not_change_the_fingerprint(self):
+        reformatted = '\n\n'.join('• ' + line.upper() for line in RESUME.split('\n'))
+
+        self.assertEqual(resume_fingerprint(RESUME), resume_fingerprint(reformatted))
+        self.assertEqual(resume_fingerprint(PDF_TEXT), resume_fingerprint(normalize_resume_text(PDF_TEXT)))
+
+    def test_small_edits_are_near_duplicates_and_other_resumes_are_not(self):
+        edited = RESUME.replace('mentored eight engineers', 'mentored nine engineers')
+        other = RESUME.replace('Jane Doe', 'John Roe').replace('Acme Corp', 'Gamma LLC').replace(
+            'billing service in Go', 'search ranking in Java').replace('Kafka', 'Spark')
+
+        self.assertLessEqual(fingerprint_distance(resume_fingerprint(RESUME), resume_fingerprint(edited)),
+                             NEAR_DUPLICATE_DISTANCE)
+        self.assertGreater(fingerprint_distance(resume_fingerprint(RESUME), resume_fingerprint(other)),
+                           NEAR_DUPLICATE_DISTANCE)
+        self.assertGreater(fingerprint_distance(resume_fingerprint(RESUME), resume_fingerprint(PDF_TEXT)),
+                           NEAR_DUPLICATE_DISTANCE)
+        self.assertIsNone(resume_fingerprint('  • '))
+
+    def test_find_near_duplicate_prefers_closest_then_earliest(self):
+        fingerprint = resume_fingerprint(RESUME)
+        one_bit_off = f'{int(fingerprint, 16) ^ 1:016x}'
+        far = f'{int(fingerprint, 16) ^ 0xffff:016x}'
+
+        self.assertEqual(find_near_duplicate(fingerprint, [('a', far), ('b', one_bit_off), ('c', fingerprint)]), 'c')
+        self.assertEqual(find_near_duplicate(fingerprint, [('a', one_bit_off), ('b', one_bit_off)]), 'a')
+        self.assertIsNone(find_near_duplicate(fingerprint, [('a', far), ('b', None)]))
+        self.assertIsNone(find_near_duplicate(None, [('a', fingerprint)]))
+
+
+if __name__ == '__main__':
+    unittest.main()
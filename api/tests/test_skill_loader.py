@@ -0,0 +1,110 @@
+"""
+Tests for the memoized skill instruction loader in ai_evaluator.py
+"""
+import builtins
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Add api directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import ai_evaluator
+
+
+class TestSkillLoader(unittest.TestCase):
+    """Test caching and change detection of the skill file"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.skill_path = os.path.join(self.temp_dir, 'SKILL.md')
+        self._write('# Skill v1\n')
+        self.original_path = ai_evaluator.SKILL_PATH
+        ai_evaluator.SKILL_PATH = self.skill_path
+        ai_evaluator.clear_skill_cache()
+
+    def tearDown(self):
+        ai_evaluator.SKILL_PATH = self.original_path
+        ai_evaluator.clear_skill_cache()
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, text, mtime_ns=None):
+        with open(self.skill_path, 'w') as f:
+            f.write(text)
+        if mtime_ns is not None:
+            os.utime(self.skill_path, ns=(mtime_ns, mtime_ns))
+
+    def _count_opens(self):
+        real_open = builtins.open
+        opened = []
+
+        def counting_open(path, *args, **kwargs):
+            if path == self.skill_path:
+                opened.append(path)
+            return real_open(path, *args, **kwargs)
+
+        return opened, patch('builtins.open', side_effect=counting_open)
+
+    def test_file_is_read_once_while_unchanged(self):
+        opened, patcher = self._count_opens()
+        with patcher:
+            for _ in range(5):
+                self.assertEqual(ai_evaluator.load_skill_instructions(), '# Skill v1\n')
+
+        self.assertEqual(len(opened), 1)
+
+    def test_reloads_when_file_changes(self):
+        first, first_hash = ai_evaluator.load_skill()
+
+        # Same size, different mtime
+        self._write('# Skill v2\n', mtime_ns=os.stat(self.skill_path).st_mtime_ns + 10**9)
+        second, second_hash = ai_evaluator.load_skill()
+
+        self.assertEqual(first, '# Skill v1\n')
+        self.assertEqual(second, '# Skill v2\n')
+        self.assertNotEqual(first_hash, second_hash)
+        self.assertEqual(ai_evaluator.get_skill_hash(), second_hash)
+
+    def test_hash_depends_only_on_content(self):
+        _, first_hash = ai_evaluator.load_skill()
+        self._write('# Skill v1\n', mtime_ns=os.stat(self.skill_path).st_mtime_ns + 10**9)
+
+        self.assertEqual(ai_evaluator.get_skill_hash(), first_hash)
+
+    def test_missing_file_uses_fallback_hash(self):
+        os.remove(self.skill_path)
+
+        instructions, skill_hash = ai_evaluator.load_skill()
+
+        self.assertEqual(instructions, ai_evaluator.DEFAULT_SKILL_INSTRUCTIONS)
+        self.assertEqual(skill_hash, ai_evaluator.DEFAULT_SKILL_HASH)
+
+
+class TestSkillHashInEvaluations(unittest.TestCase):
+    """Test that the skill hash reaches the cache key and the result"""
+
+    def test_skill_hash_is_part_of_cache_key_and_result(self):
+        provider = type('Provider', (), {})()
+        provider.get_provider_name = lambda: 'anthropic'
+        calls = []
+
+        def fake_cached_evaluate(llm_provider, prompt, use_cache=True, extra_key=None, schema=None):
+            calls.append(extra_key)
+            return 'SCORE: 80\nA_SCORE: 80\nT_SCORE: 80\nQ_SCORE: 80', {
+                'input_tokens': 1, 'output_tokens': 1, 'cost': 0.0, 'model': 'm'
+            }
+
+        job = {'title': 'Engineer', 'must_have_requirements': [], 'preferred_requirements': []}
+        with patch('ai_evaluator.get_provider', return_value=provider), \
+                patch('ai_evaluator.cached_evaluate', side_effect=fake_cached_evaluate):
+            result = ai_evaluator.evaluate_candidate_with_ai(job, {'name': 'Ann', 'resume_text': 'x'})
+
+        self.assertEqual(calls, [{'skill_hash': result['skill_hash']}])
+        self.assertEqual(result['skill_hash'], ai_evaluator.get_skill_hash())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,191 @@
+"""
+Tests for stage1_batch.py against a local stub of the Message Batches endpoints
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from unittest.mock import patch
+from urllib.parse import urlparse
+
+import pytest
+
+# Add api directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import database as db
+import stage1_batch
+
+
+JOB = {'title': 'Engineer', 'must_have_requirements': ['Python'], 'preferred_requirements': []}
+RESPONSE_TEXT = """SCORE: 82
+A_SCORE: 85
+T_SCORE: 80
+Q_SCORE: 78
+RECOMMENDATION: PHONE SCREEN FIRST
+
+REASONING:
+Strong comparable work."""
+
+
+class StubBatchServer(BaseHTTPRequestHandler):
+    """Mimics POST /v1/messages/batches, GET /v1/messages/batches/<id> and its results"""
+
+    batches = {}
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, payload, content_type='application/json'):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _batch_object(self, batch_id):
+        batch = self.batches[batch_id]
+        ended = batch['polls'] >= 2
+        total = len(batch['requests'])
+        return {
+            'id': batch_id,
+            'type': 'message_batch',
+            'processing_status': 'ended' if ended else 'in_progress',
+            'request_counts': {
+                'processing': 0 if ended else total,
+                'succeeded': total - 1 if ended else 0,
+                'errored': 1 if ended else 0,
+                'canceled': 0,
+                'expired': 0
+            },
+            'created_at': '2024-10-01T00:00:00Z',
+            'expires_at': '2024-10-02T00:00:00Z',
+            'ended_at': '2024-10-01T00:05:00Z' if ended else None,
+            'cancel_initiated_at': None,
+            'archived_at': None,
+            'results_url': f'http://{self.headers["Host"]}/v1/messages/batches/{batch_id}/results' if ended else None
+        }
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        batch_id = f'msgbatch_{len(self.batches) + 1}'
+        self.batches[batch_id] = {'requests': body['requests'], 'polls': 0}
+        self._send_json(self._batch_object(batch_id))
+
+    def do_GET(self):
+        parts = urlparse(self.path).path.strip('/').split('/')
+        batch_id = parts[3]
+        if len(parts) == 5 and parts[4] == 'results':
+            lines = []
+            # Results come back in reverse order to check matching by custom_id
+            for request in reversed(self.batches[batch_id]['requests']):
+                content = request['params']['messages'][0]['content']
+                prompt = content if isinstance(content, str) else ''.join(block['text'] for block in content)
+                if 'broken resume' in prompt:
+                    result = {'type': 'errored',
+                              'error': {'type': 'error', 'error': {'type': 'invalid_request_error', 'message': 'prompt too long'}}}
+                else:
+                    result = {'type': 'succeeded', 'message': {
+                        'id': 'msg_1', 'type': 'message', 'role': 'assistant', 'model': request['params']['model'],
+                        'content': [{'type': 'text', 'text': RESPONSE_TEXT}],
+                        'stop_reason': 'end_turn', 'stop_sequence': None,
+                        'usage': {'input_tokens': 1000, 'output_tokens': 200}
+                    }}
+                lines.append(json.dumps({'custom_id': request['custom_id'], 'result': result}))
+            self._send_json(('\n'.join(lines) + '\n').encode('utf-8'), 'application/binary')
+        else:
+            self.batches[batch_id]['polls'] += 1
+            self._send_json(self._batch_object(batch_id))
+
+
+@pytest.fixture
+def stub_server():
+    StubBatchServer.batches = {}
+    server = HTTPServer(('127.0.0.1', 0), StubBatchServer)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    with patch.dict(os.environ, {
+        'ANTHROPIC_BASE_URL': f'http://127.0.0.1:{server.server_port}',
+        'ANTHROPIC_API_KEY': 'test-key'
+    }):
+        yield StubBatchServer
+    server.shutdown()
+
+
+@pytest.fixture
+def temp_db():
+    """Temporary database with the tables create_evaluation writes to"""
+    temp_dir = tempfile.mkdtemp()
+    original_db_path = db.DB_PATH
+    db.DB_PATH = Path(temp_dir) / "test.db"
+    with db.get_db() as conn:
+        conn.executescript("""
+            CREATE TABLE candidates (
+                id TEXT PRIMARY KEY, job_id TEXT, name TEXT, resume_text TEXT,
+                stage1_score REAL, stage1_a_score REAL, stage1_t_score REAL, stage1_q_score REAL,
+                stage1_evaluated_at TEXT, recommendation TEXT, scoring_model TEXT, status TEXT, updated_at TEXT
+            );
+            CREATE TABLE evaluations (
+                id TEXT PRIMARY KEY, candidate_id TEXT, score REAL, scoring_model TEXT,
+                a_score REAL, t_score REAL, q_score REAL,
+                accomplishments_analysis TEXT, trajectory_analysis TEXT, qualifications_analysis TEXT,
+                recommendation TEXT, reasoning TEXT, strengths TEXT, concerns TEXT,
+                interview_questions TEXT, observations TEXT,
+                llm_provider TEXT, llm_model TEXT, input_tokens INTEGER, output_tokens INTEGER, cost REAL,
+                version INTEGER, evaluation_stage TEXT, skill_hash TEXT, created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            );
+            INSERT INTO candidates (id, job_id, name, resume_text) VALUES ('cand-1', 'job-1', 'Ann', 'python resume');
+        """)
+    yield
+    db.DB_PATH = original_db_path
+    shutil.rmtree(temp_dir)
+
+
+def test_batch_results_are_parsed_and_saved(stub_server, temp_db):
+    candidates = [
+        {'id': 'cand-1', 'name': 'Ann', 'resume_text': 'python resume'},
+        {'name': 'Bob', 'resume_text': 'broken resume'},
+        {'name': 'Cy', 'resume_text': 'unsaved resume'},
+    ]
+
+    summary = stage1_batch.run_stage1_batch(JOB, candidates, model='claude-3-5-haiku-20241022', poll_interval=0)
+
+    assert len(stub_server.batches) == 1
+    assert summary['status']['status'] == 'ended'
+    assert [r['success'] for r in summary['results']] == [True, False, True]
+    assert summary['results'][1]['error'] == 'prompt too long'
+
+    first = summary['results'][0]
+    assert first['evaluation']['score'] == 82
+    assert first['usage']['batch'] is True
+    # Half of the synchronous price: (1000 * 0.25 + 200 * 1.25) / 1M * 0.5
+    assert first['usage']['cost'] == 0.0003
+
+    evaluations = db.get_evaluations_for_candidate('cand-1')
+    assert len(evaluations) == 1
+    assert evaluations[0]['id'] == first['evaluation_id']
+    assert evaluations[0]['llm_provider'] == 'anthropic'
+    assert evaluations[0]['skill_hash'] == summary['skill_hash']
+    assert len(summary['skill_hash']) == 64
+    assert db.get_candidate('cand-1')['stage1_score'] == 82
+    assert 'evaluation_id' not in summary['results'][2]
+
+
+def test_unsupported_provider_is_rejected():
+    with patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'}):
+        with pytest.raises(ValueError, match='does not support batch'):
+            stage1_batch.run_stage1_batch(JOB, [{'name': 'Ann', 'resume_text': 'x'}], provider='openai')
+
+
+def test_wait_for_batch_times_out():
+    class NeverEnds:
+        def get_batch_status(self, batch_id):
+            return {'status': 'in_progress', 'processing': 1, 'succeeded': 0}
+
+    with pytest.raises(TimeoutError):
+        stage1_batch.wait_for_batch(NeverEnds(), 'msgbatch_1', poll_interval=0, timeout=0, sleep=lambda s: None)
@@ -0,0 +1,112 @@
+"""
+Tests for the Stage 1 response parser and its benchmark script
+"""
+import json
+import os
+import sys
+import tempfile
+
+# Add api directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ai_evaluator import parse_stage1_response, parse_stage1_json
+from benchmark_stage1_parser import SAMPLE_RESPONSE, benchmark, load_corpus, synthetic_corpus
+
+
+def sample(score=82, a=85, t=80, q=78, recommendation='PHONE SCREEN FIRST'):
+    return SAMPLE_RESPONSE.format(score=score, a=a, t=t, q=q, recommendation=recommendation)
+
+
+def test_text_response_fields():
+    evaluation = parse_stage1_response(sample())
+
+    assert (evaluation['score'], evaluation['a_score'], evaluation['t_score'], evaluation['q_score']) == (82, 85, 80, 78)
+    assert evaluation['recommendation'] == 'PHONE SCREEN FIRST'
+    assert evaluation['accomplishments_analysis'] == {'comparable_work': 85, 'comparable_scale': 80, 'impact_evidence': 78}
+    assert evaluation['trajectory_analysis']['intentionality'] == 78
+    assert evaluation['qualifications_analysis']['must_haves_met'].startswith('3/4 - Degree')
+    assert evaluation['key_strengths'][0] == 'Built a volunteer program from scratch'
+    assert len(evaluation['observations']) == 2
+    assert evaluation['interview_questions'][2] == 'What drew you to this role now?'
+    assert evaluation['reasoning'] == (
+        'The candidate has done comparable work at a similar scale, with quantified results in participation growth.'
+        '\n\n Their trajectory shows steady growth with intentional moves. The missing '
+        'certification is a factual gap that can be addressed after hire.'
+    )
+
+
+def test_scores_derived_from_components():
+    text = """Comparable Work: 90 - x
+Comparable Scale: 80
+Impact Evidence: 70
+Growth Pattern: 60
+Q_SCORE: 50
+SCORE: n/a"""
+
+    evaluation = parse_stage1_response(text)
+
+    assert evaluation['a_score'] == 83
+    assert evaluation['t_score'] == 30
+    assert evaluation['score'] == int(83 * 0.5 + 30 * 0.3 + 50 * 0.2)
+
+
+def test_headers_need_the_exact_prefix():
+    evaluation = parse_stage1_response('Score: 90\nSCORE : 80\nREASONING:\nSCORE: 70\nText')
+
+    assert evaluation['score'] == 70
+    assert evaluation['reasoning'] == 'Text'
+
+
+def test_json_response():
+    evaluation = parse_stage1_response(json.dumps({
+        'score': '88', 'a_score': 90.0, 't_score': 85, 'q_score': 80,
+        'recommendation': ' ADVANCE TO INTERVIEW ',
+        'accomplishments_analysis': {'comparable_work': 95},
+        'qualifications_analysis': {'must_haves_met': '4/4'},
+        'key_strengths': ['Scale', ''],
+        'reasoning': 'Strong.'
+    }))
+
+    assert evaluation['score'] == 88
+    assert evaluation['a_score'] == 90
+    assert evaluation['recommendation'] == 'ADVANCE TO INTERVIEW'
+    assert evaluation['accomplishments_analysis'] == {'comparable_work': 95, 'comparable_scale': 0, 'impact_evidence': 0}
+    assert evaluation['qualifications_analysis']['must_haves_met'] == '4/4'
+    assert evaluation['key_strengths'] == ['Scale']
+    assert evaluation['interview_questions'] == []
+
+
+def test_fenced_json_and_derived_scores():
+    evaluation = parse_stage1_response('```json\n{"a_score": 80, "t_score": 70, "q_score": 60}\n```')
+
+    assert evaluation['score'] == int(80 * 0.5 + 70 * 0.3 + 60 * 0.2)
+
+
+def test_invalid_json_falls_back_to_text():
+    evaluation = parse_stage1_response('{not json\nSCORE: 75')
+
+    assert evaluation['score'] == 75
+
+
+def test_parse_stage1_json_ignores_malformed_fields():
+    evaluation = parse_stage1_json({'score': True, 'key_strengths': 'not a list', 'trajectory_analysis': []})
+
+    assert evaluation['score'] == 0
+    assert evaluation['key_strengths'] == []
+
+
+def test_benchmark_over_recorded_corpus():
+    with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False) as f:
+        for text in synthetic_corpus(20):
+            f.write(json.dumps({'raw_response': text}) + '\n')
+        f.write(json.dumps({'other': 'ignored'}) + '\n')
+    try:
+        corpus = load_corpus(f.name)
+    finally:
+        os.remove(f.name)
+
+    result = benchmark(corpus, repeat=1)
+
+    assert len(corpus) == 20
+    assert result['responses'] == 20
+    assert result['per_response_us'] > 0
@@ -0,0 +1,109 @@
+"""
+Tests for streaming batch responses (streaming.py and the NDJSON/SSE endpoint modes)
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+import unittest
+from unittest.mock import patch
+
+# Add api directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from streaming import format_record, get_stream_format
+
+
+JOB = {'title': 'Engineer', 'requirements': ['python', 'react'], 'education': ''}
+CANDIDATES = [
+    {'name': 'Ann', 'text': 'python and react developer'},
+    {'name': 'Bob', 'text': 'react only'},
+]
+QUICK_RESPONSE = "A_SCORE: 80\nT_SCORE: 70\nQ_SCORE: 90\nSCORE: 79\nREASONING: Solid."
+
+
+def parse_ndjson(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+class TestStreamFormat(unittest.TestCase):
+    """Test stream mode selection and record formatting"""
+
+    def test_body_flag_and_accept_header(self):
+        self.assertIsNone(get_stream_format({}))
+        self.assertEqual(get_stream_format({'stream': True}), 'ndjson')
+        self.assertEqual(get_stream_format({'stream': 'sse'}), 'sse')
+        self.assertEqual(get_stream_format({}, 'application/x-ndjson'), 'ndjson')
+        self.assertEqual(get_stream_format({'stream': True}, 'text/event-stream'), 'sse')
+
+    def test_sse_uses_type_as_event_name(self):
+        self.assertEqual(format_record({'type': 'summary', 'total': 1}, 'sse'),
+                         'event: summary\ndata: {"type": "summary", "total": 1}\n\n')
+        self.assertEqual(format_record({'type': 'result'}, 'ndjson'), '{"type": "result"}\n')
+
+
+class TestStreamingEndpoints(unittest.TestCase):
+    """Test streaming modes of /api/evaluate_regex and /api/evaluate_quick/batch"""
+
+    def setUp(self):
+        from flask_server import app
+        app.config['TESTING'] = True
+        self.client = app.test_client()
+
+    def test_regex_streams_results_then_summary(self):
+        response = self.client.post('/api/evaluate_regex', json={'job': JOB, 'candidates': CANDIDATES, 'stream': True})
+
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        records = parse_ndjson(response)
+        self.assertEqual([r['type'] for r in records], ['result', 'result', 'summary'])
+        self.assertEqual([r['name'] for r in records[:2]], ['Ann', 'Bob'])
+        self.assertEqual(records[-1]['summary']['top_candidate'], 'Ann')
+
+    def test_regex_sse_mode(self):
+        response = self.client.post('/api/evaluate_regex', json={'job': JOB, 'candidates': CANDIDATES},
+                                    headers={'Accept': 'text/event-stream'})
+
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        events = [block.split('\n')[0] for block in response.get_data(as_text=True).strip().split('\n\n')]
+        self.assertEqual(events, ['event: result', 'event: result', 'event: summary'])
+
+    def test_regex_without_stream_flag_is_unchanged(self):
+        response = self.client.post('/api/evaluate_regex', json={'job': JOB, 'candidates': CANDIDATES})
+        data = response.get_json()
+        self.assertTrue(data['success'])
+        self.assertEqual(len(data['results']), 2)
+
+    def test_quick_batch_streams_in_completion_order(self):
+        async def fake_aevaluate(prompt):
+            if 'slow resume' in prompt:
+                await asyncio.sleep(0.2)
+            if 'broken resume' in prompt:
+                raise Exception('Ollama request timed out after 60 seconds')
+            return QUICK_RESPONSE, {'input_tokens': 10, 'output_tokens': 5, 'cost': 0.0}
+
+        with patch('flask_server.OllamaProvider.is_available', return_value=True), \
+                patch('flask_server.OllamaProvider.aevaluate', side_effect=fake_aevaluate):
+            response = self.client.post('/api/evaluate_quick/batch', json={
+                'job': {'title': 'Engineer'},
+                'candidates': [
+                    {'id': 'c1', 'resume_text': 'slow resume'},
+                    {'id': 'c2', 'resume_text': 'fast resume'},
+                    {'id': 'c3', 'resume_text': 'broken resume'},
+                ],
+                'parallelism': 3,
+                'use_cache': False,
+                'stream': True
+            })
+            records = parse_ndjson(response)
+
+        results = [r for r in records if r['type'] == 'result']
+        self.assertEqual(results[-1]['candidate_id'], 'c1')
+        self.assertEqual({r['index'] for r in results}, {0, 1, 2})
+        self.assertEqual(records[-1]['type'], 'summary')
+        self.assertEqual(records[-1]['succeeded'], 2)
+        self.assertEqual(records[-1]['failed'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,207 @@
+"""
+Tests for structured (JSON schema) output: validation, provider requests and parser fallback
+"""
+import json
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+# Add api directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ai_evaluator import evaluate_candidate_with_ai
+from llm_providers import AnthropicProvider, OpenAIProvider
+from ollama_provider import OllamaProvider, build_quick_score_prompt, run_quick_score
+from structured_output import QUICK_SCORE_SCHEMA, STAGE1_SCHEMA, decode_structured, validate_structured
+
+
+JOB = {'title': 'Engineer', 'must_have_requirements': ['Python'], 'preferred_requirements': []}
+CANDIDATE = {'id': 'cand-1', 'name': 'Ann', 'resume_text': 'Python developer'}
+
+STAGE1_JSON = {
+    'score': 82, 'a_score': 85, 't_score': 80, 'q_score': 78,
+    'recommendation': 'PHONE SCREEN FIRST',
+    'accomplishments_analysis': {'comparable_work': 85},
+    'key_strengths': ['Shipped a payments platform'],
+    'reasoning': 'Comparable work at scale.'
+}
+QUICK_JSON = {
+    'a_score': 70, 't_score': 60, 'q_score': 90, 'score': 71,
+    'reasoning': 'Solid Python background.',
+    'requirements_identified': {'must_have': ['Python'], 'preferred': []},
+    'match_analysis': [{'requirement': 'Python', 'status': 'MET', 'evidence': 'Python developer'}]
+}
+
+
+class TestValidation(unittest.TestCase):
+    """Test the schema validator"""
+
+    def test_valid_objects(self):
+        self.assertEqual(validate_structured(STAGE1_JSON, STAGE1_SCHEMA), [])
+        self.assertEqual(validate_structured(QUICK_JSON, QUICK_SCORE_SCHEMA), [])
+        self.assertEqual(validate_structured({**STAGE1_JSON, 'score': 82.0}, STAGE1_SCHEMA), [])
+
+    def test_invalid_objects(self):
+        missing = {k: v for k, v in STAGE1_JSON.items() if k != 'reasoning'}
+        self.assertEqual(validate_structured(missing, STAGE1_SCHEMA), ['$.reasoning: required'])
+        self.assertEqual(validate_structured({**STAGE1_JSON, 'score': 120}, STAGE1_SCHEMA),
+                         ['$.score: above maximum 100'])
+        self.assertTrue(validate_structured({**STAGE1_JSON, 'a_score': True}, STAGE1_SCHEMA))
+        self.assertTrue(validate_structured({**STAGE1_JSON, 'recommendation': 'HIRE'}, STAGE1_SCHEMA))
+        self.assertTrue(validate_structured({**QUICK_JSON, 'match_analysis': [{'requirement': 'x', 'status': 'YES'}]},
+                                            QUICK_SCORE_SCHEMA))
+
+    def test_decode(self):
+        self.assertEqual(decode_structured('```json\n' + json.dumps(STAGE1_JSON) + '\n```', STAGE1_SCHEMA), STAGE1_JSON)
+        self.assertIsNone(decode_structured('SCORE: 80', STAGE1_SCHEMA))
+        self.assertIsNone(decode_structured('[1, 2]', STAGE1_SCHEMA))
+
+
+class TestProviderRequests(unittest.TestCase):
+    """Test how each provider asks for structured output"""
+
+    def test_anthropic_forces_tool_use(self):
+        provider = AnthropicProvider(api_key='test-key', model='claude-3-5-haiku-20241022')
+        provider.client = MagicMock()
+        provider.client.messages.create.return_value = SimpleNamespace(
+            content=[SimpleNamespace(type='tool_use', name='record_evaluation', input=STAGE1_JSON)],
+            usage=SimpleNamespace(input_tokens=100, output_tokens=50)
+        )
+
+        text, usage = provider.evaluate_structured('prompt', STAGE1_SCHEMA)
+
+        kwargs = provider.client.messages.create.call_args.kwargs
+        self.assertEqual(kwargs['tools'][0]['input_schema'], STAGE1_SCHEMA)
+        self.assertEqual(kwargs['tool_choice'], {'type': 'tool', 'name': 'record_evaluation'})
+        self.assertEqual(json.loads(text), STAGE1_JSON)
+        self.assertEqual(usage['output_tokens'], 50)
+
+    def test_openai_sets_response_format(self):
+        provider = OpenAIProvider(api_key='test-key', model='gpt-4o-mini')
+        provider.client = MagicMock()
+        provider.client.chat.completions.create.return_value = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(STAGE1_JSON)))],
+            usage=SimpleNamespace(prompt_tokens=100, completion_tokens=50)
+        )
+
+        text, _ = provider.evaluate_structured('prompt', STAGE1_SCHEMA)
+
+        response_format = provider.client.chat.completions.create.call_args.kwargs['response_format']
+        self.assertEqual(response_format['type'], 'json_schema')
+        self.assertEqual(response_format['json_schema']['schema'], STAGE1_SCHEMA)
+        self.assertEqual(json.loads(text), STAGE1_JSON)
+
+    def test_ollama_uses_json_mode(self):
+        response = MagicMock(status_code=200)
+        response.json.return_value = {'response': json.dumps(QUICK_JSON), 'prompt_eval_count': 10, 'eval_count': 5}
+
+        with patch('ollama_provider.get_session') as get_session:
+            get_session.return_value.post.return_value = response
+            text, _ = OllamaProvider(model='phi3').evaluate_structured('prompt', QUICK_SCORE_SCHEMA)
+
+        body = get_session.return_value.post.call_args.kwargs['json']
+        self.assertEqual(body['format'], 'json')
+        self.assertIn('"match_analysis"', body['prompt'])
+        self.assertEqual(json.loads(text), QUICK_JSON)
+
+
+class TestStructuredEvaluation(unittest.TestCase):
+    """Test that validated JSON skips the text parser and invalid JSON falls back to it"""
+
+    def _provider(self, structured_text):
+        provider = MagicMock()
+        provider.get_provider_name.return_value = 'anthropic'
+        provider.model = 'claude-3-5-haiku-20241022'
+        provider.temperature = 1.0
+        provider.supports_structured_output.return_value = True
+        provider.evaluate_structured.return_value = (structured_text, {
+            'input_tokens': 100, 'output_tokens': 50, 'cost': 0.001, 'model': provider.model
+        })
+        return provider
+
+    def _evaluate(self, provider):
+        with patch('ai_evaluator.get_provider', return_value=provider), \
+                patch('llm_cache.CACHE_ENABLED', False):
+            return evaluate_candidate_with_ai(JOB, CANDIDATE, structured_output=True)
+
+    def test_valid_structured_output(self):
+        provider = self._provider(json.dumps(STAGE1_JSON))
+
+        result = self._evaluate(provider)
+
+        provider.evaluate.assert_not_called()
+        prompt, schema = provider.evaluate_structured.call_args.args
+        self.assertIs(schema, STAGE1_SCHEMA)
+        self.assertIn('structured output', prompt.suffix)
+        self.assertEqual(result['output_format'], 'json')
+        self.assertEqual(result['evaluation']['score'], 82)
+        self.assertEqual(result['evaluation']['accomplishments_analysis']['comparable_work'], 85)
+
+    def test_invalid_structured_output_falls_back_to_text(self):
+        provider = self._provider('SCORE: 64\nA_SCORE: 60\nRECOMMENDATION: DECLINE')
+
+        result = self._evaluate(provider)
+
+        self.assertEqual(result['output_format'], 'text')
+        self.assertEqual(result['evaluation']['score'], 64)
+
+    def test_text_mode_is_the_default(self):
+        provider = self._provider('')
+        provider.evaluate.return_value = ('SCORE: 70', {'input_tokens': 1, 'output_tokens': 1, 'cost': 0.0,
+                                                        'model': provider.model})
+
+        with patch('ai_evaluator.get_provider', return_value=provider), \
+                patch('llm_cache.CACHE_ENABLED', False):
+            result = evaluate_candidate_with_ai(JOB, CANDIDATE)
+
+        provider.evaluate_structured.assert_not_called()
+        self.assertEqual(result['output_format'], 'text')
+
+
+class TestStructuredQuickScore(unittest.TestCase):
+    """Test run_quick_score in structured mode"""
+
+    def _run(self, structured_text):
+        provider = OllamaProvider(model='phi3')
+        usage = {'input_tokens': 10, 'output_tokens': 5, 'cost': 0.0, 'model': 'phi3'}
+        with patch.object(provider, 'evaluate_structured', return_value=(structured_text, usage)) as call, \
+                patch('llm_cache.CACHE_ENABLED', False):
+            result = run_quick_score(provider, JOB, CANDIDATE, structured_output=True)
+        return result, call
+
+    def test_valid_json(self):
+        result, call = self._run(json.dumps(QUICK_JSON))
+
+        prompt, schema = call.call_args.args
+        self.assertNotIn('EXACT format', prompt)
+        self.assertIs(schema, QUICK_SCORE_SCHEMA)
+        self.assertEqual(result['output_format'], 'json')
+        self.assertEqual(result['score'], 71)
+        self.assertEqual(result['match_analysis'][0]['status'], 'MET')
+
+    def test_schema_violations_are_coerced(self):
+        result, _ = self._run(json.dumps({
+            'a_score': 80, 't_score': '70', 'q_score': 140, 'score': 105, 'reasoning': 'good',
+            'requirements_identified': ['not', 'a', 'dict'],
+            'match_analysis': [{'requirement': 'Python', 'status': 'met'}, {'requirement': 'Go', 'status': 'maybe'}]
+        }))
+
+        self.assertEqual(result['output_format'], 'json')
+        self.assertEqual((result['a_score'], result['t_score'], result['q_score']), (80, 70, 100))
+        self.assertEqual(result['score'], 81)  # Out of range, so recomputed from A/T/Q
+        self.assertEqual(result['requirements_identified'], {'must_have': [], 'preferred': []})
+        self.assertEqual(result['match_analysis'], [{'requirement': 'Python', 'status': 'MET', 'evidence': ''}])
+
+    def test_unusable_json_raises_instead_of_guessing(self):
+        for text in ('{"score": 71}\nSCORE: 71', '{"score": 71, "reasoning": "ok"}', 'SCORE: 71'):
+            with self.assertRaises(ValueError):
+                self._run(text)
+
+    def test_text_prompt_unchanged(self):
+        self.assertIn('EXACT format', build_quick_score_prompt(JOB, CANDIDATE))
+
+
+if __name__ == '__main__':
+    unittest.main()
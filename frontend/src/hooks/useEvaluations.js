@@ -159,7 +159,8 @@ export function useEvaluateCandidate() {
         strengths: evaluation.keyStrengths || [],
         concerns: evaluation.keyConcerns || [],
         accomplishments_analysis: evaluation.accomplishmentsAnalysis || null,
-        trajectory_analysis: evaluation.trajectoryAnalysis || null
+        trajectory_analysis: evaluation.trajectoryAnalysis || null,
+        skill_hash: evaluation.skillHash || null
       }
 
       const evalResult = await dbService.createEvaluation(candidateId, evalData)
@@ -284,7 +285,8 @@ export function useBatchEvaluate() {
                 recommendation: mappedRecommendation,
                 reasoning: evaluation.reasoning,
                 strengths: evaluation.keyStrengths || [],
-                concerns: evaluation.keyConcerns || []
+                concerns: evaluation.keyConcerns || [],
+                skill_hash: evaluation.skillHash || null
               })
 
               // Update candidate status
@@ -138,7 +138,8 @@ async function evaluateSingleCandidate(job, candidate, options, retryCount = 0)
       success: true,
       evaluation: {
         name: candidate.name,
-        ...camelData.evaluation
+        ...camelData.evaluation,
+        skillHash: camelData.skillHash || null
       },
       usage: camelData.usage
     }